@@ -14,6 +14,8 @@
 
 import concurrent
 import os
+import random
+import time
 import warnings
 from typing import Dict, List, Tuple
 
@@ -21,12 +23,12 @@ import numpy as np
 import soundfile as sf
 import torch
 from omegaconf import OmegaConf
-from scipy.signal import convolve
 from scipy.signal.windows import cosine, hamming, hann
 from tqdm import tqdm
 
 from nemo.collections.asr.parts.preprocessing.perturb import process_augmentations
 from nemo.collections.asr.parts.utils.data_simulation_utils import (
+    AudioMemmapIndex,
     DataAnnotator,
     SpeechSampler,
     build_speaker_samples_map,
@@ -45,6 +47,7 @@ from nemo.collections.asr.parts.utils.data_simulation_utils import (
 )
 from nemo.collections.asr.parts.utils.manifest_utils import read_manifest
 from nemo.collections.asr.parts.utils.speaker_utils import get_overlap_range, is_overlap, merge_float_intervals
+from nemo.collections.audio.parts.utils.audio import fft_convolve
 from nemo.utils import logging
 
 try:
@@ -183,6 +186,12 @@ class MultiSpeakerSimulator(object):
       shift (float): Shift length for segmentation
       step_count (int): Number of the unit segments you want to create per utterance
       deci (int): Rounding decimals for segment manifest file
+
+    audio_index: (optional, memory-mapped audio index shared by the worker processes)
+      use_audio_index (bool): Decode the source and noise audio files once into a memory-mapped sample store
+                              and slice segments from it instead of decoding the audio files in every session
+      index_dir (str): Directory of the audio index. An existing index is reused if it contains all the files.
+                       If null, `<output_dir>/audio_index` is used.
     """
 
     def __init__(self, cfg):
@@ -214,6 +223,9 @@ class MultiSpeakerSimulator(object):
         self._speaker_ids = None
         self._device = torch.device("cuda") if torch.cuda.is_available() else torch.device("cpu")
         self._audio_read_buffer_dict = {}
+        self._audio_index = None
+        # speech intervals parsed from the RTTM entries of the current session
+        self._rttm_speech_intervals = []
         self.add_missing_overlap = self._params.data_simulator.session_params.get("add_missing_overlap", False)
 
         if (
@@ -414,6 +426,23 @@ class MultiSpeakerSimulator(object):
         self._audio_read_buffer_dict = {}
         torch.cuda.empty_cache()
 
+    def _build_audio_index(self, output_dir: str, noise_manifest: List[dict]):
+        """
+        Build (or reuse) the memory-mapped audio index of the source and noise audio files
+        if `data_simulator.audio_index.use_audio_index` is True.
+
+        Args:
+            output_dir (str): Output directory, used for the index if `audio_index.index_dir` is not set.
+            noise_manifest (list): List of the entire noise source samples.
+        """
+        audio_index_cfg = self._params.data_simulator.get('audio_index', None)
+        if audio_index_cfg is None or not audio_index_cfg.get('use_audio_index', False):
+            return
+        index_dir = audio_index_cfg.get('index_dir', None) or os.path.join(output_dir, 'audio_index')
+        audio_filepaths = [sample['audio_filepath'] for sample in self._manifest]
+        audio_filepaths += [sample['audio_filepath'] for sample in noise_manifest]
+        self._audio_index = AudioMemmapIndex.build(audio_filepaths=audio_filepaths, index_dir=index_dir)
+
     def _get_speaker_dominance(self) -> List[float]:
         """
         Get the dominance value for each speaker, accounting for the dominance variance and
@@ -656,7 +685,7 @@ class MultiSpeakerSimulator(object):
 
         Returns:
             sentence_word_count+current_word_count (int): Running word count
-            len(self._sentence) (tensor): Current length of the audio file
+            self._sentence_len (int): Current length of the sentence in terms of samples
         """
         # In general, random offset is not needed since random silence index has already been chosen
         if random_offset:
@@ -670,7 +699,7 @@ class MultiSpeakerSimulator(object):
             start_window_amount = 0
 
         # Ensure the desired number of words are added and the length of the output session isn't exceeded
-        sentence_samples = len(self._sentence)
+        sentence_samples = self._sentence_len
 
         remaining_dur_samples = max_samples_in_sentence - sentence_samples
         remaining_duration = max_word_count_in_sentence - sentence_word_count
@@ -720,26 +749,12 @@ class MultiSpeakerSimulator(object):
         if self._params.data_simulator.session_params.window_type is not None:  # cut off the start of the sentence
             if start_window_amount > 0:  # include window
                 window = self._get_window(start_window_amount, start=True)
-                self._sentence = self._sentence.to(self._device)
-                self._sentence = torch.cat(
-                    (
-                        self._sentence,
-                        torch.multiply(audio_file[start_cutoff : start_cutoff + start_window_amount], window),
-                    ),
-                    0,
+                self._append_to_sentence(
+                    torch.multiply(audio_file[start_cutoff : start_cutoff + start_window_amount], window)
                 )
-            self._sentence = torch.cat(
-                (
-                    self._sentence,
-                    audio_file[start_cutoff + start_window_amount : start_cutoff + prev_dur_samples],
-                ),
-                0,
-            ).to(self._device)
-
+            self._append_to_sentence(audio_file[start_cutoff + start_window_amount : start_cutoff + prev_dur_samples])
         else:
-            self._sentence = torch.cat(
-                (self._sentence, audio_file[start_cutoff : start_cutoff + prev_dur_samples]), 0
-            ).to(self._device)
+            self._append_to_sentence(audio_file[start_cutoff : start_cutoff + prev_dur_samples])
 
         # windowing at the end of the sentence
         if (
@@ -750,23 +765,30 @@ class MultiSpeakerSimulator(object):
                 remaining_dur_samples,
                 len(audio_file[start_cutoff + prev_dur_samples :]),
             )
-            self._sentence = torch.cat(
-                (
-                    self._sentence,
-                    audio_file[start_cutoff + prev_dur_samples : start_cutoff + prev_dur_samples + release_buffer],
-                ),
-                0,
-            ).to(self._device)
+            self._append_to_sentence(
+                audio_file[start_cutoff + prev_dur_samples : start_cutoff + prev_dur_samples + release_buffer]
+            )
 
             if end_window_amount > 0:  # include window
                 window = self._get_window(end_window_amount, start=False)
                 sig_start = start_cutoff + prev_dur_samples + release_buffer
                 sig_end = start_cutoff + prev_dur_samples + release_buffer + end_window_amount
                 windowed_audio_file = torch.multiply(audio_file[sig_start:sig_end], window)
-                self._sentence = torch.cat((self._sentence, windowed_audio_file), 0).to(self._device)
+                self._append_to_sentence(windowed_audio_file)
 
         del audio_file
-        return sentence_word_count + current_word_count, len(self._sentence)
+        return sentence_word_count + current_word_count, self._sentence_len
+
+    def _append_to_sentence(self, audio_chunk: torch.Tensor):
+        """
+        Append an audio chunk to the current sentence. Chunks are concatenated once in `_build_sentence`
+        to avoid copying the whole sentence every time a chunk is added.
+
+        Args:
+            audio_chunk (torch.Tensor): Time-series audio chunk to be appended
+        """
+        self._sentence_chunks.append(audio_chunk.to(self._device))
+        self._sentence_len += len(audio_chunk)
 
     def _build_sentence(
         self,
@@ -795,7 +817,8 @@ class MultiSpeakerSimulator(object):
         )
 
         # initialize sentence, text, words, alignments
-        self._sentence = torch.zeros(0, dtype=torch.float64, device=self._device)
+        self._sentence_chunks = [torch.zeros(0, dtype=torch.float64, device=self._device)]
+        self._sentence_len = 0
         self._text = ""
         self._words, self._alignments = [], []
         sentence_word_count, sentence_samples = 0, 0
@@ -825,6 +848,7 @@ class MultiSpeakerSimulator(object):
                 max_audio_read_sec=self._max_audio_read_sec,
                 min_alignment_count=self._min_alignment_count,
                 read_subset=True,
+                audio_index=self._audio_index,
             )
 
             # Step 6-2: Add optional perturbations to the specific audio segment (i.e. to `self._sentnece`)
@@ -834,6 +858,8 @@ class MultiSpeakerSimulator(object):
             sentence_word_count, sentence_samples = self._add_file(
                 audio_manifest, audio_file, sentence_word_count, sl, max_samples_in_sentence
             )
+        self._sentence = torch.cat(self._sentence_chunks, 0)
+        self._sentence_chunks = []
 
         # per-speaker normalization (accounting for active speaker time)
         if self._params.data_simulator.session_params.normalize and torch.max(torch.abs(self._sentence)) > 0:
@@ -960,12 +986,14 @@ class MultiSpeakerSimulator(object):
             sess_silence_len_rttm (int):
                 The total number of silence samples in the current session
         """
-        all_sample_list = []
-        for x_raw in rttm_list:
+        # Only the RTTM entries added since the last call are parsed.
+        if len(rttm_list) < len(self._rttm_speech_intervals):
+            self._rttm_speech_intervals = []
+        for x_raw in rttm_list[len(self._rttm_speech_intervals) :]:
             x = [token for token in x_raw.split()]
-            all_sample_list.append([float(x[0]), float(x[1])])
+            self._rttm_speech_intervals.append([float(x[0]), float(x[1])])
 
-        self._merged_speech_intervals = merge_float_intervals(all_sample_list)
+        self._merged_speech_intervals = merge_float_intervals(self._rttm_speech_intervals)
         total_speech_in_secs = sum([x[1] - x[0] for x in self._merged_speech_intervals])
         total_silence_in_secs = running_len_samples / self._params.data_simulator.sr - total_speech_in_secs
         sess_speech_len = int(total_speech_in_secs * self._params.data_simulator.sr)
@@ -977,6 +1005,9 @@ class MultiSpeakerSimulator(object):
     ) -> Tuple[torch.Tensor, torch.Tensor, int]:
         """
         Add a sentence to the session array containing time-series signal.
+        If the sentence exceeds the session array (only occurs in enforce mode), the capacity of the session arrays
+        is doubled so that the arrays are not re-allocated for every sentence. The caller trims the arrays to
+        the actual session length.
 
         Args:
             start (int): Starting position in the session
@@ -990,8 +1021,9 @@ class MultiSpeakerSimulator(object):
         """
         end = start + length
         if end > len(array):  # only occurs in enforce mode
-            array = torch.nn.functional.pad(array, (0, end - len(array)))
-            is_speech = torch.nn.functional.pad(is_speech, (0, end - len(is_speech)))
+            capacity = max(end, 2 * len(array))
+            array = torch.nn.functional.pad(array, (0, capacity - len(array)))
+            is_speech = torch.nn.functional.pad(is_speech, (0, capacity - len(is_speech)))
         array[start:end] += self._sentence
         is_speech[start:end] = 1
         return array, is_speech, end
@@ -1023,6 +1055,9 @@ class MultiSpeakerSimulator(object):
         """
         random_seed = self._params.data_simulator.random_seed
         np.random.seed(random_seed + idx)
+        # Python and torch RNGs are used by the augmentors, seed them per session for reproducible outputs
+        random.seed(random_seed + idx)
+        torch.manual_seed(random_seed + idx)
 
         self._device = device
         speaker_dominance = self._get_speaker_dominance()  # randomly determine speaker dominance
@@ -1035,6 +1070,7 @@ class MultiSpeakerSimulator(object):
         self._noise_samples = noise_samples
         self._furthest_sample = [0 for n in range(self._params.data_simulator.session_config.num_speakers)]
         self._missing_silence = 0
+        self._rttm_speech_intervals = []
 
         # hold enforce until all speakers have spoken
         enforce_time = np.random.uniform(
@@ -1139,6 +1175,10 @@ class MultiSpeakerSimulator(object):
             prev_speaker = speaker_turn
             prev_len_samples = length
 
+        # Trim the unused capacity of the session arrays
+        session_end = max(session_len_samples, int(running_len_samples))
+        array, is_speech = array[:session_end], is_speech[:session_end]
+
         # Step 7-1: Add optional perturbations to the whole session, such as white noise.
         if self._params.data_simulator.session_augmentor.add_sess_aug:
             # NOTE: This perturbation is not reflected in the session SNR in meta dictionary.
@@ -1158,6 +1198,7 @@ class MultiSpeakerSimulator(object):
                     background_noise_snr=self._params.data_simulator.background_noise.snr,
                     seed=(random_seed + idx),
                     device=self._device,
+                    audio_index=self._audio_index,
                 )
                 array += bg
             else:
@@ -1210,6 +1251,9 @@ class MultiSpeakerSimulator(object):
             add_bg=self._params.data_simulator.background_noise.add_bg,
             background_manifest=self._params.data_simulator.background_noise.background_manifest,
         )
+        self._build_audio_index(output_dir=basepath, noise_manifest=source_noise_manifest)
+        start_time = time.time()
+        simulated_duration = 0.0
         queue = []
 
         # add radomly sampled arguments to a list(queue) for multiprocessing
@@ -1249,13 +1293,9 @@ class MultiSpeakerSimulator(object):
                 else:
                     futures.append(queue[sess_idx])
 
-            if self.num_workers > 1:
-                generator = concurrent.futures.as_completed(futures)
-            else:
-                generator = futures
-
+            # Results are collected in the submission order to keep the file lists reproducible.
             for future in tqdm(
-                generator,
+                futures,
                 desc=f"[{chunk_idx+1}/{self.chunk_count}] Waiting jobs from {stt_idx+1: 2} to {end_idx: 2}",
                 unit="jobs",
                 total=len(futures),
@@ -1269,12 +1309,19 @@ class MultiSpeakerSimulator(object):
                     basepath, filename = self._generate_session(*future)
 
                 self.annotator.add_to_filename_lists(basepath=basepath, filename=filename)
+                simulated_duration += sf.info(os.path.join(basepath, filename + '.wav')).duration
 
                 # throw warning if number of speakers is less than requested
                 self._check_missing_speakers()
 
         tp.shutdown()
         self.annotator.write_filelist_files(basepath=basepath)
+        elapsed_time = time.time() - start_time
+        logging.info(
+            f"Simulated {simulated_duration / 3600:.2f} hours in {elapsed_time / 3600:.4f} hours of wall-clock time: "
+            f"{simulated_duration / max(elapsed_time, 1e-6):.1f} hours simulated per wall-clock hour "
+            f"with {self.num_workers} workers."
+        )
         logging.info(f"Data simulation has been completed, results saved at: {basepath}")
 
 
@@ -1493,6 +1540,7 @@ class RIRMultiSpeakerSimulator(MultiSpeakerSimulator):
     def _convolve_rir(self, input, speaker_turn: int, RIR: torch.Tensor) -> Tuple[list, int]:
         """
         Augment one sentence (or background noise segment) using a synthetic RIR.
+        The RIRs of all channels are convolved at once using batched FFT convolution on `self._device`.
 
         Args:
             input (torch.tensor): Input audio.
@@ -1502,16 +1550,24 @@ class RIRMultiSpeakerSimulator(MultiSpeakerSimulator):
             output_sound (list): List of tensors containing augmented audio
             length (int): Length of output audio channels (or of the longest if they have different lengths)
         """
-        output_sound = []
-        length = 0
-        for channel in range(self._params.data_simulator.rir_generation.mic_config.num_channels):
+        input = torch.as_tensor(input, device=self._device)
+        num_channels = self._params.data_simulator.rir_generation.mic_config.num_channels
+        rirs = []
+        for channel in range(num_channels):
             if self._params.data_simulator.rir_generation.toolkit == 'gpuRIR':
-                out_channel = convolve(input, RIR[speaker_turn, channel, : len(input)]).tolist()
+                rirs.append(RIR[speaker_turn, channel, : len(input)])
             elif self._params.data_simulator.rir_generation.toolkit == 'pyroomacoustics':
-                out_channel = convolve(input, RIR[channel][speaker_turn][: len(input)]).tolist()
-            if len(out_channel) > length:
-                length = len(out_channel)
-            output_sound.append(torch.tensor(out_channel))
+                rirs.append(RIR[channel][speaker_turn][: len(input)])
+
+        # Zero-pad the RIRs of all channels to the same length and convolve all channels at once
+        rir_lengths = [len(rir) for rir in rirs]
+        rir_batch = torch.zeros(num_channels, max(rir_lengths), dtype=torch.float64, device=self._device)
+        for channel, rir in enumerate(rirs):
+            rir_batch[channel, : rir_lengths[channel]] = torch.as_tensor(rir)
+        out = fft_convolve(input, rir_batch).float().cpu()
+
+        output_sound = [out[channel, : len(input) + rir_lengths[channel] - 1] for channel in range(num_channels)]
+        length = max(len(out_channel) for out_channel in output_sound)
         return output_sound, length
 
     def _generate_session(
@@ -1540,6 +1596,9 @@ class RIRMultiSpeakerSimulator(MultiSpeakerSimulator):
         """
         random_seed = self._params.data_simulator.random_seed
         np.random.seed(random_seed + idx)
+        # Python and torch RNGs are used by the augmentors, seed them per session for reproducible outputs
+        random.seed(random_seed + idx)
+        torch.manual_seed(random_seed + idx)
 
         self._device = device
         speaker_dominance = self._get_speaker_dominance()  # randomly determine speaker dominance
@@ -1672,6 +1731,7 @@ class RIRMultiSpeakerSimulator(MultiSpeakerSimulator):
                     background_noise_snr=self._params.data_simulator.background_noise.snr,
                     seed=(random_seed + idx),
                     device=self._device,
+                    audio_index=self._audio_index,
                 )
                 array += bg
             length = array.shape[0]
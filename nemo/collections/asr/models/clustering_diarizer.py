@@ -29,9 +29,11 @@ from nemo.collections.asr.metrics.der import score_labels
 from nemo.collections.asr.models.classification_models import EncDecClassificationModel
 from nemo.collections.asr.models.label_models import EncDecSpeakerLabelModel
 from nemo.collections.asr.parts.mixins.mixins import DiarizationMixin
+from nemo.collections.asr.parts.preprocessing.features import WaveformFeaturizer
 from nemo.collections.asr.parts.utils.speaker_utils import (
     audio_rttm_map,
     get_embs_and_timestamps,
+    get_multiscale_subsegments_from_manifest,
     get_uniqname_from_filepath,
     parse_scale_configs,
     perform_clustering,
@@ -372,15 +374,113 @@ class ClusteringDiarizer(torch.nn.Module, Model, DiarizationMixin):
                 self.time_stamps[uniq_name].append([start, end])
 
         if self._speaker_params.save_embeddings:
-            embedding_dir = os.path.join(self._speaker_dir, 'embeddings')
-            if not os.path.exists(embedding_dir):
-                os.makedirs(embedding_dir, exist_ok=True)
+            self._save_embeddings(prefix=get_uniqname_from_filepath(manifest_file))
 
-            prefix = get_uniqname_from_filepath(manifest_file)
-            name = os.path.join(embedding_dir, prefix)
-            self._embeddings_file = name + '_embeddings.pkl'
-            pkl.dump(self.embeddings, open(self._embeddings_file, 'wb'))
-            logging.info("Saved embedding files to {}".format(embedding_dir))
+    def _save_embeddings(self, prefix: str):
+        """
+        Save the speaker embeddings of the current scale in pickle format under `speaker_outputs/embeddings`.
+        """
+        embedding_dir = os.path.join(self._speaker_dir, 'embeddings')
+        if not os.path.exists(embedding_dir):
+            os.makedirs(embedding_dir, exist_ok=True)
+
+        name = os.path.join(embedding_dir, prefix)
+        self._embeddings_file = name + '_embeddings.pkl'
+        pkl.dump(self.embeddings, open(self._embeddings_file, 'wb'))
+        logging.info("Saved embedding files to {}".format(embedding_dir))
+
+    def _extract_multiscale_embeddings_in_memory(self):
+        """
+        Extract speaker embeddings for all scales without writing subsegment manifests.
+        The audio of each session is decoded once, and the subsegments of every scale are sliced from the decoded
+        waveform buffer. The subsegments of each scale are batched and padded like the subsegments manifest of
+        that scale in `_extract_embeddings`, so that both give the same embeddings.
+        """
+        logging.info("Extracting multiscale embeddings for Diarization from in-memory audio buffers")
+        scale_dict = self.multiscale_args_dict['scale_dict']
+        session_subsegments = get_multiscale_subsegments_from_manifest(
+            segments_manifest_file=self._speaker_manifest_path, scale_dict=scale_dict
+        )
+        featurizer = WaveformFeaturizer(sample_rate=self._cfg.sample_rate)
+        sample_rate = featurizer.sample_rate
+        batch_size = self._cfg.get('batch_size') or 1
+        self._speaker_model.eval()
+
+        multiscale_embs = {scale_idx: {} for scale_idx in scale_dict}
+        multiscale_stamps = {scale_idx: {} for scale_idx in scale_dict}
+        # Subsegments of each scale waiting for a full batch. Like the batches of a subsegments manifest, a batch
+        # can hold the subsegments of several sessions.
+        pending = {scale_idx: [] for scale_idx in scale_dict}
+        for uniq_name, session in tqdm(
+            session_subsegments.items(), desc='extract multiscale embeddings', leave=True, disable=not self.verbose
+        ):
+            if session['end'] <= session['start']:
+                continue
+            # Decode the time range covered by the speech segments of this session only once for all scales. One
+            # more sample is read, so that rounding the time range to samples never truncates the last subsegment.
+            buffer_offset = session['start']
+            audio_buffer = featurizer.process(
+                session['audio_filepath'],
+                offset=buffer_offset,
+                duration=session['end'] - buffer_offset + 1 / sample_rate,
+                trim=False,
+            )
+            buffer_start_idx = int(buffer_offset * sample_rate)
+
+            for scale_idx, subsegments in session['subsegments'].items():
+                multiscale_embs[scale_idx][uniq_name] = []
+                multiscale_stamps[scale_idx][uniq_name] = []
+                for start, dur in subsegments:
+                    # Same samples as reading the subsegment from the audio file
+                    start_idx = int(start * sample_rate) - buffer_start_idx
+                    sig = audio_buffer[start_idx : start_idx + int(dur * sample_rate)]
+                    # Copy the samples, so that pending subsegments do not hold the buffer of their session
+                    pending[scale_idx].append((uniq_name, start, dur, sig.clone()))
+                    if len(pending[scale_idx]) == batch_size:
+                        self._extract_subsegment_embeddings(
+                            pending[scale_idx], multiscale_embs[scale_idx], multiscale_stamps[scale_idx]
+                        )
+                        pending[scale_idx] = []
+        for scale_idx, subsegments in pending.items():
+            if subsegments:
+                self._extract_subsegment_embeddings(
+                    subsegments, multiscale_embs[scale_idx], multiscale_stamps[scale_idx]
+                )
+
+        for scale_idx in scale_dict:
+            self.embeddings = {
+                uniq_name: torch.stack(embs) for uniq_name, embs in multiscale_embs[scale_idx].items() if embs
+            }
+            self.time_stamps = {
+                uniq_name: stamps for uniq_name, stamps in multiscale_stamps[scale_idx].items() if stamps
+            }
+            self.multiscale_embeddings_and_timestamps[scale_idx] = [self.embeddings, self.time_stamps]
+            if self._speaker_params.save_embeddings:
+                self._save_embeddings(prefix=f'subsegments_scale{scale_idx}')
+
+    def _extract_subsegment_embeddings(self, subsegments: List[tuple], embeddings: dict, time_stamps: dict):
+        """
+        Extract the speaker embeddings of a batch of (uniq_name, start, duration, signal) subsegments, and append
+        them and their time stamps to the lists of their sessions in `embeddings` and `time_stamps`.
+        Shorter signals are padded by repeating them to the longest signal of the batch, like
+        `AudioToSpeechLabelDataset.fixed_seq_collate_fn`.
+        """
+        fixed_length = max(sig.shape[0] for _, _, _, sig in subsegments)
+        audio_signal = []
+        for _, _, _, sig in subsegments:
+            sig_len = sig.shape[0]
+            if sig_len < fixed_length:
+                repeat, rem = divmod(fixed_length, sig_len)
+                sig = torch.cat(repeat * [sig] + [sig[sig_len - rem :]])
+            audio_signal.append(sig)
+        audio_signal = torch.stack(audio_signal).to(self._speaker_model.device)
+        audio_signal_len = torch.full((len(subsegments),), fixed_length, device=self._speaker_model.device)
+        with torch.amp.autocast(self._speaker_model.device.type), torch.no_grad():
+            _, embs = self._speaker_model.forward(input_signal=audio_signal, input_signal_length=audio_signal_len)
+        embs = embs.view(-1, embs.shape[-1]).cpu().detach().float()
+        for (uniq_name, start, dur, _), emb in zip(subsegments, embs):
+            embeddings[uniq_name].append(emb)
+            time_stamps[uniq_name].append([start, start + dur])
 
     def diarize(self, paths2audio_files: List[str] = None, batch_size: int = 0):
         """
@@ -423,17 +523,21 @@ class ClusteringDiarizer(torch.nn.Module, Model, DiarizationMixin):
         # Speech Activity Detection
         self._perform_speech_activity_detection()
 
-        # Segmentation
-        scales = self.multiscale_args_dict['scale_dict'].items()
-        for scale_idx, (window, shift) in scales:
+        if self._speaker_params.get('in_memory_multiscale', False):
+            # Segmentation and embedding extraction for all scales from a single decoding pass per session
+            self._extract_multiscale_embeddings_in_memory()
+        else:
+            # Segmentation
+            scales = self.multiscale_args_dict['scale_dict'].items()
+            for scale_idx, (window, shift) in scales:
 
-            # Segmentation for the current scale (scale_idx)
-            self._run_segmentation(window, shift, scale_tag=f'_scale{scale_idx}')
+                # Segmentation for the current scale (scale_idx)
+                self._run_segmentation(window, shift, scale_tag=f'_scale{scale_idx}')
 
-            # Embedding Extraction for the current scale (scale_idx)
-            self._extract_embeddings(self.subsegments_manifest_path, scale_idx, len(scales))
+                # Embedding Extraction for the current scale (scale_idx)
+                self._extract_embeddings(self.subsegments_manifest_path, scale_idx, len(scales))
 
-            self.multiscale_embeddings_and_timestamps[scale_idx] = [self.embeddings, self.time_stamps]
+                self.multiscale_embeddings_and_timestamps[scale_idx] = [self.embeddings, self.time_stamps]
 
         embs_and_timestamps = get_embs_and_timestamps(
             self.multiscale_embeddings_and_timestamps, self.multiscale_args_dict
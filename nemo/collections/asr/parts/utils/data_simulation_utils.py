@@ -13,9 +13,11 @@
 # limitations under the License.
 
 import copy
+import json
 import os
 import shutil
 from collections import defaultdict
+from functools import lru_cache
 from typing import IO, Dict, List, Optional, Tuple
 
 import numpy as np
@@ -149,6 +151,7 @@ def read_audio_from_buffer(
     max_audio_read_sec: float = 2.5,
     min_alignment_count: int = 2,
     read_subset: bool = True,
+    audio_index: Optional['AudioMemmapIndex'] = None,
 ) -> Tuple[torch.Tensor, int, dict]:
     """
     Read from the provided file path while maintaining a hash-table that saves loading time.
@@ -166,6 +169,8 @@ def read_audio_from_buffer(
                             To control the length of the audio file, use data_simulator.session_params.max_audio_read_sec.
                             Note that using large value (greater than 3~4 sec) for `max_audio_read_sec` will slow down the generation process.
                             If False, read the entire audio file.
+        audio_index (AudioMemmapIndex): Memory-mapped audio index. If the audio file is in the index,
+                                        samples are sliced from the index instead of decoding the file.
 
     Returns:
         audio_file (torch.Tensor): Time-series audio data in a tensor.
@@ -176,6 +181,7 @@ def read_audio_from_buffer(
     if audio_file_id in buffer_dict:
         audio_file, sr, audio_manifest = buffer_dict[audio_file_id]
     else:
+        offset, duration = 0, 0
         if read_subset:
             audio_manifest = get_subset_of_audio_manifest(
                 audio_manifest=audio_manifest,
@@ -183,16 +189,18 @@ def read_audio_from_buffer(
                 max_audio_read_sec=max_audio_read_sec,
                 min_alignment_count=min_alignment_count,
             )
+            offset, duration = audio_manifest['offset'], audio_manifest['duration']
+        if audio_index is not None and audio_manifest['audio_filepath'] in audio_index:
+            samples, sr = audio_index.read(audio_manifest['audio_filepath'], offset=offset, duration=duration)
+        else:
             segment = AudioSegment.from_file(
-                audio_file=audio_manifest['audio_filepath'],
-                offset=audio_manifest['offset'],
-                duration=audio_manifest['duration'],
+                audio_file=audio_manifest['audio_filepath'], offset=offset, duration=duration
             )
-        else:
-            segment = AudioSegment.from_file(audio_file=audio_manifest['audio_filepath'])
-        audio_file, sr = torch.from_numpy(segment.samples).to(device), segment.sample_rate
-        if read_subset and segment.duration < (audio_manifest['alignments'][-1] - audio_manifest['alignments'][0]):
-            audio_manifest['alignments'][-1] = min(segment.duration, audio_manifest['alignments'][-1])
+            samples, sr = segment.samples, segment.sample_rate
+        audio_file = torch.from_numpy(samples).to(device)
+        segment_duration = samples.shape[0] / sr
+        if read_subset and segment_duration < (audio_manifest['alignments'][-1] - audio_manifest['alignments'][0]):
+            audio_manifest['alignments'][-1] = min(segment_duration, audio_manifest['alignments'][-1])
         if audio_file.ndim > 1:
             audio_file = torch.mean(audio_file, 1, False).to(device)
         buffer_dict[audio_file_id] = (audio_file, sr, audio_manifest)
@@ -318,6 +326,7 @@ def get_background_noise(
     background_noise_snr: float,
     seed: int,
     device: torch.device,
+    audio_index: Optional['AudioMemmapIndex'] = None,
 ):
     """
     Augment with background noise (inserting ambient background noise up to the desired SNR for the full clip).
@@ -332,6 +341,7 @@ def get_background_noise(
         background_noise_snr (float): SNR of the background noise.
         seed (int): Seed for random number generator.
         device (torch.device): Device to use.
+        audio_index (AudioMemmapIndex): Memory-mapped audio index for reading the noise files.
     
     Returns:
         bg_array (tensor): Tensor containing background noise.
@@ -352,6 +362,7 @@ def get_background_noise(
             offset_index=0,
             device=device,
             read_subset=False,
+            audio_index=audio_index,
         )
         if running_len_samples + len(audio_file) < len_array:
             end_audio_file = running_len_samples + len(audio_file)
@@ -625,6 +636,116 @@ def per_speaker_normalize(
     return sentence_audio
 
 
+@lru_cache(maxsize=None)
+def _load_audio_index(index_dir: str, mtime: float) -> Tuple[Dict[str, list], np.memmap]:
+    """
+    Load the file index and open the memory-mapped samples of an audio index.
+    The result is cached per process, so sessions generated in the same worker process share one memory-map.
+    `mtime` is only used as a cache key to reload the index if it is rebuilt.
+    """
+    with open(os.path.join(index_dir, AudioMemmapIndex.INDEX_FILENAME), 'r') as f:
+        index = json.load(f)
+    samples_path = os.path.join(index_dir, AudioMemmapIndex.SAMPLES_FILENAME)
+    if os.path.getsize(samples_path) > 0:
+        samples = np.memmap(samples_path, dtype=np.float32, mode='r')
+    else:
+        samples = np.zeros(0, dtype=np.float32)
+    return index, samples
+
+
+class AudioMemmapIndex(object):
+    """
+    Memory-mapped sample store for the source audio files of the data simulator.
+
+    Each audio file is decoded once, down-mixed to mono and appended to a flat float32 file (`samples.bin`).
+    The start index, number of samples and sample rate of each file are saved in `index.json`.
+    Reading a segment is then a slice of the memory-mapped file, which is shared through the page cache
+    by all worker processes instead of decoding the audio file again in every process.
+
+    The object only holds `index_dir`, so it can be passed to worker processes at no cost.
+
+    Args:
+        index_dir (str): Directory containing `samples.bin` and `index.json`.
+    """
+
+    SAMPLES_FILENAME = 'samples.bin'
+    INDEX_FILENAME = 'index.json'
+
+    def __init__(self, index_dir: str):
+        self.index_dir = index_dir
+
+    def _load(self) -> Tuple[Dict[str, list], np.memmap]:
+        mtime = os.path.getmtime(os.path.join(self.index_dir, self.INDEX_FILENAME))
+        return _load_audio_index(self.index_dir, mtime)
+
+    def __contains__(self, audio_filepath: str) -> bool:
+        return audio_filepath in self._load()[0]
+
+    def __len__(self) -> int:
+        return len(self._load()[0])
+
+    def read(self, audio_filepath: str, offset: float = 0, duration: float = 0) -> Tuple[np.ndarray, int]:
+        """
+        Read samples of an indexed audio file in the same way as `AudioSegment.from_file` with offset and duration.
+
+        Args:
+            audio_filepath (str): Path to the audio file.
+            offset (float): Offset in seconds. Reads from the beginning if not positive.
+            duration (float): Duration in seconds. Reads until the end if not positive.
+
+        Returns:
+            samples (np.ndarray): Mono audio samples in float32.
+            sample_rate (int): Sample rate of the audio file.
+        """
+        index, samples = self._load()
+        start, num_samples, sample_rate = index[audio_filepath]
+        begin = min(int(offset * sample_rate), num_samples) if offset is not None and offset > 0 else 0
+        if duration is not None and duration > 0:
+            end = min(begin + int(duration * sample_rate), num_samples)
+        else:
+            end = num_samples
+        return np.array(samples[start + begin : start + end]), sample_rate
+
+    @classmethod
+    def build(cls, audio_filepaths: List[str], index_dir: str) -> 'AudioMemmapIndex':
+        """
+        Decode the audio files and write them to a memory-mapped audio index.
+        If `index_dir` already contains an index with all the given audio files, the existing index is reused.
+
+        Args:
+            audio_filepaths (list): List of audio file paths to be indexed.
+            index_dir (str): Directory to save `samples.bin` and `index.json`.
+
+        Returns:
+            (AudioMemmapIndex): Audio index for the given audio files.
+        """
+        audio_filepaths = list(dict.fromkeys(audio_filepaths))
+        index_path = os.path.join(index_dir, cls.INDEX_FILENAME)
+        if os.path.exists(index_path):
+            with open(index_path, 'r') as f:
+                index = json.load(f)
+            if all(audio_filepath in index for audio_filepath in audio_filepaths):
+                logging.info(f"Using the existing audio index with {len(index)} files at {index_dir}")
+                return cls(index_dir)
+
+        os.makedirs(index_dir, exist_ok=True)
+        index, start = {}, 0
+        with open(os.path.join(index_dir, cls.SAMPLES_FILENAME), 'wb') as f:
+            for audio_filepath in tqdm(audio_filepaths, desc="Building audio index", unit="files"):
+                segment = AudioSegment.from_file(audio_file=audio_filepath)
+                samples = torch.from_numpy(segment.samples)
+                if samples.ndim > 1:
+                    samples = torch.mean(samples, 1, False)
+                samples = samples.numpy().astype(np.float32, copy=False)
+                f.write(samples.tobytes())
+                index[audio_filepath] = [start, samples.shape[0], segment.sample_rate]
+                start += samples.shape[0]
+        with open(index_path, 'w') as f:
+            json.dump(index, f)
+        logging.info(f"Built audio index with {len(index)} files ({start} samples) at {index_dir}")
+        return cls(index_dir)
+
+
 class DataAnnotator(object):
     """
     Class containing the functions that create RTTM, CTM, JSON files.
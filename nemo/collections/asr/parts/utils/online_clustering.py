@@ -36,6 +36,7 @@ import torch
 
 from nemo.collections.asr.parts.utils.offline_clustering import (
     NMESC,
+    ScalerMinMax,
     SpeakerClustering,
     SpectralClustering,
     get_scale_interpolated_embs,
@@ -590,7 +591,23 @@ class OnlineSpeakerClustering(torch.nn.Module):
         history_embedding_buffer_label (Tensor)
             Speaker label (cluster label) for embedding vectors saved in the history buffer
         Y_fullhist (Tensor)
-            Tensor containing the speaker label hypothesis from start to current frame
+            Tensor containing the speaker label hypothesis from start to current frame.
+            This is a view of `Y_fullhist_buffer`.
+
+    Attributes for preallocated buffers and caches:
+
+        Y_fullhist_buffer (Tensor)
+            Preallocated storage for `Y_fullhist`. The capacity is doubled when the session outgrows it, so
+            the speaker label history is not reallocated at every step.
+        processing_emb_buffer (Tensor)
+            Fixed-size buffer of (`history_n` + `current_n`) x (embedding dimension) which holds the history
+            embeddings followed by the current embeddings in online mode.
+        cached_emb (Tensor)
+            Embedding vectors that were used for the affinity matrix in the previous step
+        cached_emb_norm (Tensor)
+            Normalized embedding vectors of `cached_emb`
+        cached_cos_sim (Tensor)
+            Cosine similarity matrix of `cached_emb` before min-max scaling
     """
 
     def __init__(
@@ -641,6 +658,13 @@ class OnlineSpeakerClustering(torch.nn.Module):
         self.history_embedding_buffer_emb = torch.tensor([])
         self.history_embedding_buffer_label = torch.tensor([])
         self.Y_fullhist = torch.tensor([])
+        self.Y_fullhist_buffer = torch.tensor([])
+        self.processing_emb_buffer = torch.tensor([])
+
+        # Initialize the cache for incremental affinity matrix computation
+        self.cached_emb = torch.tensor([])
+        self.cached_emb_norm = torch.tensor([])
+        self.cached_cos_sim = torch.tensor([])
 
     def onlineNMEanalysis(self, mat_in: torch.Tensor, frame_index: int) -> Tuple[int, int]:
         """
@@ -991,23 +1015,151 @@ class OnlineSpeakerClustering(torch.nn.Module):
                 raise ValueError("History label size is not maintained correctly.")
 
         else:
-            total_emb.append(self.history_embedding_buffer_emb)
             total_cluster_labels.append(self.history_embedding_buffer_label)
 
         # `emb_curr` is the incumbent set of embeddings which is the the latest.
         emb_curr = self.make_constant_length_emb(emb_in, base_segment_indexes)
-        total_emb.append(emb_curr)
 
         # Before perform clustering, we attach the current_n number of estimated speaker labels
         # from the previous clustering result.
         total_cluster_labels.append(self.Y_fullhist[-self.current_n :])
 
-        history_and_current_emb = torch.vstack(total_emb)
+        # Write the history and current embeddings into the preallocated processing buffer
+        history_and_current_emb = self.fill_processing_buffer(self.history_embedding_buffer_emb, emb_curr)
         history_and_current_labels = torch.hstack(total_cluster_labels)
         if history_and_current_emb.shape[0] != len(history_and_current_labels):
             raise ValueError("`history_and_current_emb` has a mismatch in length with `history_and_current_labels`.")
         return history_and_current_emb, is_update
 
+    def fill_processing_buffer(self, history_emb: torch.Tensor, emb_curr: torch.Tensor) -> torch.Tensor:
+        """
+        Copy the history embeddings and the current embeddings into the fixed-size processing buffer instead of
+        concatenating them into a newly allocated matrix at every step. The buffer is only allocated when
+        the embedding dimension, data type, device or total size changes.
+
+        Args:
+            history_emb (Tensor):
+                Merged embedding vectors in the history buffer
+                Dimensions: (history_n) x (embedding dimension)
+            emb_curr (Tensor):
+                Length preserved embedding vectors of the current buffer
+                Dimensions: (current_n) x (embedding dimension)
+
+        Returns:
+            (Tensor):
+                Processing buffer containing `history_emb` followed by `emb_curr`
+        """
+        total_n = history_emb.shape[0] + emb_curr.shape[0]
+        if (
+            self.processing_emb_buffer.dim() != 2
+            or self.processing_emb_buffer.shape[0] != total_n
+            or self.processing_emb_buffer.shape[1] != emb_curr.shape[1]
+            or self.processing_emb_buffer.dtype != emb_curr.dtype
+            or self.processing_emb_buffer.device != emb_curr.device
+        ):
+            self.processing_emb_buffer = torch.empty(
+                (total_n, emb_curr.shape[1]), dtype=emb_curr.dtype, device=emb_curr.device
+            )
+        self.processing_emb_buffer[: history_emb.shape[0]] = history_emb
+        self.processing_emb_buffer[history_emb.shape[0] :] = emb_curr
+        return self.processing_emb_buffer
+
+    def get_incremental_cos_affinity(self, emb: torch.Tensor, eps: float = 3.5e-4) -> torch.Tensor:
+        """
+        Calculate the min-max normalized cosine affinity matrix like `getCosAffinityMatrix`, while only computing
+        the rows and columns of embedding vectors that were not part of the previous step.
+
+        Most embedding vectors are shared between consecutive steps: the bypassed (not merged) history
+        embeddings and the current buffer embeddings that are shifted by a few segments. The embedding vectors
+        of the previous step are matched to the new ones with a projection fingerprint, verified with an exact
+        comparison, and their cosine similarity values are gathered from the cached matrix.
+
+        Args:
+            emb (Tensor):
+                Matrix containing embedding vectors.
+                Dimensions: (Number of embedding vectors) x (embedding dimension)
+            eps (float):
+                Small value to avoid division by zero, same as in `cos_similarity`
+
+        Returns:
+            (Tensor):
+                Min-max normalized cosine affinity matrix of the given embedding vectors.
+                Dimensions: (Number of embedding vectors) x (Number of embedding vectors)
+        """
+        emb = emb.float()
+        num_embs = emb.shape[0]
+        reuse_cache = (
+            self.cached_emb.dim() == 2
+            and self.cached_emb.shape[0] > 0
+            and self.cached_emb.shape[1] == emb.shape[1]
+            and self.cached_emb.device == emb.device
+        )
+        if reuse_cache:
+            # Find the embedding vectors of the previous step that are identical to the new embedding vectors
+            fingerprint_weights = torch.linspace(1.0, 2.0, emb.shape[1], device=emb.device)
+            cached_fingerprint, cached_order = torch.sort(torch.mv(self.cached_emb, fingerprint_weights))
+            fingerprint = torch.mv(emb, fingerprint_weights)
+            position = torch.searchsorted(cached_fingerprint, fingerprint)
+            position = torch.clamp(position, max=self.cached_emb.shape[0] - 1)
+            candidate = cached_order[position]
+            is_cached = torch.all(self.cached_emb[candidate] == emb, dim=1)
+        else:
+            candidate = torch.zeros(num_embs, dtype=torch.long, device=emb.device)
+            is_cached = torch.zeros(num_embs, dtype=torch.bool, device=emb.device)
+
+        emb_norm = torch.empty_like(emb)
+        cos_sim = torch.empty((num_embs, num_embs), dtype=emb.dtype, device=emb.device)
+        cached_inds = torch.where(is_cached)[0]
+        new_inds = torch.where(~is_cached)[0]
+        if cached_inds.shape[0] > 0:
+            cached_src = candidate[cached_inds]
+            emb_norm[cached_inds] = self.cached_emb_norm[cached_src]
+            cos_sim[cached_inds.unsqueeze(1), cached_inds.unsqueeze(0)] = self.cached_cos_sim[
+                cached_src.unsqueeze(1), cached_src.unsqueeze(0)
+            ]
+        if new_inds.shape[0] > 0:
+            new_embs = emb[new_inds]
+            emb_norm[new_inds] = new_embs / (torch.norm(new_embs, dim=1).unsqueeze(1) + eps)
+            new_rows = torch.mm(emb_norm[new_inds], emb_norm.transpose(0, 1))
+            cos_sim[new_inds] = new_rows
+            cos_sim[:, new_inds] = new_rows.transpose(0, 1)
+        cos_sim.fill_diagonal_(1)
+
+        self.cached_emb = emb.clone()
+        self.cached_emb_norm = emb_norm
+        self.cached_cos_sim = cos_sim
+        return ScalerMinMax(cos_sim)
+
+    def update_label_history(self, start: int, labels: torch.Tensor) -> torch.Tensor:
+        """
+        Write the speaker labels to `Y_fullhist_buffer` starting from index `start` and update `Y_fullhist`
+        to be a view of the buffer up to the last written label. The buffer capacity is doubled whenever
+        the session outgrows it, so the label history is not reallocated at every step.
+
+        Args:
+            start (int):
+                Index in the speaker label history where `labels` should be written
+            labels (Tensor):
+                Speaker labels to be written
+
+        Returns:
+            (Tensor):
+                Updated speaker label history `Y_fullhist`
+        """
+        end = start + labels.shape[0]
+        if (
+            self.Y_fullhist_buffer.shape[0] < end
+            or self.Y_fullhist_buffer.dtype != labels.dtype
+            or self.Y_fullhist_buffer.device != labels.device
+        ):
+            new_buffer = torch.zeros(max(2 * end, 1), dtype=labels.dtype, device=labels.device)
+            keep_n = min(start, self.Y_fullhist.shape[0])
+            new_buffer[:keep_n] = self.Y_fullhist[:keep_n].to(labels.device)
+            self.Y_fullhist_buffer = new_buffer
+        self.Y_fullhist_buffer[start:end] = labels
+        self.Y_fullhist = self.Y_fullhist_buffer[:end]
+        return self.Y_fullhist
+
     def get_reduced_mat(self, emb_in: torch.Tensor, base_segment_indexes: torch.Tensor) -> Tuple[torch.Tensor, bool]:
         """
         Choose whether we want to add embeddings to the memory or not.
@@ -1090,16 +1242,15 @@ class OnlineSpeakerClustering(torch.nn.Module):
             if add_new:
                 if Y_matched[self.history_n :].shape[0] != self.current_n:
                     raise ValueError("Update point sync is not correct.")
-                # Concatenate the newly generated speaker labels
-                Y_out = torch.hstack((self.Y_fullhist[: self.history_buffer_seg_end], Y_matched[self.history_n :]))
-                self.Y_fullhist = Y_out
+                # Write the newly generated speaker labels after the history buffer boundary
+                Y_out = self.update_label_history(self.history_buffer_seg_end, Y_matched[self.history_n :])
             else:
                 # Do not update cumulative labels since there are no new segments.
                 Y_out = self.Y_fullhist
         else:
             # If no memory is used, offline clustering is applied.
             Y_out = stitch_cluster_labels(Y_old=self.Y_fullhist, Y_new=Y_merged).to(Y_merged.device)
-            self.Y_fullhist = Y_out
+            Y_out = self.update_label_history(0, Y_out)
         return Y_out
 
     def forward(
@@ -1186,7 +1337,7 @@ class OnlineSpeakerClustering(torch.nn.Module):
         if merged_embs.shape[0] == 1:
             Y = torch.zeros((1,), dtype=torch.int32)
         else:
-            mat = getCosAffinityMatrix(merged_embs)
+            mat = self.get_incremental_cos_affinity(merged_embs)
             est_num_of_spk, affinity_mat = self.online_spk_num_estimation(mat, frame_index)
             spectral_model = SpectralClustering(n_clusters=est_num_of_spk, cuda=cuda, device=merged_embs.device)
             Y = spectral_model.forward(affinity_mat).to(merged_embs.device)
@@ -690,6 +690,148 @@ def get_overlap_range(rangeA: List[float], rangeB: List[float]):
     return [max(rangeA[0], rangeB[0]), min(rangeA[1], rangeB[1])]
 
 
+def get_interval_set(intervals: torch.Tensor) -> torch.Tensor:
+    """
+    Build an interval set from an unsorted (N, 2) tensor of [start, end] pairs. The returned interval set has
+    sorted starts and ends and contains disjoint intervals, where overlapping or touching intervals are merged.
+    Start and end values are sorted separately, which keeps the union of the intervals intact as long as
+    each input interval satisfies `start <= end`. This makes merging a single vectorized pass with
+    `O(N*logN)` time complexity instead of a Python loop over the intervals.
+
+    Example:
+        input: [[11, 20], [1, 10], [10, 12], [30, 40]]
+        output: [[1, 20], [30, 40]]
+
+    Args:
+        intervals (Tensor):
+            Tensor of shape (N, 2) containing start and end values of the intervals.
+
+    Returns:
+        interval_set (Tensor):
+            Tensor of shape (M, 2) containing sorted and disjoint intervals.
+    """
+    if intervals.shape[0] == 0:
+        return intervals.reshape(0, 2)
+    starts, _ = torch.sort(intervals[:, 0])
+    ends, _ = torch.sort(intervals[:, 1])
+    gap_indices = torch.nonzero(starts[1:] > ends[:-1]).squeeze(1)
+    merged_starts = torch.cat([starts[:1], starts[gap_indices + 1]])
+    merged_ends = torch.cat([ends[gap_indices], ends[-1:]])
+    return torch.stack([merged_starts, merged_ends], dim=1)
+
+
+def _get_interval_set_coverage(set_a: torch.Tensor, set_b: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    Sweep the boundaries of two interval sets and return the elementary pieces between consecutive
+    boundaries with their coverage state. The coverage state is 1 if a piece is only covered by `set_a`,
+    2 if it is only covered by `set_b` and 3 if it is covered by both. Zero-length pieces are removed.
+
+    Args:
+        set_a (Tensor):
+            Interval set of shape (N, 2) from `get_interval_set`.
+        set_b (Tensor):
+            Interval set of shape (M, 2) from `get_interval_set`.
+
+    Returns:
+        pieces (Tensor):
+            Tensor of shape (K, 2) containing start and end values of the elementary pieces.
+        states (Tensor):
+            Tensor of shape (K,) containing the coverage state of each piece.
+    """
+    positions = torch.cat([set_a[:, 0], set_a[:, 1], set_b[:, 0], set_b[:, 1]])
+    deltas = torch.cat(
+        [
+            torch.ones(set_a.shape[0], dtype=torch.long, device=set_a.device),
+            -torch.ones(set_a.shape[0], dtype=torch.long, device=set_a.device),
+            2 * torch.ones(set_b.shape[0], dtype=torch.long, device=set_a.device),
+            -2 * torch.ones(set_b.shape[0], dtype=torch.long, device=set_a.device),
+        ]
+    )
+    positions, order = torch.sort(positions, stable=True)
+    states = torch.cumsum(deltas[order], dim=0)[:-1]
+    pieces = torch.stack([positions[:-1], positions[1:]], dim=1)
+    valid_mask = pieces[:, 1] > pieces[:, 0]
+    return pieces[valid_mask], states[valid_mask]
+
+
+def get_interval_union(set_a: torch.Tensor, set_b: torch.Tensor) -> torch.Tensor:
+    """
+    Calculate the union of two interval sets.
+
+    Args:
+        set_a (Tensor):
+            Interval set of shape (N, 2) from `get_interval_set`.
+        set_b (Tensor):
+            Interval set of shape (M, 2) from `get_interval_set`.
+
+    Returns:
+        (Tensor):
+            Interval set containing the ranges covered by `set_a` or `set_b`.
+    """
+    return get_interval_set(torch.cat([set_a, set_b], dim=0))
+
+
+def get_interval_intersection(set_a: torch.Tensor, set_b: torch.Tensor) -> torch.Tensor:
+    """
+    Calculate the intersection of two interval sets. Intervals that only touch each other do not intersect.
+
+    Args:
+        set_a (Tensor):
+            Interval set of shape (N, 2) from `get_interval_set`.
+        set_b (Tensor):
+            Interval set of shape (M, 2) from `get_interval_set`.
+
+    Returns:
+        (Tensor):
+            Interval set containing the ranges covered by both `set_a` and `set_b`.
+    """
+    pieces, states = _get_interval_set_coverage(set_a, set_b)
+    return get_interval_set(pieces[states == 3])
+
+
+def get_interval_subtraction(set_a: torch.Tensor, set_b: torch.Tensor) -> torch.Tensor:
+    """
+    Subtract an interval set from another interval set.
+
+    Args:
+        set_a (Tensor):
+            Interval set of shape (N, 2) from `get_interval_set`.
+        set_b (Tensor):
+            Interval set of shape (M, 2) from `get_interval_set` to be removed from `set_a`.
+
+    Returns:
+        (Tensor):
+            Interval set containing the ranges covered by `set_a` but not by `set_b`.
+    """
+    pieces, states = _get_interval_set_coverage(set_a, set_b)
+    return get_interval_set(pieces[states == 1])
+
+
+def get_overlap_ranges(intervals: torch.Tensor, target_start: float, target_end: float) -> torch.Tensor:
+    """
+    Vectorized version of `is_overlap` and `get_overlap_range` over a tensor of intervals.
+    Select the intervals that overlap with the target range and clip them to the target range.
+    The order of the input intervals is preserved.
+
+    Args:
+        intervals (Tensor):
+            Tensor of shape (N, 2) containing start and end values of the intervals.
+        target_start (float):
+            Start of the target range.
+        target_end (float):
+            End of the target range.
+
+    Returns:
+        (Tensor):
+            Tensor of shape (M, 2) containing the overlapping ranges.
+    """
+    overlap_mask = (intervals[:, 1] > target_start) & (intervals[:, 0] < target_end)
+    selected = intervals[overlap_mask]
+    return torch.stack(
+        [torch.clamp(selected[:, 0], min=target_start), torch.clamp(selected[:, 1], max=target_end)], dim=1
+    )
+
+
 def merge_int_intervals(intervals_in: List[List[int]]) -> List[List[int]]:
     """
     Interval merging algorithm which has `O(N*logN)` time complexity. (N is number of intervals)
@@ -723,29 +865,9 @@ def merge_int_intervals(intervals_in: List[List[int]]) -> List[List[int]]:
     elif num_intervals == 1:
         return intervals_in
     else:
-        merged_list: List[List[int]] = []
-        stt2: int = 0
-        end2: int = 0
-
         intervals_in = [[int(x[0]), int(x[1])] for x in intervals_in]
-        interval_tensor: torch.Tensor = torch.tensor(intervals_in)
-        _sorted, _ = torch.sort(interval_tensor, dim=0)
-        _sorted_int: List[List[int]] = [[int(x[0]), int(x[1])] for x in _sorted.cpu()]
-        intervals: List[List[int]] = _sorted_int
-
-        start, end = intervals[0][0], intervals[0][1]
-        for i in range(1, num_intervals):
-            stt2, end2 = intervals[i][0], intervals[i][1]
-            if end >= stt2:
-                end = max(end2, end)
-            else:
-                start, end = int(start), int(end)
-                merged_list.append([start, end])
-                start = stt2
-                end = max(end2, end)
-
-        start, end = int(start), int(end)
-        merged_list.append([start, end])
+        merged_tensor = get_interval_set(torch.tensor(intervals_in, dtype=torch.long))
+        merged_list: List[List[int]] = merged_tensor.tolist()
         return merged_list
 
 
@@ -794,15 +916,18 @@ def merge_float_intervals(ranges: List[List[float]], decimals: int = 5, margin:
             List containing the combined ranges.
             Example: [(10.2, 12.09)]
     """
-    ranges_int: List[List[int]] = []
-    merged_ranges_int: List[List[int]] = []
-    for x in ranges:
-        stt, end = int(fl2int(x[0], decimals) + margin), int(fl2int(x[1], decimals))
-        if stt < end:
-            ranges_int.append([stt, end])
-    merged_ranges_int = merge_int_intervals(ranges_int)
-    merged_ranges_float: List[List[float]] = []
-    merged_ranges_float = [[int2fl(x[0] - margin, decimals), int2fl(x[1], decimals)] for x in merged_ranges_int]
+    if len(ranges) == 0:
+        return []
+    # Same rounding as `fl2int` and `int2fl`, applied to all ranges at once
+    ranges_tensor = torch.tensor([[float(x[0]), float(x[1])] for x in ranges], dtype=torch.float64)
+    ranges_int = torch.round((ranges_tensor * (10**decimals)).float()).long()
+    ranges_int[:, 0] += margin
+    ranges_int = ranges_int[ranges_int[:, 0] < ranges_int[:, 1]]
+    merged_ranges_int = get_interval_set(ranges_int)
+    merged_ranges_int[:, 0] -= margin
+    merged_ranges_float: List[List[float]] = torch.round(
+        (merged_ranges_int.double() / (10**decimals)).float(), decimals=decimals
+    ).tolist()
     return merged_ranges_float
 
 
@@ -830,14 +955,13 @@ def get_sub_range_list(target_range: List[float], source_range_list: List[List[f
             List containing the overlap between target_range and
             source_range_list.
     """
-    if len(target_range) == 0:
+    if len(target_range) == 0 or len(source_range_list) == 0:
         return []
     else:
-        out_range: List[List[float]] = []
-        for s_range in source_range_list:
-            if is_overlap(s_range, target_range):
-                ovl_range = get_overlap_range(s_range, target_range)
-                out_range.append(ovl_range)
+        source_ranges = torch.tensor([[float(x[0]), float(x[1])] for x in source_range_list], dtype=torch.float64)
+        out_range: List[List[float]] = get_overlap_ranges(
+            source_ranges, float(target_range[0]), float(target_range[1])
+        ).tolist()
         return out_range
 
 
@@ -938,6 +1062,51 @@ def segments_manifest_to_subsegments_manifest(
     return subsegments_manifest_file
 
 
+def get_multiscale_subsegments_from_manifest(
+    segments_manifest_file: str,
+    scale_dict: Dict[int, Tuple[float, float]],
+    min_subsegment_duration: float = 0.05,
+) -> Dict[str, dict]:
+    """
+    Generate subsegments for every scale from a segments manifest file without writing subsegment manifests.
+    The subsegments are grouped by session so that the audio of each session only needs to be decoded once.
+    Subsegments follow the same ordering and filtering as `segments_manifest_to_subsegments_manifest`.
+
+    Args:
+        segments_manifest_file (str): path to segments manifest file, typically from VAD output
+        scale_dict (dict): dictionary of scale index to (window, shift) tuple
+        min_subsegment_duration (float): exclude subsegments smaller than this duration value
+
+    Returns:
+        session_subsegments (dict):
+            Dictionary keyed by unique session name. Each value contains `audio_filepath`, the time range
+            (`start`, `end`) spanned by all subsegments and `subsegments`, a dictionary mapping each scale index
+            to a list of [start, duration] pairs.
+    """
+    session_subsegments: Dict[str, dict] = {}
+    with open(segments_manifest_file, 'r') as segments_manifest:
+        for segment in segments_manifest.readlines():
+            dic = json.loads(segment.strip())
+            audio, offset, duration = dic['audio_filepath'], dic['offset'], dic['duration']
+            uniq_name = get_uniqname_from_filepath(audio)
+            if uniq_name not in session_subsegments:
+                session_subsegments[uniq_name] = {
+                    'audio_filepath': audio,
+                    'start': float('inf'),
+                    'end': 0.0,
+                    'subsegments': {scale_idx: [] for scale_idx in scale_dict},
+                }
+            session = session_subsegments[uniq_name]
+            for scale_idx, (window, shift) in scale_dict.items():
+                subsegments = get_subsegments_scriptable(offset=offset, window=window, shift=shift, duration=duration)
+                for start, dur in subsegments:
+                    if dur > min_subsegment_duration:
+                        session['subsegments'][scale_idx].append([start, dur])
+                        session['start'] = min(session['start'], start)
+                        session['end'] = max(session['end'], start + dur)
+    return session_subsegments
+
+
 def get_subsegments(
     offset: float,
     window: float,
@@ -1079,7 +1248,10 @@ def tensor_to_list(range_tensor: torch.Tensor) -> List[List[float]]:
     """
     For online segmentation. Force the list elements to be float type.
     """
-    return [[float(range_tensor[k][0]), float(range_tensor[k][1])] for k in range(range_tensor.shape[0])]
+    if range_tensor.numel() == 0:
+        return []
+    range_list: List[List[float]] = range_tensor.double().tolist()
+    return range_list
 
 
 def generate_diarization_output_lines(speaker_timestamps: List[List[float]], model_spk_num: int) -> List[str]:
@@ -1412,9 +1584,10 @@ def get_overlap_stamps(cont_stamps: List[str], ovl_spk_idx: List[str]):
     """
     ovl_spk_cont_list = [[] for _ in range(len(ovl_spk_idx))]
     for spk_idx in range(len(ovl_spk_idx)):
-        for idx, cont_a_line in enumerate(cont_stamps):
-            start, end, speaker = cont_a_line.split()
-            if idx in ovl_spk_idx[spk_idx]:
+        # Visit the overlap segment indices in order instead of scanning every segment for each speaker
+        for idx in sorted(set(ovl_spk_idx[spk_idx])):
+            if 0 <= idx < len(cont_stamps):
+                start, end, speaker = cont_stamps[idx].split()
                 ovl_spk_cont_list[spk_idx].append(f"{start} {end} speaker_{spk_idx}")
     total_ovl_cont_list = []
     for ovl_cont_list in ovl_spk_cont_list:
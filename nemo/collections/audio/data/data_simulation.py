@@ -23,15 +23,22 @@ import librosa
 import matplotlib.pyplot as plt
 import numpy as np
 import soundfile as sf
+import torch
 from numpy.random import default_rng
 from omegaconf import DictConfig, OmegaConf
-from scipy.signal import convolve
 from scipy.spatial.transform import Rotation
 from tqdm import tqdm
 
 from nemo.collections.asr.parts.preprocessing.segment import AudioSegment
 from nemo.collections.asr.parts.utils.manifest_utils import read_manifest, write_manifest
-from nemo.collections.audio.parts.utils.audio import db2mag, generate_approximate_noise_field, mag2db, pow2db, rms
+from nemo.collections.audio.parts.utils.audio import (
+    db2mag,
+    fft_convolve,
+    generate_approximate_noise_field,
+    mag2db,
+    pow2db,
+    rms,
+)
 from nemo.utils import logging
 
 try:
@@ -1636,19 +1643,55 @@ def convolve_rir(signal: np.ndarray, rir: np.ndarray) -> np.ndarray:
     Returns:
         out: same length as signal, same number of channels as rir, shape (samples, channels)
     """
-    num_samples = len(signal)
-    if rir.ndim == 1:
-        # convolve and trim to length
-        out = convolve(signal, rir)[:num_samples]
-    elif rir.ndim == 2:
-        num_channels = rir.shape[1]
-        out = np.zeros((num_samples, num_channels))
-        for m in range(num_channels):
-            out[:, m] = convolve(signal, rir[:, m])[:num_samples]
+    return convolve_rir_batch(signals=[signal], rirs=[rir])[0]
 
-    else:
-        raise RuntimeError(f'RIR with {rir.ndim} not supported')
 
+def convolve_rir_batch(
+    signals: List[np.ndarray], rirs: List[np.ndarray], max_batch_size: int = 256
+) -> List[np.ndarray]:
+    """Convolve a batch of signals with the corresponding IRs in a single call, i.e.,
+    calculate `convolve_rir(signals[n], rirs[n])` for each n.
+
+    All channels of all IRs are convolved at once using FFT. Signals and IRs are zero-padded
+    to a common length, which does not change the output after trimming it to the length
+    of the corresponding signal.
+
+    Args:
+        signals: list of single-channel signals, each with shape (samples,)
+        rirs: list of single- or multi-channel IRs, each with shape (samples,) or (samples, channels).
+              All IRs must have the same number of channels.
+        max_batch_size: maximum number of convolutions calculated at once, to bound memory
+
+    Returns:
+        List of convolved signals, each with the same length as the corresponding signal and the same
+        number of channels as the corresponding IR
+    """
+    if len(signals) != len(rirs):
+        raise ValueError(f'Number of signals ({len(signals)}) not matching the number of RIRs ({len(rirs)})')
+    for rir in rirs:
+        if rir.ndim not in [1, 2]:
+            raise RuntimeError(f'RIR with {rir.ndim} not supported')
+    if len(set(rir.shape[1:] for rir in rirs)) > 1:
+        raise ValueError(f'All RIRs must have the same number of channels, got {[rir.shape for rir in rirs]}')
+
+    num_samples = [len(signal) for signal in signals]
+    # signals with shape (batch, 1, samples), RIRs with shape (batch, channels, samples)
+    # if the same signal is convolved with all IRs, it is transformed only once and broadcasted
+    same_signal = all(signal is signals[0] for signal in signals)
+    x = np.zeros((1 if same_signal else len(signals), 1, max(num_samples)))
+    num_channels = rirs[0].shape[1] if rirs[0].ndim == 2 else 1
+    h = np.zeros((len(rirs), num_channels, max(len(rir) for rir in rirs)))
+    for n, signal in enumerate(signals[:1] if same_signal else signals):
+        x[n, 0, : len(signal)] = signal
+    for n, rir in enumerate(rirs):
+        h[n, :, : len(rir)] = rir.reshape(len(rir), -1).T
+
+    y = fft_convolve(torch.from_numpy(x), torch.from_numpy(h), num_samples=x.shape[-1], max_batch_size=max_batch_size)
+
+    out = []
+    for n, rir in enumerate(rirs):
+        y_n = y[n, :, : num_samples[n]].numpy().T
+        out.append(np.ascontiguousarray(y_n if rir.ndim == 2 else y_n[:, 0]))
     return out
 
 
@@ -2125,9 +2168,9 @@ def simulate_room_mix(
     source_signals_metadata = {'target': target_metadata['source_signals']}
 
     # Convolve target
-    target_reverberant = convolve_rir(target_signal, target_rir)
-    target_anechoic = convolve_rir(target_signal, target_rir_anechoic)
-    target_early = convolve_rir(target_signal, target_rir_early)
+    target_reverberant, target_anechoic, target_early = convolve_rir_batch(
+        signals=[target_signal] * 3, rirs=[target_rir, target_rir_anechoic, target_rir_early]
+    )
 
     # Prepare noise signal
     noise, noise_metadata = prepare_source_signal(
@@ -2145,7 +2188,7 @@ def simulate_room_mix(
         interference = None
     else:
         # Load interference signals
-        interference = 0
+        i_signals, i_rirs = [], []
         source_signals_metadata['interference'] = []
         for i_cfg in interference_cfg:
             # Load single-channel signal for directional interference
@@ -2164,10 +2207,10 @@ def simulate_room_mix(
                 selected_mics=i_cfg['selected_mics'],
                 sample_rate=sample_rate,
             )
-            # Convolve interference
-            i_reverberant = convolve_rir(i_signal, i_rir)
-            # Sum
-            interference += i_reverberant
+            i_signals.append(i_signal)
+            i_rirs.append(i_rir)
+        # Convolve all interference sources at once and sum
+        interference = sum(convolve_rir_batch(signals=i_signals, rirs=i_rirs)) if i_signals else 0
 
     # Scale and add components of the signal
     mic = target_reverberant.copy()
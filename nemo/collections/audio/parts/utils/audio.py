@@ -517,3 +517,49 @@ def toeplitz(x: torch.Tensor) -> torch.Tensor:
     length = x.size(-1)
     x = torch.cat([x[..., 1:].flip(dims=(-1,)), x], dim=-1)
     return x.unfold(-1, length, 1).flip(dims=(-1,))
+
+
+def fft_convolve(
+    x: torch.Tensor, h: torch.Tensor, num_samples: Optional[int] = None, max_batch_size: int = 256
+) -> torch.Tensor:
+    """Batched linear convolution of signals and filters along the last dimension,
+    calculated using FFT.
+
+    Leading dimensions of `x` and `h` are broadcasted, e.g., a single-channel
+    signal with shape (T,) can be convolved with a multi-channel RIR with shape (M, L)
+    to get a multi-channel signal with shape (M, T + L - 1). The spectrum of each input
+    is calculated only once before broadcasting, and the output is calculated in chunks
+    of at most `max_batch_size` along the first dimension to bound memory.
+    The calculation is done on the device of the input tensors.
+
+    Args:
+        x: input signals with shape (..., T)
+        h: filters with shape (..., L), leading dimensions must be broadcastable with `x`
+        num_samples: number of output samples, full convolution length T + L - 1 if None
+        max_batch_size: maximum number of elements along the first dimension calculated at once
+
+    Returns:
+        Tensor with shape (..., num_samples)
+    """
+    if x.device != h.device:
+        raise ValueError(f'Signal and filter must be on the same device, got {x.device} and {h.device}')
+
+    dtype = torch.promote_types(x.dtype, h.dtype)
+    full_length = x.size(-1) + h.size(-1) - 1
+    num_samples = full_length if num_samples is None else min(num_samples, full_length)
+    n_fft = scipy.fft.next_fast_len(full_length, real=True)
+
+    X = torch.fft.rfft(x.to(dtype), n=n_fft)
+    H = torch.fft.rfft(h.to(dtype), n=n_fft)
+    # broadcasted views, the product is calculated only for the current chunk
+    X, H = torch.broadcast_tensors(X, H)
+    batch_shape = X.shape[:-1]
+    if X.ndim == 1:
+        X, H = X.unsqueeze(0), H.unsqueeze(0)
+
+    y = torch.empty(*X.shape[:-1], num_samples, dtype=dtype, device=x.device)
+    for start in range(0, X.size(0), max_batch_size):
+        end = start + max_batch_size
+        y[start:end] = torch.fft.irfft(X[start:end] * H[start:end], n=n_fft)[..., :num_samples]
+
+    return y.reshape(*batch_shape, num_samples)
@@ -16,9 +16,11 @@
 import re
 import unicodedata
 from builtins import str as unicode
-from typing import List, Tuple
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional, Tuple
 
 __all__ = [
+    "LRUCache",
     "french_text_preprocessing",
     "chinese_text_preprocessing",
     "english_text_preprocessing",
@@ -211,3 +213,38 @@ def vietnamese_text_preprocessing(text: str) -> str:
 
 def japanese_text_preprocessing(text: str) -> str:
     return text.lower()
+
+
+class LRUCache:
+    """
+    Bounded cache which evicts the least recently used entry when it is full.
+    Unlike functools.lru_cache it can be pickled, so it can be stored in G2P modules and tokenizers which are copied to
+    dataloader workers.
+
+    Args:
+        maxsize: Maximum number of entries. If 0, nothing is cached.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
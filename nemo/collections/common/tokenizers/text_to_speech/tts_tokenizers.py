@@ -27,6 +27,7 @@ from nemo.collections.common.tokenizers.text_to_speech.ipa_lexicon import (
     validate_locale,
 )
 from nemo.collections.common.tokenizers.text_to_speech.tokenizer_utils import (
+    LRUCache,
     any_locale_text_preprocessing,
     chinese_text_preprocessing,
     english_text_preprocessing,
@@ -89,6 +90,10 @@ class BaseTokenizer(ABC):
         """Turns str text into int tokens."""
         pass
 
+    def batch_encode(self, texts: List[str]) -> List[List[int]]:
+        """Turns a list of str texts into lists of int tokens."""
+        return [self.encode(text) for text in texts]
+
     def decode(self, tokens: List[int]) -> str:
         """Turns ints tokens into str text."""
         return self.sep.join(self._id2token[t] for t in tokens if t not in self._util_ids)
@@ -522,6 +527,49 @@ class ItalianPhonemesTokenizer(BaseCharsTokenizer):
         return [self._token2id[p] for p in cs]
 
 
+def _batch_encode_with_g2p_cache(
+    tokenizer: Union["EnglishPhonemesTokenizer", "IPATokenizer"], texts: List[str]
+) -> List[List[int]]:
+    """
+    Encodes texts with a G2P-based tokenizer, using its texts cache.
+
+    The cache stores the preprocessed text and the grapheme and phoneme variants of all its words from
+    `g2p.batch_get_pronunciation_variants`, so a cached text is not preprocessed and converted by G2P again. If the G2P
+    module is deterministic (its `phoneme_probability` is None), the token IDs are cached as well. Otherwise a new
+    pronunciation is sampled on every call, which draws from the G2P random number generator in the same order as
+    encoding without the cache. G2P modules without `batch_get_pronunciation_variants` are not cached.
+    """
+    g2p = tokenizer.g2p
+    if tokenizer._text_cache.maxsize <= 0 or not hasattr(g2p, "batch_get_pronunciation_variants"):
+        # normalize the input text with "NFC" form.
+        texts = [tokenizer.text_preprocessing_func(text) for text in texts]
+        # transliterate the text into phoneme sequences and/or grapheme sequences.
+        g2p_texts = g2p.batch_call(texts) if hasattr(g2p, "batch_call") else [g2p(text) for text in texts]
+        return [tokenizer.encode_from_g2p(g2p_text, text) for g2p_text, text in zip(g2p_texts, texts)]
+
+    entries = [tokenizer._text_cache.get(text) for text in texts]
+    missing_indices = [i for i, entry in enumerate(entries) if entry is None]
+    if missing_indices:
+        preprocessed_texts = [tokenizer.text_preprocessing_func(texts[i]) for i in missing_indices]
+        variants = g2p.batch_get_pronunciation_variants(preprocessed_texts)
+        for i, preprocessed_text, text_variants in zip(missing_indices, preprocessed_texts, variants):
+            entries[i] = [preprocessed_text, text_variants, None]
+
+    is_deterministic = getattr(g2p, "phoneme_probability", None) is None
+    tokens_list = []
+    for text, entry in zip(texts, entries):
+        preprocessed_text, text_variants, tokens = entry
+        if tokens is None or not is_deterministic:
+            g2p_text = g2p.sample_pronunciation(text_variants)
+            tokens = tokenizer.encode_from_g2p(g2p_text, preprocessed_text)
+            entry[2] = tokens if is_deterministic else None
+        tokenizer._text_cache.put(text, entry)
+        # Return a copy so that callers can't modify the cached tokens
+        tokens_list.append(list(tokens))
+
+    return tokens_list
+
+
 class EnglishPhonemesTokenizer(BaseTokenizer):
     # fmt: off
     PUNCT_LIST = (  # Derived from LJSpeech and "/" additionally
@@ -558,6 +606,7 @@ class EnglishPhonemesTokenizer(BaseTokenizer):
         add_blank_at=None,
         pad_with_space=False,
         text_preprocessing_func=lambda text: english_text_preprocessing(text, lower=False),
+        cache_size=0,
     ):
         """English phoneme-based tokenizer.
         Args:
@@ -579,6 +628,7 @@ class EnglishPhonemesTokenizer(BaseTokenizer):
                 Basically, it replaces all non-unicode characters with unicode ones.
                 Note that lower() function shouldn't be applied here, in case the text contains phonemes (it will be
                 handled by g2p).
+            cache_size: Maximum number of texts whose G2P output is cached, 0 disables the cache. See `batch_encode`.
         """
 
         self.phoneme_probability = None
@@ -622,13 +672,22 @@ class EnglishPhonemesTokenizer(BaseTokenizer):
 
         self.text_preprocessing_func = text_preprocessing_func
         self.g2p = g2p
+        self._text_cache = LRUCache(cache_size)
 
     def encode(self, text):
         """See base class for more information."""
+        return self.batch_encode([text])[0]
 
-        text = self.text_preprocessing_func(text)
-        g2p_text = self.g2p(text)  # TODO: handle infer
-        return self.encode_from_g2p(g2p_text, text)
+    def batch_encode(self, texts: List[str]) -> List[List[int]]:
+        """
+        Encodes a list of texts, running G2P on all texts which are not cached in a single batch.
+        See `_batch_encode_with_g2p_cache` for the texts cache.
+        """
+        return _batch_encode_with_g2p_cache(self, texts)
+
+    def clear_cache(self):
+        """Clear the cached texts, this is needed after changing the G2P module."""
+        self._text_cache.clear()
 
     def encode_from_g2p(self, g2p_text: List[str], raw_text: Optional[str] = None):
         """
@@ -700,6 +759,7 @@ class IPATokenizer(BaseTokenizer):
         sep='|',  # To be able to distinguish between symbols
         add_blank_at=None,
         pad_with_space=False,
+        cache_size=0,
     ):
         """General-purpose IPA-based tokenizer.
         Args:
@@ -723,6 +783,7 @@ class IPATokenizer(BaseTokenizer):
             add_blank_at: Add blank to labels in the specified order ("last") or after tokens (any non None),
                 if None then no blank in labels.
             pad_with_space: Whether to pad text with spaces at the beginning and at the end or not.
+            cache_size: Maximum number of texts whose G2P output is cached, 0 disables the cache. See `batch_encode`.
         """
         if not hasattr(g2p, "symbols"):
             logging.error(
@@ -790,16 +851,22 @@ class IPATokenizer(BaseTokenizer):
         self.pad_with_space = pad_with_space
 
         self.g2p = g2p
+        self._text_cache = LRUCache(cache_size)
 
     def encode(self, text: str) -> List[int]:
         """See base class for more information."""
-        # normalize the input text with "NFC" form.
-        text = self.text_preprocessing_func(text)
+        return self.batch_encode([text])[0]
 
-        # transliterate the text into phoneme sequences and/or grapheme sequences.
-        g2p_text = self.g2p(text)
+    def batch_encode(self, texts: List[str]) -> List[List[int]]:
+        """
+        Encodes a list of texts, running G2P on all texts which are not cached in a single batch.
+        See `_batch_encode_with_g2p_cache` for the texts cache.
+        """
+        return _batch_encode_with_g2p_cache(self, texts)
 
-        return self.encode_from_g2p(g2p_text, text)
+    def clear_cache(self):
+        """Clear the cached texts, this is needed after changing the G2P module or its symbols."""
+        self._text_cache.clear()
 
     def encode_from_g2p(self, g2p_text: List[str], raw_text: Optional[str] = None) -> List[int]:
         """
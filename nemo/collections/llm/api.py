@@ -641,6 +641,8 @@ def deploy(
         # Store triton ip, port relevant for FastAPI as env vars to be accessible by fastapi_interface_to_pytriton.py
         os.environ["TRITON_HTTP_ADDRESS"] = triton_http_address
         os.environ["TRITON_PORT"] = str(triton_http_port)
+        # Requests to FastAPI are merged into queries of at most the max batch size of the model
+        os.environ["TRITON_MAX_BATCH_SIZE"] = str(max_batch_size)
 
         try:
             from nemo.deploy.nlp.megatronllm_deployable import MegatronLLMDeployableNemo2
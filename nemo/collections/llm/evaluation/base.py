@@ -16,6 +16,7 @@ import importlib
 import pkgutil
 import re
 import warnings
+from collections import defaultdict
 
 import numpy as np
 
@@ -29,6 +30,7 @@ from tqdm import tqdm
 from nemo.collections.common.tokenizers.huggingface.auto_tokenizer import AutoTokenizer
 from nemo.collections.common.tokenizers.sentencepiece_tokenizer import SentencePieceTokenizer
 from nemo.collections.llm.evaluation.api import EvaluationConfig, EvaluationTarget
+from nemo.collections.llm.evaluation.prefix_grouping import group_requests_by_prefix
 from nemo.deploy.nlp import NemoQueryLLM
 from nemo.utils import logging
 
@@ -42,7 +44,17 @@ class NeMoFWLMEval(LM):
     """
 
     def __init__(
-        self, model_name, api_url, tokenizer, batch_size, max_tokens_to_generate, temperature, top_p, top_k, add_bos
+        self,
+        model_name,
+        api_url,
+        tokenizer,
+        batch_size,
+        max_tokens_to_generate,
+        temperature,
+        top_p,
+        top_k,
+        add_bos,
+        group_by_prefix=False,
     ):
         warnings.warn(
             "NeMoFWLMEval is deprecated and will be removed in 25.06. Please refer to "
@@ -60,6 +72,7 @@ class NeMoFWLMEval(LM):
         self.top_p = top_p
         self.top_k = top_k
         self.add_bos = add_bos
+        self.group_by_prefix = group_by_prefix
         super().__init__()
 
     def _generate_tokens_logits(self, payload, single_prediction_token: bool = False, return_logits: bool = False):
@@ -116,6 +129,8 @@ class NeMoFWLMEval(LM):
         Defines the loglikelihood request. Takes input requests of type list[Instance] where Instance is a dataclass
         defined in lm_eval.api.instance. Each Instance conists of the input prompt, output prompt, request type(here
         loglikelihood) and other relevant args like few shot samples.
+        If group_by_prefix is set, requests which share a context are scored from the logits of as few queries as
+        possible, and the queries of a context are sent together (see group_requests_by_prefix).
         """
         special_tokens_kwargs = {}
         tokenizer_type = self.tokenizer_type(self.tokenizer)
@@ -135,45 +150,68 @@ class NeMoFWLMEval(LM):
         # Hard code max_tokens_to_generate to 1 to always generate just 1 token in case of loglikelihood type tasks
         self.max_tokens_to_generate = 1
 
-        results = []
-        for i in tqdm(range(0, len(requests), self.batch_size)):
-            # Group requests into batches
-            batch = requests[i : i + self.batch_size]
-            prompts = []
-            continuations = []
-            continuation_encs = []
-            num_ctx_tokens_list = []
-            num_cont_tokens_list = []
-            # Prepare inputs for the batch
-            for request in batch:
-                # get the input prompt from the request
-                context = request.arguments[0]
-                # get the output prompt from the request
-                continuation = request.arguments[1]
-                # get encoded tokens of context
-                context_enc = self.tokenizer.tokenizer.encode(context, **special_tokens_kwargs)
-                # get encoded tokens of continuation
-                continuation_enc = self.tokenizer.tokenizer.encode(continuation, **special_tokens_kwargs)
-                # for SentencePeice consider the encoded tokens from the 2nd token since first encoded token is space.
-                if self.tokenizer_type(self.tokenizer) == "SentencePieceTokenizer":
-                    context_enc = context_enc[1:]
-                    continuation_enc = continuation_enc[1:]
-                num_ctx_tokens = len(context_enc)
-                num_cont_tokens = len(continuation_enc)
-                # Delete the last token from continuation before passing it to the ip prompt by replacing with empty
-                # string
-                prompt = context + continuation.replace(self.tokenizer.tokenizer.decode(continuation_enc[-1]), "")
-
-                prompts.append(prompt)
-                continuations.append(continuation)
-                continuation_encs.append(continuation_enc)
-                num_ctx_tokens_list.append(num_ctx_tokens)
-                num_cont_tokens_list.append(num_cont_tokens)
+        prompts = []
+        context_encs = []
+        continuation_encs = []
+        # Prepare inputs for all requests
+        for request in requests:
+            # get the input prompt from the request
+            context = request.arguments[0]
+            # get the output prompt from the request
+            continuation = request.arguments[1]
+            # get encoded tokens of context
+            context_enc = self.tokenizer.tokenizer.encode(context, **special_tokens_kwargs)
+            # get encoded tokens of continuation
+            continuation_enc = self.tokenizer.tokenizer.encode(continuation, **special_tokens_kwargs)
+            # for SentencePeice consider the encoded tokens from the 2nd token since first encoded token is space.
+            if tokenizer_type == "SentencePieceTokenizer":
+                context_enc = context_enc[1:]
+                continuation_enc = continuation_enc[1:]
+            # Delete the last token from continuation before passing it to the ip prompt by replacing with empty
+            # string. Only the last occurrence is removed, since the logits of the prompt also score the requests
+            # whose continuations are a prefix of this continuation.
+            last_token = self.tokenizer.tokenizer.decode(continuation_enc[-1])
+            if last_token and continuation.endswith(last_token):
+                prompt = context + continuation[: -len(last_token)]
+            else:
+                prompt = context + continuation.replace(last_token, "")
+
+            prompts.append(prompt)
+            context_encs.append(context_enc)
+            continuation_encs.append(continuation_enc)
+
+        if self.group_by_prefix:
+            queries, sources = group_requests_by_prefix(context_encs, continuation_encs, single_prediction_token)
+        else:
+            queries, sources = list(range(len(requests))), list(range(len(requests)))
+        # Requests scored by the logits of the query of each request
+        scored_requests = defaultdict(list)
+        for i, source in enumerate(sources):
+            scored_requests[source].append(i)
+        num_tokens = [
+            len(context_enc) + len(continuation_enc)
+            for context_enc, continuation_enc in zip(context_encs, continuation_encs)
+        ]
+
+        if self.group_by_prefix:
+            # Each prompt holds the context and the continuation without its last token
+            num_prompt_tokens = sum(num_tokens) - len(requests)
+            num_query_tokens = sum(num_tokens[i] for i in queries) - len(queries)
+            logging.info(
+                f"Scoring {len(requests)} loglikelihood requests with {len(queries)} queries of {num_query_tokens} "
+                f"prompt tokens instead of {num_prompt_tokens} "
+                f"({1 - num_query_tokens / max(num_prompt_tokens, 1):.1%} fewer tokens processed)."
+            )
+
+        results = [None] * len(requests)
+        for i in tqdm(range(0, len(queries), self.batch_size)):
+            # Group queries into batches
+            batch = queries[i : i + self.batch_size]
 
             # Create a single payload for the entire batch
             payload = {
                 "model": self.model_name,
-                "prompt": prompts,
+                "prompt": [prompts[j] for j in batch],
                 "max_tokens": self.max_tokens_to_generate,
                 "temperature": self.temperature,
                 "top_p": self.top_p,
@@ -183,38 +221,46 @@ class NeMoFWLMEval(LM):
             # Query the model deployed on PyTriton server with the batched payload to get the logits
             logits_batch = self._generate_tokens_logits(payload, single_prediction_token, return_logits=True)
 
-            # Process each result in the batch
-            for j, logits in enumerate(logits_batch):
-                continuation_enc = continuation_encs[j]
-                num_ctx_tokens = num_ctx_tokens_list[j]
-                num_cont_tokens = num_cont_tokens_list[j]
-
-                # In case of multiple token prediction where full context logits are returned (tasks other than mmlu),
-                # get only logits corresponding to the continuation tokens from context logits tensor. context_logits
-                # contains logits for all tokens in the ip prompt along with the logit for the next token prediction
-                # after the final token in the prompt. Shape of context_logits: [1, #tokens_in_prompt+1, vocab_size].
+            # Score the requests of each query in the batch
+            for query, logits in zip(batch, logits_batch):
                 if not single_prediction_token:
                     # Discard zero padding if any
                     logits = logits[:, np.any(logits != 0, axis=(0, 2)), :]
-                    # Get only logits corresponding to cont tokens
-                    logits = logits[:, -num_cont_tokens:, :]
-                # Convert logits to torch tensor to easily get logprobs wo manual implementation of log_softmax
-                logProbs = F.log_softmax(torch.tensor(logits), dim=-1)
-                # Convert encoded continuation tokens to torch tensor
-                cont_toks = torch.tensor(continuation_enc, dtype=torch.long).unsqueeze(0)
-                # Get the greedy token from the logits (i.e token with the highest prob)
-                greedy_tokens = logProbs.argmax(dim=-1)
-                # Check if all greedy_tokens match the the actual continuation tokens
-                is_greedy = (greedy_tokens == cont_toks).all()
-                # Get the logits corresponding to the actual continuation tokens
-                logProbs_actual = torch.gather(logProbs, 2, cont_toks.unsqueeze(-1)).squeeze(-1)
-                # result is tuple of logProb of generating the continuation token and is_greedy
-                result = (float(logProbs_actual.sum()), bool(is_greedy))
-                # Append the result of this input in the batch to results list
-                results.append(result)
+                for request in scored_requests[query]:
+                    continuation_enc = continuation_encs[request]
+                    request_logits = logits
+                    # In case of multiple token prediction where full context logits are returned (tasks other than
+                    # mmlu), get only logits corresponding to the continuation tokens from context logits tensor.
+                    # context_logits contains logits for all tokens in the ip prompt along with the logit for the next
+                    # token prediction after the final token in the prompt. Shape of context_logits:
+                    # [1, #tokens_in_prompt+1, vocab_size]. The continuation of a request scored by a longer query
+                    # ends before the last tokens of the query.
+                    if not single_prediction_token:
+                        end = logits.shape[1] - (num_tokens[query] - num_tokens[request])
+                        request_logits = logits[:, end - len(continuation_enc) : end, :]
+                    results[request] = self._score_continuation(request_logits, continuation_enc)
 
         return results
 
+    @staticmethod
+    def _score_continuation(logits, continuation_enc):
+        """
+        Returns the log probability of the continuation tokens given their logits, and whether they are the greedy
+        tokens.
+        """
+        # Convert logits to torch tensor to easily get logprobs wo manual implementation of log_softmax
+        logProbs = F.log_softmax(torch.tensor(logits), dim=-1)
+        # Convert encoded continuation tokens to torch tensor
+        cont_toks = torch.tensor(continuation_enc, dtype=torch.long).unsqueeze(0)
+        # Get the greedy token from the logits (i.e token with the highest prob)
+        greedy_tokens = logProbs.argmax(dim=-1)
+        # Check if all greedy_tokens match the the actual continuation tokens
+        is_greedy = (greedy_tokens == cont_toks).all()
+        # Get the logits corresponding to the actual continuation tokens
+        logProbs_actual = torch.gather(logProbs, 2, cont_toks.unsqueeze(-1)).squeeze(-1)
+        # result is tuple of logProb of generating the continuation token and is_greedy
+        return (float(logProbs_actual.sum()), bool(is_greedy))
+
     def loglikelihood_rolling(self, requests: list[Instance]):
         """
         Defines the loglikelihood_rolling request type. Yet to be implemented.
@@ -454,6 +500,7 @@ def _legacy_evaluate(
         top_p=params.top_p,
         top_k=params.top_k,
         add_bos=params.add_bos,
+        group_by_prefix=params.extra.get("group_by_prefix", False),
     )
 
     eval_task = eval_cfg.type
@@ -0,0 +1,71 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import defaultdict
+from typing import List, Sequence, Tuple
+
+
+def group_requests_by_prefix(
+    context_encs: Sequence[Sequence[int]],
+    continuation_encs: Sequence[Sequence[int]],
+    single_prediction_token: bool = False,
+) -> Tuple[List[int], List[int]]:
+    """
+    Plans the queries which score loglikelihood requests, so that requests which share a context are scored from the
+    logits of as few queries as possible.
+
+    The prompt of the query of a request is its context followed by its continuation without the last token, and
+    the logits of its continuation are the last logits of the prompt. With teacher forcing, the logits of a prompt
+    also score every request whose context and continuation are a prefix of the context and continuation of the
+    query, like the continuations of multiple choice tasks which are prefixes of longer choices. If only the logits of
+    the next token are returned (`single_prediction_token`), requests are scored by a query with the same prompt,
+    like the single token answers of a multiple choice task.
+
+    Queries of the same context are sent one after the other, so that a backend which caches the states of prompt
+    prefixes can reuse them, and contexts are sorted by decreasing length, so that batches of queries have prompts
+    of similar lengths.
+
+    Args:
+        context_encs: Token ids of the context of each request.
+        continuation_encs: Token ids of the continuation of each request, which must not be empty.
+        single_prediction_token (bool): Whether the model only returns the logits of the token after the prompt.
+
+    Returns:
+        queries (List[int]): Indices of the requests whose prompts are sent to the model, in the order to send them.
+        sources (List[int]): For each request, the index of the request whose query scores it.
+    """
+    groups = defaultdict(list)
+    for i, context_enc in enumerate(context_encs):
+        groups[tuple(context_enc)].append(i)
+
+    def length(i):
+        return len(context_encs[i]) + len(continuation_encs[i])
+
+    queries = []
+    sources = list(range(len(context_encs)))
+    for requests in sorted(groups.values(), key=lambda requests: (-max(map(length, requests)), requests[0])):
+        group_queries = {}
+        for i in sorted(requests, key=lambda i: (-length(i), i)):
+            tokens = tuple(continuation_encs[i])
+            if single_prediction_token:
+                source = group_queries.get(tokens[:-1])
+            else:
+                # Continuations are compared to the longer continuations of the queries of the group
+                source = next((j for query, j in group_queries.items() if query[: len(tokens)] == tokens), None)
+            if source is None:
+                group_queries[tokens[:-1] if single_prediction_token else tokens] = i
+                queries.append(i)
+            else:
+                sources[i] = source
+    return queries, sources
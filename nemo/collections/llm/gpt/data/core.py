@@ -12,12 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
 import json
 import logging
 import math
+import multiprocessing as mp
+import os
 import re
+import time
 from pathlib import Path
-from typing import List, Mapping, Optional
+from typing import List, Mapping, Optional, Tuple
 
 import datasets
 import numpy as np
@@ -27,9 +31,12 @@ from datasets import load_dataset
 from nemo.collections.common.tokenizers import TokenizerSpec
 from nemo.collections.llm.gpt.data.utils import (
     _get_samples_mapping,
+    _index_fn,
     _JSONLMemMapDataset,
     _OnlineSampleMapping,
     _preprocess,
+    _PretokenizedSFTCache,
+    lightning_prepare_data,
 )
 from nemo.core.classes import Dataset
 from nemo.lightning.base import NEMO_DATASETS_CACHE
@@ -46,6 +53,9 @@ PREFIX_STR = (
 __idx_version__ = "0.2"  # index file version
 __idx_suffix__ = "idx"  # index file suffix
 
+# Dataset whose examples are tokenized by the forked workers of `GPTSFTDataset.build_pretokenized_cache`
+_PRETOKENIZE_DATASET = None
+
 
 def get_dataset_root(name: str) -> Path:
     """ """
@@ -121,6 +131,10 @@ def create_sft_dataset(
         )
 
 
+def _pretokenize_examples(indices: range) -> List[Tuple[List[int], List[bool], int, int, dict]]:
+    return [_PRETOKENIZE_DATASET._pretokenize_example(idx) for idx in indices]
+
+
 class GPTSFTDataset(Dataset):
     """ """
 
@@ -155,6 +169,7 @@ class GPTSFTDataset(Dataset):
         ceil_to_power_2: bool = False,
         get_attention_mask_from_fusion: bool = False,
         sanity_check_dist_workers: bool = True,
+        pretokenize: bool = False,
     ):
         """
         file_path: Path to a JSONL GPT supervised fine-tuning dataset.
@@ -202,6 +217,8 @@ class GPTSFTDataset(Dataset):
         is_test: Whether this dataset is the test split.
         output_original_text (bool): if true, will keep the original text in the output alongside the tokenized ids.
         sanity_check_dist_workers (bool): if true, will run sanity check across workers when making mapping.
+        pretokenize (bool): if true, all examples are tokenized once into a memory-mapped cache next to the index
+            files, using `memmap_workers` processes, and served from it without tokenizing at train time.
         """
         self.tokenizer = tokenizer
         self.file_path = file_path
@@ -251,6 +268,10 @@ class GPTSFTDataset(Dataset):
         # Will be None after this call if `max_num_samples` is None
         self._build_samples_mapping()
 
+        self.pretokenized_cache = None
+        if pretokenize:
+            self._load_pretokenized_cache()
+
     def _load_dataset(self):
         if self.hf_dataset:
             self.indexed_dataset = load_dataset(
@@ -340,6 +361,11 @@ class GPTSFTDataset(Dataset):
             auto_gen_idx = True
         else:
             auto_gen_idx = False
+        if self.pretokenized_cache is not None:
+            processed_example = self._example_from_cache(*self.pretokenized_cache[idx])
+            if auto_gen_idx:
+                processed_example['metadata']['__AUTOGENERATED__'] = True
+            return processed_example
         try:
             example = self.indexed_dataset[idx]
             if auto_gen_idx:
@@ -349,6 +375,131 @@ class GPTSFTDataset(Dataset):
             raise e
         return self._process_example(example)
 
+    def _pretokenized_cache_info(self) -> dict:
+        """Everything which changes the result of `_process_example` for the examples of the file"""
+        file_hash = hashlib.sha1()
+        with open(self.file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                file_hash.update(chunk)
+        return {
+            'dataset_class': type(self).__name__,
+            'file_sha1': file_hash.hexdigest(),
+            'tokenizer': {
+                'class': type(self.tokenizer).__name__,
+                'vocab_size': getattr(self.tokenizer, 'vocab_size', None),
+                'bos_id': getattr(self.tokenizer, 'bos_id', None),
+                'eos_id': getattr(self.tokenizer, 'eos_id', None),
+                'probe_ids': [
+                    int(x) for x in self.tokenizer.text_to_ids("The quick brown fox.\n<extra_id_1>User 1,234!")
+                ],
+            },
+            'prompt_template': self.prompt_template,
+            'max_seq_length': self.max_seq_length,
+            'add_bos': self.add_bos,
+            'add_eos': self.add_eos,
+            'add_sep': self.add_sep,
+            'sep_id': self.sep_id,
+            'label_key': self.label_key,
+            'answer_only_loss': self.answer_only_loss,
+            'truncation_fields': self.truncation_fields,
+            'truncation_method': self.truncation_method,
+            'virtual_tokens': self.virtual_tokens,
+            'tokens_to_generate': self.tokens_to_generate,
+            'special_tokens': dict(self.special_tokens),
+            'is_test': self.is_test,
+            'output_original_text': self.output_original_text,
+        }
+
+    def _pretokenized_cache_dir(self, info: dict) -> str:
+        key = hashlib.sha1(json.dumps(info, sort_keys=True).encode('utf-8')).hexdigest()
+        return f"{_index_fn(self.file_path, self.index_mapping_dir)}.tokenized_{key}"
+
+    def build_pretokenized_cache(self) -> str:
+        """
+        Tokenize all examples of the dataset with `memmap_workers` processes and write them into the pre-tokenized
+        cache, unless it already exists.
+
+        Returns:
+            Directory of the cache.
+        """
+        global _PRETOKENIZE_DATASET
+
+        info = self._pretokenized_cache_info()
+        cache_dir = self._pretokenized_cache_dir(info)
+        if _PretokenizedSFTCache.exists(cache_dir):
+            return cache_dir
+
+        workers = self.memmap_workers if self.memmap_workers is not None else max(1, os.cpu_count() // 2)
+        num_examples = len(self.indexed_dataset)
+        chunk_size = 256
+        chunks = [range(start, min(start + chunk_size, num_examples)) for start in range(0, num_examples, chunk_size)]
+        logger.info(f"Pre-tokenizing {num_examples} examples of {self.file_path} using {workers} workers")
+        start_time = time.time()
+        if workers > 1 and len(chunks) > 1:
+            # Forked workers share the loaded dataset and tokenizer with this process
+            _PRETOKENIZE_DATASET = self
+            try:
+                with mp.get_context("fork").Pool(workers) as p:
+                    _PretokenizedSFTCache.write(
+                        cache_dir,
+                        (example for examples in p.imap(_pretokenize_examples, chunks) for example in examples),
+                        info,
+                    )
+            finally:
+                _PRETOKENIZE_DATASET = None
+        else:
+            _PretokenizedSFTCache.write(
+                cache_dir,
+                (self._pretokenize_example(idx) for idx in range(num_examples)),
+                info,
+            )
+        logger.info(f"Time pre-tokenizing {self.file_path}: {time.time() - start_time:.2f} s, saved to {cache_dir}")
+        return cache_dir
+
+    def _pretokenize_example(self, idx: int) -> Tuple[List[int], List[bool], int, int, dict]:
+        try:
+            return self._example_to_cache(self._process_example(self.indexed_dataset[idx]))
+        except Exception as e:
+            logger.error(f"Error while pre-tokenizing example {idx} from dataset {self.file_path}")
+            raise e
+
+    def _load_pretokenized_cache(self):
+        is_distributed = torch.distributed.is_available() and torch.distributed.is_initialized()
+        if not is_distributed or torch.distributed.get_rank() == 0:
+            cache_dir = self.build_pretokenized_cache()
+        if is_distributed and not lightning_prepare_data():
+            torch.distributed.barrier()
+        if is_distributed and torch.distributed.get_rank() != 0:
+            # Also builds the cache if it is not on a filesystem shared with rank 0
+            cache_dir = self.build_pretokenized_cache()
+        self.pretokenized_cache = _PretokenizedSFTCache(cache_dir)
+
+    def _example_to_cache(self, processed_example: dict) -> Tuple[List[int], List[bool], int, int, dict]:
+        """Convert the output of `_process_example` to the fields stored in the pre-tokenized cache"""
+        loss_mask = [mask > 0 for mask in self._build_loss_mask(processed_example)]
+        return (
+            processed_example['input_ids'],
+            loss_mask,
+            processed_example['context_length'],
+            len(processed_example['answer_ids']),
+            processed_example['metadata'],
+        )
+
+    def _example_from_cache(
+        self, input_ids: np.ndarray, loss_mask: np.ndarray, context_length: int, answer_length: int, metadata: dict
+    ) -> dict:
+        """Create the output of `_process_example` from the fields stored in the pre-tokenized cache"""
+        input_ids = input_ids.tolist()
+        return {
+            'input_ids': input_ids,
+            'answer_start_idx': context_length,
+            'context_ids': input_ids[:context_length],
+            'context_length': context_length,
+            'answer_ids': input_ids[context_length : context_length + answer_length],
+            'metadata': metadata,
+            'token_count': len(input_ids),
+        }
+
     def _separate_template(self, prompt_template_values: List[str]):
         """
         Combine contexts and label based on prompt_template into a list of strings and a list of keys.
@@ -666,6 +817,7 @@ class GPTSFTPackedDataset(GPTSFTDataset):
                 cross-sequence attention. This flag should be True unless you have a specific use case.
         """
         np.random.seed(kwargs.get('seed', 1234))
+        assert not kwargs.get('pretokenize', False), "Packed sequence datasets are already tokenized."
         super().__init__(file_path, tokenizer, **kwargs)
         assert self.virtual_tokens == 0, "P-Tuning with packed sequence is not supported."
         self.return_cu_seqlen = return_cu_seqlen
@@ -930,6 +1082,27 @@ class GPTSFTChatDataset(GPTSFTDataset):
 
         return result
 
+    def _example_to_cache(self, processed_example: dict) -> Tuple[List[int], List[bool], int, int, dict]:
+        return (
+            processed_example['input_ids'].tolist(),
+            processed_example['mask'].tolist(),
+            len(processed_example['context_ids']),
+            len(processed_example['answer_ids']),
+            processed_example['metadata'],
+        )
+
+    def _example_from_cache(
+        self, input_ids: np.ndarray, loss_mask: np.ndarray, context_length: int, answer_length: int, metadata: dict
+    ) -> dict:
+        input_ids = torch.from_numpy(input_ids.astype(np.int64))
+        return {
+            'input_ids': input_ids,
+            'mask': torch.from_numpy(loss_mask),
+            'context_ids': input_ids[:context_length],
+            'answer_ids': input_ids[context_length:],
+            'metadata': metadata,
+        }
+
     def collate_fn(self, batch):
         input_ids = [item['input_ids'][:-1].tolist() for item in batch]
         labels = [item['input_ids'][1:].tolist() for item in batch]
@@ -57,7 +57,9 @@ class FineTuningDataModule(pl.LightningDataModule):
         persistent_workers (bool, optional): Whether to keep data loading workers persistent across epochs.
             Defaults to False.
         packed_sequence_specs (PackedSequenceSpecs, optional): See PackedSequenceSpecs for details
-        dataset_kwargs (Optional[Dict[str, Any]], optional): Keyword arguments to pass into the GPTSFTDataset class
+        dataset_kwargs (Optional[Dict[str, Any]], optional): Keyword arguments to pass into the GPTSFTDataset class.
+            With `pretokenize=True`, the training and validation data are tokenized once in `prepare_data`, and served
+            from a memory-mapped cache afterwards.
     """
 
     def __init__(
@@ -117,8 +119,11 @@ class FineTuningDataModule(pl.LightningDataModule):
 
     def prepare_data(self) -> None:
         """
-        Prepare packed sequence data
+        Prepare packed sequence data, or pre-tokenized data if `pretokenize` is set in the dataset kwargs
         """
+        if self.packed_sequence_size <= 0 and self.dataset_kwargs.get('pretokenize', False):
+            self._prepare_pretokenized_data()
+
         if self.packed_sequence_size > 0:
             from nemo.collections.llm.gpt.data.packed_sequence import prepare_packed_sequence_data
 
@@ -144,6 +149,15 @@ class FineTuningDataModule(pl.LightningDataModule):
                     output_metadata_path=self.pack_metadata,
                 )
 
+    def _prepare_pretokenized_data(self) -> None:
+        """
+        Build the pre-tokenized caches of the training and validation data, by creating the datasets with the
+        arguments of `train_dataloader` and `val_dataloader`. The validation dataset is reused by `val_dataloader`.
+        """
+        for path, is_test in ((self.train_path, False), (self.validation_path, True)):
+            if path.is_file():
+                self._create_dataset(path, pack_metadata_path=None, is_test=is_test, **self.dataset_kwargs)
+
     def setup(self, stage: str):
         """Called by pytorch lightning in datamodule setup"""
 
@@ -19,9 +19,11 @@ import logging
 import multiprocessing as mp
 import os
 import pickle
+import shutil
 import time
+import uuid
 from functools import lru_cache, partial
-from typing import Any, Callable, List, Optional, Type
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Type
 
 import numpy as np
 import torch
@@ -349,6 +351,111 @@ class _JSONLMemMapDataset(_TextMemMapDataset):
         return record
 
 
+class _PretokenizedSFTCache:
+    """
+    Memory-mapped cache of the pre-tokenized examples of a supervised fine-tuning dataset.
+
+    The cache is a directory with the concatenated input ids and loss masks of all examples, an index with the offset,
+    number of tokens, context length and answer length of each example, and the JSON encoded metadata of each example.
+    It is written once with `write` and then read by all dataloader workers and ranks without tokenizing.
+    The info file is written last, so a cache is only complete if it exists.
+    """
+
+    INFO_FILENAME = "info.json"
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self._arrays = None
+
+    @classmethod
+    def exists(cls, cache_dir: str) -> bool:
+        """Whether a complete cache exists in cache_dir"""
+        return os.path.exists(os.path.join(cache_dir, cls.INFO_FILENAME))
+
+    @classmethod
+    def write(cls, cache_dir: str, examples: Iterable[Tuple[List[int], List[bool], int, int, dict]], info: dict):
+        """
+        Write the pre-tokenized examples into cache_dir. The files are written to a temporary directory first,
+        which replaces cache_dir once it is complete, so that concurrent writers do not corrupt the cache. If another
+        writer, possibly on another node, completed the cache first, its cache is kept.
+
+        Args:
+            examples: iterable of (input ids, loss mask, context length, answer length, metadata) of each example.
+            info: JSON serializable description of the cached dataset.
+        """
+        # Unique for each writer, also when writers on several nodes share the file system
+        tmp_dir = f"{cache_dir}.tmp{uuid.uuid4().hex}"
+        os.makedirs(tmp_dir, exist_ok=True)
+        index = []
+        metadata_offsets = [0]
+        offset = 0
+        with (
+            open(os.path.join(tmp_dir, "input_ids.bin"), "wb") as ids_f,
+            open(os.path.join(tmp_dir, "loss_mask.bin"), "wb") as mask_f,
+            open(os.path.join(tmp_dir, "metadata.bin"), "wb") as metadata_f,
+        ):
+            for input_ids, loss_mask, context_length, answer_length, metadata in examples:
+                ids_f.write(np.asarray(input_ids, dtype=np.int32).tobytes())
+                mask_f.write(np.asarray(loss_mask, dtype=np.uint8).tobytes())
+                index.append((offset, len(input_ids), context_length, answer_length))
+                offset += len(input_ids)
+                metadata_f.write(json.dumps(metadata).encode("utf-8"))
+                metadata_offsets.append(metadata_f.tell())
+
+        np.save(os.path.join(tmp_dir, "index.npy"), np.array(index, dtype=np.int64).reshape(-1, 4))
+        np.save(os.path.join(tmp_dir, "metadata_offsets.npy"), np.array(metadata_offsets, dtype=np.int64))
+        with open(os.path.join(tmp_dir, cls.INFO_FILENAME), "w") as info_f:
+            json.dump({**info, "num_examples": len(index), "num_tokens": offset}, info_f)
+
+        try:
+            os.replace(tmp_dir, cache_dir)
+        except OSError:
+            shutil.rmtree(tmp_dir)
+            # Only a complete cache replaces cache_dir, so a cache written by another process in the meantime is kept
+            if not cls.exists(cache_dir):
+                raise
+
+    def _load(self):
+        if self._arrays is None:
+
+            def _memmap(filename, dtype):
+                path = os.path.join(self.cache_dir, filename)
+                if os.path.getsize(path) == 0:
+                    return np.zeros(0, dtype=dtype)
+                return np.memmap(path, dtype=dtype, mode="r")
+
+            self._arrays = (
+                _memmap("input_ids.bin", np.int32),
+                _memmap("loss_mask.bin", np.uint8),
+                np.load(os.path.join(self.cache_dir, "index.npy"), mmap_mode="r"),
+                _memmap("metadata.bin", np.uint8),
+                np.load(os.path.join(self.cache_dir, "metadata_offsets.npy"), mmap_mode="r"),
+            )
+        return self._arrays
+
+    def __getstate__(self):
+        # Memory maps are opened again in each dataloader worker instead of being pickled
+        return {"cache_dir": self.cache_dir, "_arrays": None}
+
+    def __len__(self):
+        return len(self._load()[2])
+
+    def __getitem__(self, idx: int) -> Tuple[np.ndarray, np.ndarray, int, int, dict]:
+        """Return the input ids, loss mask, context length, answer length and metadata of an example"""
+        input_ids, loss_mask, index, metadata, metadata_offsets = self._load()
+        offset, num_tokens, context_length, answer_length = (int(x) for x in index[idx])
+        example_metadata = json.loads(
+            metadata[metadata_offsets[idx] : metadata_offsets[idx + 1]].tobytes().decode("utf-8")
+        )
+        return (
+            np.array(input_ids[offset : offset + num_tokens]),
+            np.array(loss_mask[offset : offset + num_tokens], dtype=bool),
+            context_length,
+            answer_length,
+            example_metadata,
+        )
+
+
 class _OnlineSampleMapping:
     """
     This class replaces NeMo's get_samples_mapping function which pre-computes.
@@ -605,7 +712,11 @@ def lightning_prepare_data():
 
     return any(
         [
-            frame.function == 'prepare_data' and 'prepare_packed_sequence_data' in frame.code_context[0]
+            frame.function == 'prepare_data'
+            and any(
+                prepare_fn in frame.code_context[0]
+                for prepare_fn in ('prepare_packed_sequence_data', 'prepare_pretokenized_data')
+            )
             for frame in inspect.stack()
         ]
     )
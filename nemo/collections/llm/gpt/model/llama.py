@@ -31,7 +31,7 @@ from nemo.export.trt_llm.nemo_ckpt_loader.nemo_file import load_distributed_mode
 from nemo.lightning import OptimizerModule, io, teardown
 from nemo.lightning.ckpt_utils import ADAPTER_META_FILENAME
 from nemo.lightning.io.pl import ckpt_to_weights_subdir
-from nemo.lightning.io.state import TransformCTX, TransformFns, _ModelState
+from nemo.lightning.io.state import TransformCTX, TransformFns, _ModelState, _SafetensorsModelState
 from nemo.lightning.pytorch.utils import dtype_from_hf
 from nemo.utils import logging
 
@@ -501,11 +501,14 @@ class HFLlamaImporter(io.ModelConnector["LlamaForCausalLM", LlamaModel]):
         """
         return LlamaModel(self.config, tokenizer=self.tokenizer)
 
-    def apply(self, output_path: Path) -> Path:
+    def apply(self, output_path: Path, streaming: bool = False) -> Path:
         """Apply the conversion from HF to NeMo format.
 
         Args:
             output_path: Path where the converted model will be saved
+            streaming: Whether to convert the safetensors files of the HF checkpoint one at a time, instead of
+                loading the HF model first. The converted weights are copied into the NeMo model as soon as they
+                are complete, so that the HF weights are never all held in memory. Not supported for Llama4.
 
         Returns:
             Path: Path to the saved NeMo model
@@ -519,6 +522,8 @@ class HFLlamaImporter(io.ModelConnector["LlamaForCausalLM", LlamaModel]):
 
             source = Llama4ForConditionalGeneration.from_pretrained(str(self), torch_dtype='auto')
             source = source.language_model
+        elif streaming:
+            source = _SafetensorsModelState.from_pretrained(str(self), config=hf_config)
         else:
             source = AutoModelForCausalLM.from_pretrained(str(self), torch_dtype='auto')
 
@@ -0,0 +1,599 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Analytic model of the memory per GPU and of the step time of training configurations.
+
+The estimates only need the model config and the parallelism of a configuration, so that the grid search can rank
+and prune configurations on CPU before any job is launched. Memory follows the per layer activation formulas of
+"Reducing Activation Recomputation in Large Transformer Models" (Korthikanti et al.) for each recompute mode, with
+mixed precision Adam states. Step time combines the model FLOPs of nemo/utils/flops_formulas.py with the pipeline
+bubble, recomputation and the communication volume of each parallelism.
+"""
+
+import math
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import pandas as pd
+
+from nemo.utils import flops_formulas, logging
+
+GB = 1024**3
+
+
+@dataclass
+class ModelSpec:
+    """Architecture of a decoder (or encoder) only transformer.
+
+    Args:
+        num_layers (int): number of transformer layers.
+        hidden_size (int): hidden size.
+        ffn_hidden_size (int): hidden size of the MLP, or of each expert of MoE layers.
+        num_attention_heads (int): number of attention heads.
+        seq_length (int): sequence length.
+        vocab_size (int): size of the vocabulary.
+        num_query_groups (Optional[int]): number of key and value heads, defaults to the number of attention heads.
+        kv_channels (Optional[int]): size of each attention head, defaults to hidden_size / num_attention_heads.
+        gated_linear_unit (bool): whether the MLP has a gated linear unit, like SwiGLU.
+        num_moe_experts (Optional[int]): number of experts of the MLP of each layer, or None for dense layers.
+        moe_router_topk (Optional[int]): number of experts each token is routed to.
+        share_embeddings_and_output_weights (bool): whether the output layer reuses the embeddings.
+    """
+
+    num_layers: int
+    hidden_size: int
+    ffn_hidden_size: int
+    num_attention_heads: int
+    seq_length: int
+    vocab_size: int
+    num_query_groups: Optional[int] = None
+    kv_channels: Optional[int] = None
+    gated_linear_unit: bool = False
+    num_moe_experts: Optional[int] = None
+    moe_router_topk: Optional[int] = None
+    share_embeddings_and_output_weights: bool = False
+
+    @classmethod
+    def from_config(cls, config, vocab_size: int) -> "ModelSpec":
+        """Creates the spec of a model config, like `base_cfg.model.config` of a recipe."""
+
+        def get(name, default=None):
+            value = getattr(config, name, default)
+            return default if value is None else value
+
+        hidden_size = config.hidden_size
+        return cls(
+            num_layers=config.num_layers,
+            hidden_size=hidden_size,
+            ffn_hidden_size=get("ffn_hidden_size", 4 * hidden_size),
+            num_attention_heads=config.num_attention_heads,
+            seq_length=config.seq_length,
+            vocab_size=vocab_size,
+            num_query_groups=get("num_query_groups"),
+            kv_channels=get("kv_channels"),
+            gated_linear_unit=get("gated_linear_unit", False),
+            num_moe_experts=get("num_moe_experts"),
+            moe_router_topk=get("moe_router_topk"),
+            share_embeddings_and_output_weights=get("share_embeddings_and_output_weights", False),
+        )
+
+    @property
+    def head_size(self) -> int:
+        return self.kv_channels or self.hidden_size // self.num_attention_heads
+
+    @property
+    def query_size(self) -> int:
+        return self.num_attention_heads * self.head_size
+
+    @property
+    def key_value_size(self) -> int:
+        return (self.num_query_groups or self.num_attention_heads) * self.head_size
+
+    @property
+    def ffn_multiplier(self) -> int:
+        """Number of projections from the hidden size to the FFN hidden size."""
+        return 2 if self.gated_linear_unit else 1
+
+    @property
+    def is_moe(self) -> bool:
+        return bool(self.num_moe_experts)
+
+    def num_parameters(self):
+        """Returns the number of dense parameters of a layer, of expert parameters of a layer and of embeddings.
+
+        The embeddings include the output layer if it is not shared.
+        """
+        h = self.hidden_size
+        attention = h * (self.query_size + 2 * self.key_value_size) + self.query_size * h
+        mlp = (self.ffn_multiplier + 1) * h * self.ffn_hidden_size
+        layer_norms = 2 * h
+        embeddings = self.vocab_size * h * (1 if self.share_embeddings_and_output_weights else 2)
+        if self.is_moe:
+            router = h * self.num_moe_experts
+            return attention + layer_norms + router, self.num_moe_experts * mlp, embeddings
+        return attention + layer_norms + mlp, 0, embeddings
+
+
+@dataclass
+class ParallelConfig:
+    """Parallelism, batch size and recomputation of a training configuration.
+
+    Sequence parallelism is assumed to be enabled with tensor parallelism, and experts are split with the tensor
+    parallel size like the other layers.
+
+    Args:
+        tp (int): tensor parallel size.
+        pp (int): pipeline parallel size.
+        cp (int): context parallel size.
+        ep (int): expert parallel size.
+        mbs (int): micro batch size.
+        vp (Optional[int]): virtual pipeline parallel size, or None without interleaving.
+        recompute_granularity (Optional[str]): None, "selective" to recompute the core attention, or "full" to
+            recompute whole layers.
+        recompute_num_layers (Optional[int]): with full recomputation, number of layers of each pipeline stage (or
+            of each virtual pipeline stage) which are recomputed, defaults to all of them.
+        distributed_optimizer (bool): whether the optimizer states are sharded across data parallel ranks.
+        flash_attention (bool): whether the attention scores are not stored, like with flash or fused attention.
+    """
+
+    tp: int = 1
+    pp: int = 1
+    cp: int = 1
+    ep: int = 1
+    mbs: int = 1
+    vp: Optional[int] = None
+    recompute_granularity: Optional[str] = None
+    recompute_num_layers: Optional[int] = None
+    distributed_optimizer: bool = True
+    flash_attention: bool = True
+
+    @classmethod
+    def from_config(cls, config: dict, **kwargs) -> "ParallelConfig":
+        """Creates the parallel config of a grid search config generated by `utils.modify_cfg`."""
+        act = config.get("activations_checkpoint_num_layers")
+        if act:
+            kwargs.update(recompute_granularity="full", recompute_num_layers=act)
+        return cls(
+            tp=config["tensor_model_parallel_size"],
+            pp=config["pipeline_model_parallel_size"],
+            cp=config.get("context_parallel_size") or 1,
+            ep=config.get("expert_model_parallel_size") or 1,
+            mbs=config["micro_batch_size"],
+            vp=config.get("virtual_pipeline_model_parallel_size"),
+            **kwargs,
+        )
+
+
+@dataclass
+class HardwareSpec:
+    """GPUs and interconnect of the cluster.
+
+    Args:
+        gpu_memory_gb (float): memory per GPU, in GB.
+        tflops_per_gpu (float): matrix multiplication TFLOPS achieved by each GPU.
+        gpus_per_node (int): number of GPUs per node.
+        intra_node_bandwidth (float): bus bandwidth of collectives within a node, like NVLink, in GB/s.
+        inter_node_bandwidth (float): bus bandwidth of collectives across nodes, per GPU, in GB/s.
+        memory_overhead_gb (float): memory of the CUDA context, communication buffers and fragmentation, in GB.
+    """
+
+    gpu_memory_gb: float = 80
+    tflops_per_gpu: float = 140
+    gpus_per_node: int = 8
+    intra_node_bandwidth: float = 200.0
+    inter_node_bandwidth: float = 25.0
+    memory_overhead_gb: float = 4.0
+
+
+@dataclass
+class MemoryEstimate:
+    """Peak memory per GPU, in GB, of the pipeline stage which needs the most memory."""
+
+    params: float
+    grads: float
+    optimizer: float
+    activations: float
+    overhead: float
+
+    @property
+    def total(self) -> float:
+        return self.params + self.grads + self.optimizer + self.activations + self.overhead
+
+
+@dataclass
+class StepTimeEstimate:
+    """Time of a global batch, in seconds, split in the time of each component."""
+
+    compute: float
+    recompute: float
+    bubble: float
+    tp_comm: float
+    cp_comm: float
+    ep_comm: float
+    pp_comm: float
+    dp_comm: float
+
+    @property
+    def total(self) -> float:
+        return (
+            self.compute
+            + self.recompute
+            + self.bubble
+            + self.tp_comm
+            + self.cp_comm
+            + self.ep_comm
+            + self.pp_comm
+            + self.dp_comm
+        )
+
+
+def _data_parallel_sizes(parallel: ParallelConfig, num_gpus: int):
+    """Returns the data parallel size of dense parameters and of expert parameters."""
+    return num_gpus // (parallel.tp * parallel.pp * parallel.cp), num_gpus // (parallel.tp * parallel.pp * parallel.ep)
+
+
+def _num_micro_batches(parallel: ParallelConfig, num_gpus: int, global_batch_size: int) -> int:
+    dp, _ = _data_parallel_sizes(parallel, num_gpus)
+    return max(1, global_batch_size // (parallel.mbs * dp))
+
+
+def activation_memory_per_layer(model: ModelSpec, parallel: ParallelConfig, recompute: bool = True) -> float:
+    """Returns the memory of the activations that a layer keeps for the backward pass of a micro batch, in bytes.
+
+    Args:
+        model (ModelSpec): model architecture.
+        parallel (ParallelConfig): parallelism and recompute mode.
+        recompute (bool): whether the layer is recomputed, if the recompute granularity is "full".
+    """
+    s = model.seq_length / parallel.cp
+    b = parallel.mbs
+    h = model.hidden_size
+    sb = s * b
+
+    if parallel.recompute_granularity == "full" and recompute:
+        # Only the input of the layer is kept
+        return 2 * sb * h / parallel.tp
+
+    # Input of the QKV projection, Q, K and V, input of the output projection and dropout mask
+    attention = sb * (3 * h + 4 * model.query_size + 4 * model.key_value_size)
+    if not parallel.flash_attention and parallel.recompute_granularity != "selective":
+        # Softmax output, its dropout mask and dropout output
+        attention += 5 * model.num_attention_heads * s * s * b
+    # Input of the first projection, its output, the activation output and dropout mask
+    expert = 2 * model.ffn_multiplier * model.ffn_hidden_size + 2 * model.ffn_hidden_size
+    if model.is_moe:
+        mlp = sb * (3 * h + model.moe_router_topk * (2 * h + expert))
+    else:
+        mlp = sb * (3 * h + expert)
+    layer_norms = 4 * sb * h
+    return (attention + mlp + layer_norms) / parallel.tp
+
+
+def estimate_memory(
+    model: ModelSpec,
+    parallel: ParallelConfig,
+    num_gpus: int,
+    global_batch_size: int,
+    hardware: Optional[HardwareSpec] = None,
+) -> MemoryEstimate:
+    """Estimates the peak memory per GPU of a configuration.
+
+    Parameters are kept in bf16 with fp32 gradients, and Adam keeps fp32 master weights and two moments, which are
+    sharded across data parallel ranks with the distributed optimizer. With 1F1B pipeline scheduling, the first stage
+    keeps the activations of `pp` micro batches (more with interleaving), and the last stage keeps the logits.
+
+    Args:
+        model (ModelSpec): model architecture.
+        parallel (ParallelConfig): parallelism, micro batch size and recompute mode.
+        num_gpus (int): total number of GPUs.
+        global_batch_size (int): global batch size.
+        hardware (Optional[HardwareSpec]): GPUs of the cluster, for the memory overhead.
+
+    Returns:
+        MemoryEstimate: memory of the pipeline stage which needs the most memory.
+    """
+    hardware = hardware or HardwareSpec()
+    tp, pp = parallel.tp, parallel.pp
+    dp, expert_dp = _data_parallel_sizes(parallel, num_gpus)
+    num_micro_batches = _num_micro_batches(parallel, num_gpus, global_batch_size)
+
+    layer_params, expert_params, embedding_params = model.num_parameters()
+    layers_per_stage = model.num_layers / pp
+    stage_params = layers_per_stage * layer_params / tp
+    stage_expert_params = layers_per_stage * expert_params / (tp * parallel.ep)
+    # The first stage has the embeddings, and the last stage the output layer
+    if pp == 1:
+        embedding_params = embedding_params / tp
+    elif model.share_embeddings_and_output_weights:
+        embedding_params = embedding_params / tp
+    else:
+        embedding_params = embedding_params / 2 / tp
+
+    # Recomputed layers of each (virtual) pipeline stage
+    layers_per_chunk = layers_per_stage / (parallel.vp or 1)
+    recompute_num_layers = parallel.recompute_num_layers
+    if recompute_num_layers is None:
+        recompute_num_layers = layers_per_chunk
+    recompute_fraction = min(recompute_num_layers, layers_per_chunk) / layers_per_chunk
+    layer_activations = recompute_fraction * activation_memory_per_layer(model, parallel) + (
+        1 - recompute_fraction
+    ) * activation_memory_per_layer(model, parallel, recompute=False)
+
+    in_flight = min(pp, num_micro_batches)
+    if parallel.vp:
+        in_flight *= 1 + (pp - 1) / (pp * parallel.vp)
+    first_stage_activations = layers_per_stage * layer_activations * in_flight
+    # fp32 logits for the cross entropy of one micro batch
+    logits = 4 * model.seq_length / parallel.cp * parallel.mbs * model.vocab_size / tp
+    last_stage_activations = layers_per_stage * layer_activations + logits
+    activations = max(first_stage_activations, last_stage_activations) if pp > 1 else first_stage_activations + logits
+
+    params = stage_params + stage_expert_params + embedding_params
+    optimizer_params = (stage_params + embedding_params) / dp + stage_expert_params / expert_dp
+    return MemoryEstimate(
+        params=2 * params / GB,
+        grads=4 * params / GB,
+        optimizer=12 * (optimizer_params if parallel.distributed_optimizer else params) / GB,
+        activations=activations / GB,
+        overhead=hardware.memory_overhead_gb,
+    )
+
+
+def estimate_step_time(
+    model: ModelSpec,
+    parallel: ParallelConfig,
+    num_gpus: int,
+    global_batch_size: int,
+    hardware: Optional[HardwareSpec] = None,
+) -> StepTimeEstimate:
+    """Estimates the time of a global batch of a configuration.
+
+    Communication of tensor, context and expert parallelism is on the critical path of each micro batch. Pipeline
+    stages idle for (pp - 1) / vp micro batches, and the data parallel gradient reduction is exposed beyond the
+    backward pass of the last micro batch. A parallel group uses the intra node bandwidth if it fits in a node.
+
+    Args:
+        model (ModelSpec): model architecture.
+        parallel (ParallelConfig): parallelism, micro batch size and recompute mode.
+        num_gpus (int): total number of GPUs.
+        global_batch_size (int): global batch size.
+        hardware (Optional[HardwareSpec]): GPUs and interconnect of the cluster.
+
+    Returns:
+        StepTimeEstimate: time of each component.
+    """
+    hardware = hardware or HardwareSpec()
+    tp, pp, cp, ep = parallel.tp, parallel.pp, parallel.cp, parallel.ep
+    dp, expert_dp = _data_parallel_sizes(parallel, num_gpus)
+    num_micro_batches = _num_micro_batches(parallel, num_gpus, global_batch_size)
+    h, s, b = model.hidden_size, model.seq_length, parallel.mbs
+    layers_per_stage = model.num_layers / pp
+
+    def bandwidth(group_size):
+        """Bandwidth in bytes/s of a group of consecutive ranks of the given size."""
+        if group_size <= hardware.gpus_per_node or num_gpus <= hardware.gpus_per_node:
+            return hardware.intra_node_bandwidth * 1e9
+        return hardware.inter_node_bandwidth * 1e9
+
+    flops = flops_formulas.transformer(
+        flops_formulas.FLOPSConfig(
+            gbs=global_batch_size,
+            enc_seq_len=s,
+            hs=h,
+            layers=model.num_layers,
+            # The formula has two MLP projections, a gated linear unit has three
+            ffn_hs=model.ffn_hidden_size * (model.ffn_multiplier + 1) / 2,
+            attention_heads=model.num_attention_heads,
+            query_groups=model.num_query_groups,
+            moe_router_topk=model.moe_router_topk if model.is_moe else None,
+            vocab_size=model.vocab_size,
+            causal_self_attn=True,
+        )
+    )
+    flops_per_second = num_gpus * hardware.tflops_per_gpu * 1e12
+    compute = flops / flops_per_second
+
+    # Forward pass of the recomputed layers, or of the causal core attention
+    recompute = 0.0
+    if parallel.recompute_granularity == "full":
+        layers_per_chunk = layers_per_stage / (parallel.vp or 1)
+        recompute_num_layers = parallel.recompute_num_layers
+        if recompute_num_layers is None:
+            recompute_num_layers = layers_per_chunk
+        recompute = compute / 3 * min(recompute_num_layers, layers_per_chunk) / layers_per_chunk
+    elif parallel.recompute_granularity == "selective":
+        recompute = 2 * global_batch_size * s * s * h * model.num_layers / flops_per_second
+
+    # Communication of one micro batch in one stage, forward and backward
+    activation_bytes = 2 * s / cp * b * h
+    tp_comm = cp_comm = ep_comm = 0.0
+    if tp > 1:
+        # All-gathers and reduce-scatters of sequence parallelism, twice in the forward and twice in the backward
+        tp_comm = 8 * activation_bytes * (tp - 1) / tp / bandwidth(tp) * layers_per_stage
+    if cp > 1:
+        # Ring exchange of keys and values, and of their gradients in the backward
+        kv_bytes = 2 * 2 * s / cp * b * model.key_value_size / tp
+        cp_comm = 3 * kv_bytes * (cp - 1) / bandwidth(tp * cp) * layers_per_stage
+    if model.is_moe and ep > 1:
+        # All-to-all dispatch and combine of the routed tokens, in the forward and in the backward
+        ep_comm = 4 * activation_bytes * model.moe_router_topk * (ep - 1) / ep / bandwidth(tp * ep) * layers_per_stage
+    pp_comm = 0.0
+    if pp > 1:
+        # Activations and their gradients sent to the next and previous stages, for each virtual stage
+        pp_comm = 2 * activation_bytes / tp * (parallel.vp or 1) / bandwidth(num_gpus)
+    micro_batch_comm = tp_comm + cp_comm + ep_comm
+
+    stage_compute = (compute + recompute) / num_micro_batches
+    bubble = (pp - 1) / (parallel.vp or 1) * (stage_compute + micro_batch_comm + pp_comm)
+
+    # Reduce-scatter of fp32 gradients and all-gather of bf16 parameters of the distributed optimizer
+    layer_params, expert_params, embedding_params = model.num_parameters()
+    dense_params = (layers_per_stage * layer_params + embedding_params / min(pp, 2)) / tp
+    stage_expert_params = layers_per_stage * expert_params / (tp * ep)
+    dp_comm = 0.0
+    if dp > 1:
+        dp_comm += 6 * dense_params * (dp - 1) / dp / bandwidth(num_gpus // pp)
+    if expert_params and expert_dp > 1:
+        dp_comm += 6 * stage_expert_params * (expert_dp - 1) / expert_dp / bandwidth(num_gpus // pp)
+    dp_comm = max(0.0, dp_comm - 2 / 3 * stage_compute)
+
+    return StepTimeEstimate(
+        compute=compute,
+        recompute=recompute,
+        bubble=bubble,
+        tp_comm=tp_comm * num_micro_batches,
+        cp_comm=cp_comm * num_micro_batches,
+        ep_comm=ep_comm * num_micro_batches,
+        pp_comm=pp_comm * num_micro_batches,
+        dp_comm=dp_comm,
+    )
+
+
+def _hardware_spec(train_cfg) -> HardwareSpec:
+    return HardwareSpec(
+        gpu_memory_gb=train_cfg.gpu_memory_gb,
+        tflops_per_gpu=train_cfg.tflops_per_gpu,
+        gpus_per_node=train_cfg.num_gpus,
+    )
+
+
+def prune_configs(base_cfg, train_cfg, configs: dict, max_configs: Optional[int] = None) -> dict:
+    """Removes the configurations which are estimated to run out of memory, and sorts the others by their
+        estimated step time.
+
+    The estimated memory per GPU and step time are added to each config, as "estimated_memory_gb" and
+    "estimated_step_time".
+
+    Args:
+        base_cfg (Partial): base configuration of the model to be trained.
+        train_cfg (AutoConfigurator): Auto Configurator runner config.
+        configs (dict): configurations generated by the grid search, by name.
+        max_configs (Optional[int]): number of the fastest configurations to keep, or None to keep all of them.
+
+    Returns:
+        dict: kept configurations, from the fastest to the slowest.
+    """
+    model = ModelSpec.from_config(base_cfg.model.config, train_cfg.vocab_size)
+    hardware = _hardware_spec(train_cfg)
+    num_gpus = base_cfg.trainer.num_nodes * base_cfg.trainer.devices
+    recompute_granularity = getattr(base_cfg.model.config, "recompute_granularity", None)
+
+    estimates = []
+    for name, config in configs.items():
+        parallel = ParallelConfig.from_config(config, recompute_granularity=recompute_granularity)
+        memory = estimate_memory(model, parallel, num_gpus, config["global_batch_size"], hardware)
+        step_time = estimate_step_time(model, parallel, num_gpus, config["global_batch_size"], hardware)
+        config["estimated_memory_gb"] = round(memory.total, 2)
+        config["estimated_step_time"] = round(step_time.total, 4)
+        if memory.total > hardware.gpu_memory_gb:
+            print(f"Pruned config {name}: estimated {memory.total:.1f}GB per GPU.")
+            continue
+        estimates.append((step_time.total, name))
+
+    estimates.sort()
+    if max_configs is not None:
+        estimates = estimates[:max_configs]
+    print(f"Kept {len(estimates)} of {len(configs)} configs with the performance model.")
+    return OrderedDict((name, configs[name]) for _, name in estimates)
+
+
+def _to_int(value) -> Optional[int]:
+    if value is None or (isinstance(value, float) and math.isnan(value)) or str(value) == "None":
+        return None
+    return int(value)
+
+
+def compare_with_results(base_config, train_config, path_to_results: str) -> pd.DataFrame:
+    """Compares the estimates of the performance model to the results of past runs, saved by `get_results`.
+
+    Args:
+        base_config (Partial): model base config.
+        train_config (AutoConfigurator): Auto Configurator runner config.
+        path_to_results (str): directory of the "final_summary_{num_nodes}nodes.csv" and
+            "failed_jobs_{num_nodes}nodes.csv" files of the runs.
+
+    Returns:
+        pd.DataFrame: for each run, its parallelism, its time per step (empty if it failed), whether it ran out of
+            memory, and the estimated time per step, memory per GPU and whether it runs out of memory.
+    """
+    model = ModelSpec.from_config(base_config.model.config, train_config.vocab_size)
+    hardware = _hardware_spec(train_config)
+    num_nodes = train_config.num_nodes
+    num_gpus = num_nodes * train_config.num_gpus
+    recompute_granularity = getattr(base_config.model.config, "recompute_granularity", None)
+
+    summary = pd.read_csv(os.path.join(path_to_results, f"final_summary_{num_nodes}nodes.csv"))
+    summary["OOM"] = False
+    failed_jobs_file = os.path.join(path_to_results, f"failed_jobs_{num_nodes}nodes.csv")
+    if os.path.exists(failed_jobs_file):
+        failed = pd.read_csv(failed_jobs_file)
+        failed["OOM"] = failed["Error Message"].str.contains("out of memory", na=False)
+        summary = pd.concat([summary, failed], ignore_index=True)
+
+    rows = []
+    for _, run in summary.iterrows():
+        parallel = ParallelConfig(
+            tp=_to_int(run["TP"]),
+            pp=_to_int(run["PP"]),
+            cp=_to_int(run["CP"]) or 1,
+            ep=_to_int(run["EP"]) or 1,
+            mbs=_to_int(run["MBS"]),
+            vp=_to_int(run["VP"]),
+            recompute_granularity=recompute_granularity,
+        )
+        gbs = _to_int(run["GBS"])
+        memory = estimate_memory(model, parallel, num_gpus, gbs, hardware)
+        step_time = estimate_step_time(model, parallel, num_gpus, gbs, hardware)
+        rows.append(
+            [
+                parallel.tp,
+                parallel.pp,
+                parallel.cp,
+                parallel.ep,
+                parallel.mbs,
+                parallel.vp,
+                run.get("Time per Step"),
+                bool(run["OOM"]),
+                round(step_time.total, 4),
+                round(memory.total, 2),
+                memory.total > hardware.gpu_memory_gb,
+            ]
+        )
+    comparison = pd.DataFrame(
+        rows,
+        columns=[
+            "TP",
+            "PP",
+            "CP",
+            "EP",
+            "MBS",
+            "VP",
+            "Time per Step",
+            "OOM",
+            "Estimated Time per Step",
+            "Estimated Memory per GPU (GB)",
+            "Estimated OOM",
+        ],
+    )
+
+    completed = comparison.dropna(subset=["Time per Step"])
+    if len(completed) > 1:
+        correlation = completed["Time per Step"].corr(completed["Estimated Time per Step"], method="spearman")
+        logging.info(f"Rank correlation of the estimated and measured time per step: {correlation:.3f}")
+    if len(comparison):
+        accuracy = (comparison["OOM"] == comparison["Estimated OOM"]).mean()
+        logging.info(f"Accuracy of the estimated out of memory errors: {accuracy:.3f}")
+    return comparison
@@ -15,7 +15,7 @@
 from dataclasses import dataclass
 from typing import List, Tuple
 
-from nemo.collections.llm.tools.auto_configurator.core import utils
+from nemo.collections.llm.tools.auto_configurator.core import performance_model, utils
 
 
 GPT_BASED_MODELS = [
@@ -153,6 +153,8 @@ def generate_grid_search_configs(
                     configs[config_name] = new_cfg
 
     print(f"\nAll candidate configurations created correctly. Total number of configs: {len(configs)}.\n")
+    if train_cfg.prune_configs and model_name in GPT_BASED_MODELS:
+        configs = performance_model.prune_configs(base_cfg, train_cfg, configs, train_cfg.max_configs)
     return base_cfg, configs
 
 
@@ -65,6 +65,8 @@ class AutoConfigurator:
         max_steps_per_run: Optional[int] = 50,
         vocab_size: Optional[int] = 32000,
         calculate_model_size: Optional[bool] = False,
+        prune_configs: Optional[bool] = False,
+        max_configs: Optional[int] = None,
     ):
         """
         Args:
@@ -91,6 +93,9 @@ class AutoConfigurator:
             max_steps_per_run (Optional[int]): maximum number of steps per run for the grid search.
             vocab_size (Optional[int]): size of tokenizer vocabulary.
             calculate_model_size (Optional[bool]): whether the AutoConfigurator should calculate the model size or not.
+            prune_configs (Optional[bool]): whether to remove the configs which are estimated to run out of memory,
+                and sort the others by estimated step time, with the analytic performance model.
+            max_configs (Optional[int]): number of the fastest configs to keep when pruning configs.
         """
 
         # Print out the config
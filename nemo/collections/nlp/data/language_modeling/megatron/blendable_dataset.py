@@ -187,3 +187,104 @@ class MemoryEfficientBlendableDataset(torch.utils.data.Dataset):
             plt.legend()
             plt.grid()
             plt.title(f"weight_bins={weight_bins}")
+
+
+def _splitmix64(seed, counter):
+    """Counter-based random number: the SplitMix64 hash of the seed and counter, in [0, 2**64)."""
+    mask = (1 << 64) - 1
+    z = (int(seed) * 0x9E3779B97F4A7C15 + int(counter) * 0xBF58476D1CE4E5B9 + 0x9E3779B97F4A7C15) & mask
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & mask
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & mask
+    return z ^ (z >> 31)
+
+
+class StreamingBlendableDataset(torch.utils.data.Dataset):
+    """
+    A BlendableDataset which computes the dataset and sample of any index on the fly, with a memory and startup time
+    which do not depend on the size of the blend.
+
+    Like BlendableDataset, the number of samples drawn from each dataset follows the weights with error feedback:
+    the first N samples contain floor(weight * N + phase) samples of each dataset, with a random phase in [0, 1), so
+    the error of the rounding carries over to the next samples instead of accumulating. The blend is cut in blocks
+    of about `block_size` samples, in which the samples of each dataset are interleaved by a golden ratio rotation
+    with a random offset. The phases and offsets come from a counter-based random number generator of the seed and
+    of the dataset or block, so that any index is computed independently of the others, and resuming from any index
+    gives exactly the same samples.
+
+    Within a block, the samples of a dataset are not in increasing order, but each sample of a dataset is drawn once
+    before the dataset wraps around.
+    """
+
+    def __init__(self, datasets, weights, size, seed=1234, block_size=1024):
+        self.datasets = datasets
+        num_datasets = len(datasets)
+        assert num_datasets == len(weights)
+
+        self.size = size
+        self.seed = seed
+        # Blocks have more than block_size - num_datasets samples
+        self.block_size = max(block_size, num_datasets)
+
+        # Normalize weights.
+        weights = np.array(weights, dtype=np.float64)
+        assert (weights >= 0.0).all()
+        sum_weights = np.sum(weights)
+        assert sum_weights > 0.0
+        self.weights = weights / sum_weights
+        self.phases = np.array([_splitmix64(seed, i) / 2.0**64 for i in range(num_datasets)], dtype=np.float64)
+
+        self.ds_size = np.array([len(ds) for ds in datasets], dtype=np.int64)
+        self._block = None
+
+    def _num_dataset_samples(self, block):
+        """Number of samples of each dataset before the given block."""
+        return np.floor(self.weights * (block * self.block_size) + self.phases).astype(np.int64)
+
+    def _get_block(self, idx):
+        """Returns the block of the index, its first index, the samples of each dataset before it and its permutation."""
+        block = self._block
+        if block is not None and block[1] <= idx < block[1] + block[3][-1]:
+            return block
+
+        b = idx // self.block_size
+        while b > 0 and self._num_dataset_samples(b).sum() > idx:
+            b -= 1
+        while self._num_dataset_samples(b + 1).sum() <= idx:
+            b += 1
+        start_samples = self._num_dataset_samples(b)
+        block_samples = self._num_dataset_samples(b + 1) - start_samples
+        block_offsets = np.concatenate(([0], np.cumsum(block_samples)))
+
+        # Golden ratio stride coprime with the block size and random offset
+        num_samples = int(block_offsets[-1])
+        stride = max(1, round(num_samples * 0.6180339887498949))
+        while np.gcd(stride, num_samples) != 1:
+            stride += 1
+        offset = _splitmix64(self.seed, len(self.datasets) + b) % num_samples
+
+        self._block = (b, int(start_samples.sum()), start_samples, block_offsets, stride, offset)
+        return self._block
+
+    def get_ds_sample_idx(self, idx):
+        """Returns ds index and sample index (within the ds) for the given index in the blendable dataset."""
+        if not 0 <= idx < self.size:
+            raise IndexError(f"Index {idx} out of range for a blendable dataset of size {self.size}")
+
+        _, start, start_samples, block_offsets, stride, offset = self._get_block(idx)
+        slot = ((idx - start) * stride + offset) % int(block_offsets[-1])
+        ds_idx = int(np.searchsorted(block_offsets, slot, side='right')) - 1
+        sample_idx = int(start_samples[ds_idx] + slot - block_offsets[ds_idx]) % int(self.ds_size[ds_idx])
+
+        return ds_idx, sample_idx
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, idx):
+        ds_idx, sample_idx = self.get_ds_sample_idx(idx)
+
+        return self.datasets[ds_idx][sample_idx]
+
+    def create_data_mmap(self):
+        for dataset in self.datasets:
+            dataset.create_data_mmap()
@@ -14,8 +14,10 @@
 
 """GPT style dataset."""
 
+import multiprocessing as mp
 import os
 import time
+from functools import partial
 
 import numpy as np
 import torch
@@ -25,7 +27,10 @@ from nemo.collections.nlp.data.language_modeling.megatron.base_dataset_utils imp
     get_datasets_weights_and_num_samples,
     get_train_valid_test_split_,
 )
-from nemo.collections.nlp.data.language_modeling.megatron.blendable_dataset import BlendableDataset
+from nemo.collections.nlp.data.language_modeling.megatron.blendable_dataset import (
+    BlendableDataset,
+    StreamingBlendableDataset,
+)
 from nemo.collections.nlp.data.language_modeling.megatron.indexed_dataset import deallocate_indexed_dataset_memory
 from nemo.collections.nlp.data.language_modeling.megatron.indexed_dataset import make_dataset as make_indexed_dataset
 from nemo.core import Dataset
@@ -73,11 +78,14 @@ def build_dataset(cfg, trainer, data_prefix, data_impl, num_samples, seq_length,
     else:
         output = get_datasets_weights_and_num_samples(data_prefix, num_samples)
         prefixes, weights, datasets_num_samples = output
+        _build_blend_index_mappings(
+            cfg, prefixes, [[n] for n in datasets_num_samples], [name], None, data_impl, seq_length, seed, skip_warmup
+        )
         datasets = []
         for i in range(len(prefixes)):
             dataset = _build_dataset(prefixes[i], datasets_num_samples[i])
             datasets.append(dataset)
-        return BlendableDataset(datasets, weights, num_samples)
+        return _build_blendable_dataset(cfg, datasets, weights, num_samples, seed)
 
 
 def build_train_valid_test_datasets(
@@ -171,6 +179,17 @@ def build_train_valid_test_datasets(
         # Parse the values.
         output = get_datasets_weights_and_num_samples(data_prefix, train_valid_test_num_samples)
         prefixes, weights, datasets_train_valid_test_num_samples = output
+        _build_blend_index_mappings(
+            cfg,
+            prefixes,
+            datasets_train_valid_test_num_samples,
+            ['train', 'valid', 'test'],
+            splits_string,
+            data_impl,
+            seq_length,
+            seed,
+            skip_warmup,
+        )
 
         # Build individual datasets.
         train_datasets = []
@@ -201,13 +220,13 @@ def build_train_valid_test_datasets(
         # Blend.
         blending_train_dataset = None
         if train_datasets:
-            blending_train_dataset = BlendableDataset(train_datasets, weights, train_n)
+            blending_train_dataset = _build_blendable_dataset(cfg, train_datasets, weights, train_n, seed)
         blending_valid_dataset = None
         if valid_datasets:
-            blending_valid_dataset = BlendableDataset(valid_datasets, weights, valid_n)
+            blending_valid_dataset = _build_blendable_dataset(cfg, valid_datasets, weights, valid_n, seed)
         blending_test_dataset = None
         if test_datasets:
-            blending_test_dataset = BlendableDataset(test_datasets, weights, test_n)
+            blending_test_dataset = _build_blendable_dataset(cfg, test_datasets, weights, test_n, seed)
 
         return (blending_train_dataset, blending_valid_dataset, blending_test_dataset)
 
@@ -288,6 +307,99 @@ def get_indexed_dataset_(data_prefix, data_impl, skip_warmup, delay_data_mmap=Fa
     return indexed_dataset
 
 
+def _build_blendable_dataset(cfg, datasets, weights, size, seed):
+    """Blend the datasets, with indices computed on the fly if `cfg.data.streaming_blend` is set."""
+    if cfg.data.get('streaming_blend', False):
+        return StreamingBlendableDataset(datasets, weights, size, seed=seed)
+    return BlendableDataset(datasets, weights, size)
+
+
+def _build_blend_index_mappings(
+    cfg, data_prefixes, datasets_num_samples, names, splits_string, data_impl, seq_length, seed, skip_warmup
+):
+    """Build the index mappings of the datasets of a blend in parallel processes on rank 0.
+
+    The number of processes is set by `cfg.data.index_mapping_num_workers`,
+    and the indices are built by the datasets one after the other if it is 1.
+    Each process builds the missing index mappings of one data prefix, so
+    that the datasets only load them. The names of the datasets of a prefix
+    are `names`, with one number of samples each, and their documents are
+    given by `splits_string`, or are all documents of the prefix if it is None.
+    """
+    num_workers = cfg.data.get('index_mapping_num_workers', 1)
+    if num_workers <= 1 or len(data_prefixes) <= 1:
+        return
+
+    if torch.distributed.get_rank() == 0:
+        index_mapping_dir = cfg.data.get('index_mapping_dir', None)
+        if index_mapping_dir is not None and not os.path.isdir(index_mapping_dir):
+            os.makedirs(index_mapping_dir)
+        build_fn = partial(
+            _build_prefix_index_mappings,
+            names=names,
+            splits_string=splits_string,
+            data_impl=data_impl,
+            seq_length=seq_length,
+            seed=seed,
+            skip_warmup=skip_warmup,
+            index_mapping_dir=index_mapping_dir,
+            validation_drop_last=cfg.data.get("validation_drop_last", True),
+            add_extra_token=0 if cfg.data.get('no_seqlen_plus_one_input_tokens', False) else 1,
+            shuffle_documents=cfg.data.get('shuffle_documents', True),
+        )
+        start_time = time.time()
+        with mp.get_context("fork").Pool(min(num_workers, len(data_prefixes))) as p:
+            p.starmap(build_fn, zip(data_prefixes, datasets_num_samples))
+        logging.info(
+            ' > elasped time to build the index mappings of {} datasets with {} processes '
+            '(seconds): {:4f}'.format(len(data_prefixes), num_workers, time.time() - start_time)
+        )
+    torch.distributed.barrier()
+
+
+def _build_prefix_index_mappings(
+    data_prefix,
+    num_samples,
+    names,
+    splits_string,
+    data_impl,
+    seq_length,
+    seed,
+    skip_warmup,
+    index_mapping_dir,
+    validation_drop_last,
+    add_extra_token,
+    shuffle_documents,
+):
+    """Build the missing index mappings of the datasets of a data prefix, like GPTDataset."""
+    indexed_dataset = make_indexed_dataset(data_prefix, data_impl, skip_warmup)
+    total_num_of_documents = indexed_dataset.sizes.shape[0]
+    if splits_string is None:
+        splits = [0, total_num_of_documents]
+    else:
+        splits = get_train_valid_test_split_(splits_string, total_num_of_documents)
+
+    for index, name in enumerate(names):
+        if splits[index + 1] <= splits[index]:
+            continue
+        filenames = _get_index_mapping_filenames(
+            data_prefix, name, num_samples[index], seq_length, seed, index_mapping_dir
+        )
+        if all(os.path.isfile(filename) for filename in filenames):
+            continue
+        _build_index_mapping_files(
+            *filenames,
+            np.arange(start=splits[index], stop=splits[index + 1], step=1, dtype=np.int32),
+            indexed_dataset.sizes,
+            num_samples[index],
+            seq_length,
+            seed,
+            drop_last=validation_drop_last if name == "valid" else True,
+            add_extra_token=add_extra_token,
+            shuffle_documents=shuffle_documents,
+        )
+
+
 class GPTDataset(Dataset):
     def __init__(
         self,
@@ -575,21 +687,11 @@ def _build_index_mappings(
     # Number of tokens in each epoch and number of required epochs.
     tokens_per_epoch = _num_tokens(documents, sizes)
     num_epochs = _num_epochs(tokens_per_epoch, seq_length, num_samples, add_extra_token)
-    # rng state
-    np_rng = np.random.RandomState(seed=seed)
 
     # Filename of the index mappings.
-    if index_mapping_dir is not None:
-        _filename = os.path.join(index_mapping_dir, os.path.basename(data_prefix))
-    else:
-        _filename = data_prefix
-    _filename += '_{}_indexmap'.format(name)
-    _filename += '_{}ns'.format(num_samples)
-    _filename += '_{}sl'.format(seq_length)
-    _filename += '_{}s'.format(seed)
-    doc_idx_filename = _filename + '_doc_idx.npy'
-    sample_idx_filename = _filename + '_sample_idx.npy'
-    shuffle_idx_filename = _filename + '_shuffle_idx.npy'
+    doc_idx_filename, sample_idx_filename, shuffle_idx_filename = _get_index_mapping_filenames(
+        data_prefix, name, num_samples, seq_length, seed, index_mapping_dir
+    )
 
     # Build the indexed mapping if not exist.
     if torch.distributed.get_rank() == 0:
@@ -601,93 +703,18 @@ def _build_index_mappings(
         ):
             using_cached_indices = False
             logging.info(' > WARNING: could not find index map files, building ' 'the indices on rank 0 ...')
-
-            # For the last epoch, decide whether include the entire epoch
-            # in the global shuffle or not.
-
-            # If we need only one epoch, then separating last epoch  does
-            # not mean anything.
-            if num_epochs == 1:
-                separate_last_epoch = False
-                print(' > only one epoch required, setting ' 'separate_last_epoch to False', flush=True)
-
-            else:
-                # Get the number of samples for the last epoch
-                num_samples_from_epochs_minus_one = (
-                    (num_epochs - 1) * tokens_per_epoch - add_extra_token
-                ) // seq_length
-                last_epoch_num_samples = num_samples - num_samples_from_epochs_minus_one
-                assert last_epoch_num_samples >= 0, 'last epoch number of samples should be non-negative.'
-                num_samples_per_epoch = (tokens_per_epoch - add_extra_token) // seq_length
-                assert last_epoch_num_samples <= (
-                    num_samples_per_epoch + 1
-                ), 'last epoch number of samples exceeded max value.'
-                # If we have less than 80% of the samples for the last epoch,
-                # seperate out the epoch and treat it differently.
-                # Note: the 80% number is just based on common sense and can
-                # be adjusted if needed.
-                separate_last_epoch = last_epoch_num_samples < int(0.80 * num_samples_per_epoch)
-                if separate_last_epoch:
-                    string = (
-                        ' > last epoch number of samples ({}) is smaller '
-                        'than 80% of number of samples per epoch ({}), '
-                        'setting separate_last_epoch to True'
-                    )
-                else:
-                    string = (
-                        ' > last epoch number of samples ({}) is larger '
-                        'than 80% of number of samples per epoch ({}), '
-                        'setting separate_last_epoch to False'
-                    )
-                print(string.format(last_epoch_num_samples, num_samples_per_epoch), flush=True)
-
-            # doc-idx.
-            start_time = time.time()
-            doc_idx = _build_doc_idx(documents, num_epochs, np_rng, separate_last_epoch, shuffle_documents)
-            np.save(doc_idx_filename, doc_idx, allow_pickle=True)
-            logging.info(
-                ' > elasped time to build and save doc-idx mapping '
-                '(seconds): {:4f}'.format(time.time() - start_time)
-            )
-            # sample-idx.
-            start_time = time.time()
-            # Use C++ implementation for speed.
-            # First compile and then import.
-            assert doc_idx.dtype == np.int32
-            assert sizes.dtype == np.int32
-            try:
-                from nemo.collections.nlp.data.language_modeling.megatron.dataset_utils import compile_helper
-
-                compile_helper()
-                from nemo.collections.nlp.data.language_modeling.megatron import helpers
-            except ImportError:
-                raise ImportError(
-                    f'Could not compile megatron dataset C++ helper functions and therefore cannot import helpers python file.'
-                )
-
-            sample_idx = helpers.build_sample_idx(
-                sizes, doc_idx, seq_length, num_epochs, tokens_per_epoch, drop_last, add_extra_token
-            )
-            # sample_idx = _build_sample_idx(sizes, doc_idx, seq_length,
-            #                              num_epochs, tokens_per_epoch, drop_last, add_extra_token)
-            np.save(sample_idx_filename, sample_idx, allow_pickle=True)
-            logging.info(
-                ' > elasped time to build and save sample-idx mapping '
-                '(seconds): {:4f}'.format(time.time() - start_time)
-            )
-            # shuffle-idx.
-            start_time = time.time()
-            # -1 is due to data structure used to retieve the index:
-            #    sample i --> [sample_idx[i], sample_idx[i+1])
-            if separate_last_epoch:
-                num_samples_ = num_samples_from_epochs_minus_one
-            else:
-                num_samples_ = sample_idx.shape[0] - 1
-            shuffle_idx = _build_shuffle_idx(num_samples_, sample_idx.shape[0] - 1, np_rng)
-            np.save(shuffle_idx_filename, shuffle_idx, allow_pickle=True)
-            logging.info(
-                ' > elasped time to build and save shuffle-idx mapping'
-                ' (seconds): {:4f}'.format(time.time() - start_time)
+            _build_index_mapping_files(
+                doc_idx_filename,
+                sample_idx_filename,
+                shuffle_idx_filename,
+                documents,
+                sizes,
+                num_samples,
+                seq_length,
+                seed,
+                drop_last=drop_last,
+                add_extra_token=add_extra_token,
+                shuffle_documents=shuffle_documents,
             )
 
     torch.distributed.barrier()
@@ -723,6 +750,132 @@ def _build_index_mappings(
     return doc_idx, sample_idx, shuffle_idx
 
 
+def _get_index_mapping_filenames(data_prefix, name, num_samples, seq_length, seed, index_mapping_dir=None):
+    """Filenames of the doc-idx, sample-idx and shuffle-idx of a dataset."""
+    if index_mapping_dir is not None:
+        _filename = os.path.join(index_mapping_dir, os.path.basename(data_prefix))
+    else:
+        _filename = data_prefix
+    _filename += '_{}_indexmap'.format(name)
+    _filename += '_{}ns'.format(num_samples)
+    _filename += '_{}sl'.format(seq_length)
+    _filename += '_{}s'.format(seed)
+    return _filename + '_doc_idx.npy', _filename + '_sample_idx.npy', _filename + '_shuffle_idx.npy'
+
+
+def _open_index_file(filename, dtype, shape):
+    """Open a temporary memory-mapped .npy file for an index, which is renamed to filename once it is complete."""
+    return np.lib.format.open_memmap('{}.{}.tmp'.format(filename, os.getpid()), mode='w+', dtype=dtype, shape=shape)
+
+
+def _save_index_file(filename, index):
+    index.flush()
+    os.replace(index.filename, filename)
+
+
+def _build_index_mapping_files(
+    doc_idx_filename,
+    sample_idx_filename,
+    shuffle_idx_filename,
+    documents,
+    sizes,
+    num_samples,
+    seq_length,
+    seed,
+    drop_last: bool = True,
+    add_extra_token: int = 1,
+    shuffle_documents: bool = True,
+):
+    """Build doc-idx, sample-idx, and shuffle-idx, and save them to .npy files.
+    The indices are written to memory-mapped files while they are built, and
+    the files only appear under their names once they are complete.
+    """
+    # Number of tokens in each epoch and number of required epochs.
+    tokens_per_epoch = _num_tokens(documents, sizes)
+    num_epochs = _num_epochs(tokens_per_epoch, seq_length, num_samples, add_extra_token)
+    # rng state
+    np_rng = np.random.RandomState(seed=seed)
+
+    # For the last epoch, decide whether include the entire epoch
+    # in the global shuffle or not.
+
+    # If we need only one epoch, then separating last epoch  does
+    # not mean anything.
+    if num_epochs == 1:
+        separate_last_epoch = False
+        print(' > only one epoch required, setting ' 'separate_last_epoch to False', flush=True)
+
+    else:
+        # Get the number of samples for the last epoch
+        num_samples_from_epochs_minus_one = ((num_epochs - 1) * tokens_per_epoch - add_extra_token) // seq_length
+        last_epoch_num_samples = num_samples - num_samples_from_epochs_minus_one
+        assert last_epoch_num_samples >= 0, 'last epoch number of samples should be non-negative.'
+        num_samples_per_epoch = (tokens_per_epoch - add_extra_token) // seq_length
+        assert last_epoch_num_samples <= (
+            num_samples_per_epoch + 1
+        ), 'last epoch number of samples exceeded max value.'
+        # If we have less than 80% of the samples for the last epoch,
+        # seperate out the epoch and treat it differently.
+        # Note: the 80% number is just based on common sense and can
+        # be adjusted if needed.
+        separate_last_epoch = last_epoch_num_samples < int(0.80 * num_samples_per_epoch)
+        if separate_last_epoch:
+            string = (
+                ' > last epoch number of samples ({}) is smaller '
+                'than 80% of number of samples per epoch ({}), '
+                'setting separate_last_epoch to True'
+            )
+        else:
+            string = (
+                ' > last epoch number of samples ({}) is larger '
+                'than 80% of number of samples per epoch ({}), '
+                'setting separate_last_epoch to False'
+            )
+        print(string.format(last_epoch_num_samples, num_samples_per_epoch), flush=True)
+
+    # doc-idx.
+    start_time = time.time()
+    doc_idx = _open_index_file(doc_idx_filename, np.int32, (num_epochs * len(documents),))
+    _build_doc_idx(documents, num_epochs, np_rng, separate_last_epoch, shuffle_documents, out=doc_idx)
+    logging.info(
+        ' > elasped time to build and save doc-idx mapping ' '(seconds): {:4f}'.format(time.time() - start_time)
+    )
+    # sample-idx.
+    start_time = time.time()
+    assert doc_idx.dtype == np.int32
+    assert sizes.dtype == np.int32
+    sample_idx = _open_index_file(
+        sample_idx_filename,
+        np.int32,
+        (_num_samples(num_epochs, tokens_per_epoch, seq_length, drop_last, add_extra_token) + 1, 2),
+    )
+    _build_sample_idx(
+        sizes, doc_idx, seq_length, num_epochs, tokens_per_epoch, drop_last, add_extra_token, out=sample_idx
+    )
+    logging.info(
+        ' > elasped time to build and save sample-idx mapping ' '(seconds): {:4f}'.format(time.time() - start_time)
+    )
+    # shuffle-idx.
+    start_time = time.time()
+    # -1 is due to data structure used to retieve the index:
+    #    sample i --> [sample_idx[i], sample_idx[i+1])
+    if separate_last_epoch:
+        num_samples_ = num_samples_from_epochs_minus_one
+    else:
+        num_samples_ = sample_idx.shape[0] - 1
+    total_size = sample_idx.shape[0] - 1
+    shuffle_idx = _open_index_file(shuffle_idx_filename, _shuffle_idx_dtype(total_size), (total_size,))
+    _build_shuffle_idx(num_samples_, total_size, np_rng, out=shuffle_idx)
+    logging.info(
+        ' > elasped time to build and save shuffle-idx mapping' ' (seconds): {:4f}'.format(time.time() - start_time)
+    )
+
+    # The files are complete once all indices are written.
+    _save_index_file(doc_idx_filename, doc_idx)
+    _save_index_file(sample_idx_filename, sample_idx)
+    _save_index_file(shuffle_idx_filename, shuffle_idx)
+
+
 def _num_tokens(documents, sizes):
     """Total number of tokens in the dataset."""
     return np.sum(sizes[documents])
@@ -743,100 +896,113 @@ def _num_epochs(tokens_per_epoch, seq_length, num_samples, add_extra_token=1):
             return num_epochs
 
 
-def _build_doc_idx(documents, num_epochs, np_rng, separate_last_epoch, shuffle=True):
+def _build_doc_idx(documents, num_epochs, np_rng, separate_last_epoch, shuffle=True, out=None):
     """Build an array with length = number-of-epochs * number-of-dcuments.
-    Each index is mapped to a corresponding document."""
+    Each index is mapped to a corresponding document. The array is built in
+    `out` if it is given, like a memory-mapped file."""
+    if out is None:
+        out = np.empty(num_epochs * len(documents), dtype=np.int32)
+    out.reshape(num_epochs, len(documents))[:] = documents
+    # Shuffle a plain ndarray view, since np_rng.shuffle falls back to a Python loop for memmaps.
+    doc_idx = out.view(np.ndarray)
     if not separate_last_epoch or num_epochs == 1:
-        doc_idx = np.mgrid[0:num_epochs, 0 : len(documents)][1]
-        doc_idx[:] = documents
-        doc_idx = doc_idx.reshape(-1)
-        doc_idx = doc_idx.astype(np.int32)
+        parts = [doc_idx]
+    else:
+        parts = [doc_idx[: -len(documents)], doc_idx[-len(documents) :]]
+    for part in parts:
         if shuffle:
-            np_rng.shuffle(doc_idx)
+            np_rng.shuffle(part)
         else:
             logging.info('Document shuffling disabled')
-        return doc_idx
+    return out
 
-    doc_idx_first = _build_doc_idx(documents, num_epochs - 1, np_rng, False, shuffle)
-    doc_idx_last = _build_doc_idx(documents, 1, np_rng, False, shuffle)
-    return np.concatenate((doc_idx_first, doc_idx_last))
+
+def _num_samples(num_epochs, tokens_per_epoch, seq_length, drop_last=True, add_extra_token=1):
+    """Number of samples of the epochs. For -1 see comments in `_num_epochs`."""
+    if not drop_last:
+        return -(-(num_epochs * tokens_per_epoch - add_extra_token) // seq_length)
+    return (num_epochs * tokens_per_epoch - add_extra_token) // seq_length
 
 
-def _build_sample_idx(sizes, doc_idx, seq_length, num_epochs, tokens_per_epoch, drop_last=True, add_extra_token=1):
+def _build_sample_idx(
+    sizes,
+    doc_idx,
+    seq_length,
+    num_epochs,
+    tokens_per_epoch,
+    drop_last=True,
+    add_extra_token=1,
+    out=None,
+    chunk_size=2**22,
+):
     """Sample index mapping is a 2D array with sizes
     [number-of-samples + 1, 2] where [..., 0] contains
     the index into `doc_idx` and [..., 1] is the
-    starting offset in that document."""
-
-    # Total number of samples. For -1 see comments in `_num_epochs`.
-    if not drop_last:
-        num_samples = -(-(num_epochs * tokens_per_epoch - add_extra_token) // seq_length)
-    else:
-        num_samples = (num_epochs * tokens_per_epoch - add_extra_token) // seq_length
-    sample_idx = np.zeros([num_samples + 1, 2], dtype=np.int32)
-
-    # Index into sample_idx.
-    sample_index = 0
-    # Index into doc_idx.
-    doc_idx_index = 0
-    # Begining offset for each document.
-    doc_offset = 0
+    starting offset in that document.
+
+    Sample i starts at token i * seq_length of the documents of `doc_idx`
+    concatenated together and takes seq_length + add_extra_token tokens, so
+    the next sample starts in the document where sample i ends. These
+    documents are found with binary searches of the cumulative sizes of the
+    documents, for chunks of `chunk_size` documents and samples at a time.
+    The indices are the same as the ones of `helpers.build_sample_idx`, and
+    are built in `out` if it is given, like a memory-mapped file."""
+    num_samples = _num_samples(num_epochs, tokens_per_epoch, seq_length, drop_last, add_extra_token)
+    if out is None:
+        out = np.empty([num_samples + 1, 2], dtype=np.int32)
     # Start with first document and no offset.
-    sample_idx[sample_index][0] = doc_idx_index
-    sample_idx[sample_index][1] = doc_offset
-    sample_index += 1
-    while sample_index <= num_samples:
-        # Start with a fresh sequence.
-        remaining_seq_length = seq_length + add_extra_token
-        while remaining_seq_length != 0:
-            # Get the document length.
-            doc_id = doc_idx[doc_idx_index]
-            doc_length = sizes[doc_id] - doc_offset
-            # And add it to the current sequence.
-            remaining_seq_length -= doc_length
-            # If we have more than a full sequence, adjust offset and set
-            # remaining length to zero so we return from the while loop.
-            # Note that -1 here is for the same reason we have -1 in
-            # `_num_epochs` calculations.
-            if remaining_seq_length <= 0:
-                doc_offset += remaining_seq_length + doc_length - add_extra_token
-                remaining_seq_length = 0
-            else:
-                # Otherwise, start from the begining of the next document.
-                if doc_idx_index == (len(doc_idx) - 1):
-                    assert (
-                        sample_index == num_samples
-                    ), F"sample_index={sample_index} and num_samples={num_samples} should be the same"
-                    doc_offset = sizes[doc_idx[doc_idx_index]] - add_extra_token
-                    break
-                doc_idx_index += 1
-                doc_offset = 0
-        # Record the sequence.
-        sample_idx[sample_index][0] = doc_idx_index
-        sample_idx[sample_index][1] = doc_offset
-        sample_index += 1
-
-    return sample_idx
-
-
-def _build_shuffle_idx(num_samples, total_size, np_rng):
-    """Build the range [0, size) and shuffle."""
+    out[0] = 0
+
+    # Next sample whose start is searched, and number of tokens before the chunk of documents.
+    sample_index = 1
+    chunk_offset = 0
+    for doc_start in range(0, len(doc_idx), chunk_size):
+        doc_sizes = sizes[doc_idx[doc_start : doc_start + chunk_size]].astype(np.int64)
+        # Number of tokens up to the end of each document of the chunk.
+        doc_ends = np.cumsum(doc_sizes) + chunk_offset
+        chunk_offset = doc_ends[-1]
+        # Samples whose previous sample ends in the chunk.
+        last_sample_index = min(num_samples, (chunk_offset - add_extra_token) // seq_length)
+        for start in range(sample_index, last_sample_index + 1, chunk_size):
+            stop = min(start + chunk_size, last_sample_index + 1)
+            sample_starts = np.arange(start, stop, dtype=np.int64) * seq_length
+            # The previous sample ends in the first document which ends at or after its last token.
+            doc_index = np.searchsorted(doc_ends, sample_starts + add_extra_token, side='left')
+            out[start:stop, 0] = doc_index + doc_start
+            out[start:stop, 1] = sample_starts - (doc_ends[doc_index] - doc_sizes[doc_index])
+        sample_index = max(sample_index, last_sample_index + 1)
+
+    # Without drop_last, the last sample ends with the last document.
+    if sample_index <= num_samples:
+        out[sample_index:, 0] = len(doc_idx) - 1
+        out[sample_index:, 1] = sizes[doc_idx[-1]] - add_extra_token
+
+    return out
+
+
+def _shuffle_idx_dtype(total_size):
+    if total_size >= (np.iinfo(np.uint32).max - 1):
+        return np.int64
+    return np.uint32
+
+
+def _build_shuffle_idx(num_samples, total_size, np_rng, out=None, chunk_size=2**22):
+    """Build the range [0, size) and shuffle. The range is built in `out` if it
+    is given, like a memory-mapped file."""
     print(
         ' > building shuffle index with split [0, {}) and [{}, {}) '
         '...'.format(num_samples, num_samples, total_size),
         flush=True,
     )
 
-    dtype_ = np.uint32
-    if total_size >= (np.iinfo(np.uint32).max - 1):
-        dtype_ = np.int64
-
-    shuffle_idx_first = np.arange(start=0, stop=num_samples, step=1, dtype=dtype_)
-    np_rng.shuffle(shuffle_idx_first)
-    if num_samples == total_size:
-        return shuffle_idx_first
-
-    shuffle_idx_last = np.arange(start=num_samples, stop=total_size, step=1, dtype=dtype_)
-    np_rng.shuffle(shuffle_idx_last)
-
-    return np.concatenate((shuffle_idx_first, shuffle_idx_last))
+    if out is None:
+        out = np.empty(total_size, dtype=_shuffle_idx_dtype(total_size))
+    shuffle_idx = out.view(np.ndarray)
+    for start in range(0, total_size, chunk_size):
+        stop = min(start + chunk_size, total_size)
+        shuffle_idx[start:stop] = np.arange(start=start, stop=stop, step=1, dtype=shuffle_idx.dtype)
+    np_rng.shuffle(shuffle_idx[:num_samples])
+    if num_samples < total_size:
+        np_rng.shuffle(shuffle_idx[num_samples:])
+
+    return out
@@ -36,9 +36,12 @@ from nemo.collections.common.tokenizers.text_to_speech.tts_tokenizers import (
 )
 from nemo.collections.tts.parts.utils.tts_dataset_utils import (
     BetaBinomialInterpolator,
+    PackedFeatureStore,
     beta_binomial_prior_distribution,
     general_padding,
     get_base_dir,
+    get_packed_feature_dir,
+    load_text_tokens_store,
 )
 from nemo.collections.tts.torch.tts_data_types import (
     DATA_STR2DATA_CLASS,
@@ -115,6 +118,10 @@ class TTSDataset(Dataset):
         It loads main data types (audio, text) and specified supplementary data types (log mel, durations, align prior matrix, pitch, energy, speaker id).
         Some supplementary data types will be computed on the fly and saved in the sup_data_path if they did not exist before.
         Saved folder can be changed for some supplementary data types (see keyword args section).
+        Log mel, pitch, voiced mask, p_voiced and energy are read from a packed feature store "<folder>_packed" next to
+        their folder if it exists (see scripts/dataset_processing/tts/pack_sup_data.py).
+        Text tokens are read from the pre-tokenized texts of a manifest if they exist and the tokenizer is deterministic,
+        instead of tokenizing all texts when the dataset is created (see scripts/dataset_processing/tts/pretokenize_text.py).
         Arguments for supplementary data should be also specified in this class, and they will be used from kwargs (see keyword args section).
         Args:
             manifest_filepath (Union[str, Path, List[str], List[Path]]): Path(s) to the .json manifests containing information on the
@@ -226,9 +233,15 @@ class TTSDataset(Dataset):
         data = []
         total_duration = 0
         for manifest_file in self.manifest_filepath:
+            text_tokens_store = None
+            if self.cache_text and isinstance(self.text_tokenizer, BaseTokenizer):
+                text_tokens_store = load_text_tokens_store(
+                    manifest_path=Path(manifest_file).expanduser(), tokens=self.text_tokenizer.tokens
+                )
+
             with open(Path(manifest_file).expanduser(), 'r') as f:
                 logging.info(f"Loading dataset from {manifest_file}.")
-                for line in tqdm(f):
+                for line_index, line in enumerate(tqdm(f)):
                     item = json.loads(line)
 
                     file_info = {
@@ -249,7 +262,13 @@ class TTSDataset(Dataset):
                             text = self.text_normalizer_call(text, **self.text_normalizer_call_kwargs)
                         file_info["normalized_text"] = text
 
-                    if self.cache_text:
+                    # Texts are pre-tokenized from "normalized_text", or from "text" if it is not given
+                    is_pretokenized = text_tokens_store is not None and (
+                        "normalized_text" in item or ("text_normalized" not in item and self.text_normalizer is None)
+                    )
+                    if is_pretokenized:
+                        file_info["text_tokens"] = text_tokens_store.read(str(line_index)).tolist()
+                    elif self.cache_text:
                         file_info["text_tokens"] = self.text_tokenizer(file_info["normalized_text"])
 
                     data.append(file_info)
@@ -384,6 +403,14 @@ class TTSDataset(Dataset):
 
         return filtered_data
 
+    @staticmethod
+    def _get_packed_feature_store(feature_folder: Path) -> Optional[PackedFeatureStore]:
+        store_dir = get_packed_feature_dir(feature_dir=feature_folder.parent, feature_name=feature_folder.name)
+        if not PackedFeatureStore.exists(store_dir):
+            return None
+        logging.info(f"Reading supplementary data from packed feature store {store_dir}")
+        return PackedFeatureStore(store_dir)
+
     def add_log_mel(self, **kwargs):
         self.log_mel_folder = kwargs.pop('log_mel_folder', None)
 
@@ -393,6 +420,7 @@ class TTSDataset(Dataset):
             self.log_mel_folder = Path(self.log_mel_folder)
 
         self.log_mel_folder.mkdir(exist_ok=True, parents=True)
+        self.log_mel_store = self._get_packed_feature_store(self.log_mel_folder)
 
     def add_durations(self, **kwargs):
         durs_file = kwargs.pop('durs_file')
@@ -432,6 +460,7 @@ class TTSDataset(Dataset):
             self.pitch_folder = Path(self.pitch_folder)
 
         self.pitch_folder.mkdir(exist_ok=True, parents=True)
+        self.pitch_store = self._get_packed_feature_store(self.pitch_folder)
 
         self.pitch_fmin = kwargs.pop("pitch_fmin", librosa.note_to_hz('C2'))
         self.pitch_fmax = kwargs.pop("pitch_fmax", librosa.note_to_hz('C7'))
@@ -464,6 +493,7 @@ class TTSDataset(Dataset):
             self.voiced_mask_folder = Path(self.sup_data_path) / Voiced_mask.name
 
         self.voiced_mask_folder.mkdir(exist_ok=True, parents=True)
+        self.voiced_mask_store = self._get_packed_feature_store(self.voiced_mask_folder)
 
     def add_p_voiced(self, **kwargs):
         self.p_voiced_folder = kwargs.pop('p_voiced_folder', None)
@@ -472,6 +502,7 @@ class TTSDataset(Dataset):
             self.p_voiced_folder = Path(self.sup_data_path) / P_voiced.name
 
         self.p_voiced_folder.mkdir(exist_ok=True, parents=True)
+        self.p_voiced_store = self._get_packed_feature_store(self.p_voiced_folder)
 
     def add_energy(self, **kwargs):
         self.energy_folder = kwargs.pop('energy_folder', None)
@@ -482,6 +513,7 @@ class TTSDataset(Dataset):
             self.energy_folder = Path(self.energy_folder)
 
         self.energy_folder.mkdir(exist_ok=True, parents=True)
+        self.energy_store = self._get_packed_feature_store(self.energy_folder)
 
     def add_speaker_id(self, **kwargs):
         pass
@@ -607,6 +639,8 @@ class TTSDataset(Dataset):
 
             if mel_path is not None and Path(mel_path).exists():
                 log_mel = torch.load(mel_path)
+            elif self.log_mel_store is not None and rel_audio_path_as_text_id in self.log_mel_store:
+                log_mel = torch.from_numpy(self.log_mel_store.read(rel_audio_path_as_text_id))
             else:
                 mel_path = self.log_mel_folder / f"{rel_audio_path_as_text_id}.pt"
 
@@ -637,9 +671,13 @@ class TTSDataset(Dataset):
         my_var = locals()
         for i, voiced_item in enumerate([Pitch, Voiced_mask, P_voiced]):
             if voiced_item in self.sup_data_types_set:
+                voiced_store = getattr(self, f"{voiced_item.name}_store")
                 voiced_folder = getattr(self, f"{voiced_item.name}_folder")
                 voiced_filepath = voiced_folder / f"{rel_audio_path_as_text_id}.pt"
-                if voiced_filepath.exists():
+                if voiced_store is not None and rel_audio_path_as_text_id in voiced_store:
+                    voiced_array = voiced_store.read(rel_audio_path_as_text_id)
+                    my_var.__setitem__(voiced_item.name, torch.from_numpy(voiced_array).float())
+                elif voiced_filepath.exists():
                     my_var.__setitem__(voiced_item.name, torch.load(voiced_filepath).float())
                 else:
                     non_exist_voiced_index.append((i, voiced_item.name, voiced_filepath))
@@ -690,7 +728,9 @@ class TTSDataset(Dataset):
         if Energy in self.sup_data_types_set:
             energy_path = self.energy_folder / f"{rel_audio_path_as_text_id}.pt"
 
-            if energy_path.exists():
+            if self.energy_store is not None and rel_audio_path_as_text_id in self.energy_store:
+                energy = torch.from_numpy(self.energy_store.read(rel_audio_path_as_text_id)).float()
+            elif energy_path.exists():
                 energy = torch.load(energy_path).float()
             else:
                 spec = self.get_spec(audio)
@@ -28,11 +28,18 @@ from nemo.collections.common.tokenizers.text_to_speech.tts_tokenizers import Bas
 from nemo.collections.tts.parts.preprocessing.feature_processors import FeatureProcessor
 from nemo.collections.tts.parts.preprocessing.features import Featurizer
 from nemo.collections.tts.parts.utils.tts_dataset_utils import (
+    LengthBucketingBatchSampler,
+    PackedFeatureStore,
     _read_audio,
     beta_binomial_prior_distribution,
-    filter_dataset_by_duration,
+    filter_entry_indices_by_duration,
+    get_speaker_embedding_key,
+    get_speaker_reference_audio,
+    get_target_audio,
     get_weighted_sampler,
     load_audio,
+    load_speaker_reference_audio,
+    load_text_tokens_store,
     stack_tensors,
 )
 from nemo.core.classes import Dataset
@@ -59,6 +66,8 @@ class DatasetSample:
     speaker: str
     speaker_index: int = None
     tokenizer_names: List[str] = None
+    text_tokens_store: Optional[PackedFeatureStore] = None
+    text_tokens_key: Optional[str] = None
 
 
 @experimental
@@ -86,6 +95,15 @@ class TextToSpeechDataset(Dataset):
         max_duration: Optional float, if provided audio files in the training manifest longer than 'max_duration'
             will be ignored.
         volume_norm: Whether to apply volume normalization to loaded audio.
+        max_batch_duration: Optional float, if provided then training examples are grouped by audio and text length
+            into batches with at most 'max_batch_duration' seconds of padded audio, see LengthBucketingBatchSampler.
+            The batch size of the dataloader is the maximum number of examples in a batch.
+        num_buckets: Number of buckets by audio length when 'max_batch_duration' is provided.
+        num_text_buckets: Number of buckets by text length in each audio length bucket when 'max_batch_duration' is
+            provided.
+
+    If the texts of a manifest were pre-tokenized with scripts.dataset_processing.tts.pretokenize_text.py and the
+    tokenizer is deterministic, the text tokens are read from the pre-tokenized texts instead of tokenizing the text.
     """
 
     def __init__(
@@ -101,12 +119,21 @@ class TextToSpeechDataset(Dataset):
         min_duration: Optional[float] = None,
         max_duration: Optional[float] = None,
         volume_norm: bool = True,
+        max_batch_duration: Optional[float] = None,
+        num_buckets: int = 30,
+        num_text_buckets: int = 4,
     ):
         super().__init__()
 
+        if weighted_sampling_steps_per_epoch and max_batch_duration:
+            raise ValueError("Weighted sampling and length bucketing with max_batch_duration can't be used together.")
+
         self.sample_rate = sample_rate
         self.text_tokenizer = text_tokenizer
         self.weighted_sampling_steps_per_epoch = weighted_sampling_steps_per_epoch
+        self.max_batch_duration = max_batch_duration
+        self.num_buckets = num_buckets
+        self.num_text_buckets = num_text_buckets
         self.align_prior_hop_length = align_prior_hop_length
         self.include_align_prior = self.align_prior_hop_length is not None
         self.volume_norm = volume_norm
@@ -146,6 +173,17 @@ class TextToSpeechDataset(Dataset):
             self.sample_weights += weights
 
     def get_sampler(self, batch_size: int, world_size: int) -> Optional[torch.utils.data.Sampler]:
+        if self.max_batch_duration:
+            return LengthBucketingBatchSampler(
+                audio_lengths=[int(data.manifest_entry["duration"] * self.sample_rate) for data in self.data_samples],
+                text_lengths=[self._get_text_length(data) for data in self.data_samples],
+                max_batch_length=int(self.max_batch_duration * self.sample_rate),
+                max_batch_size=batch_size,
+                num_buckets=self.num_buckets,
+                num_text_buckets=self.num_text_buckets,
+                world_size=world_size,
+            )
+
         if not self.weighted_sampling_steps_per_epoch:
             return None
 
@@ -157,6 +195,13 @@ class TextToSpeechDataset(Dataset):
         )
         return sampler
 
+    @staticmethod
+    def _get_text_length(data: DatasetSample) -> int:
+        # Number of characters if the text was not pre-tokenized
+        if data.text_tokens_store is not None:
+            return data.text_tokens_store.shape(data.text_tokens_key)[0]
+        return len(data.text)
+
     def _preprocess_manifest(
         self,
         dataset_name: str,
@@ -166,19 +211,21 @@ class TextToSpeechDataset(Dataset):
         speaker_index_map: Dict[str, int],
     ):
         entries = read_manifest(dataset.manifest_path)
-        filtered_entries, total_hours, filtered_hours = filter_dataset_by_duration(
+        text_tokens_store = self._get_text_tokens_store(dataset.manifest_path)
+        entry_indices, total_hours, filtered_hours = filter_entry_indices_by_duration(
             entries=entries, min_duration=min_duration, max_duration=max_duration
         )
 
         logging.info(dataset_name)
         logging.info(f"Original # of files: {len(entries)}")
-        logging.info(f"Filtered # of files: {len(filtered_entries)}")
+        logging.info(f"Filtered # of files: {len(entry_indices)}")
         logging.info(f"Original duration: {total_hours:.2f} hours")
         logging.info(f"Filtered duration: {filtered_hours:.2f} hours")
 
         samples = []
         sample_weights = []
-        for entry in filtered_entries:
+        for entry_index in entry_indices:
+            entry = entries[entry_index]
 
             if "normalized_text" in entry:
                 text = entry["normalized_text"]
@@ -202,11 +249,23 @@ class TextToSpeechDataset(Dataset):
                 speaker_index=speaker_index,
                 tokenizer_names=dataset.tokenizer_names,
             )
+            if text_tokens_store is not None:
+                # Pre-tokenized texts are stored by the index of their entry in the manifest
+                sample.text_tokens_store = text_tokens_store
+                sample.text_tokens_key = str(entry_index)
             samples.append(sample)
             sample_weights.append(dataset.sample_weight)
 
         return samples, sample_weights
 
+    def _get_text_tokens_store(self, manifest_path: Path) -> Optional[PackedFeatureStore]:
+        if not isinstance(self.text_tokenizer, BaseTokenizer):
+            return None
+        # Texts can't be pre-tokenized if words are randomly phonemized
+        if getattr(self.text_tokenizer, "phoneme_probability", None) is not None:
+            return None
+        return load_text_tokens_store(manifest_path=manifest_path, tokens=self.text_tokenizer.tokens)
+
     def __len__(self):
         return len(self.data_samples)
 
@@ -222,7 +281,10 @@ class TextToSpeechDataset(Dataset):
         audio = torch.tensor(audio_array, dtype=torch.float32)
         audio_len = audio.shape[0]
 
-        tokens = self.text_tokenizer(data.text)
+        if data.text_tokens_store is not None:
+            tokens = data.text_tokens_store.read(data.text_tokens_key)
+        else:
+            tokens = self.text_tokenizer(data.text)
         tokens = torch.tensor(tokens, dtype=torch.int32)
         text_len = tokens.shape[0]
 
@@ -355,6 +417,17 @@ class MagpieTTSDataset(TextToSpeechDataset):
         pad_context_text_to_max_duration: Whether to pad context text to max context audio frames.
         context_duration_min: Minimum duration of context audio in seconds.
         context_duration_max: Maximum duration of context audio in seconds.
+        max_batch_duration: Optional float, if provided then training examples are grouped by audio and text length
+            into batches with at most 'max_batch_duration' seconds of padded audio, see TextToSpeechDataset.
+        num_buckets: Number of buckets by audio length when 'max_batch_duration' is provided.
+        num_text_buckets: Number of buckets by text length in each audio length bucket when 'max_batch_duration' is
+            provided.
+        speaker_embedding_store: Optional store with precomputed speaker embeddings of the reference audio, see
+            load_speaker_embedding_store. When 'load_16khz_audio' is True, examples whose reference audio is in the
+            store return its 'speaker_embedding' instead of the 16khz audio. The embeddings are computed from the
+            whole reference audio, so the reference audio is not randomly sliced to the context duration. The store
+            is only used if it was computed with the same 'volume_norm' as the dataset. Each example also returns
+            the 'target_speaker_embedding_key' of its target audio, which evaluation looks up in the store.
     """
 
     def __init__(
@@ -382,6 +455,10 @@ class MagpieTTSDataset(TextToSpeechDataset):
         pad_context_text_to_max_duration: bool = False,
         context_duration_min: float = 3.0,
         context_duration_max: float = 10.0,
+        max_batch_duration: Optional[float] = None,
+        num_buckets: int = 30,
+        num_text_buckets: int = 4,
+        speaker_embedding_store: Optional[PackedFeatureStore] = None,
     ):
         super().__init__(
             dataset_meta=dataset_meta,
@@ -395,6 +472,9 @@ class MagpieTTSDataset(TextToSpeechDataset):
             min_duration=min_duration,
             max_duration=max_duration,
             volume_norm=volume_norm,
+            max_batch_duration=max_batch_duration,
+            num_buckets=num_buckets,
+            num_text_buckets=num_text_buckets,
         )
         self.bos_id = bos_id
         self.eos_id = eos_id
@@ -418,6 +498,13 @@ class MagpieTTSDataset(TextToSpeechDataset):
         self.pad_context_text_to_max_duration = pad_context_text_to_max_duration
         self.context_duration_min = context_duration_min
         self.context_duration_max = context_duration_max
+        if speaker_embedding_store is not None and speaker_embedding_store.metadata["volume_norm"] != volume_norm:
+            logging.warning(
+                f"Ignoring speaker embeddings in {speaker_embedding_store.store_dir}, they were computed with "
+                f"volume_norm={speaker_embedding_store.metadata['volume_norm']} instead of {volume_norm}."
+            )
+            speaker_embedding_store = None
+        self.speaker_embedding_store = speaker_embedding_store
 
     def get_num_audio_samples_to_slice(self, duration, sample_rate):
         num_codec_frames = int(duration * sample_rate / self.codec_model_downsample_factor)
@@ -547,23 +634,30 @@ class MagpieTTSDataset(TextToSpeechDataset):
                 example['context_audio'] = context_audio
                 example['context_audio_len'] = context_audio_len
 
+        example['target_speaker_embedding_key'] = get_speaker_embedding_key(
+            *get_target_audio(manifest_entry=data.manifest_entry, audio_dir=data.audio_dir)
+        )
+        speaker_embedding_key = None
+        if self.load_16khz_audio and self.speaker_embedding_store is not None:
+            speaker_embedding_key = get_speaker_embedding_key(
+                *get_speaker_reference_audio(manifest_entry=data.manifest_entry, audio_dir=data.audio_dir)
+            )
+            if speaker_embedding_key not in self.speaker_embedding_store:
+                speaker_embedding_key = None
+
+        if speaker_embedding_key is not None:
+            speaker_embedding = self.speaker_embedding_store.read(speaker_embedding_key)
+            example['speaker_embedding'] = torch.tensor(speaker_embedding, dtype=torch.float32)
         # 16kHz audio is used for SV model
-        if self.load_16khz_audio:
-            if 'context_audio_filepath' in data.manifest_entry:
-                # If context_audio_filepath is available, then use that for 16khz audio for SV model
-                context_audio_filepath = os.path.join(data.audio_dir, data.manifest_entry['context_audio_filepath'])
-                context_duration = data.manifest_entry['context_audio_duration']
-                audio_array_16khz = _read_audio(
-                    audio_filepath=context_audio_filepath, sample_rate=16000, offset=0, duration=context_duration
-                ).samples
-            else:
-                # Otherwise, load the target audio file.
-                audio_array_16khz, _, _ = load_audio(
-                    manifest_entry=data.manifest_entry,
-                    audio_dir=data.audio_dir,
-                    sample_rate=16000,
-                    volume_norm=self.volume_norm,
-                )
+        elif self.load_16khz_audio:
+            # If context_audio_filepath is available, then use that for 16khz audio for SV model.
+            # Otherwise, load the target audio file.
+            audio_array_16khz = load_speaker_reference_audio(
+                manifest_entry=data.manifest_entry,
+                audio_dir=data.audio_dir,
+                sample_rate=16000,
+                volume_norm=self.volume_norm,
+            )
             _context_duration_to_slice = random.uniform(self.context_duration_min, self.context_duration_max)
             _num_samples_to_slice = int(_context_duration_to_slice * 16000)
             if _num_samples_to_slice < len(audio_array_16khz):
@@ -617,6 +711,8 @@ class MagpieTTSDataset(TextToSpeechDataset):
         audio_len_list = []
         audio_list_16khz = []
         audio_len_list_16khz = []
+        speaker_embedding_list = []
+        target_speaker_embedding_key_list = []
         token_list = []
         token_len_list = []
         prior_list = []
@@ -647,6 +743,9 @@ class MagpieTTSDataset(TextToSpeechDataset):
                 audio_list_16khz.append(example["audio_16khz"])
                 audio_len_list_16khz.append(example["audio_len_16khz"])
 
+            speaker_embedding_list.append(example.get('speaker_embedding'))
+            target_speaker_embedding_key_list.append(example['target_speaker_embedding_key'])
+
             if 'audio_codes' in example:
                 audio_codes_list.append(example['audio_codes'])
                 audio_codes_len_list.append(example['audio_codes_len'])
@@ -678,6 +777,7 @@ class MagpieTTSDataset(TextToSpeechDataset):
             "dataset_names": dataset_name_list,
             "raw_texts": raw_text_list,
             "audio_filepaths": audio_filepath_list,
+            "target_speaker_embedding_keys": target_speaker_embedding_key_list,
             "text": batch_tokens,
             "text_lens": batch_token_len,
         }
@@ -696,6 +796,15 @@ class MagpieTTSDataset(TextToSpeechDataset):
             batch_dict['audio_16khz'] = batch_audio_16khz
             batch_dict['audio_lens_16khz'] = batch_audio_len_16khz
 
+        # Examples without a cached speaker embedding have zeros, their embeddings are computed from 'audio_16khz'
+        has_speaker_embedding = [speaker_embedding is not None for speaker_embedding in speaker_embedding_list]
+        if any(has_speaker_embedding):
+            embedding_dim = next(emb for emb in speaker_embedding_list if emb is not None).shape[0]
+            batch_dict['speaker_embeddings'] = torch.stack(
+                [emb if emb is not None else torch.zeros(embedding_dim) for emb in speaker_embedding_list]
+            )
+            batch_dict['has_speaker_embedding'] = torch.BoolTensor(has_speaker_embedding)
+
         if len(audio_codes_list) > 0:
             batch_audio_codes_len = torch.IntTensor(audio_codes_len_list)
             audio_codes_max_len = int(batch_audio_codes_len.max().item())
@@ -28,6 +28,7 @@ from nemo.collections.asr.parts.preprocessing.segment import available_formats a
 from nemo.collections.asr.parts.utils.manifest_utils import read_manifest
 from nemo.collections.tts.parts.preprocessing.feature_processors import FeatureProcessor
 from nemo.collections.tts.parts.utils.tts_dataset_utils import (
+    LengthBucketingBatchSampler,
     filter_dataset_by_duration,
     get_weighted_sampler,
     load_audio,
@@ -128,6 +129,10 @@ class VocoderDataset(Dataset):
             will be ignored.
         trunc_duration: Optional int, if provided audio will be truncated to at most 'trunc_duration' seconds.
         volume_norm: Whether to apply volume normalization to loaded audio.
+        max_batch_duration: Optional float, if provided then examples are grouped by audio length into batches with
+            at most 'max_batch_duration' seconds of padded audio, see LengthBucketingBatchSampler. The batch size of
+            the dataloader is the maximum number of examples in a batch.
+        num_buckets: Number of buckets by audio length when 'max_batch_duration' is provided.
     """
 
     def __init__(
@@ -141,14 +146,21 @@ class VocoderDataset(Dataset):
         max_duration: Optional[float] = None,
         trunc_duration: Optional[float] = None,
         volume_norm: bool = False,
+        max_batch_duration: Optional[float] = None,
+        num_buckets: int = 30,
     ):
         super().__init__()
 
+        if weighted_sampling_steps_per_epoch and max_batch_duration:
+            raise ValueError("Weighted sampling and length bucketing with max_batch_duration can't be used together.")
+
         self.sample_rate = sample_rate
         self.n_samples = n_samples
         self.trunc_duration = trunc_duration
         self.volume_norm = volume_norm
         self.weighted_sampling_steps_per_epoch = weighted_sampling_steps_per_epoch
+        self.max_batch_duration = max_batch_duration
+        self.num_buckets = num_buckets
         self.load_precomputed_mel = False
 
         if feature_processors:
@@ -168,6 +180,15 @@ class VocoderDataset(Dataset):
             self.sample_weights += weights
 
     def get_sampler(self, batch_size: int, world_size: int) -> Optional[torch.utils.data.Sampler]:
+        if self.max_batch_duration:
+            return LengthBucketingBatchSampler(
+                audio_lengths=[self._get_audio_length(data) for data in self.data_samples],
+                max_batch_length=int(self.max_batch_duration * self.sample_rate),
+                max_batch_size=batch_size,
+                num_buckets=self.num_buckets,
+                world_size=world_size,
+            )
+
         if not self.weighted_sampling_steps_per_epoch:
             return None
 
@@ -179,6 +200,15 @@ class VocoderDataset(Dataset):
         )
         return sampler
 
+    def _get_audio_length(self, data: DatasetSample) -> int:
+        # Audio segments are padded to n_samples if the audio is shorter
+        if self.n_samples:
+            return self.n_samples
+        duration = data.manifest_entry["duration"]
+        if self.trunc_duration:
+            duration = min(duration, self.trunc_duration)
+        return int(duration * self.sample_rate)
+
     def __len__(self):
         return len(self.data_samples)
 
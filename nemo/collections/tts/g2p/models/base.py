@@ -13,7 +13,8 @@
 # limitations under the License.
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import List, Optional
+
 from nemo.utils import logging
 
 
@@ -42,6 +43,12 @@ class BaseG2p(ABC):
     def __call__(self, text: str) -> str:
         pass
 
+    def batch_call(self, texts: List[str]) -> List:
+        """
+        Convert a list of sentences. Returns the same outputs as calling the module on every sentence in order.
+        """
+        return [self(text) for text in texts]
+
     # TODO @xueyang: replace `wordid_to_phonemes_file` default variable with a global variable defined in util file.
     def setup_heteronym_model(
         self,
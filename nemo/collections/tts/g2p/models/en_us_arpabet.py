@@ -16,18 +16,22 @@ import pathlib
 import random
 import re
 import time
-from typing import Optional
+from typing import List, Optional
 
 import nltk
 import torch
 
 from nemo.collections.common.tokenizers.text_to_speech.tokenizer_utils import english_word_tokenize
 from nemo.collections.tts.g2p.models.base import BaseG2p
+from nemo.collections.tts.g2p.utils import LRUCache, PronunciationVariant, sample_pronunciation_variants
 from nemo.utils import logging
 from nemo.utils.get_rank import is_global_rank_zero
 
 
 class EnglishG2p(BaseG2p):
+    # Regex for words which contain letters or digits, other words are punctuation or whitespace
+    CHAR_REGEX = re.compile(r"[a-zA-ZÀ-ÿ\d]")
+
     def __init__(
         self,
         phoneme_dict=None,
@@ -38,6 +42,7 @@ class EnglishG2p(BaseG2p):
         encoding='latin-1',
         phoneme_probability: Optional[float] = None,
         mapping_file: Optional[str] = None,
+        cache_size: int = 100000,
     ):
         """English G2P module. This module converts words from grapheme to phoneme representation using phoneme_dict in CMU dict format.
         Optionally, it can ignore words which are heteronyms, ambiguous or marked as unchangeable by word_tokenize_func (see code for details).
@@ -55,6 +60,8 @@ class EnglishG2p(BaseG2p):
             phoneme_probability (Optional[float]): The probability (0.<var<1.) that each word is phonemized. Defaults to None which is the same as 1.
                 Note that this code path is only run if the word can be phonemized. For example: If the word does not have an entry in the g2p dict, it will be returned
                 as characters. If the word has multiple entries and ignore_ambiguous_words is True, it will be returned as characters.
+            cache_size (int): Maximum number of words whose parsed pronunciations are cached. Words are re-parsed after
+                eviction, so apply_to_oov_word has to be deterministic. Set to 0 to disable the cache.
         """
         phoneme_dict = (
             self._parse_as_cmu_dict(phoneme_dict, encoding)
@@ -85,6 +92,7 @@ class EnglishG2p(BaseG2p):
         )
         self.phoneme_probability = phoneme_probability
         self._rng = random.Random()
+        self._word_cache = LRUCache(maxsize=cache_size)
 
     @staticmethod
     def _parse_as_cmu_dict(phoneme_dict_path=None, encoding='latin-1'):
@@ -151,6 +159,12 @@ class EnglishG2p(BaseG2p):
     def is_unique_in_phoneme_dict(self, word):
         return len(self.phoneme_dict[word]) == 1
 
+    def clear_cache(self):
+        """
+        Clear the cached word pronunciations, this is needed after changing the phoneme dict or heteronyms.
+        """
+        self._word_cache.clear()
+
     def parse_one_word(self, word: str):
         """
         Returns parsed `word` and `status` as bool.
@@ -160,8 +174,21 @@ class EnglishG2p(BaseG2p):
         if self.phoneme_probability is not None and self._rng.random() > self.phoneme_probability:
             return word, True
 
+        pron, is_handled = self._get_parsed_word(word)
+        # Return a copy so that callers can't modify the cached pronunciation
+        return list(pron) if isinstance(pron, list) else pron, is_handled
+
+    def _get_parsed_word(self, word: str):
+        # The parsing after the phoneme_probability draw is deterministic, so its result is cached.
+        parsed = self._word_cache.get(word)
+        if parsed is None:
+            parsed = self._parse_one_word(word)
+            self._word_cache.put(word, parsed)
+        return parsed
+
+    def _parse_one_word(self, word: str):
         # punctuation or whitespace.
-        if re.search(r"[a-zA-ZÀ-ÿ\d]", word) is None:
+        if self.CHAR_REGEX.search(word) is None:
             return list(word), True
 
         # heteronyms
@@ -198,26 +225,47 @@ class EnglishG2p(BaseG2p):
             return word, False
 
     def __call__(self, text):
+        return self.sample_pronunciation(self.batch_get_pronunciation_variants([text])[0])
+
+    def batch_get_pronunciation_variants(self, texts: List[str]) -> List[List[PronunciationVariant]]:
+        """
+        Returns the grapheme and phoneme variants of the words of each text, see `sample_pronunciation_variants`.
+        The variants don't depend on `phoneme_probability`, so they can be cached to convert a text again.
+        """
+        return [self._get_text_variants(text) for text in texts]
+
+    def sample_pronunciation(self, variants: List[PronunciationVariant]) -> List[str]:
+        """
+        Sample a pronunciation from the variants of a text, this returns the same as calling the module on the text.
+        """
+        return sample_pronunciation_variants(variants, self.phoneme_probability, self._rng)
+
+    def _get_word_variant(self, word: str):
+        pron, is_handled = self._get_parsed_word(word)
+        return (list(word), [list(pron)]), is_handled
+
+    def _get_text_variants(self, text: str) -> List[PronunciationVariant]:
         words = self.word_tokenize_func(text)
 
-        prons = []
+        variants = []
         for word, without_changes in words:
             if without_changes:
-                prons.extend(word)
+                variants.append(list(word))
                 continue
 
             word_str = word[0]
             word_by_hyphen = word_str.split("-")
-            pron, is_handled = self.parse_one_word(word_str)
+            variant, is_handled = self._get_word_variant(word_str)
 
             if not is_handled and len(word_by_hyphen) > 1:
-                pron = []
+                phoneme_variants = []
                 for sub_word in word_by_hyphen:
-                    p, _ = self.parse_one_word(sub_word)
-                    pron.extend(p)
-                    pron.extend(["-"])
-                pron.pop()
+                    sub_word_variant, _ = self._get_word_variant(sub_word)
+                    phoneme_variants.append(sub_word_variant)
+                    phoneme_variants.append(["-"])
+                phoneme_variants.pop()
+                variant = (variant[0], phoneme_variants)
 
-            prons.extend(pron)
+            variants.append(variant)
 
-        return prons
+        return variants
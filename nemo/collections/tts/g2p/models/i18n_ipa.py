@@ -26,7 +26,14 @@ from nemo.collections.common.tokenizers.text_to_speech.tokenizer_utils import (
     normalize_unicode_text,
 )
 from nemo.collections.tts.g2p.models.base import BaseG2p
-from nemo.collections.tts.g2p.utils import GRAPHEME_CASE_MIXED, GRAPHEME_CASE_UPPER, set_grapheme_case
+from nemo.collections.tts.g2p.utils import (
+    GRAPHEME_CASE_MIXED,
+    GRAPHEME_CASE_UPPER,
+    LRUCache,
+    PronunciationVariant,
+    sample_pronunciation_variants,
+    set_grapheme_case,
+)
 from nemo.utils import logging
 from nemo.utils.decorators import experimental
 
@@ -38,6 +45,14 @@ class IpaG2p(BaseG2p):
     # Regex for roman characters, accented characters, and locale-agnostic numbers/digits
     CHAR_REGEX = re.compile(fr"[{LATIN_CHARS_ALL}\d]")
     PUNCT_REGEX = re.compile(fr"[^{LATIN_CHARS_ALL}\d]")
+    # fr-FR contracted prefixes (with apostrophe) and their phonemes
+    FR_CONTRACTIONS = [
+        (cont_g + "'", list(cont_p))
+        for cont_g, cont_p in zip(
+            ['l', 'c', 'd', 'j', 'm', 'n', 'qu', 's', 't', 'puisqu', 'lorsqu', 'jusqu'],
+            ['l', 's', 'd', 'ʒ', 'm', 'n', 'k', 's', 't', 'pyisk', 'loʁsk', 'ʒysk'],
+        )
+    ]
     # fmt: on
 
     def __init__(
@@ -53,6 +68,7 @@ class IpaG2p(BaseG2p):
         grapheme_case: Optional[str] = GRAPHEME_CASE_UPPER,
         grapheme_prefix: Optional[str] = "",
         mapping_file: Optional[str] = None,
+        cache_size: int = 100000,
     ) -> None:
         """
         Generic IPA G2P module. This module converts words from graphemes to International Phonetic Alphabet
@@ -92,6 +108,8 @@ class IpaG2p(BaseG2p):
                 from phonemes because there may be overlaps between the two set. It is suggested to choose a prefix that
                 is not used or preserved somewhere else. "#" could be a good candidate. Default to "".
             TODO @borisfom: add docstring for newly added `mapping_file` argument.
+            cache_size (int): Maximum number of words whose parsed pronunciations are cached. Words are re-parsed after
+                eviction, so `apply_to_oov_word` has to be deterministic. Set to 0 to disable the cache.
         """
         self.use_stresses = use_stresses
         self.grapheme_case = grapheme_case
@@ -99,6 +117,7 @@ class IpaG2p(BaseG2p):
         self.phoneme_probability = phoneme_probability
         self.locale = locale
         self._rng = random.Random()
+        self._word_cache = LRUCache(maxsize=cache_size)
 
         if locale is not None:
             validate_locale(locale)
@@ -224,6 +243,7 @@ class IpaG2p(BaseG2p):
         Replace model's phoneme dictionary with a custom one
         """
         self.phoneme_dict = self._parse_phoneme_dict(phoneme_dict)
+        self.clear_cache()
 
     @staticmethod
     def _parse_file_by_lines(p: Union[str, pathlib.Path]) -> List[str]:
@@ -339,6 +359,13 @@ class IpaG2p(BaseG2p):
             self.phoneme_dict.update(replacement_dict)
 
         self.symbols = new_symbols
+        self.clear_cache()
+
+    def clear_cache(self):
+        """
+        Clear the cached word pronunciations, this is needed after changing the phoneme dict or heteronyms.
+        """
+        self._word_cache.clear()
 
     def is_unique_in_phoneme_dict(self, word: str) -> bool:
         return len(self.phoneme_dict[word]) == 1
@@ -355,6 +382,19 @@ class IpaG2p(BaseG2p):
         if self.phoneme_probability is not None and self._rng.random() > self.phoneme_probability:
             return self._prepend_prefix_for_one_word(word), True
 
+        pron, is_handled = self._get_parsed_word(word)
+        # Return a copy so that callers can't modify the cached pronunciation
+        return list(pron) if isinstance(pron, list) else pron, is_handled
+
+    def _get_parsed_word(self, word: str) -> Tuple[List[str], bool]:
+        # The parsing after the phoneme_probability draw is deterministic, so its result is cached.
+        parsed = self._word_cache.get(word)
+        if parsed is None:
+            parsed = self._parse_one_word(word)
+            self._word_cache.put(word, parsed)
+        return parsed
+
+    def _parse_one_word(self, word: str) -> Tuple[List[str], bool]:
         # Heteronyms
         if self.heteronyms and word in self.heteronyms:
             return self._prepend_prefix_for_one_word(word), True
@@ -406,11 +446,7 @@ class IpaG2p(BaseG2p):
 
         if self.locale == "fr-FR":
             # contracted prefix (with apostrophe) - not in phoneme dict
-            contractions_g = ['l', 'c', 'd', 'j', 'm', 'n', 'qu', 's', 't', 'puisqu', 'lorsqu', 'jusqu']
-            contractions_p = ['l', 's', 'd', 'ʒ', 'm', 'n', 'k', 's', 't', 'pyisk', 'loʁsk', 'ʒysk']
-
-            for cont_g, cont_p in zip(contractions_g, contractions_p):
-                starter = cont_g + "'"
+            for starter, cont_p in self.FR_CONTRACTIONS:
                 if len(word) > 2 and (word.startswith(starter) or word.startswith(starter.upper())):
                     word_found = None
                     if (word not in self.phoneme_dict) and (word.upper() not in self.phoneme_dict):
@@ -423,7 +459,7 @@ class IpaG2p(BaseG2p):
                     if word_found is not None and (
                         not self.ignore_ambiguous_words or self.is_unique_in_phoneme_dict(word_found)
                     ):
-                        return [c for c in cont_p] + self.phoneme_dict[word_found][0], True
+                        return cont_p + self.phoneme_dict[word_found][0], True
 
         # For the words that have a single pronunciation, directly look it up in the phoneme_dict; for the
         # words that have multiple pronunciation variants, if we don't want to ignore them, then directly choose their
@@ -449,28 +485,60 @@ class IpaG2p(BaseG2p):
             return self._prepend_prefix_for_one_word(word), False
 
     def __call__(self, text: str) -> List[str]:
-        text = normalize_unicode_text(text)
+        return self.batch_call([text])[0]
+
+    def batch_call(self, texts: List[str]) -> List[List[str]]:
+        """
+        Convert a list of sentences. The heteronym model, if set up, disambiguates all sentences in a single batch.
+        """
+        return [self.sample_pronunciation(variants) for variants in self.batch_get_pronunciation_variants(texts)]
+
+    def batch_get_pronunciation_variants(self, texts: List[str]) -> List[List[PronunciationVariant]]:
+        """
+        Returns the grapheme and phoneme variants of the words of each text, see `sample_pronunciation_variants`.
+        The variants don't depend on `phoneme_probability`, so they can be cached to convert a text again.
+        """
+        texts = [normalize_unicode_text(text) for text in texts]
 
         if self.heteronym_model is not None:
             try:
-                text = self.heteronym_model.disambiguate(sentences=[text])[1][0]
+                texts = self.heteronym_model.disambiguate(sentences=texts)[1]
             except Exception as e:
                 logging.warning(f"Heteronym model failed {e}, skipping")
 
+        return [self._get_text_variants(text) for text in texts]
+
+    def sample_pronunciation(self, variants: List[PronunciationVariant]) -> List[str]:
+        """
+        Sample a pronunciation from the variants of a text, this returns the same as calling the module on the text.
+        """
+        return sample_pronunciation_variants(variants, self.phoneme_probability, self._rng)
+
+    def _get_word_variant(self, word: str) -> Tuple[PronunciationVariant, bool]:
+        word = set_grapheme_case(word, case=self.grapheme_case)
+
+        # Punctuation (assumes other chars have been stripped)
+        if self.CHAR_REGEX.search(word) is None:
+            return list(word), True
+
+        pron, is_handled = self._get_parsed_word(word)
+        return (self._prepend_prefix_for_one_word(word), [list(pron)]), is_handled
+
+    def _get_text_variants(self, text: str) -> List[PronunciationVariant]:
         words_list_of_tuple = self.word_tokenize_func(text)
 
-        prons = []
+        variants = []
         for words, without_changes in words_list_of_tuple:
             if without_changes:
                 # for example: (["NVIDIA", "unchanged"], True). "NVIDIA" is considered as a single token.
-                prons.extend([f"{self.grapheme_prefix}{word}" for word in words])
+                variants.append([f"{self.grapheme_prefix}{word}" for word in words])
             else:
                 assert (
                     len(words) == 1
                 ), f"{words} should only have a single item when `without_changes` is False, but found {len(words)}."
 
                 word = words[0]
-                pron, is_handled = self.parse_one_word(word)
+                variant, is_handled = self._get_word_variant(word)
 
                 # If `is_handled` is False, then the only possible case is that the word is an OOV. The OOV may have a
                 # hyphen so that it doesn't show up in the g2p dictionary. We need split it into sub-words by a hyphen,
@@ -478,13 +546,15 @@ class IpaG2p(BaseG2p):
                 if not is_handled:
                     subwords_by_hyphen = word.split("-")
                     if len(subwords_by_hyphen) > 1:
-                        pron = []  # reset the previous pron
+                        phoneme_variants = []
                         for sub_word in subwords_by_hyphen:
-                            p, _ = self.parse_one_word(sub_word)
-                            pron.extend(p)
-                            pron.append("-")
-                        pron.pop()  # remove the redundant hyphen that is previously appended at the end of the word.
+                            sub_word_variant, _ = self._get_word_variant(sub_word)
+                            phoneme_variants.append(sub_word_variant)
+                            phoneme_variants.append(["-"])
+                        # remove the redundant hyphen that is previously appended at the end of the word.
+                        phoneme_variants.pop()
+                        variant = (variant[0], phoneme_variants)
 
-                prons.extend(pron)
+                variants.append(variant)
 
-        return prons
+        return variants
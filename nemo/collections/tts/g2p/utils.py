@@ -17,9 +17,14 @@ import csv
 import os
 import re
 import string
-from typing import Dict, List, Union
+from random import Random
+from typing import Dict, List, Optional, Tuple, Union
+
+from nemo.collections.common.tokenizers.text_to_speech.tokenizer_utils import LRUCache
 
 __all__ = [
+    "LRUCache",
+    "sample_pronunciation_variants",
     "read_wordids",
     "set_grapheme_case",
     "GRAPHEME_CASE_UPPER",
@@ -168,3 +173,35 @@ def set_grapheme_case(text: str, case: str = "upper") -> str:
         raise ValueError(f"Case <{case}> is not supported. Please specify either 'upper', 'lower', or 'mixed'.")
 
     return text_new
+
+
+# A pronunciation variant is either a list of symbols which is always used, or a tuple of the graphemes of a word and
+# the variants of its phoneme pronunciation.
+PronunciationVariant = Union[List[str], Tuple[List[str], List["PronunciationVariant"]]]
+
+
+def sample_pronunciation_variants(
+    variants: List[PronunciationVariant], phoneme_probability: Optional[float], rng: Random
+) -> List[str]:
+    """
+    Sample a pronunciation from the variants returned by `batch_get_pronunciation_variants` of a G2P module.
+    For each word the graphemes are used with probability `1 - phoneme_probability`, drawing from `rng` in the same
+    order as when calling the G2P module on the text.
+
+    Args:
+        variants: Pronunciation variants of a text.
+        phoneme_probability: Probability that a word is phonemized. If None, all words are phonemized.
+        rng: Random number generator of the G2P module.
+
+    Returns:
+        List of symbols, as returned by calling the G2P module.
+    """
+    prons = []
+    for variant in variants:
+        if not isinstance(variant, tuple):
+            prons.extend(variant)
+        elif phoneme_probability is not None and rng.random() > phoneme_probability:
+            prons.extend(variant[0])
+        else:
+            prons.extend(sample_pronunciation_variants(variant[1], phoneme_probability, rng))
+    return prons
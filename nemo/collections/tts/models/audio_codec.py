@@ -15,7 +15,7 @@
 import itertools
 from math import ceil
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import torch
 import torch.nn.functional as F
@@ -34,8 +34,13 @@ from nemo.collections.tts.losses.audio_codec_loss import (
 )
 from nemo.collections.tts.modules.audio_codec_modules import ResNetSpeakerEncoder
 from nemo.collections.tts.modules.common import GaussianDropout
+from nemo.collections.tts.parts.utils.audio_codec_streaming import (
+    AudioCodecStreamingDecoder,
+    estimate_decoder_context_frames,
+)
 from nemo.collections.tts.parts.utils.callbacks import LoggingCallback
 from nemo.collections.tts.parts.utils.helpers import get_batch_size, get_num_workers
+from nemo.collections.tts.parts.utils.tts_dataset_utils import get_dataloader_params, set_batch_sampler_epoch
 from nemo.core import ModelPT
 from nemo.core.classes.common import PretrainedModelInfo, typecheck
 from nemo.core.neural_types.elements import AudioSignal, EncodedRepresentation, LengthsType, TokenIndex
@@ -106,6 +111,8 @@ class AudioCodecModel(ModelPT):
 
         # Decoder setup
         self.audio_decoder = instantiate(cfg.audio_decoder)
+        # Number of past and future frames that the audio of a frame depends on, estimated for streaming decoding
+        self._decoder_context_frames = None
 
         # Discriminator setup
         self.discriminator = instantiate(cfg.discriminator)
@@ -394,6 +401,39 @@ class AudioCodecModel(ModelPT):
 
         return audio, audio_len
 
+    def get_streaming_decoder(
+        self, num_past_frames: Optional[int] = None, num_future_frames: Optional[int] = None
+    ) -> AudioCodecStreamingDecoder:
+        """Create a decoder which converts tokens into audio incrementally, see `AudioCodecStreamingDecoder`.
+
+        The context frames which are not given are estimated with `estimate_decoder_context_frames`. They only
+        depend on the architecture of the decoder, so they are estimated once and reused by all streaming decoders
+        of this model.
+
+        Args:
+            num_past_frames: number of past frames that the audio of a frame depends on, estimated if not given
+            num_future_frames: number of future frames that the audio of a frame depends on, estimated if not given
+
+        Returns:
+            Streaming decoder for this model.
+        """
+        if num_past_frames is None or num_future_frames is None:
+            if self._decoder_context_frames is None:
+                self._decoder_context_frames = estimate_decoder_context_frames(
+                    audio_decoder=self.audio_decoder,
+                    input_dim=self.vector_quantizer.codebook_dim,
+                    samples_per_frame=self.samples_per_frame,
+                )
+            estimated_past_frames, estimated_future_frames = self._decoder_context_frames
+            if num_past_frames is None:
+                num_past_frames = estimated_past_frames
+            if num_future_frames is None:
+                num_future_frames = estimated_future_frames
+
+        return AudioCodecStreamingDecoder(
+            model=self, num_past_frames=num_past_frames, num_future_frames=num_future_frames
+        )
+
     @typecheck(
         input_types={
             "audio": NeuralType(('B', 'T_audio'), AudioSignal()),
@@ -658,7 +698,7 @@ class AudioCodecModel(ModelPT):
     def _setup_train_dataloader(self, cfg):
         dataset, sampler = self.get_dataset(cfg)
         data_loader = torch.utils.data.DataLoader(
-            dataset, collate_fn=dataset.collate_fn, sampler=sampler, **cfg.dataloader_params
+            dataset, collate_fn=dataset.collate_fn, **get_dataloader_params(sampler, cfg.dataloader_params)
         )
         return data_loader
 
@@ -692,6 +732,13 @@ class AudioCodecModel(ModelPT):
                     "training batches will be used. Please set the trainer and rebuild the dataset."
                 )
 
+    def train_dataloader(self):
+        set_batch_sampler_epoch(self._train_dl, self.trainer)
+        return super().train_dataloader()
+
+    def on_train_epoch_start(self):
+        set_batch_sampler_epoch(self._train_dl, self.trainer)
+
     def setup_validation_data(self, cfg):
         self._validation_dl = self._setup_test_dataloader(cfg)
 
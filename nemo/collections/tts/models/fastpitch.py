@@ -38,6 +38,7 @@ from nemo.collections.tts.parts.utils.helpers import (
     process_batch,
     sample_tts_input,
 )
+from nemo.collections.tts.parts.utils.tts_dataset_utils import get_dataloader_params, set_batch_sampler_epoch
 from nemo.core.classes import Exportable
 from nemo.core.classes.common import PretrainedModelInfo, typecheck
 from nemo.core.neural_types.elements import (
@@ -612,7 +613,7 @@ class FastPitchModel(SpectrogramGenerator, Exportable, FastPitchAdapterModelMixi
 
         sampler = dataset.get_sampler(cfg.dataloader_params.batch_size, world_size=self.trainer.world_size)
         return torch.utils.data.DataLoader(
-            dataset, collate_fn=dataset.collate_fn, sampler=sampler, **cfg.dataloader_params
+            dataset, collate_fn=dataset.collate_fn, **get_dataloader_params(sampler, cfg.dataloader_params)
         )
 
     def _setup_test_dataloader(self, cfg):
@@ -669,6 +670,13 @@ class FastPitchModel(SpectrogramGenerator, Exportable, FastPitchAdapterModelMixi
         else:
             self._train_dl = self.__setup_dataloader_from_config(cfg)
 
+    def train_dataloader(self):
+        set_batch_sampler_epoch(self._train_dl, self.trainer)
+        return super().train_dataloader()
+
+    def on_train_epoch_start(self):
+        set_batch_sampler_epoch(self._train_dl, self.trainer)
+
     def setup_validation_data(self, cfg):
         if self.ds_class == "nemo.collections.tts.data.text_to_speech_dataset.TextToSpeechDataset":
             self._validation_dl = self._setup_test_dataloader(cfg)
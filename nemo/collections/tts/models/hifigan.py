@@ -26,6 +26,7 @@ from nemo.collections.tts.models.base import Vocoder
 from nemo.collections.tts.modules.hifigan_modules import MultiPeriodDiscriminator, MultiScaleDiscriminator
 from nemo.collections.tts.parts.utils.callbacks import LoggingCallback
 from nemo.collections.tts.parts.utils.helpers import get_batch_size, get_num_workers, plot_spectrogram_to_numpy
+from nemo.collections.tts.parts.utils.tts_dataset_utils import get_dataloader_params, set_batch_sampler_epoch
 from nemo.core.classes import Exportable
 from nemo.core.classes.common import PretrainedModelInfo, typecheck
 from nemo.core.neural_types.elements import AudioSignal, MelSpectrogramType
@@ -339,7 +340,7 @@ class HifiGanModel(Vocoder, Exportable):
         dataset = instantiate(cfg.dataset)
         sampler = dataset.get_sampler(cfg.dataloader_params.batch_size, world_size=self.trainer.world_size)
         data_loader = torch.utils.data.DataLoader(
-            dataset, collate_fn=dataset.collate_fn, sampler=sampler, **cfg.dataloader_params
+            dataset, collate_fn=dataset.collate_fn, **get_dataloader_params(sampler, cfg.dataloader_params)
         )
         return data_loader
 
@@ -375,6 +376,13 @@ class HifiGanModel(Vocoder, Exportable):
         else:
             self._train_dl = self.__setup_dataloader_from_config(cfg)
 
+    def train_dataloader(self):
+        set_batch_sampler_epoch(self._train_dl, self.trainer)
+        return super().train_dataloader()
+
+    def on_train_epoch_start(self):
+        set_batch_sampler_epoch(self._train_dl, self.trainer)
+
     def setup_validation_data(self, cfg):
         if self.ds_class == "nemo.collections.tts.data.vocoder_dataset.VocoderDataset":
             self._validation_dl = self._setup_test_dataloader(cfg)
@@ -36,11 +36,20 @@ from nemo.collections.tts.losses.aligner_loss import ForwardSumLoss
 from nemo.collections.tts.models import AudioCodecModel
 from nemo.collections.tts.modules import transformer_2501
 from nemo.collections.tts.parts.utils.helpers import get_mask_from_lengths, plot_alignment_to_numpy
-from nemo.collections.tts.parts.utils.tts_dataset_utils import stack_tensors
+from nemo.collections.tts.parts.utils.magpietts_inference import MagpieTTSInferenceScheduler
+from nemo.collections.tts.parts.utils.tts_dataset_utils import (
+    get_dataloader_params,
+    load_speaker_embedding_store,
+    normalize_volume,
+    set_batch_sampler_epoch,
+    stack_tensors,
+)
 from nemo.core.classes import ModelPT
 from nemo.core.classes.common import PretrainedModelInfo
 from nemo.utils import logging
 
+SPEAKER_VERIFICATION_MODEL_NAME = 'titanet_large'
+
 
 def setup_tokenizers(all_tokenizers_config, use_text_conditioning_tokenizer, mode='train'):
     # Being used in both model and worker_init_fn, so it is defined here
@@ -94,7 +103,9 @@ class MagpieTTS_Model(ModelPT):
 
     - single_encoder_sv_tts: Transcript goes into the encoder and target audio goes to the decoder. Additionally,
     speaker_embedding of target audio (or context audio if provided) from TitaNet gets added to encoder
-    output(all timesteps).
+    output(all timesteps). If cfg.speaker_embedding_store_dir is set, speaker embeddings precomputed with
+    scripts/dataset_processing/tts/compute_speaker_embeddings.py are read from it instead of computed from the
+    reference audio.
 
     - multi_encoder_context_tts: Transcript and context audio go to different encoders. Transcript encoding feeds to
     layers given by cfg.model.transcript_decoder_layers and the context encoding feeds into the layers given by
@@ -148,6 +159,11 @@ class MagpieTTS_Model(ModelPT):
 
         self.pad_context_text_to_max_duration = self.model_type == 'decoder_context_tts'
         self.use_kv_cache_for_inference = cfg.get('use_kv_cache_for_inference', False)
+        self.speaker_embedding_store = None
+        if cfg.get('speaker_embedding_store_dir', None):
+            self.speaker_embedding_store = load_speaker_embedding_store(
+                cfg.speaker_embedding_store_dir, SPEAKER_VERIFICATION_MODEL_NAME
+            )
 
         super().__init__(cfg=cfg, trainer=trainer)
 
@@ -174,7 +190,7 @@ class MagpieTTS_Model(ModelPT):
 
         if self.model_type == 'single_encoder_sv_tts':
             speaker_verification_model = nemo_asr.models.EncDecSpeakerLabelModel.from_pretrained(
-                model_name='titanet_large'
+                model_name=SPEAKER_VERIFICATION_MODEL_NAME
             )
             speaker_verification_model.eval()
             self.freeze_model(speaker_verification_model)
@@ -318,6 +334,21 @@ class MagpieTTS_Model(ModelPT):
             )
             return speaker_embeddings
 
+    def get_batch_speaker_embeddings(self, batch):
+        # Speaker embeddings read from the speaker embedding store by the dataset, the other examples of the batch
+        # have their 16khz reference audio in the batch.
+        if 'speaker_embeddings' not in batch:
+            return self.get_speaker_embeddings(batch['audio_16khz'], batch['audio_lens_16khz'])
+
+        speaker_embeddings = batch['speaker_embeddings']
+        if 'audio_16khz' in batch:
+            speaker_embeddings = speaker_embeddings.clone()
+            computed_speaker_embeddings = self.get_speaker_embeddings(batch['audio_16khz'], batch['audio_lens_16khz'])
+            speaker_embeddings[~batch['has_speaker_embedding']] = computed_speaker_embeddings.to(
+                speaker_embeddings.dtype
+            )
+        return speaker_embeddings
+
     def compute_loss(self, logits, audio_codes, audio_codes_lens):
         # logits: (B, T', num_codebooks * num_tokens_per_codebook)
         # audio_codes: (B, C, T')
@@ -514,9 +545,7 @@ class MagpieTTS_Model(ModelPT):
             _attn_prior = self.scale_prior(_attn_prior, self.global_step)
 
         if self.model_type == 'single_encoder_sv_tts':
-            target_audio_16khz = batch['audio_16khz']
-            target_audio_lens_16khz = batch['audio_lens_16khz']
-            speaker_embeddings = self.get_speaker_embeddings(target_audio_16khz, target_audio_lens_16khz)
+            speaker_embeddings = self.get_batch_speaker_embeddings(batch)
             speaker_embeddings_projected = self.speaker_projection_layer(speaker_embeddings)
             cond = text_encoder_out + speaker_embeddings_projected.unsqueeze(1)
             cond_mask = text_mask
@@ -812,6 +841,10 @@ class MagpieTTS_Model(ModelPT):
         return val_output
 
     def infer_batch(self, batch, max_decoder_steps=500, temperature=0.7, topk=80, use_cfg=False, cfg_scale=1.0):
+        if self.use_kv_cache_for_inference:
+            # Items are removed from the batch and the KV cache as soon as they end
+            return self._infer_batch_with_scheduler(batch, max_decoder_steps, temperature, topk, use_cfg, cfg_scale)
+
         with torch.no_grad():
             self.decoder.reset_cache(use_cache=self.use_kv_cache_for_inference)
 
@@ -933,6 +966,32 @@ class MagpieTTS_Model(ModelPT):
             torch.cuda.empty_cache()
             return predicted_audio, predicted_audio_lens, predicted_codes, predicted_codes_lens
 
+    def _infer_batch_with_scheduler(self, batch, max_decoder_steps, temperature, topk, use_cfg, cfg_scale):
+        text = batch['text']
+        scheduler = MagpieTTSInferenceScheduler(
+            model=self,
+            max_batch_size=text.size(0),
+            max_decoder_steps=max_decoder_steps,
+            temperature=temperature,
+            topk=topk,
+            use_cfg=use_cfg,
+            cfg_scale=cfg_scale,
+        )
+        scheduler.add_requests(batch)
+        results = scheduler.run()
+
+        predicted_codes_lens = torch.tensor([result['codes_len'] for result in results], device=text.device).long()
+        predicted_codes = stack_tensors(
+            [result['codes'] for result in results], max_lens=[max(predicted_codes_lens.max().item(), 1)]
+        )
+        predicted_audio_lens = torch.tensor([result['audio_len'] for result in results], device=text.device).long()
+        predicted_audio = stack_tensors(
+            [result['audio'] for result in results], max_lens=[max(predicted_audio_lens.max().item(), 1)]
+        )
+
+        torch.cuda.empty_cache()
+        return predicted_audio, predicted_audio_lens, predicted_codes, predicted_codes_lens
+
     def test_step(self, batch, batch_idx):
         with torch.no_grad():
             test_dl_batch_size = self._test_dl.batch_size
@@ -994,6 +1053,7 @@ class MagpieTTS_Model(ModelPT):
             pad_context_text_to_max_duration=self.pad_context_text_to_max_duration,
             context_duration_min=self.cfg.context_duration_min,
             context_duration_max=self.cfg.context_duration_max,
+            speaker_embedding_store=self.speaker_embedding_store,
         )
         dataset.load_16khz_audio = self.model_type == 'single_encoder_sv_tts'
         dataset.tokenizer_config = (
@@ -1012,8 +1072,7 @@ class MagpieTTS_Model(ModelPT):
         data_loader = torch.utils.data.DataLoader(
             dataset,
             collate_fn=dataset.collate_fn,
-            sampler=sampler,
-            **cfg.dataloader_params,
+            **get_dataloader_params(sampler, cfg.dataloader_params),
             worker_init_fn=worker_init_fn,
             persistent_workers=persistent_workers,
         )
@@ -1039,6 +1098,13 @@ class MagpieTTS_Model(ModelPT):
     def setup_training_data(self, cfg):
         self._train_dl = self._setup_train_dataloader(cfg)
 
+    def train_dataloader(self):
+        set_batch_sampler_epoch(self._train_dl, self.trainer)
+        return super().train_dataloader()
+
+    def on_train_epoch_start(self):
+        set_batch_sampler_epoch(self._train_dl, self.trainer)
+
     def setup_validation_data(self, cfg):
         self._validation_dl = self._setup_test_dataloader(cfg)
 
@@ -1066,7 +1132,7 @@ class MagpieTTS_ModelInference(MagpieTTS_Model):
             self.eval_asr_model.eval()
 
         self.eval_speaker_verification_model = nemo_asr.models.EncDecSpeakerLabelModel.from_pretrained(
-            model_name='titanet_large'
+            model_name=SPEAKER_VERIFICATION_MODEL_NAME
         )
         self.eval_speaker_verification_model.freeze()
         self.eval_speaker_verification_model.eval()
@@ -1116,13 +1182,37 @@ class MagpieTTS_ModelInference(MagpieTTS_Model):
 
         return single_space_text
 
-    def get_speaker_embeddings_from_filepaths(self, filepaths):
+    def get_speaker_embeddings_from_filepaths(
+        self, filepaths, speaker_embedding_store=None, speaker_embedding_keys=None
+    ):
+        """
+        Compute the speaker embeddings of audio files with the evaluation speaker verification model. If a speaker
+        embedding store is given, the embeddings of the files whose keys from get_speaker_embedding_key are in the
+        store are read from it, and only the other embeddings are computed. These files are read with volume
+        normalization if the store was computed with it, so that all embeddings are computed from the same audio.
+        """
+        speaker_embeddings = [None] * len(filepaths)
+        volume_norm = False
+        if speaker_embedding_store is not None:
+            volume_norm = speaker_embedding_store.metadata["volume_norm"]
+            for idx, key in enumerate(speaker_embedding_keys):
+                if key in speaker_embedding_store:
+                    speaker_embeddings[idx] = torch.tensor(
+                        speaker_embedding_store.read(key), dtype=torch.float32, device=self.device
+                    )
+
+        missing_indices = [idx for idx, embedding in enumerate(speaker_embeddings) if embedding is None]
+        if not missing_indices:
+            return torch.stack(speaker_embeddings)
+
         audio_batch = []
         audio_lengths = []
-        for filepath in filepaths:
+        for filepath in [filepaths[idx] for idx in missing_indices]:
             audio, sr = sf.read(filepath)
             if sr != 16000:
                 audio = librosa.core.resample(audio, orig_sr=sr, target_sr=16000)
+            if volume_norm:
+                audio = normalize_volume(audio)
             audio_tensor = torch.tensor(audio, dtype=torch.float32, device=self.device)
             audio_batch.append(audio_tensor)
             audio_lengths.append(audio_tensor.size(0))
@@ -1131,11 +1221,15 @@ class MagpieTTS_ModelInference(MagpieTTS_Model):
         max_audio_len = int(batch_audio_lens.max().item())
         audio_batch = stack_tensors(audio_batch, max_lens=[max_audio_len])
 
-        _, speaker_embeddings = self.eval_speaker_verification_model.forward(
+        _, computed_speaker_embeddings = self.eval_speaker_verification_model.forward(
             input_signal=audio_batch, input_signal_length=batch_audio_lens
         )
+        if len(missing_indices) == len(filepaths):
+            return computed_speaker_embeddings
 
-        return speaker_embeddings
+        for idx, embedding in zip(missing_indices, computed_speaker_embeddings):
+            speaker_embeddings[idx] = embedding.float()
+        return torch.stack(speaker_embeddings)
 
     def test_step(self, batch, batch_idx):
         with torch.no_grad():
@@ -1202,7 +1296,11 @@ class MagpieTTS_ModelInference(MagpieTTS_Model):
                             batch_invalid = True
                             continue  # don't break since we want to continue building audio durations list
                         pred_speaker_embeddings = self.get_speaker_embeddings_from_filepaths(predicted_audio_paths)
-                        gt_speaker_embeddings = self.get_speaker_embeddings_from_filepaths(batch['audio_filepaths'])
+                        gt_speaker_embeddings = self.get_speaker_embeddings_from_filepaths(
+                            batch['audio_filepaths'],
+                            speaker_embedding_store=self.speaker_embedding_store,
+                            speaker_embedding_keys=batch['target_speaker_embedding_keys'],
+                        )
 
             for idx in range(predicted_audio.size(0)):
                 if not batch_invalid:
@@ -34,4 +34,15 @@
 # SOFTWARE.
 
 
-from .numba_core import maximum_path
+from .numba_core import maximum_path as maximum_path_numba
+from .torch_core import maximum_path as maximum_path_torch
+
+
+def maximum_path(neg_cent, mask):
+    """Uses the PyTorch version for tensors on GPU, which keeps them on the device, and the Numba version otherwise.
+    neg_cent: [b, t_t, t_s]
+    mask: [b, t_t, t_s]
+    """
+    if neg_cent.is_cuda:
+        return maximum_path_torch(neg_cent, mask)
+    return maximum_path_numba(neg_cent, mask)
@@ -0,0 +1,74 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import torch
+
+
+@torch.no_grad()
+def maximum_path(neg_cent, mask, max_neg_val=-1e9):
+    """PyTorch version, computed for the whole batch on the device of the inputs.
+    Gives the same path as the Numba version in `numba_core`.
+    neg_cent: [b, t_t, t_s]
+    mask: [b, t_t, t_s]
+    """
+    device = neg_cent.device
+    dtype = neg_cent.dtype
+    batch_size, max_t_t, max_t_s = neg_cent.shape
+    neg_cent = neg_cent.float()
+
+    t_t = mask[:, :, 0].sum(1).long()
+    t_s = mask[:, 0, :].sum(1).long()
+
+    # Accumulated values, with a first row and column of padding. Each row only depends on the previous row, so
+    # all columns and utterances are updated at once. Row y is computed for x <= y and reads the padding column and
+    # the cell x == y of the previous row, which are set to `max_neg_val` like in `numba_core`. Cells which are not
+    # on any monotonic path from (0, 0) to (t_t - 1, t_s - 1) are computed too, but they are never read for the
+    # cells on such a path, and the other cells are never read at all.
+    value = neg_cent.new_empty(batch_size, max_t_t + 1, max_t_s + 1)
+    value[:, :, 0] = max_neg_val
+    value.diagonal(offset=1, dim1=1, dim2=2).fill_(max_neg_val)
+    value[:, 0, 0] = 0.0
+    # Whether the path comes from the previous column, which is also the case for x == y
+    moves = torch.empty(batch_size, max_t_t, max_t_s, dtype=torch.bool, device=device)
+    value_rows = value.unbind(1)
+    move_rows = moves.unbind(1)
+    neg_cent_rows = neg_cent.unbind(1)
+    for y in range(max_t_t):
+        num_x = min(y + 1, max_t_s)
+        prev_move = value_rows[y][:, :num_x]
+        prev_stay = value_rows[y][:, 1 : num_x + 1]
+        torch.lt(prev_stay, prev_move, out=move_rows[y][:, :num_x])
+        torch.add(
+            torch.maximum(prev_move, prev_stay), neg_cent_rows[y][:, :num_x], out=value_rows[y + 1][:, 1 : num_x + 1]
+        )
+
+    # The path stays in the last column for rows y >= t_t
+    active = torch.arange(max_t_t, device=device).unsqueeze(0) < t_t.unsqueeze(1)
+    moves = moves.view(torch.uint8).view(batch_size, max_t_t * max_t_s)
+    last_column = torch.arange(max_t_t, device=device) * max_t_s + (t_s - 1).clamp(min=0).unsqueeze(1)
+    moves.scatter_(1, last_column, moves.gather(1, last_column) * active)
+    moves = moves.flatten()
+
+    # Trace the path back from (t_t - 1, t_s - 1), as positions in the flattened `moves`
+    positions = torch.empty(max_t_t, batch_size, dtype=torch.long, device=device)
+    position = torch.arange(batch_size, device=device) * max_t_t * max_t_s + (max_t_t - 1) * max_t_s
+    position += (t_s - 1).clamp(min=0)
+    for y in range(max_t_t - 1, -1, -1):
+        positions[y] = position
+        position = position - moves.take(position) - max_t_s
+
+    path = torch.zeros(batch_size, max_t_t, max_t_s, dtype=dtype, device=device)
+    path.scatter_(2, (positions.t() % max_t_s).unsqueeze(2), active.unsqueeze(2).to(dtype))
+    return path
@@ -22,6 +22,53 @@ from nemo.utils import logging
 # TODO: Move the cache implementation out of the Module class, and pass it as part of the forward so we can reset
 # as needed in the inference pipeline.
 
+# Cached tensors with the decoding steps or the cross-attention memory as second dimension
+_CACHE_STEP_KEYS = ('self_k', 'self_v', 'self_k_mask', 'self_attn_output', 'cross_attn_output')
+_CACHE_MEMORY_KEYS = ('memory', 'cross_kv', 'cross_k', 'cross_v')
+
+
+def _merge_cache_dicts(caches: List[Dict]) -> Dict:
+    if caches[0].get('self_k') is not None:
+        # Mask of the keys which are not padding, needed once sequences of different lengths are merged
+        caches = [dict(cache) for cache in caches]
+        for cache in caches:
+            if cache['self_k_mask'] is None:
+                self_k = cache['self_k']
+                cache['self_k_mask'] = torch.ones(self_k.shape[:2], dtype=torch.bool, device=self_k.device)
+
+    merged_cache = {}
+    for key, value in caches[0].items():
+        if not isinstance(value, torch.Tensor):
+            merged_cache[key] = value
+            continue
+
+        values = [cache[key] for cache in caches]
+        max_len = max(value.size(1) for value in values)
+        if key in _CACHE_STEP_KEYS:
+            pad_value = False if key == 'self_k_mask' else 0.0
+            values = [_pad_dim(value, dim=1, pad_start=max_len - value.size(1), value=pad_value) for value in values]
+        elif key in _CACHE_MEMORY_KEYS:
+            values = [_pad_dim(value, dim=1, pad_end=max_len - value.size(1)) for value in values]
+        merged_cache[key] = torch.cat(values, dim=0)
+    return merged_cache
+
+
+def _pad_dim(
+    x: torch.Tensor, dim: int, pad_start: int = 0, pad_end: int = 0, value: Union[bool, float] = 0.0
+) -> torch.Tensor:
+    if pad_start == 0 and pad_end == 0:
+        return x
+    pad_shape = list(x.shape)
+    tensors = []
+    if pad_start > 0:
+        pad_shape[dim] = pad_start
+        tensors.append(torch.full(pad_shape, value, dtype=x.dtype, device=x.device))
+    tensors.append(x)
+    if pad_end > 0:
+        pad_shape[dim] = pad_end
+        tensors.append(torch.full(pad_shape, value, dtype=x.dtype, device=x.device))
+    return torch.cat(tensors, dim=dim)
+
 
 class ConvolutionLayer(torch.nn.Module):
     def __init__(
@@ -183,6 +230,7 @@ class Attention(torch.nn.Module):
             'is_initialized': False,
             'self_k': None,
             'self_v': None,
+            'self_k_mask': None,
             'cross_kv': None,
             'cross_k': None,
             'cross_v': None,
@@ -334,6 +382,12 @@ class SelfAttention(Attention):
             self.cache['self_k'] = k
             self.cache['self_v'] = v
         mask = query_mask[:, None, :, None] if query_mask is not None else None
+        if self.use_cache and self.cache['self_k_mask'] is not None:
+            # The cache was merged from sequences of different lengths, mask out the padding keys at their start
+            k_mask = F.pad(self.cache['self_k_mask'], (0, T), value=True)
+            self.cache['self_k_mask'] = k_mask
+            k_mask = k_mask[:, None, None, :]
+            mask = k_mask if mask is None else mask * k_mask
         return q, k, v, mask
 
 
@@ -628,6 +682,90 @@ class Transformer(torch.nn.Module):
         for layer in self.layers:
             layer.reset_cache(use_cache)
 
+    def get_cache(self) -> List[Dict[str, Optional[Dict]]]:
+        """
+        Returns the KV cache of all layers, which can be restored with set_cache(). Each cached tensor has the batch as
+        its first dimension.
+        """
+        return [
+            {
+                'layer': layer.cache,
+                'self_attention': layer.self_attention.cache,
+                'cross_attention': layer.cross_attention.cache if layer.has_xattn else None,
+            }
+            for layer in self.layers
+        ]
+
+    def set_cache(self, cache: List[Dict[str, Optional[Dict]]]):
+        """
+        Enables the KV cache and sets it to a cache returned by get_cache() or merge_caches().
+        """
+        for layer, layer_cache in zip(self.layers, cache):
+            layer.use_cache = True
+            layer.cache = layer_cache['layer']
+            layer.self_attention.use_cache = True
+            layer.self_attention.cache = layer_cache['self_attention']
+            if layer.has_xattn:
+                layer.cross_attention.use_cache = True
+                layer.cross_attention.cache = layer_cache['cross_attention']
+
+    def select_cache(self, indices: torch.Tensor):
+        """
+        Keeps only the given batch elements in the KV cache, for example to remove finished sequences from the batch
+        during inference.
+
+        Args:
+            indices <torch tensor> (B'): Indices of the batch elements to keep, in their new order
+        """
+        for layer_cache in self.get_cache():
+            for cache in layer_cache.values():
+                if cache is None:
+                    continue
+                for key, value in cache.items():
+                    if isinstance(value, torch.Tensor):
+                        cache[key] = value.index_select(0, indices)
+
+    def trim_cache(self, num_steps: int):
+        """
+        Removes the first steps from the KV cache. Only valid if these steps are padding for all batch elements, which
+        can be the case after select_cache() removed the longest sequences of a cache created by merge_caches().
+
+        Args:
+            num_steps <int>: Number of steps to remove
+        """
+        for layer_cache in self.get_cache():
+            for cache in layer_cache.values():
+                if cache is None:
+                    continue
+                for key in _CACHE_STEP_KEYS:
+                    if cache.get(key) is not None:
+                        cache[key] = cache[key][:, num_steps:]
+
+    @staticmethod
+    def merge_caches(caches: List[List[Dict[str, Optional[Dict]]]]) -> List[Dict[str, Optional[Dict]]]:
+        """
+        Concatenates KV caches returned by get_cache() along the batch dimension. Caches with fewer steps are padded
+        at the start and the padded steps are excluded from self-attention, so that sequences of different lengths
+        can be decoded in the same batch. The cross-attention memory is padded at the end, the memory mask passed to
+        forward() must be padded accordingly.
+
+        Args:
+            caches <list>: KV caches of the same model
+
+        Returns:
+            Merged KV cache
+        """
+        merged_cache = []
+        for layer_caches in zip(*caches):
+            merged_layer_cache = {}
+            for name in layer_caches[0]:
+                if layer_caches[0][name] is None:
+                    merged_layer_cache[name] = None
+                    continue
+                merged_layer_cache[name] = _merge_cache_dicts([layer_cache[name] for layer_cache in layer_caches])
+            merged_cache.append(merged_layer_cache)
+        return merged_cache
+
     @staticmethod
     def _init_weights_gpt2(module):
         if isinstance(module, (torch.nn.Linear, torch.nn.Embedding, torch.nn.Conv1d)):
@@ -664,6 +802,7 @@ class Transformer(torch.nn.Module):
         cond_mask: Optional[Union[torch.Tensor, List[torch.Tensor]]] = None,
         attn_prior: Optional[Union[torch.Tensor, List[torch.Tensor]]] = None,
         multi_encoder_mapping: Optional[List[Optional[int]]] = None,
+        positions: Optional[torch.Tensor] = None,
     ) -> Dict[str, Union[torch.Tensor, List]]:
         """
         Args:
@@ -676,6 +815,8 @@ class Transformer(torch.nn.Module):
                 out or list of such tensors (from different encoders) output <torch tensor> (B, T1, C)
             multi_encoder_mapping <list> <int>: None or Same size as n_layers, value indicates which cond input to use
                 for this layer
+            positions <torch tensor> (B, T1): Positions of the inputs for the learnable position embeddings. Defaults
+                to 0, ..., T1 - 1 for all batch elements.
 
         Returns dict with keys:
             output <torch tensor> (B, T1, C): Output tensor
@@ -688,7 +829,8 @@ class Transformer(torch.nn.Module):
             )
 
         if self.use_learnable_pos_emb:
-            positions = torch.arange(x.size(1), device=x.device).unsqueeze(0)
+            if positions is None:
+                positions = torch.arange(x.size(1), device=x.device).unsqueeze(0)
             x = x + self.position_embeddings(positions)
 
         attn_probabilities = []
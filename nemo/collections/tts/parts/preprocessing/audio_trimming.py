@@ -13,7 +13,7 @@
 # limitations under the License.
 
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import List, Optional, Tuple
 
 import librosa
 import numpy as np
@@ -41,6 +41,24 @@ class AudioTrimmer(ABC):
         """
         raise NotImplementedError
 
+    def trim_audio_batch(
+        self, audios: List[np.array], sample_rate: int, audio_ids: Optional[List[str]] = None
+    ) -> List[Tuple[np.array, int, int]]:
+        """Trim starting and trailing silence from a batch of audio.
+           Args:
+               audios: List of numpy arrays containing audio samples. Float [-1.0, 1.0] format.
+               sample_rate: Sample rate of all input audio.
+               audio_ids: Optional list of string identifiers (eg. file names) used for logging.
+
+           Returns list with the output of trim_audio() for each input audio.
+        """
+        if audio_ids is None:
+            audio_ids = [""] * len(audios)
+        return [
+            self.trim_audio(audio=audio, sample_rate=sample_rate, audio_id=audio_id)
+            for audio, audio_id in zip(audios, audio_ids)
+        ]
+
 
 class EnergyAudioTrimmer(AudioTrimmer):
     def __init__(
@@ -98,6 +116,63 @@ class EnergyAudioTrimmer(AudioTrimmer):
             top_db=self.db_threshold,
         )
 
+        return self._trim_speech_frames(
+            audio=audio, speech_frames=speech_frames, sample_rate=sample_rate, audio_id=audio_id
+        )
+
+    def trim_audio_batch(
+        self, audios: List[np.array], sample_rate: int, audio_ids: Optional[List[str]] = None
+    ) -> List[Tuple[np.array, int, int]]:
+        if audio_ids is None:
+            audio_ids = [""] * len(audios)
+        if self.volume_norm:
+            audios = [normalize_volume(audio=audio, volume_level=1.0) for audio in audios]
+
+        batch_speech_frames = self._detect_speech_batch(audios)
+
+        return [
+            self._trim_speech_frames(
+                audio=audio, speech_frames=speech_frames, sample_rate=sample_rate, audio_id=audio_id
+            )
+            for audio, speech_frames, audio_id in zip(audios, batch_speech_frames, audio_ids)
+        ]
+
+    def _detect_speech_batch(self, audios: List[np.array]) -> List[np.array]:
+        """Batched equivalent of librosa.effects._signal_to_frame_nonsilent(), with the RMS energy of all audio
+           frames computed at once from the cumulative sum of the squared, zero padded audio.
+        """
+        if not audios:
+            return []
+
+        # Frames are centered, the audio is padded with zeros like in librosa.feature.rms()
+        pad_length = self.trim_win_length // 2
+        audio_lengths = np.array([audio.shape[0] for audio in audios])
+        num_frames = 1 + (audio_lengths + 2 * pad_length - self.trim_win_length) // self.trim_hop_length
+        num_frames = np.maximum(num_frames, 0)
+        max_num_frames = int(num_frames.max())
+
+        # [batch_size, padded_length + 1] cumulative energy, with a leading zero
+        padded_length = max(int(audio_lengths.max()) + 2 * pad_length, self.trim_win_length)
+        energy = np.zeros((len(audios), padded_length + 1), dtype=np.float64)
+        for i, audio in enumerate(audios):
+            energy[i, pad_length + 1 : pad_length + 1 + audio.shape[0]] = np.square(audio, dtype=np.float64)
+        np.cumsum(energy, axis=1, out=energy)
+
+        # [batch_size, max_num_frames] mean squared amplitude of each frame
+        frame_starts = np.arange(max_num_frames) * self.trim_hop_length
+        frame_power = (energy[:, frame_starts + self.trim_win_length] - energy[:, frame_starts]) / self.trim_win_length
+
+        # Same as comparing the decibels of the RMS energy with librosa.core.amplitude_to_db(), with amin=1e-5
+        amin_power = 1e-10
+        ref_power = max(amin_power, self.ref_amplitude ** 2)
+        power_threshold = ref_power * 10.0 ** (-self.db_threshold / 10.0)
+        is_speech = np.maximum(frame_power, amin_power) > power_threshold
+
+        return [is_speech[i, :num_frames_i] for i, num_frames_i in enumerate(num_frames)]
+
+    def _trim_speech_frames(
+        self, audio: np.array, speech_frames: np.array, sample_rate: int, audio_id: str
+    ) -> Tuple[np.array, int, int]:
         start_frame, end_frame = get_start_and_end_of_speech_frames(
             is_speech=speech_frames, speech_frame_threshold=self.speech_frame_threshold, audio_id=audio_id,
         )
@@ -132,6 +207,7 @@ class VadAudioTrimmer(AudioTrimmer):
         trim_hop_length: int = 1024,
         pad_seconds: float = 0.1,
         volume_norm: bool = True,
+        batch_size: int = 1024,
     ) -> None:
         """Voice activity detection (VAD) based silence trimming.
 
@@ -150,12 +226,15 @@ class VadAudioTrimmer(AudioTrimmer):
                  Set this to at least 0.1 to avoid cutting off any speech audio, with larger values
                  being safer but increasing the average silence duration left afterwards.
                volume_norm: Whether to normalize the volume of audio before doing speech detection.
+               batch_size: Maximum number of audio frames to run the VAD model on at once. The frames of all audio
+                 in a call to trim_audio_batch() are classified together.
         """
         assert vad_sample_rate > 0
         assert vad_threshold >= 0
         assert speech_frame_threshold > 0
         assert trim_win_length > 0
         assert trim_hop_length > 0
+        assert batch_size > 0
 
         self.device = device
         self.vad_model = EncDecClassificationModel.from_pretrained(model_name=model_name).eval().to(self.device)
@@ -170,32 +249,56 @@ class VadAudioTrimmer(AudioTrimmer):
 
         self.pad_seconds = pad_seconds
         self.volume_norm = volume_norm
+        self.batch_size = batch_size
 
     def _detect_speech(self, audio: np.array) -> np.array:
-        if audio.shape[0] < self.trim_win_length:
-            return np.array([])
-
-        # [num_frames, win_length]
-        audio_frames = librosa.util.frame(
-            audio, frame_length=self.trim_win_length, hop_length=self.trim_hop_length
-        ).transpose()
-        audio_frame_lengths = audio_frames.shape[0] * [self.trim_win_length]
-
-        # [num_frames, win_length]
-        audio_signal = torch.tensor(audio_frames, dtype=torch.float32, device=self.device)
-        # [1]
-        audio_signal_len = torch.tensor(audio_frame_lengths, dtype=torch.int32, device=self.device)
-        # VAD outputs 2 values for each audio frame with logits indicating the likelihood that
-        # each frame is non-speech or speech, respectively.
-        # [num_frames, 2]
-        log_probs = self.vad_model(input_signal=audio_signal, input_signal_length=audio_signal_len)
-        probs = torch.softmax(log_probs, dim=-1)
-        probs = probs.detach().cpu().numpy()
-        # [num_frames]
-        speech_probs = probs[:, 1]
-        speech_frames = speech_probs >= self.vad_threshold
-
-        return speech_frames
+        return self._detect_speech_batch([audio])[0]
+
+    def _detect_speech_batch(self, audios: List[np.array]) -> List[np.array]:
+        if not audios:
+            return []
+
+        # [num_frames, win_length] for each audio
+        batch_audio_frames = []
+        for audio in audios:
+            if audio.shape[0] < self.trim_win_length:
+                audio_frames = np.zeros([0, self.trim_win_length], dtype=np.float32)
+            else:
+                audio_frames = librosa.util.frame(
+                    audio, frame_length=self.trim_win_length, hop_length=self.trim_hop_length
+                ).transpose()
+            batch_audio_frames.append(audio_frames)
+
+        # All frames have the same length, so the frames of all audio are classified in batches of batch_size.
+        # [total_num_frames, win_length]
+        all_audio_frames = np.concatenate(batch_audio_frames)
+        all_speech_frames = []
+        for batch_start in range(0, all_audio_frames.shape[0], self.batch_size):
+            # [batch_size, win_length]
+            audio_signal = torch.tensor(
+                all_audio_frames[batch_start : batch_start + self.batch_size], dtype=torch.float32, device=self.device
+            )
+            # [batch_size]
+            audio_signal_len = torch.full(
+                [audio_signal.shape[0]], self.trim_win_length, dtype=torch.int32, device=self.device
+            )
+            # VAD outputs 2 values for each audio frame with logits indicating the likelihood that
+            # each frame is non-speech or speech, respectively.
+            # [batch_size, 2]
+            with torch.no_grad():
+                log_probs = self.vad_model(input_signal=audio_signal, input_signal_length=audio_signal_len)
+            probs = torch.softmax(log_probs, dim=-1)
+            probs = probs.cpu().numpy()
+            # [batch_size]
+            speech_probs = probs[:, 1]
+            all_speech_frames.append(speech_probs >= self.vad_threshold)
+
+        if not all_speech_frames:
+            return [np.zeros([0], dtype=bool) for _ in audios]
+
+        all_speech_frames = np.concatenate(all_speech_frames)
+        split_indices = np.cumsum([audio_frames.shape[0] for audio_frames in batch_audio_frames])[:-1]
+        return np.split(all_speech_frames, split_indices)
 
     def _scale_sample_indices(self, start_sample: int, end_sample: int, sample_rate: int) -> Tuple[int, int]:
         sample_rate_ratio = sample_rate / self.vad_sample_rate
@@ -203,7 +306,7 @@ class VadAudioTrimmer(AudioTrimmer):
         end_sample = int(sample_rate_ratio * end_sample)
         return start_sample, end_sample
 
-    def trim_audio(self, audio: np.array, sample_rate: int, audio_id: str = "") -> Tuple[np.array, int, int]:
+    def _get_vad_audio(self, audio: np.array, sample_rate: int) -> np.array:
         if sample_rate == self.vad_sample_rate:
             vad_audio = audio
         else:
@@ -214,8 +317,40 @@ class VadAudioTrimmer(AudioTrimmer):
             # Normalize volume so we have a fixed scale relative to the reference amplitude
             vad_audio = normalize_volume(audio=vad_audio, volume_level=1.0)
 
+        return vad_audio
+
+    def trim_audio(self, audio: np.array, sample_rate: int, audio_id: str = "") -> Tuple[np.array, int, int]:
+        vad_audio = self._get_vad_audio(audio=audio, sample_rate=sample_rate)
         speech_frames = self._detect_speech(audio=vad_audio)
+        return self._trim_speech_frames(
+            audio=audio,
+            vad_audio_length=vad_audio.shape[0],
+            speech_frames=speech_frames,
+            sample_rate=sample_rate,
+            audio_id=audio_id,
+        )
+
+    def trim_audio_batch(
+        self, audios: List[np.array], sample_rate: int, audio_ids: Optional[List[str]] = None
+    ) -> List[Tuple[np.array, int, int]]:
+        if audio_ids is None:
+            audio_ids = [""] * len(audios)
+        vad_audios = [self._get_vad_audio(audio=audio, sample_rate=sample_rate) for audio in audios]
+        batch_speech_frames = self._detect_speech_batch(vad_audios)
+        return [
+            self._trim_speech_frames(
+                audio=audio,
+                vad_audio_length=vad_audio.shape[0],
+                speech_frames=speech_frames,
+                sample_rate=sample_rate,
+                audio_id=audio_id,
+            )
+            for audio, vad_audio, speech_frames, audio_id in zip(audios, vad_audios, batch_speech_frames, audio_ids)
+        ]
 
+    def _trim_speech_frames(
+        self, audio: np.array, vad_audio_length: int, speech_frames: np.array, sample_rate: int, audio_id: str
+    ) -> Tuple[np.array, int, int]:
         start_frame, end_frame = get_start_and_end_of_speech_frames(
             is_speech=speech_frames, speech_frame_threshold=self.speech_frame_threshold, audio_id=audio_id,
         )
@@ -230,7 +365,7 @@ class VadAudioTrimmer(AudioTrimmer):
 
         # Avoid trimming off the end because VAD model is not trained to classify partial end frames.
         if end_frame == speech_frames.shape[0]:
-            end_sample = vad_audio.shape[0]
+            end_sample = vad_audio_length
         else:
             end_sample = librosa.core.frames_to_samples(end_frame, hop_length=self.trim_hop_length)
             end_sample += self.trim_shift
@@ -267,27 +402,21 @@ def get_start_and_end_of_speech_frames(
     """
     num_frames = is_speech.shape[0]
 
-    # Iterate forwards over the utterance until we find the first speech_frame_threshold consecutive speech frames.
-    start_frame = None
-    for i in range(0, num_frames - speech_frame_threshold + 1):
-        high_i = i + speech_frame_threshold
-        if all(is_speech[i:high_i]):
-            start_frame = i
-            break
-
-    # Iterate backwards over the utterance until we find the last speech_frame_threshold consecutive speech frames.
-    end_frame = None
-    for i in range(num_frames, speech_frame_threshold - 1, -1):
-        low_i = i - speech_frame_threshold
-        if all(is_speech[low_i:i]):
-            end_frame = i
-            break
-
-    if start_frame is None or end_frame is None:
-        # Algorithm is symmetric, so if the start is not found then the end should also not be found.
+    # Find the windows of speech_frame_threshold consecutive speech frames, from the number of speech frames
+    # in each window.
+    speech_windows = np.array([], dtype=np.int64)
+    if num_frames >= speech_frame_threshold:
+        num_speech_frames = np.convolve(
+            np.asarray(is_speech, dtype=np.int64), np.ones(speech_frame_threshold, dtype=np.int64), mode="valid"
+        )
+        speech_windows = np.flatnonzero(num_speech_frames == speech_frame_threshold)
+
+    if speech_windows.size == 0:
         logging.warning(f"Could not find start or end of speech for '{audio_id}'")
         return 0, 0
 
+    start_frame = int(speech_windows[0])
+    end_frame = int(speech_windows[-1]) + speech_frame_threshold
     return start_frame, end_frame
 
 
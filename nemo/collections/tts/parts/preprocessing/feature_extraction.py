@@ -0,0 +1,524 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import math
+import shutil
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import torch
+from tqdm import tqdm
+
+from nemo.collections.tts.parts.preprocessing.features import (
+    Featurizer,
+    _features_exists,
+    _get_feature_key,
+    _save_feature,
+)
+from nemo.collections.tts.parts.utils.tts_dataset_utils import PackedFeatureWriter, get_packed_feature_dir
+from nemo.utils import logging
+from nemo.utils.decorators import experimental
+
+
+class RunningFeatureStats:
+    """
+    Streaming global and per-speaker mean and standard deviation of feature values.
+
+    Statistics are accumulated as (count, mean, sum of squared differences) and combined with the parallel
+    variant of Welford's algorithm, so partial statistics of different shards can be merged in any order.
+    """
+
+    def __init__(self):
+        # feature name -> speaker -> [count, mean, sum of squared differences from the mean]
+        self.stats = defaultdict(dict)
+
+    def _merge(self, feature_name: str, speaker: str, count: int, mean: float, m2: float) -> None:
+        if count == 0:
+            return
+
+        speaker_stats = self.stats[feature_name]
+        if speaker not in speaker_stats:
+            speaker_stats[speaker] = [count, mean, m2]
+            return
+
+        prev_count, prev_mean, prev_m2 = speaker_stats[speaker]
+        total_count = prev_count + count
+        delta = mean - prev_mean
+        speaker_stats[speaker] = [
+            total_count,
+            prev_mean + delta * count / total_count,
+            prev_m2 + m2 + delta * delta * prev_count * count / total_count,
+        ]
+
+    def update(self, feature_name: str, values: np.ndarray, speaker: Optional[Any] = None) -> None:
+        """
+        Add feature values to the global statistics, and to the statistics of the speaker if provided.
+        """
+        values = np.asarray(values, dtype=np.float64).reshape(-1)
+        if values.size == 0:
+            return
+
+        mean = values.mean()
+        m2 = np.square(values - mean).sum()
+        self._merge(feature_name, "default", values.size, float(mean), float(m2))
+        if speaker is not None:
+            self._merge(feature_name, str(speaker), values.size, float(mean), float(m2))
+
+    def merge(self, other: 'RunningFeatureStats') -> None:
+        for feature_name, speaker_stats in other.stats.items():
+            for speaker, (count, mean, m2) in speaker_stats.items():
+                self._merge(feature_name, speaker, count, mean, m2)
+
+    def state_dict(self) -> Dict[str, Dict[str, List[float]]]:
+        return {feature_name: dict(speaker_stats) for feature_name, speaker_stats in self.stats.items()}
+
+    def load_state_dict(self, state_dict: Dict[str, Dict[str, List[float]]]) -> None:
+        self.stats = defaultdict(dict)
+        for feature_name, speaker_stats in state_dict.items():
+            self.stats[feature_name] = {speaker: list(stats) for speaker, stats in speaker_stats.items()}
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the feature statistics in the format written by compute_feature_stats.py.
+
+        Returns:
+            Dictionary of speaker IDs, and "default" for the global statistics, to a dictionary with
+            "<feature_name>_mean" and "<feature_name>_std" values. The standard deviation is unbiased.
+        """
+        stat_dict = defaultdict(dict)
+        for feature_name, speaker_stats in self.stats.items():
+            for speaker, (count, mean, m2) in speaker_stats.items():
+                stat_dict[speaker][f"{feature_name}_mean"] = mean
+                stat_dict[speaker][f"{feature_name}_std"] = math.sqrt(m2 / (count - 1)) if count > 1 else 0.0
+        return dict(stat_dict)
+
+
+# Arguments shared by all shards of an extraction, set once in each worker process.
+_worker_args = {}
+
+
+def _init_worker(worker_args: Dict[str, Any]) -> None:
+    # Every worker computes a single utterance at a time, avoid oversubscribing the CPUs.
+    torch.set_num_threads(1)
+    _worker_args.update(worker_args)
+
+
+def _compute_shard(
+    shard: List[Tuple[Dict[str, Any], str, List[str], List[str]]], worker_args: Optional[Dict[str, Any]] = None
+):
+    """
+    Compute the features of a shard of manifest entries.
+
+    Args:
+        shard: List of (manifest entry, feature key, names of the featurizers to compute, names of the featurizers
+            whose features were saved before and are only loaded to compute their statistics).
+        worker_args: Arguments shared by all shards, defaults to the arguments of the worker process.
+
+    Returns:
+        Tuple with list of (feature key, featurizer name, feature dictionary), the statistics of each
+        featurizer and the time spent in each featurizer.
+    """
+    worker_args = worker_args if worker_args is not None else _worker_args
+    featurizers = worker_args["featurizers"]
+    audio_dir = worker_args["audio_dir"]
+    feature_dir = worker_args["feature_dir"]
+    stats_feature_names = worker_args["stats_feature_names"]
+    mask_feature_name = worker_args["mask_feature_name"]
+    speaker_field = worker_args["speaker_field"]
+
+    results = []
+    shard_stats = defaultdict(RunningFeatureStats)
+    shard_seconds = defaultdict(float)
+    for manifest_entry, feature_key, featurizer_names, load_featurizer_names in shard:
+        entry_features = {}
+        for featurizer_name in load_featurizer_names:
+            loaded_features = featurizers[featurizer_name].load(
+                manifest_entry={"audio_filepath": manifest_entry["audio_filepath"]},
+                audio_dir=audio_dir,
+                feature_dir=feature_dir,
+            )
+            entry_features.update({name: feature.numpy() for name, feature in loaded_features.items()})
+
+        for featurizer_name in featurizer_names:
+            start_time = time.perf_counter()
+            features = featurizers[featurizer_name].compute_features(
+                manifest_entry=manifest_entry, audio_dir=audio_dir
+            )
+            shard_seconds[featurizer_name] += time.perf_counter() - start_time
+            results.append((feature_key, featurizer_name, features))
+            entry_features.update(features)
+
+        if not stats_feature_names:
+            continue
+
+        mask = None
+        if mask_feature_name:
+            if mask_feature_name not in entry_features:
+                # The mask was computed in a previous run, read it from disk.
+                for featurizer in featurizers.values():
+                    if mask_feature_name in featurizer.feature_names:
+                        loaded_features = featurizer.load(
+                            manifest_entry={"audio_filepath": manifest_entry["audio_filepath"]},
+                            audio_dir=audio_dir,
+                            feature_dir=feature_dir,
+                        )
+                        entry_features[mask_feature_name] = loaded_features[mask_feature_name].numpy()
+            mask = entry_features[mask_feature_name].astype(bool)
+
+        speaker = manifest_entry.get(speaker_field)
+        for featurizer_name in featurizer_names + load_featurizer_names:
+            for feature_name in featurizers[featurizer_name].feature_names:
+                if feature_name not in stats_feature_names:
+                    continue
+                values = entry_features[feature_name]
+                if mask is not None:
+                    values = values[mask]
+                shard_stats[featurizer_name].update(feature_name=feature_name, values=values, speaker=speaker)
+
+    return results, dict(shard_stats), dict(shard_seconds)
+
+
+def _read_completion_index(
+    index_filepath: Path, stats_feature_names: List[str], mask_feature_name: Optional[str]
+) -> Tuple[Set[str], Set[str], RunningFeatureStats]:
+    """
+    Read the completion index of a featurizer.
+
+    Args:
+        index_filepath: Path of the completion index.
+        stats_feature_names: Names of the features of the featurizer to get statistics for.
+        mask_feature_name: Name of the feature masking the frames the statistics are computed on.
+
+    Returns:
+        Tuple with the keys of the completed entries, the keys of the completed entries without statistics for
+        all of stats_feature_names with the same mask, for example because they were computed by a run without
+        statistics, and the statistics of the other completed entries.
+    """
+    completed_keys = set()
+    keys_with_stats = set()
+    stats = RunningFeatureStats()
+    if not index_filepath.exists():
+        return completed_keys, set(), stats
+
+    with open(index_filepath, "r", encoding="utf-8") as index_f:
+        for line in index_f:
+            try:
+                shard_index = json.loads(line)
+            except json.JSONDecodeError:
+                # Last line of an interrupted run
+                continue
+            completed_keys.update(shard_index["keys"])
+            if not stats_feature_names:
+                continue
+
+            shard_feature_names = shard_index.get("stats_feature_names", list(shard_index["stats"]))
+            if shard_index.get("mask_feature_name") != mask_feature_name or not set(stats_feature_names) <= set(
+                shard_feature_names
+            ):
+                continue
+            # Shards with entries whose statistics were already read are skipped, so no entry is counted twice.
+            shard_keys = set(shard_index["keys"]) - keys_with_stats
+            if len(shard_keys) < len(shard_index["keys"]):
+                continue
+            keys_with_stats.update(shard_keys)
+            shard_stats = RunningFeatureStats()
+            shard_stats.load_state_dict(
+                {name: shard_index["stats"][name] for name in stats_feature_names if name in shard_index["stats"]}
+            )
+            stats.merge(shard_stats)
+
+    keys_without_stats = completed_keys - keys_with_stats if stats_feature_names else set()
+    return completed_keys, keys_without_stats, stats
+
+
+@experimental
+class FeatureExtractor:
+    """
+    Computes and saves the features of a manifest with a set of featurizers, sharding the manifest across
+    a pool of worker processes.
+
+    The extraction is resumable. After the features of a shard are saved, the shard is appended to a completion
+    index "<feature_dir>/<featurizer_name>_completed.jsonl" together with its feature statistics, and entries in
+    the completion index are skipped when the extraction is run again. Entries which are not in the completion
+    index but whose features were already saved, for example by Featurizer.save(), are skipped as well.
+    If statistics are requested for entries which are skipped without statistics, their saved features are loaded
+    to compute the statistics.
+
+    Args:
+        featurizers: Dictionary of featurizer names to featurizers.
+        feature_dir: base directory where features will be stored.
+        num_workers: Number of worker processes. If 1, features are computed in the main process.
+        shard_size: Number of manifest entries computed by a worker at a time.
+        packed: Whether to save features to packed feature stores instead of one .npy file per utterance.
+        feature_dtypes: Optional dictionary of feature names to the data type to store them as in packed feature
+            stores, for example {"mel_spec": "float16"}.
+        stats_feature_names: Optional list of feature names to compute global and per-speaker statistics for.
+        mask_feature_name: Optional name of a boolean feature, such as "voiced_mask". If provided, statistics are
+            only computed on frames where the mask is true.
+        speaker_field: Manifest field with the speaker ID for per-speaker statistics.
+        checkpoint_seconds: When saving packed features, interval in seconds between updates of the completion
+            index and of the packed feature stores.
+    """
+
+    def __init__(
+        self,
+        featurizers: Dict[str, Featurizer],
+        feature_dir: Path,
+        num_workers: int = 1,
+        shard_size: int = 64,
+        packed: bool = False,
+        feature_dtypes: Optional[Dict[str, str]] = None,
+        stats_feature_names: Optional[List[str]] = None,
+        mask_feature_name: Optional[str] = None,
+        speaker_field: str = "speaker",
+        checkpoint_seconds: float = 300.0,
+    ):
+        self.featurizers = featurizers
+        self.feature_dir = Path(feature_dir)
+        self.num_workers = num_workers
+        self.shard_size = shard_size
+        self.packed = packed
+        self.feature_dtypes = feature_dtypes or {}
+        self.stats_feature_names = stats_feature_names or []
+        self.mask_feature_name = mask_feature_name if self.stats_feature_names else None
+        self.speaker_field = speaker_field
+        self.checkpoint_seconds = checkpoint_seconds
+
+        all_feature_names = [name for featurizer in featurizers.values() for name in featurizer.feature_names]
+        for feature_name in self.stats_feature_names + [self.mask_feature_name]:
+            if feature_name is not None and feature_name not in all_feature_names:
+                raise ValueError(f"Feature {feature_name} is not computed by any of {list(featurizers.keys())}.")
+
+    def _get_completion_index_filepath(self, featurizer_name: str) -> Path:
+        return self.feature_dir / f"{featurizer_name}_completed.jsonl"
+
+    def _get_stats_feature_names(self, featurizer_name: str) -> List[str]:
+        return [name for name in self.featurizers[featurizer_name].feature_names if name in self.stats_feature_names]
+
+    def _features_exist(
+        self,
+        featurizer_name: str,
+        manifest_entry: Dict[str, Any],
+        feature_key: str,
+        audio_dir: Path,
+        writers: Dict[str, PackedFeatureWriter],
+    ) -> bool:
+        feature_names = self.featurizers[featurizer_name].feature_names
+        if self.packed:
+            return all(feature_key in writers[feature_name] for feature_name in feature_names)
+        return _features_exists(
+            feature_names=feature_names,
+            manifest_entry=manifest_entry,
+            audio_dir=audio_dir,
+            feature_dir=self.feature_dir,
+        )
+
+    def _remove_features(self, featurizer_name: str) -> None:
+        self._get_completion_index_filepath(featurizer_name).unlink(missing_ok=True)
+        if self.packed:
+            for feature_name in self.featurizers[featurizer_name].feature_names:
+                shutil.rmtree(get_packed_feature_dir(self.feature_dir, feature_name), ignore_errors=True)
+
+    def _save_shard(
+        self,
+        shard: List[Tuple[Dict[str, Any], str, List[str], List[str]]],
+        shard_result: Tuple[List[Tuple[str, str, Dict[str, np.ndarray]]], Dict[str, RunningFeatureStats], Dict],
+        audio_dir: Path,
+        writers: Dict[str, PackedFeatureWriter],
+    ) -> Tuple[Dict[str, RunningFeatureStats], Dict[str, float]]:
+        results, shard_stats, shard_seconds = shard_result
+        manifest_entries = {feature_key: manifest_entry for manifest_entry, feature_key, _, _ in shard}
+        for feature_key, _, features in results:
+            for feature_name, feature in features.items():
+                if self.packed:
+                    writers[feature_name].add(key=feature_key, features=feature)
+                else:
+                    _save_feature(
+                        feature_name=feature_name,
+                        features=feature,
+                        manifest_entry=manifest_entries[feature_key],
+                        audio_dir=audio_dir,
+                        feature_dir=self.feature_dir,
+                    )
+
+        featurizer_keys = defaultdict(list)
+        for _, feature_key, featurizer_names, load_featurizer_names in shard:
+            for featurizer_name in featurizer_names + load_featurizer_names:
+                featurizer_keys[featurizer_name].append(feature_key)
+        for featurizer_name, feature_keys in featurizer_keys.items():
+            featurizer_stats = shard_stats.get(featurizer_name, RunningFeatureStats())
+            index_line = json.dumps(
+                {
+                    "keys": feature_keys,
+                    "stats": featurizer_stats.state_dict(),
+                    "stats_feature_names": self._get_stats_feature_names(featurizer_name),
+                    "mask_feature_name": self.mask_feature_name,
+                }
+            )
+            self._pending_index_lines[featurizer_name].append(index_line)
+
+        # Writing the index of a packed feature store takes time proportional to its size, so packed features
+        # are only checkpointed periodically. Features saved as .npy files are checkpointed after every shard.
+        if not self.packed or time.perf_counter() - self._last_checkpoint_time > self.checkpoint_seconds:
+            self._checkpoint(writers)
+
+        return shard_stats, shard_seconds
+
+    def _checkpoint(self, writers: Dict[str, PackedFeatureWriter]) -> None:
+        # Features have to be visible in the packed feature stores before their entries are marked as completed.
+        for writer in writers.values():
+            writer.flush()
+
+        for featurizer_name, index_lines in self._pending_index_lines.items():
+            if not index_lines:
+                continue
+            with open(self._get_completion_index_filepath(featurizer_name), "a", encoding="utf-8") as index_f:
+                index_f.write("".join(f"{line}\n" for line in index_lines))
+            index_lines.clear()
+        self._last_checkpoint_time = time.perf_counter()
+
+    def extract(
+        self, manifest_entries: List[Dict[str, Any]], audio_dir: Path, overwrite: bool = False
+    ) -> RunningFeatureStats:
+        """
+        Compute and save the features of all manifest entries. Entries with the same audio file are computed once.
+
+        Args:
+            manifest_entries: List of manifest entry dictionaries.
+            audio_dir: base directory where audio is stored.
+            overwrite: whether to recompute all features, instead of skipping completed entries.
+
+        Returns:
+            Feature statistics of all manifest entries, including the ones completed in previous runs.
+        """
+        self.feature_dir.mkdir(parents=True, exist_ok=True)
+        stats = RunningFeatureStats()
+        completed_keys = {}
+        keys_without_stats = {}
+        for featurizer_name in self.featurizers:
+            if overwrite:
+                self._remove_features(featurizer_name)
+            completed_keys[featurizer_name], keys_without_stats[featurizer_name], featurizer_stats = (
+                _read_completion_index(
+                    index_filepath=self._get_completion_index_filepath(featurizer_name),
+                    stats_feature_names=self._get_stats_feature_names(featurizer_name),
+                    mask_feature_name=self.mask_feature_name,
+                )
+            )
+            stats.merge(featurizer_stats)
+
+        writers = {}
+        if self.packed:
+            for featurizer in self.featurizers.values():
+                for feature_name in featurizer.feature_names:
+                    writers[feature_name] = PackedFeatureWriter(
+                        store_dir=get_packed_feature_dir(self.feature_dir, feature_name),
+                        dtype=self.feature_dtypes.get(feature_name),
+                    )
+
+        tasks = []
+        task_keys = set()
+        num_loaded = 0
+        for manifest_entry in manifest_entries:
+            feature_key = _get_feature_key(manifest_entry=manifest_entry, audio_dir=audio_dir)
+            if feature_key in task_keys:
+                continue
+            task_keys.add(feature_key)
+            featurizer_names = []
+            load_featurizer_names = []
+            for featurizer_name in self.featurizers:
+                if feature_key in completed_keys[featurizer_name]:
+                    has_stats = feature_key not in keys_without_stats[featurizer_name]
+                elif not overwrite and self._features_exist(
+                    featurizer_name, manifest_entry, feature_key, audio_dir, writers
+                ):
+                    has_stats = not self._get_stats_feature_names(featurizer_name)
+                else:
+                    featurizer_names.append(featurizer_name)
+                    continue
+                if not has_stats:
+                    load_featurizer_names.append(featurizer_name)
+            if featurizer_names or load_featurizer_names:
+                tasks.append((manifest_entry, feature_key, featurizer_names, load_featurizer_names))
+                num_loaded += not featurizer_names
+
+        logging.info(
+            f"Computing features for {len(tasks) - num_loaded} of {len(task_keys)} audio files, and statistics of "
+            f"saved features for {num_loaded} audio files."
+        )
+        shards = [tasks[i : i + self.shard_size] for i in range(0, len(tasks), self.shard_size)]
+        worker_args = {
+            "featurizers": self.featurizers,
+            "audio_dir": audio_dir,
+            "feature_dir": self.feature_dir,
+            "stats_feature_names": self.stats_feature_names,
+            "mask_feature_name": self.mask_feature_name,
+            "speaker_field": self.speaker_field,
+        }
+        num_computed = defaultdict(int)
+        compute_seconds = defaultdict(float)
+        start_time = time.perf_counter()
+        self._last_checkpoint_time = start_time
+        self._pending_index_lines = defaultdict(list)
+
+        def _save_shard_result(shard, shard_result):
+            shard_stats, shard_seconds = self._save_shard(shard, shard_result, audio_dir, writers)
+            for featurizer_name, featurizer_stats in shard_stats.items():
+                stats.merge(featurizer_stats)
+            for featurizer_name, seconds in shard_seconds.items():
+                compute_seconds[featurizer_name] += seconds
+            for _, _, featurizer_names, _ in shard:
+                for featurizer_name in featurizer_names:
+                    num_computed[featurizer_name] += 1
+            progress_bar.update(len(shard))
+
+        progress_bar = tqdm(total=len(tasks))
+        try:
+            if self.num_workers == 1:
+                for shard in shards:
+                    _save_shard_result(shard, _compute_shard(shard, worker_args))
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=self.num_workers, initializer=_init_worker, initargs=(worker_args,)
+                ) as executor:
+                    futures = {executor.submit(_compute_shard, shard): shard for shard in shards}
+                    for future in as_completed(futures):
+                        _save_shard_result(futures[future], future.result())
+        finally:
+            progress_bar.close()
+            self._checkpoint(writers)
+            for writer in writers.values():
+                writer.close()
+
+        wall_seconds = time.perf_counter() - start_time
+        for featurizer_name in self.featurizers:
+            if num_computed[featurizer_name] == 0:
+                continue
+            logging.info(
+                f"{featurizer_name}: {num_computed[featurizer_name]} utterances, "
+                f"{num_computed[featurizer_name] / compute_seconds[featurizer_name]:.2f} utterances per second "
+                f"per worker"
+            )
+        if tasks:
+            logging.info(
+                f"Processed {len(tasks)} utterances in {wall_seconds:.1f} seconds: "
+                f"{len(tasks) / wall_seconds:.2f} utterances per second with {self.num_workers} workers"
+            )
+
+        return stats
@@ -24,7 +24,14 @@ import torch
 from torch import Tensor
 
 from nemo.collections.asr.modules import AudioToMelSpectrogramPreprocessor
-from nemo.collections.tts.parts.utils.tts_dataset_utils import get_audio_filepaths, normalize_volume, stack_tensors
+from nemo.collections.tts.parts.utils.tts_dataset_utils import (
+    PackedFeatureStore,
+    PackedFeatureWriter,
+    get_audio_filepaths,
+    get_packed_feature_dir,
+    normalize_volume,
+    stack_tensors,
+)
 from nemo.utils.decorators import experimental
 
 
@@ -62,6 +69,67 @@ class Featurizer(ABC):
         Combine list/batch of features into a feature dictionary.
         """
 
+    @property
+    @abstractmethod
+    def feature_names(self) -> List[str]:
+        """
+        Names of the features saved by this featurizer.
+        """
+
+    @abstractmethod
+    def compute_features(self, manifest_entry: Dict[str, Any], audio_dir: Path) -> Dict[str, np.ndarray]:
+        """
+        Compute all features saved by this featurizer for given manifest entry.
+
+        Args:
+            manifest_entry: Manifest entry dictionary.
+            audio_dir: base directory where audio is stored.
+
+        Returns:
+            Dictionary of feature names to arrays
+        """
+
+    def save_packed(
+        self,
+        manifest_entries: List[Dict[str, Any]],
+        audio_dir: Path,
+        feature_dir: Path,
+        overwrite: bool = True,
+        feature_dtypes: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        Save feature values for given manifest entries to packed feature stores, one per feature name.
+        Features in a packed store are read by load() instead of the per-utterance .npy files.
+
+        Args:
+            manifest_entries: List of manifest entry dictionaries.
+            audio_dir: base directory where audio is stored.
+            feature_dir: base directory where features will be stored.
+            overwrite: whether to overwrite features if they already exist in the packed stores.
+            feature_dtypes: Optional dictionary of feature names to the data type to store them as,
+                for example {"mel_spec": "float16"}.
+        """
+        feature_dtypes = feature_dtypes or {}
+        writers = {
+            feature_name: PackedFeatureWriter(
+                store_dir=get_packed_feature_dir(feature_dir=feature_dir, feature_name=feature_name),
+                dtype=feature_dtypes.get(feature_name),
+            )
+            for feature_name in self.feature_names
+        }
+        try:
+            for manifest_entry in manifest_entries:
+                feature_key = _get_feature_key(manifest_entry=manifest_entry, audio_dir=audio_dir)
+                if not overwrite and all(feature_key in writer for writer in writers.values()):
+                    continue
+
+                features = self.compute_features(manifest_entry=manifest_entry, audio_dir=audio_dir)
+                for feature_name, writer in writers.items():
+                    writer.add(key=feature_key, features=features[feature_name])
+        finally:
+            for writer in writers.values():
+                writer.close()
+
 
 def _get_feature_filepath(
     manifest_entry: Dict[str, Any], audio_dir: Path, feature_dir: Path, feature_name: str
@@ -77,6 +145,16 @@ def _get_feature_filepath(
     return feature_filepath
 
 
+def _get_feature_key(manifest_entry: Dict[str, Any], audio_dir: Path) -> str:
+    """
+    Get the key of the input manifest entry in a packed feature store.
+
+    Example: audio_filepath "<audio_dir>/speaker1/audio1.wav" becomes key "speaker1/audio1"
+    """
+    _, audio_filepath_rel = get_audio_filepaths(manifest_entry=manifest_entry, audio_dir=audio_dir)
+    return audio_filepath_rel.with_suffix("").as_posix()
+
+
 def _features_exists(
     feature_names: List[Optional[str]], manifest_entry: Dict[str, Any], audio_dir: Path, feature_dir: Path,
 ) -> bool:
@@ -120,11 +198,20 @@ def _load_feature(
     indices: Optional[Tuple[int, int]] = None,
 ) -> None:
     """
-    If feature_name is provided, load feature into feature_dict from .npy file.
+    If feature_name is provided, load feature into feature_dict from the packed feature store if it contains
+    the manifest entry, otherwise from .npy file.
     """
     if feature_name is None:
         return
 
+    store_dir = get_packed_feature_dir(feature_dir=feature_dir, feature_name=feature_name)
+    if PackedFeatureStore.exists(store_dir):
+        feature_store = PackedFeatureStore(store_dir)
+        feature_key = _get_feature_key(manifest_entry=manifest_entry, audio_dir=audio_dir)
+        if feature_key in feature_store:
+            feature_dict[feature_name] = torch.from_numpy(feature_store.read(key=feature_key, indices=indices))
+            return
+
     feature_filepath = _get_feature_filepath(
         manifest_entry=manifest_entry, audio_dir=audio_dir, feature_dir=feature_dir, feature_name=feature_name
     )
@@ -239,9 +326,17 @@ class MelSpectrogramFeaturizer(Featurizer):
 
         return spec_array
 
+    @property
+    def feature_names(self) -> List[str]:
+        return [self.feature_name]
+
+    def compute_features(self, manifest_entry: Dict[str, Any], audio_dir: Path) -> Dict[str, np.ndarray]:
+        spec = self.compute_mel_spec(manifest_entry=manifest_entry, audio_dir=audio_dir)
+        return {self.feature_name: spec}
+
     def save(self, manifest_entry: Dict[str, Any], audio_dir: Path, feature_dir: Path, overwrite: bool = True) -> None:
         if not overwrite and _features_exists(
-            feature_names=[self.feature_name],
+            feature_names=self.feature_names,
             manifest_entry=manifest_entry,
             audio_dir=audio_dir,
             feature_dir=feature_dir,
@@ -300,9 +395,17 @@ class EnergyFeaturizer(Featurizer):
         energy = np.linalg.norm(spec, axis=0)
         return energy
 
+    @property
+    def feature_names(self) -> List[str]:
+        return [self.feature_name]
+
+    def compute_features(self, manifest_entry: Dict[str, Any], audio_dir: Path) -> Dict[str, np.ndarray]:
+        energy = self.compute_energy(manifest_entry=manifest_entry, audio_dir=audio_dir)
+        return {self.feature_name: energy}
+
     def save(self, manifest_entry: Dict[str, Any], audio_dir: Path, feature_dir: Path, overwrite: bool = True) -> None:
         if not overwrite and _features_exists(
-            feature_names=[self.feature_name],
+            feature_names=self.feature_names,
             manifest_entry=manifest_entry,
             audio_dir=audio_dir,
             feature_dir=feature_dir,
@@ -482,9 +585,20 @@ class PitchFeaturizer(Featurizer):
 
         return pitch, voiced_mask, voiced_prob
 
+    @property
+    def feature_names(self) -> List[str]:
+        feature_names = [self.pitch_name, self.voiced_mask_name, self.voiced_prob_name]
+        return [feature_name for feature_name in feature_names if feature_name is not None]
+
+    def compute_features(self, manifest_entry: Dict[str, Any], audio_dir: Path) -> Dict[str, np.ndarray]:
+        pitch, voiced_mask, voiced_prob = self.compute_pitch(manifest_entry=manifest_entry, audio_dir=audio_dir)
+        feature_names = [self.pitch_name, self.voiced_mask_name, self.voiced_prob_name]
+        features = [pitch, voiced_mask, voiced_prob]
+        return {name: feature for name, feature in zip(feature_names, features) if name is not None}
+
     def save(self, manifest_entry: Dict[str, Any], audio_dir: Path, feature_dir: Path, overwrite: bool = True) -> None:
         if not overwrite and _features_exists(
-            feature_names=[self.pitch_name, self.voiced_mask_name, self.voiced_prob_name],
+            feature_names=self.feature_names,
             manifest_entry=manifest_entry,
             audio_dir=audio_dir,
             feature_dir=feature_dir,
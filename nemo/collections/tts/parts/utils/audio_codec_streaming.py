@@ -0,0 +1,185 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+from math import ceil
+from typing import TYPE_CHECKING, Tuple
+
+import torch
+
+from nemo.core.classes import NeuralModule
+
+if TYPE_CHECKING:
+    from nemo.collections.tts.models.audio_codec import AudioCodecModel
+
+
+@torch.no_grad()
+def estimate_decoder_context_frames(
+    audio_decoder: NeuralModule,
+    input_dim: int,
+    samples_per_frame: int,
+    initial_num_frames: int = 32,
+    max_num_frames: int = 4096,
+) -> Tuple[int, int]:
+    """
+    Estimate how many frames of context the audio decoder needs on each side of a frame, so that decoding a window of
+    frames gives the same audio for that frame as decoding the full sequence.
+
+    The context is measured by decoding random inputs in double precision, changing the frame in the middle, and
+    finding which output samples changed. The number of frames is doubled until the changed samples do not reach the
+    edges of the output.
+
+    Args:
+        audio_decoder: Decoder of an audio codec model.
+        input_dim: Dimension of the decoder inputs.
+        samples_per_frame: Number of audio samples generated for each frame.
+        initial_num_frames: Number of frames to decode in the first attempt.
+        max_num_frames: Maximum number of frames to decode.
+
+    Returns:
+        Number of past frames and number of future frames that the audio of a frame depends on.
+    """
+    parameter = next(audio_decoder.parameters())
+    decoder = copy.deepcopy(audio_decoder).double().eval()
+    generator = torch.Generator().manual_seed(0)
+
+    num_frames = initial_num_frames
+    while num_frames <= max_num_frames:
+        # Small inputs, so that the output activation is not saturated
+        inputs = 0.01 * torch.randn(1, input_dim, num_frames, generator=generator, dtype=torch.float64)
+        perturbed = inputs.clone()
+        center = num_frames // 2
+        perturbed[:, :, center] += torch.randn(input_dim, generator=generator, dtype=torch.float64)
+
+        inputs = torch.cat([inputs, perturbed]).to(parameter.device)
+        input_len = torch.full((2,), num_frames, dtype=torch.long, device=parameter.device)
+        audio, _ = decoder(inputs=inputs, input_len=input_len)
+
+        changed = torch.nonzero(audio[0] != audio[1]).squeeze(1)
+        if changed.numel() == 0:
+            raise ValueError("Decoder output does not depend on its input.")
+        first_changed = changed[0].item()
+        last_changed = changed[-1].item()
+        if first_changed >= samples_per_frame and last_changed < audio.size(1) - samples_per_frame:
+            num_future_frames = max(0, ceil((center * samples_per_frame - first_changed) / samples_per_frame))
+            num_past_frames = max(0, ceil((last_changed + 1 - (center + 1) * samples_per_frame) / samples_per_frame))
+            return num_past_frames, num_future_frames
+
+        num_frames *= 2
+
+    raise ValueError(f"Receptive field of the decoder is larger than {max_num_frames} frames.")
+
+
+class AudioCodecStreamingDecoder:
+    """
+    Decodes audio codes into audio incrementally, for example while the codes are generated by a TTS model.
+
+    Each call to `push` dequantizes only the new frames, and decodes them together with the past frames in the
+    receptive field of the decoder. The audio of a frame is returned as soon as all future frames in its receptive
+    field are available, so the concatenated audio chunks are the same as the audio of `AudioCodecModel.decode` for
+    the full sequence, up to floating point differences of convolutions on inputs of different lengths.
+
+    For decoders with causal convolutions the audio of each frame is returned in the same call in which the frame is
+    pushed. Non-causal decoders need a number of future frames, which delays the audio by that many frames. All
+    sequences in the batch receive the same number of frames in each call.
+
+    Streaming decoders are created with `AudioCodecModel.get_streaming_decoder`, which estimates the receptive field
+    of the decoder with `estimate_decoder_context_frames` once per model.
+
+    Args:
+        model: Audio codec model, in eval mode.
+        num_past_frames: Number of past frames that the audio of a frame depends on.
+        num_future_frames: Number of future frames that the audio of a frame depends on.
+    """
+
+    def __init__(self, model: 'AudioCodecModel', num_past_frames: int, num_future_frames: int):
+        self.model = model
+        self.samples_per_frame = model.samples_per_frame
+        self.num_past_frames = num_past_frames
+        self.num_future_frames = num_future_frames
+        self.reset()
+
+    def reset(self):
+        """Start decoding a new batch of sequences."""
+        # (B, D, T) Dequantized frames which are still in the receptive field of the frames to decode
+        self._frames = None
+        # Index of the first frame in `_frames`
+        self._start = 0
+        # Number of frames whose audio was returned
+        self._num_decoded = 0
+        self._num_frames = 0
+
+    @property
+    def num_pending_frames(self) -> int:
+        """Number of pushed frames whose audio was not returned yet."""
+        return self._num_frames - self._num_decoded
+
+    @torch.no_grad()
+    def push(self, tokens: torch.Tensor) -> torch.Tensor:
+        """
+        Add frames of codes, and decode the audio of all frames whose receptive field is available.
+
+        Args:
+            tokens: discrete tokens for each codebook for each new frame, shape `(batch, number of codebooks,
+                number of frames)`
+
+        Returns:
+            Audio of the decoded frames, shape `(batch, number of samples)`. The number of samples is a multiple of
+            `samples_per_frame`, and can be 0.
+        """
+        tokens_len = torch.full((tokens.size(0),), tokens.size(2), dtype=torch.long, device=tokens.device)
+        dequantized = self.model.dequantize(tokens=tokens, tokens_len=tokens_len)
+
+        if self._frames is None:
+            self._frames = dequantized
+        else:
+            self._frames = torch.cat([self._frames, dequantized], dim=2)
+        self._num_frames += dequantized.size(2)
+
+        return self._decode(end=self._num_frames - self.num_future_frames)
+
+    @torch.no_grad()
+    def flush(self) -> torch.Tensor:
+        """
+        Decode the audio of all remaining frames, treating the last pushed frame as the end of the sequences.
+        The decoder is reset afterwards.
+
+        Returns:
+            Audio of the remaining frames, shape `(batch, number of samples)`.
+        """
+        audio = self._decode(end=self._num_frames)
+        self.reset()
+        return audio
+
+    def _decode(self, end: int) -> torch.Tensor:
+        if self._frames is None:
+            return torch.zeros(0, 0, device=self.model.device)
+        if end <= self._num_decoded:
+            return self._frames.new_zeros(self._frames.size(0), 0)
+
+        # Frames in the window are decoded as if the sequence ended after the last pushed frame. That only changes
+        # the audio of frames within `num_future_frames` of the end, which are returned by a later call.
+        frames_len = torch.full(
+            (self._frames.size(0),), self._frames.size(2), dtype=torch.long, device=self._frames.device
+        )
+        audio, _ = self.model.decode_audio(inputs=self._frames, input_len=frames_len)
+        offset = (self._num_decoded - self._start) * self.samples_per_frame
+        audio = audio[:, offset : offset + (end - self._num_decoded) * self.samples_per_frame]
+        self._num_decoded = end
+
+        # Keep the frames in the receptive field of the frames which are not decoded yet
+        new_start = max(self._start, self._num_decoded - self.num_past_frames)
+        self._frames = self._frames[:, :, new_start - self._start :]
+        self._start = new_start
+        return audio
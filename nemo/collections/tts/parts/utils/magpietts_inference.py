@@ -0,0 +1,439 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Union
+
+import torch
+
+from nemo.collections.tts.modules.transformer_2501 import Transformer
+from nemo.utils import logging
+
+if TYPE_CHECKING:
+    from nemo.collections.tts.models.magpietts import MagpieTTS_Model
+
+Cond = Optional[Union[torch.Tensor, List[torch.Tensor]]]
+
+
+@dataclass
+class _QueuedRequests:
+    request_ids: List[int]
+    batch: Dict[str, Any]
+    submit_time: float
+
+
+@dataclass
+class _DecodingBatch:
+    """
+    State of the requests which are decoded together. The decoder inputs are preallocated for all remaining decoding
+    steps. Requests with shorter inputs are padded at the start, so that the last step of all requests is aligned.
+    With classifier-free guidance, each request has two consecutive rows in the decoder inputs and KV cache, the
+    second one with the unconditional inputs.
+    """
+
+    request_ids: List[int]
+    submit_times: List[float]
+    # (B,) Number of padding steps at the start of each request
+    offsets: torch.Tensor
+    # (B,) Number of frames generated for each request
+    num_frames: torch.Tensor
+    # (B, C, max_decoder_steps) Generated audio codes
+    codes: torch.Tensor
+    # (R, T_max, E) Decoder inputs, of which the first `length` steps are filled
+    dec_input: torch.Tensor
+    # (R, T_max) Decoder input mask
+    dec_mask: torch.Tensor
+    # (R, T_max) Positions of the decoder inputs, relative to the start of each request
+    positions: torch.Tensor
+    length: int
+    cond: Cond
+    cond_mask: Cond
+    # (R, num_codebooks * num_tokens_per_codebook) Logits of the next frame
+    logits: torch.Tensor
+
+    @property
+    def size(self) -> int:
+        return len(self.request_ids)
+
+
+def _apply_to_cond(cond: Cond, fn) -> Cond:
+    if cond is None:
+        return None
+    if isinstance(cond, list):
+        return [fn(cond_item) for cond_item in cond]
+    return fn(cond)
+
+
+def _interleave(x: torch.Tensor, y: torch.Tensor) -> torch.Tensor:
+    return torch.stack([x, y], dim=1).flatten(0, 1)
+
+
+def _merge_conds(conds: List[Cond]) -> Cond:
+    if conds[0] is None:
+        return None
+    if isinstance(conds[0], list):
+        return [_merge_conds(list(cond_items)) for cond_items in zip(*conds)]
+    max_len = max(cond.size(1) for cond in conds)
+    padded_conds = []
+    for cond in conds:
+        padding = cond.new_zeros(cond.size(0), max_len - cond.size(1), *cond.shape[2:])
+        padded_conds.append(torch.cat([cond, padding], dim=1))
+    return torch.cat(padded_conds, dim=0)
+
+
+class MagpieTTSInferenceScheduler:
+    """
+    Decodes requests to a MagpieTTS model with continuous batching.
+
+    Requests are decoded in a single batch of at most `max_batch_size` requests. A request is removed from the batch
+    and its KV cache as soon as it ends, and its audio is returned without waiting for the rest of the batch. Queued
+    requests are admitted into the freed slots: their context is encoded separately, and their KV cache is merged
+    into the KV cache of the batch, padded at the start. Since the requests in the batch are at different decoding
+    steps, the outputs of a request do not depend on the other requests in the batch.
+
+    Args:
+        model: MagpieTTS model, in eval mode.
+        max_batch_size: Maximum number of requests decoded together.
+        max_decoder_steps: Maximum number of frames generated for a request.
+        temperature: Sampling temperature.
+        topk: Number of top tokens to sample from.
+        use_cfg: Whether to use classifier-free guidance.
+        cfg_scale: Classifier-free guidance scale.
+    """
+
+    def __init__(
+        self,
+        model: 'MagpieTTS_Model',
+        max_batch_size: int = 16,
+        max_decoder_steps: int = 500,
+        temperature: float = 0.7,
+        topk: int = 80,
+        use_cfg: bool = False,
+        cfg_scale: float = 1.0,
+    ):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_decoder_steps = max_decoder_steps
+        self.temperature = temperature
+        self.topk = topk
+        self.use_cfg = use_cfg
+        self.cfg_scale = cfg_scale
+        self.rows_per_request = 2 if use_cfg else 1
+
+        self._queue: Deque[_QueuedRequests] = deque()
+        self._num_requests = 0
+        self._batch: Optional[_DecodingBatch] = None
+        self._multi_encoder_mapping = None
+
+    def add_requests(self, batch: Dict[str, Any]) -> List[int]:
+        """
+        Queues a batch of requests, which are admitted together once there are enough free slots.
+
+        Args:
+            batch: Batch in the format of the MagpieTTS test dataloader.
+
+        Returns:
+            IDs of the requests in the batch.
+        """
+        batch_size = (batch['text'] if 'text' in batch else batch['context_audio_codes']).size(0)
+        if batch_size > self.max_batch_size:
+            raise ValueError(f"Batch of {batch_size} requests is larger than max_batch_size {self.max_batch_size}.")
+
+        request_ids = list(range(self._num_requests, self._num_requests + batch_size))
+        self._num_requests += batch_size
+        self._queue.append(_QueuedRequests(request_ids=request_ids, batch=batch, submit_time=time.perf_counter()))
+        return request_ids
+
+    def run(self) -> List[Dict[str, Any]]:
+        """
+        Decodes all queued requests.
+
+        Returns:
+            Results of the requests, ordered by request ID. Each result is a dict with keys
+                request_id <int>
+                codes <torch tensor> (C, T): Generated audio codes, without the end of sequence frame
+                codes_len <int>: Number of generated frames
+                audio <torch tensor> (T_audio,): Generated audio
+                audio_len <int>: Audio length in samples
+                time_to_first_audio <float>: Time in seconds from queuing the request until its audio was decoded
+        """
+        results = []
+        num_frames = 0
+        start_time = time.perf_counter()
+        with torch.no_grad():
+            while True:
+                self._admit_requests()
+                if self._batch is None:
+                    break
+                num_frames += self._batch.size
+                results.extend(self._sample_next_frames())
+                if self._batch is not None:
+                    self._decode_step()
+        self.model.decoder.reset_cache(use_cache=False)
+
+        run_time = time.perf_counter() - start_time
+        if results:
+            mean_time_to_first_audio = sum(result['time_to_first_audio'] for result in results) / len(results)
+            logging.info(
+                f"Decoded {len(results)} requests in {run_time:.2f}s: {num_frames / run_time:.1f} frames/s, "
+                f"mean time to first audio {mean_time_to_first_audio:.3f}s"
+            )
+        return sorted(results, key=lambda result: result['request_id'])
+
+    def _admit_requests(self):
+        while self._queue:
+            num_active = self._batch.size if self._batch is not None else 0
+            if num_active + len(self._queue[0].request_ids) > self.max_batch_size:
+                break
+            queued = self._queue.popleft()
+            active_cache = self.model.decoder.get_cache() if self._batch is not None else None
+            new_batch = self._prefill(queued)
+            if self._batch is None:
+                self._batch = new_batch
+            else:
+                cache = Transformer.merge_caches([active_cache, self.model.decoder.get_cache()])
+                self.model.decoder.set_cache(cache)
+                self._batch = self._merge_batches(self._batch, new_batch)
+
+    def _prefill(self, queued: _QueuedRequests) -> _DecodingBatch:
+        """
+        Encodes the context of queued requests and decodes their context and BOS frame with an empty KV cache.
+        """
+        model = self.model
+        context_tensors = model.prepare_context_tensors(queued.batch)
+        self._multi_encoder_mapping = context_tensors['multi_encoder_mapping']
+        batch_size = len(queued.request_ids)
+        device = model.final_proj.weight.device
+
+        audio_codes_bos = torch.full(
+            (batch_size, model.cfg.num_audio_codebooks, 1), model.audio_bos_id, device=device
+        ).long()
+        dec_input = model.embed_audio_tokens(audio_codes_bos)
+        dec_mask = torch.ones(batch_size, 1, dtype=torch.bool, device=device)
+        additional_decoder_input = context_tensors['additional_decoder_input']
+        if additional_decoder_input is not None:
+            dec_input = torch.cat([additional_decoder_input, dec_input], dim=1)
+            dec_mask = torch.cat([context_tensors['addtional_decoder_mask'].bool(), dec_mask], dim=1)
+
+        cond = context_tensors['cond']
+        cond_mask = context_tensors['cond_mask']
+        if self.use_cfg:
+            dummy_cond, dummy_cond_mask, dummy_additional_decoder_input, dummy_additional_dec_mask, _ = (
+                model.prepare_dummy_cond_for_cfg(
+                    cond, cond_mask, additional_decoder_input, context_tensors['addtional_decoder_mask']
+                )
+            )
+            uncond_dec_input = dec_input.clone()
+            uncond_dec_mask = dec_mask.clone()
+            if dummy_additional_decoder_input is not None:
+                context_size = dummy_additional_decoder_input.size(1)
+                uncond_dec_input[:, :context_size] = dummy_additional_decoder_input
+                uncond_dec_mask[:, :context_size] = dummy_additional_dec_mask
+            dec_input = _interleave(dec_input, uncond_dec_input)
+            dec_mask = _interleave(dec_mask, uncond_dec_mask)
+            if isinstance(cond, list):
+                cond = [_interleave(cond_item, dummy_item) for cond_item, dummy_item in zip(cond, dummy_cond)]
+                cond_mask = [
+                    _interleave(mask_item, dummy_item) for mask_item, dummy_item in zip(cond_mask, dummy_cond_mask)
+                ]
+            else:
+                cond = _interleave(cond, dummy_cond)
+                cond_mask = _interleave(cond_mask, dummy_cond_mask)
+
+        model.decoder.reset_cache(use_cache=True)
+        decoder_out = model.decoder(
+            dec_input, dec_mask, cond=cond, cond_mask=cond_mask, multi_encoder_mapping=self._multi_encoder_mapping
+        )
+        logits = model.final_proj(decoder_out['output'][:, -1])
+
+        # Preallocate the decoder inputs for all decoding steps
+        length = dec_input.size(1)
+        max_length = length + self.max_decoder_steps
+        num_rows = dec_input.size(0)
+        dec_input_buffer = dec_input.new_zeros(num_rows, max_length, dec_input.size(2))
+        dec_input_buffer[:, :length] = dec_input
+        dec_mask_buffer = torch.zeros(num_rows, max_length, dtype=torch.bool, device=device)
+        dec_mask_buffer[:, :length] = dec_mask
+        positions = torch.arange(max_length, device=device).unsqueeze(0).expand(num_rows, -1)
+
+        return _DecodingBatch(
+            request_ids=queued.request_ids,
+            submit_times=[queued.submit_time] * batch_size,
+            offsets=torch.zeros(batch_size, dtype=torch.long, device=device),
+            num_frames=torch.zeros(batch_size, dtype=torch.long, device=device),
+            codes=torch.zeros(
+                batch_size, model.cfg.num_audio_codebooks, self.max_decoder_steps, dtype=torch.long, device=device
+            ),
+            dec_input=dec_input_buffer,
+            dec_mask=dec_mask_buffer,
+            positions=positions,
+            length=length,
+            cond=cond,
+            cond_mask=cond_mask,
+            logits=logits,
+        )
+
+    def _merge_batches(self, active: _DecodingBatch, new: _DecodingBatch) -> _DecodingBatch:
+        """
+        Merges the state of newly admitted requests into the active batch, padding the shorter inputs at the start.
+        """
+        length = max(active.length, new.length)
+        remaining_steps = self.max_decoder_steps - torch.cat([active.num_frames, new.num_frames]).min().item()
+        max_length = length + remaining_steps
+        offsets = []
+        dec_inputs = []
+        dec_masks = []
+        for batch in [active, new]:
+            pad_start = length - batch.length
+            offsets.append(batch.offsets + pad_start)
+            dec_input = batch.dec_input.new_zeros(batch.dec_input.size(0), max_length, batch.dec_input.size(2))
+            dec_input[:, pad_start:length] = batch.dec_input[:, : batch.length]
+            dec_inputs.append(dec_input)
+            dec_mask = batch.dec_mask.new_zeros(batch.dec_mask.size(0), max_length)
+            dec_mask[:, pad_start:length] = batch.dec_mask[:, : batch.length]
+            dec_masks.append(dec_mask)
+
+        offsets = torch.cat(offsets)
+        row_offsets = offsets.repeat_interleave(self.rows_per_request)
+        positions = torch.arange(max_length, device=offsets.device).unsqueeze(0) - row_offsets.unsqueeze(1)
+
+        return _DecodingBatch(
+            request_ids=active.request_ids + new.request_ids,
+            submit_times=active.submit_times + new.submit_times,
+            offsets=offsets,
+            num_frames=torch.cat([active.num_frames, new.num_frames]),
+            codes=torch.cat([active.codes, new.codes]),
+            dec_input=torch.cat(dec_inputs),
+            dec_mask=torch.cat(dec_masks),
+            positions=positions.clamp(min=0),
+            length=length,
+            cond=_merge_conds([active.cond, new.cond]),
+            cond_mask=_merge_conds([active.cond_mask, new.cond_mask]),
+            logits=torch.cat([active.logits, new.logits]),
+        )
+
+    def _sample_next_frames(self) -> List[Dict[str, Any]]:
+        """
+        Samples the next frame of all requests, and removes the requests which ended from the batch.
+        """
+        model = self.model
+        batch = self._batch
+        logits = batch.logits
+        if self.use_cfg:
+            logits = logits.view(batch.size, 2, -1)
+            logits = (1 - self.cfg_scale) * logits[:, 1] + self.cfg_scale * logits[:, 0]
+
+        audio_codes_next = model.sample_codes_from_logits(logits, temperature=self.temperature, topk=self.topk)
+        all_codes_next_argmax = model.sample_codes_from_logits(logits, temperature=0.01)
+        batch_indices = torch.arange(batch.size, device=logits.device)
+        batch.codes[batch_indices, :, batch.num_frames] = audio_codes_next
+        batch.num_frames += 1
+
+        is_end = (all_codes_next_argmax[:, 0] == model.audio_eos_id) | (audio_codes_next[:, 0] == model.audio_eos_id)
+        # The end of sequence frame is not part of the output
+        codes_lens = batch.num_frames - is_end.long()
+        is_finished = is_end | (batch.num_frames == self.max_decoder_steps)
+        finished_indices = is_finished.nonzero().squeeze(1)
+        if finished_indices.numel() == 0:
+            self._append_frames(audio_codes_next)
+            return []
+
+        results = self._finish_requests(finished_indices, codes_lens[finished_indices])
+        active_indices = (~is_finished).nonzero().squeeze(1)
+        if active_indices.numel() == 0:
+            self._batch = None
+        else:
+            self._select_requests(active_indices)
+            self._append_frames(audio_codes_next[active_indices])
+        return results
+
+    def _finish_requests(self, indices: torch.Tensor, codes_lens: torch.Tensor) -> List[Dict[str, Any]]:
+        batch = self._batch
+        max_len = max(codes_lens.max().item(), 1)
+        codes = batch.codes[indices, :, :max_len]
+        audio, audio_lens = self.model.codes_to_audio(codes.clone(), codes_lens)
+        finish_time = time.perf_counter()
+
+        results = []
+        for i, index in enumerate(indices.tolist()):
+            codes_len = codes_lens[i].item()
+            audio_len = audio_lens[i].item()
+            results.append(
+                {
+                    'request_id': batch.request_ids[index],
+                    'codes': codes[i, :, :codes_len],
+                    'codes_len': codes_len,
+                    'audio': audio[i, :audio_len],
+                    'audio_len': audio_len,
+                    'time_to_first_audio': finish_time - batch.submit_times[index],
+                }
+            )
+        return results
+
+    def _select_requests(self, indices: torch.Tensor):
+        """
+        Keeps only the given requests in the batch and the KV cache, and removes the padding steps which are no longer
+        needed by any request.
+        """
+        batch = self._batch
+        row_indices = (
+            indices.unsqueeze(1) * self.rows_per_request + torch.arange(self.rows_per_request, device=indices.device)
+        ).flatten()
+        self.model.decoder.select_cache(row_indices)
+
+        offsets = batch.offsets.index_select(0, indices)
+        num_padding_steps = offsets.min().item()
+        if num_padding_steps > 0:
+            self.model.decoder.trim_cache(num_padding_steps)
+
+        self._batch = _DecodingBatch(
+            request_ids=[batch.request_ids[index] for index in indices.tolist()],
+            submit_times=[batch.submit_times[index] for index in indices.tolist()],
+            offsets=offsets - num_padding_steps,
+            num_frames=batch.num_frames.index_select(0, indices),
+            codes=batch.codes.index_select(0, indices),
+            dec_input=batch.dec_input.index_select(0, row_indices)[:, num_padding_steps:],
+            dec_mask=batch.dec_mask.index_select(0, row_indices)[:, num_padding_steps:],
+            positions=batch.positions.index_select(0, row_indices)[:, num_padding_steps:],
+            length=batch.length - num_padding_steps,
+            cond=_apply_to_cond(batch.cond, lambda cond: cond.index_select(0, row_indices)),
+            cond_mask=_apply_to_cond(batch.cond_mask, lambda cond_mask: cond_mask.index_select(0, row_indices)),
+            logits=batch.logits.index_select(0, row_indices),
+        )
+
+    def _append_frames(self, audio_codes: torch.Tensor):
+        """
+        Writes the embeddings of the generated frames into the preallocated decoder inputs.
+        """
+        batch = self._batch
+        embedded = self.model.embed_audio_tokens(audio_codes.unsqueeze(-1))  # (B, 1, E)
+        batch.dec_input[:, batch.length] = embedded[:, 0].repeat_interleave(self.rows_per_request, dim=0)
+        batch.dec_mask[:, batch.length] = True
+        batch.length += 1
+
+    def _decode_step(self):
+        batch = self._batch
+        model = self.model
+        decoder_out = model.decoder(
+            batch.dec_input[:, : batch.length],
+            batch.dec_mask[:, : batch.length],
+            cond=batch.cond,
+            cond_mask=batch.cond_mask,
+            multi_encoder_mapping=self._multi_encoder_mapping,
+            positions=batch.positions[:, : batch.length],
+        )
+        # Only the logits of the last step are needed
+        batch.logits = model.final_proj(decoder_out['output'][:, -1])
@@ -13,6 +13,8 @@
 # limitations under the License.
 
 import functools
+import hashlib
+import json
 import os
 import random
 import traceback
@@ -23,10 +25,12 @@ import librosa
 import numpy as np
 import torch
 from einops import rearrange
+from pytorch_lightning import Trainer
 from scipy import ndimage
 from torch.special import gammaln
 
 from nemo.collections.asr.parts.preprocessing.segment import AudioSegment
+from nemo.utils import logging
 
 
 def get_abs_rel_paths(input_path: Path, base_path: Path) -> Tuple[Path, Path]:
@@ -199,22 +203,43 @@ def filter_dataset_by_duration(entries: List[Dict[str, Any]], min_duration: floa
         total_hours: Total duration of original dataset, in hours
         filtered_hours: Total duration of dataset after filtering, in hours
     """
-    filtered_entries = []
+    entry_indices, total_hours, filtered_hours = filter_entry_indices_by_duration(
+        entries=entries, min_duration=min_duration, max_duration=max_duration
+    )
+    filtered_entries = [entries[entry_index] for entry_index in entry_indices]
+    return filtered_entries, total_hours, filtered_hours
+
+
+def filter_entry_indices_by_duration(entries: List[Dict[str, Any]], min_duration: float, max_duration: float):
+    """
+    Filter out manifest entries based on duration, and return the indices of the remaining entries in the manifest.
+
+    Args:
+        entries: List of manifest entry dictionaries.
+        min_duration: Minimum duration below which entries are removed.
+        max_duration: Maximum duration above which entries are removed.
+
+    Returns:
+        entry_indices: List of indices in the manifest of the entries after filtering.
+        total_hours: Total duration of original dataset, in hours
+        filtered_hours: Total duration of dataset after filtering, in hours
+    """
+    entry_indices = []
     total_duration = 0.0
     filtered_duration = 0.0
-    for entry in entries:
+    for entry_index, entry in enumerate(entries):
         duration = entry["duration"]
         total_duration += duration
         if (min_duration and duration < min_duration) or (max_duration and duration > max_duration):
             continue
 
         filtered_duration += duration
-        filtered_entries.append(entry)
+        entry_indices.append(entry_index)
 
     total_hours = total_duration / 3600.0
     filtered_hours = filtered_duration / 3600.0
 
-    return filtered_entries, total_hours, filtered_hours
+    return entry_indices, total_hours, filtered_hours
 
 
 def get_weighted_sampler(
@@ -238,6 +263,212 @@ def get_weighted_sampler(
     return sampler
 
 
+class LengthBucketingBatchSampler(torch.utils.data.Sampler):
+    """
+    Batch sampler which groups examples of similar length, and fills each batch up to a budget of padded length.
+
+    Examples are assigned to `num_buckets` buckets of about the same size by audio length, and each bucket is split
+    into `num_text_buckets` buckets by text length. In each epoch the examples of each bucket are shuffled and
+    split into batches, so that the batch size times the longest audio length in the batch does not exceed
+    `max_batch_length`. An example longer than the budget gets a batch of its own. The order of the batches is then
+    shuffled, and the batches are divided between the ranks.
+
+    The lengths can be in any unit, for example audio samples or spectrogram frames, as long as `max_batch_length`
+    uses the same unit. The padding ratio of the audio and text in the batches is logged at the start of each epoch.
+
+    When training on multiple devices, the sampler divides the batches between the ranks itself, so the trainer
+    should not replace it with a distributed sampler, for example by using `Trainer(use_distributed_sampler=False)`.
+
+    The batches of an epoch only depend on the seed and the epoch. Lightning does not set the epoch of batch samplers,
+    so models set it with set_batch_sampler_epoch, which also resumes an epoch from a checkpoint by skipping the
+    batches that were consumed by training.
+
+    Args:
+        audio_lengths: Audio length of each example in the dataset.
+        max_batch_length: Maximum batch size times the longest audio length in the batch.
+        text_lengths: Optional text length of each example in the dataset.
+        max_batch_size: Optional maximum number of examples in a batch.
+        num_buckets: Number of buckets by audio length.
+        num_text_buckets: Number of buckets by text length in each audio length bucket.
+        world_size: Number of ranks which the batches are divided between.
+        rank: Rank to sample batches for. Defaults to the rank of the default process group when iterating.
+        shuffle: Whether to shuffle the examples and the batches in each epoch.
+        seed: Random seed, which has to be the same on all ranks.
+    """
+
+    def __init__(
+        self,
+        audio_lengths: List[int],
+        max_batch_length: int,
+        text_lengths: Optional[List[int]] = None,
+        max_batch_size: Optional[int] = None,
+        num_buckets: int = 30,
+        num_text_buckets: int = 4,
+        world_size: int = 1,
+        rank: Optional[int] = None,
+        shuffle: bool = True,
+        seed: int = 0,
+    ):
+        if text_lengths is not None and len(text_lengths) != len(audio_lengths):
+            raise ValueError(
+                f"Number of text lengths ({len(text_lengths)}) and audio lengths ({len(audio_lengths)}) differ."
+            )
+
+        self.audio_lengths = np.array(audio_lengths, dtype=np.int64)
+        self.text_lengths = None if text_lengths is None else np.array(text_lengths, dtype=np.int64)
+        self.max_batch_length = max_batch_length
+        self.max_batch_size = max_batch_size
+        self.world_size = world_size
+        self.rank = rank
+        self.shuffle = shuffle
+        self.seed = seed
+        self.epoch = 0
+        # Number of batches of the epoch which are skipped by the next iteration, to resume the epoch
+        self.consumed_batches = 0
+        self._epoch_batches = None
+
+        self.buckets = []
+        for bucket in np.array_split(np.argsort(self.audio_lengths, kind="stable"), num_buckets):
+            if self.text_lengths is not None:
+                bucket = bucket[np.argsort(self.text_lengths[bucket], kind="stable")]
+                self.buckets += [text_bucket for text_bucket in np.array_split(bucket, num_text_buckets)]
+            else:
+                self.buckets.append(bucket)
+        self.buckets = [bucket for bucket in self.buckets if bucket.size > 0]
+
+    def set_epoch(self, epoch: int, consumed_batches: int = 0):
+        """
+        Set the epoch to sample batches for.
+
+        Args:
+            epoch: Epoch to sample batches for.
+            consumed_batches: Number of batches of the epoch which were already consumed by training, and are skipped
+                by the next iteration.
+        """
+        self.epoch = epoch
+        self.consumed_batches = consumed_batches
+
+    def _get_rank(self) -> int:
+        if self.rank is not None:
+            return self.rank
+        if torch.distributed.is_available() and torch.distributed.is_initialized():
+            return torch.distributed.get_rank()
+        return 0
+
+    def _create_batches(self, rng: np.random.Generator) -> List[np.ndarray]:
+        batches = []
+        for bucket in self.buckets:
+            if self.shuffle:
+                bucket = rng.permutation(bucket)
+            batch_start = 0
+            max_length = 0
+            for position, audio_length in enumerate(self.audio_lengths[bucket]):
+                max_length = max(max_length, audio_length)
+                batch_size = position + 1 - batch_start
+                if batch_size > 1 and (
+                    batch_size * max_length > self.max_batch_length
+                    or (self.max_batch_size and batch_size > self.max_batch_size)
+                ):
+                    batches.append(bucket[batch_start:position])
+                    batch_start = position
+                    max_length = audio_length
+            batches.append(bucket[batch_start:])
+        return batches
+
+    def _get_epoch_batches(self) -> List[List[int]]:
+        rank = self._get_rank()
+        if self._epoch_batches is not None and self._epoch_batches[0] == (self.epoch, rank):
+            return self._epoch_batches[1]
+
+        rng = np.random.default_rng(self.seed + self.epoch)
+        batches = self._create_batches(rng)
+        if self.shuffle:
+            batches = [batches[batch_index] for batch_index in rng.permutation(len(batches))]
+        # All ranks get the same number of batches
+        batches = batches[: len(batches) // self.world_size * self.world_size]
+
+        self._log_padding_ratio(batches)
+        rank_batches = [batch.tolist() for batch in batches[rank :: self.world_size]]
+        self._epoch_batches = ((self.epoch, rank), rank_batches)
+        return rank_batches
+
+    def _log_padding_ratio(self, batches: List[np.ndarray]):
+        num_batches = len(batches)
+        if num_batches == 0:
+            return
+        padding_ratios = []
+        for lengths in [self.audio_lengths, self.text_lengths]:
+            if lengths is None:
+                continue
+            total_length = sum(lengths[batch].sum() for batch in batches)
+            padded_length = sum(batch.size * lengths[batch].max() for batch in batches)
+            padding_ratios.append(1.0 - total_length / padded_length)
+        num_examples = sum(batch.size for batch in batches)
+        message = (
+            f"Epoch {self.epoch}: {num_batches} batches, {num_examples / num_batches:.1f} examples per batch, "
+            f"audio padding ratio {padding_ratios[0]:.3f}"
+        )
+        if len(padding_ratios) > 1:
+            message += f", text padding ratio {padding_ratios[1]:.3f}"
+        logging.info(message)
+
+    def __iter__(self):
+        batches = self._get_epoch_batches()[self.consumed_batches :]
+        self.consumed_batches = 0
+        return iter(batches)
+
+    def __len__(self) -> int:
+        return len(self._get_epoch_batches())
+
+
+def set_batch_sampler_epoch(dataloader: torch.utils.data.DataLoader, trainer: Trainer):
+    """
+    Set the epoch of the LengthBucketingBatchSampler of a training dataloader to the epoch of the trainer. When the
+    trainer resumes from a checkpoint saved in the middle of an epoch, the batches of the epoch which were consumed by
+    training are skipped.
+
+    Lightning only sets the epoch of samplers, so models which use the batch sampler call this when the trainer
+    requests the training dataloader, which creates the iterator of the first epoch, and at the start of each epoch.
+
+    Args:
+        dataloader: Training dataloader.
+        trainer: Trainer which runs the training.
+    """
+    batch_sampler = getattr(dataloader, "batch_sampler", None)
+    if not isinstance(batch_sampler, LengthBucketingBatchSampler):
+        return
+
+    epoch_loop = trainer.fit_loop.epoch_loop
+    # The batches which were processed by training steps before the checkpoint, not the batches which the
+    # dataloader prefetched
+    consumed_batches = epoch_loop.batch_progress.current.processed if epoch_loop.restarting else 0
+    batch_sampler.set_epoch(trainer.current_epoch, consumed_batches=consumed_batches)
+
+
+def get_dataloader_params(
+    sampler: Optional[torch.utils.data.Sampler], dataloader_params: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Get the arguments to create a DataLoader with the sampler returned by the get_sampler() method of a dataset.
+
+    Args:
+        sampler: Sampler or batch sampler, or None to use the default sampler.
+        dataloader_params: DataLoader arguments from the config. The batch_size, shuffle and drop_last arguments
+            are not used with a batch sampler.
+
+    Returns:
+        DataLoader arguments including the sampler.
+    """
+    dataloader_params = dict(dataloader_params)
+    if isinstance(sampler, LengthBucketingBatchSampler):
+        for key in ["batch_size", "shuffle", "drop_last"]:
+            dataloader_params.pop(key, None)
+        dataloader_params["batch_sampler"] = sampler
+    else:
+        dataloader_params["sampler"] = sampler
+    return dataloader_params
+
+
 def _read_audio(
     audio_filepath: Path, sample_rate: int, offset: float, duration: float, n_retries: int = 5
 ) -> AudioSegment:
@@ -358,3 +589,340 @@ def sample_audio(
         audio = normalize_volume(audio)
 
     return audio, audio_filepath_abs, audio_filepath_rel
+
+
+def get_packed_feature_dir(feature_dir: Path, feature_name: str) -> Path:
+    """
+    Get the directory of the packed feature store for the given feature.
+
+    Example: feature_name "pitch" in "<feature_dir>" is packed into "<feature_dir>/pitch_packed"
+    """
+    return Path(feature_dir) / f"{feature_name}_packed"
+
+
+@functools.lru_cache(maxsize=32)
+def _load_packed_feature_store(store_dir: str, mtime_ns: int) -> Tuple[Dict[str, Any], np.memmap]:
+    # mtime_ns is only part of the cache key, so that a store which was rewritten is mapped again.
+    with open(os.path.join(store_dir, PackedFeatureStore.INDEX_FILENAME), "r", encoding="utf-8") as index_f:
+        index = json.load(index_f)
+    data_filepath = os.path.join(store_dir, PackedFeatureStore.DATA_FILENAME)
+    if os.path.getsize(data_filepath) == 0:
+        data = np.zeros(0, dtype=index["dtype"])
+    else:
+        data = np.memmap(data_filepath, dtype=index["dtype"], mode="r")
+    return index, data
+
+
+class PackedFeatureStore:
+    """
+    Read-only view of a packed feature store, which holds one feature type for all utterances of a dataset.
+
+    The store is a directory with a single binary file containing the concatenated (flattened) feature arrays
+    and an index mapping each utterance key to the offset and shape of its array. The binary file is memory-mapped
+    on first access, so that reading a feature does not require opening one file per utterance.
+    Only the directory path is pickled, so the store can be shared with dataloader workers.
+
+    Args:
+        store_dir: Directory of the packed feature store, as written by PackedFeatureWriter.
+    """
+
+    DATA_FILENAME = "data.bin"
+    INDEX_FILENAME = "index.json"
+
+    def __init__(self, store_dir: Path):
+        self.store_dir = Path(store_dir)
+
+    @classmethod
+    def exists(cls, store_dir: Path) -> bool:
+        return (Path(store_dir) / cls.INDEX_FILENAME).exists()
+
+    def _load(self) -> Tuple[Dict[str, Any], np.memmap]:
+        index_filepath = self.store_dir / self.INDEX_FILENAME
+        index, data = _load_packed_feature_store(str(self.store_dir), index_filepath.stat().st_mtime_ns)
+        return index["entries"], data
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        index_filepath = self.store_dir / self.INDEX_FILENAME
+        index, _ = _load_packed_feature_store(str(self.store_dir), index_filepath.stat().st_mtime_ns)
+        return index.get("metadata", {})
+
+    def __contains__(self, key: str) -> bool:
+        entries, _ = self._load()
+        return key in entries
+
+    def __len__(self) -> int:
+        entries, _ = self._load()
+        return len(entries)
+
+    def keys(self) -> List[str]:
+        entries, _ = self._load()
+        return list(entries.keys())
+
+    def shape(self, key: str) -> Tuple[int, ...]:
+        """Shape of the feature array of an utterance, without reading the array."""
+        entries, _ = self._load()
+        return tuple(entries[key][1])
+
+    def read(self, key: str, indices: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        """
+        Read the feature array of an utterance.
+
+        Args:
+            key: Utterance key the feature was stored with.
+            indices: Optional (start, end) indices to slice the first dimension of the feature with.
+
+        Returns:
+            Copy of the feature array. Features stored as float16 are returned as float32.
+        """
+        entries, data = self._load()
+        offset, shape = entries[key]
+        feature_array = data[offset : offset + int(np.prod(shape))].reshape(shape)
+        if indices:
+            feature_array = feature_array[indices[0] : indices[1]]
+        if feature_array.dtype == np.float16:
+            return feature_array.astype(np.float32)
+        return np.array(feature_array)
+
+
+class PackedFeatureWriter:
+    """
+    Writer for a packed feature store, see PackedFeatureStore.
+
+    If the store already exists, new features are appended to it. Writing an existing key again updates its
+    index entry, the previous array stays in the binary file until the store is packed again.
+    The index is only written by flush() and close(), features added since then are not visible to readers.
+
+    Args:
+        store_dir: Directory of the packed feature store.
+        dtype: Optional data type to store the features as, for example "float16" to halve the size of
+            float32 features. Defaults to the data type of the existing store, or of the first added feature.
+        metadata: Optional JSON serializable dict describing the stored features, see PackedFeatureStore.metadata.
+            Defaults to the metadata of the existing store.
+    """
+
+    def __init__(self, store_dir: Path, dtype: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None):
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.entries = {}
+        self.dtype = np.dtype(dtype) if dtype is not None else None
+        self.metadata = metadata
+
+        index_filepath = self.store_dir / PackedFeatureStore.INDEX_FILENAME
+        if index_filepath.exists():
+            with open(index_filepath, "r", encoding="utf-8") as index_f:
+                index = json.load(index_f)
+            if self.dtype is not None and self.dtype != np.dtype(index["dtype"]):
+                raise ValueError(f"Packed feature store {store_dir} has dtype {index['dtype']}, received {dtype}")
+            self.dtype = np.dtype(index["dtype"])
+            self.entries = index["entries"]
+            if self.metadata is None:
+                self.metadata = index.get("metadata")
+
+        self._data_file = open(self.store_dir / PackedFeatureStore.DATA_FILENAME, "ab")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def add(self, key: str, features: np.ndarray) -> None:
+        if self.dtype is None:
+            self.dtype = np.asarray(features).dtype
+        features = np.ascontiguousarray(features, dtype=self.dtype)
+        offset = self._data_file.tell() // self.dtype.itemsize
+        self._data_file.write(features.tobytes())
+        self.entries[key] = [offset, list(features.shape)]
+
+    def flush(self) -> None:
+        """
+        Make all features added so far visible to readers of the store.
+        """
+        self._data_file.flush()
+        self._write_index()
+
+    def close(self) -> None:
+        if self._data_file.closed:
+            return
+        self._data_file.close()
+        self._write_index()
+
+    def _write_index(self) -> None:
+        dtype = self.dtype if self.dtype is not None else np.dtype(np.float32)
+        index = {"dtype": dtype.name, "entries": self.entries}
+        if self.metadata is not None:
+            index["metadata"] = self.metadata
+        index_filepath = self.store_dir / PackedFeatureStore.INDEX_FILENAME
+        tmp_filepath = index_filepath.with_suffix(".tmp")
+        with open(tmp_filepath, "w", encoding="utf-8") as index_f:
+            json.dump(index, index_f)
+        os.replace(tmp_filepath, index_filepath)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+
+def get_text_tokens_dir(manifest_path: Path) -> Path:
+    """
+    Get the directory of the packed store with the pre-tokenized texts of a manifest.
+
+    Example: "<data_dir>/train_manifest.json" is pre-tokenized into "<data_dir>/train_manifest_text_tokens_packed"
+    """
+    manifest_path = Path(manifest_path)
+    return manifest_path.parent / f"{manifest_path.stem}_text_tokens_packed"
+
+
+def get_text_tokens_metadata(manifest_path: Path, tokens: List[str]) -> Dict[str, Any]:
+    """
+    Get the metadata which identifies the manifest and the tokenizer vocabulary that texts were pre-tokenized with.
+    """
+    manifest_hash = hashlib.sha1()
+    with open(manifest_path, "rb") as manifest_f:
+        for chunk in iter(functools.partial(manifest_f.read, 1 << 20), b""):
+            manifest_hash.update(chunk)
+    return {"manifest_sha1": manifest_hash.hexdigest(), "tokens": list(tokens)}
+
+
+def load_text_tokens_store(manifest_path: Path, tokens: List[str]) -> Optional[PackedFeatureStore]:
+    """
+    Load the pre-tokenized texts of a manifest, as written by scripts/dataset_processing/tts/pretokenize_text.py.
+    The token IDs of each manifest entry are stored with the line index of the entry as key.
+
+    Args:
+        manifest_path: Path to the manifest.
+        tokens: Vocabulary of the text tokenizer.
+
+    Returns:
+        The packed store with the token IDs, or None if it does not exist or if it was written for a different
+        version of the manifest or a different tokenizer vocabulary.
+    """
+    store_dir = get_text_tokens_dir(manifest_path)
+    if not PackedFeatureStore.exists(store_dir):
+        return None
+
+    store = PackedFeatureStore(store_dir)
+    if store.metadata != get_text_tokens_metadata(manifest_path=manifest_path, tokens=tokens):
+        logging.warning(
+            f"Ignoring pre-tokenized texts in {store_dir}, they were written for a different manifest or tokenizer."
+        )
+        return None
+
+    logging.info(f"Reading pre-tokenized texts from {store_dir}")
+    return store
+
+
+def get_target_audio(manifest_entry: Dict[str, Any], audio_dir: Path) -> Tuple[Path, float, float]:
+    """
+    Get the target audio of a manifest entry, which is read by load_audio.
+
+    Args:
+        manifest_entry: Manifest entry dictionary.
+        audio_dir: base directory where audio is stored.
+
+    Returns:
+        Absolute path, offset and duration of the target audio.
+    """
+    audio_filepath, _ = get_audio_filepaths(manifest_entry=manifest_entry, audio_dir=audio_dir)
+    return audio_filepath, manifest_entry.get("offset", 0.0), manifest_entry.get("duration", 0.0)
+
+
+def get_speaker_reference_audio(manifest_entry: Dict[str, Any], audio_dir: Path) -> Tuple[Path, float, float]:
+    """
+    Get the reference audio that the speaker embedding of a manifest entry is computed from. This is the context audio
+    of the entry if it has one, and the target audio otherwise.
+
+    Args:
+        manifest_entry: Manifest entry dictionary.
+        audio_dir: base directory where audio is stored.
+
+    Returns:
+        Absolute path, offset and duration of the reference audio.
+    """
+    if "context_audio_filepath" in manifest_entry:
+        audio_filepath = Path(audio_dir) / manifest_entry["context_audio_filepath"]
+        return audio_filepath, 0.0, manifest_entry["context_audio_duration"]
+
+    return get_target_audio(manifest_entry=manifest_entry, audio_dir=audio_dir)
+
+
+def load_speaker_reference_audio(
+    manifest_entry: Dict[str, Any], audio_dir: Path, sample_rate: int, volume_norm: bool = False
+) -> np.ndarray:
+    """
+    Load the reference audio that the speaker embedding of a manifest entry is computed from, see
+    get_speaker_reference_audio. Like in MagpieTTSDataset, volume normalization is only applied to the target audio.
+
+    Args:
+        manifest_entry: Manifest entry dictionary.
+        audio_dir: base directory where audio is stored.
+        sample_rate: Sample rate to load audio as.
+        volume_norm: Whether to apply volume normalization to the target audio.
+
+    Returns:
+        Audio array.
+    """
+    if "context_audio_filepath" in manifest_entry:
+        audio_filepath, offset, duration = get_speaker_reference_audio(
+            manifest_entry=manifest_entry, audio_dir=audio_dir
+        )
+        return _read_audio(
+            audio_filepath=audio_filepath, sample_rate=sample_rate, offset=offset, duration=duration
+        ).samples
+
+    audio, _, _ = load_audio(
+        manifest_entry=manifest_entry, audio_dir=audio_dir, sample_rate=sample_rate, volume_norm=volume_norm
+    )
+    return audio
+
+
+def get_speaker_embedding_key(audio_filepath: Path, offset: float = 0.0, duration: float = 0.0) -> str:
+    """
+    Get the key of the speaker embedding of an audio file in a speaker embedding store.
+
+    The key is the absolute path of the audio file, with the offset and duration of the audio the embedding was
+    computed from. A duration of 0 is the audio until the end of the file.
+    """
+    return f"{os.path.abspath(audio_filepath)}:{float(offset)}:{float(duration)}"
+
+
+def get_speaker_embedding_metadata(speaker_model_name: str, volume_norm: bool) -> Dict[str, Any]:
+    """
+    Get the metadata which identifies how speaker embeddings were computed: the speaker verification model, and
+    whether volume normalization was applied to the target audio, see load_speaker_reference_audio.
+    """
+    return {"speaker_model": speaker_model_name, "volume_norm": volume_norm}
+
+
+def load_speaker_embedding_store(store_dir: Path, speaker_model_name: str) -> Optional[PackedFeatureStore]:
+    """
+    Load the speaker embeddings of reference audio, and optionally of target audio, as written by
+    scripts/dataset_processing/tts/compute_speaker_embeddings.py. The embedding of each audio file is stored with the
+    key from get_speaker_embedding_key.
+
+    Args:
+        store_dir: Directory of the packed store with the speaker embeddings.
+        speaker_model_name: Name of the speaker verification model, for example "titanet_large".
+
+    Returns:
+        The packed store with the speaker embeddings, or None if it does not exist, if it was written with a
+        different speaker verification model, or if its metadata does not record whether volume normalization was
+        applied.
+    """
+    if not PackedFeatureStore.exists(store_dir):
+        logging.warning(f"Speaker embedding store {store_dir} does not exist.")
+        return None
+
+    store = PackedFeatureStore(store_dir)
+    if store.metadata.get("speaker_model") != speaker_model_name:
+        logging.warning(
+            f"Ignoring speaker embeddings in {store_dir}, they were computed with {store.metadata.get('speaker_model')} "
+            f"instead of {speaker_model_name}."
+        )
+        return None
+    if "volume_norm" not in store.metadata:
+        logging.warning(f"Ignoring speaker embeddings in {store_dir}, they were computed by an earlier version.")
+        return None
+
+    logging.info(f"Reading speaker embeddings from {store_dir}")
+    return store
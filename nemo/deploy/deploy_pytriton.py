@@ -73,6 +73,7 @@ class DeployPyTriton(DeployBase):
         allow_http=True,
         streaming=False,
         pytriton_log_verbose=0,
+        infer_instances: int = 1,
     ):
         """
         A nemo checkpoint or model is expected for serving on Triton Inference Server.
@@ -85,6 +86,8 @@ class DeployPyTriton(DeployBase):
             max_batch_size (int): max batch size
             port (int) : port for the Triton server
             address (str): http address for Triton server to bind.
+            infer_instances (int): number of concurrent calls of the inference function of the model, which lets
+                models with continuous batching receive concurrent requests
         """
 
         super().__init__(
@@ -101,6 +104,7 @@ class DeployPyTriton(DeployBase):
             streaming=streaming,
             pytriton_log_verbose=pytriton_log_verbose,
         )
+        self.infer_instances = infer_instances
 
     def deploy(self):
         """
@@ -140,7 +144,7 @@ class DeployPyTriton(DeployBase):
                 self.triton.bind(
                     model_name=self.triton_model_name,
                     model_version=self.triton_model_version,
-                    infer_func=self.model.triton_infer_fn,
+                    infer_func=[self.model.triton_infer_fn] * self.infer_instances,
                     inputs=self.model.get_triton_input,
                     outputs=self.model.get_triton_output,
                     config=ModelConfig(max_batch_size=self.max_batch_size),
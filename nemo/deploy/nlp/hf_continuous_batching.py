@@ -0,0 +1,338 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import logging
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import List
+
+import torch
+
+LOGGER = logging.getLogger("NeMo")
+
+
+@dataclass
+class _Sequence:
+    input_ids: List[int]
+    max_new_tokens: int
+    temperature: float
+    top_k: int
+    top_p: float
+    do_sample: bool
+    future: Future = field(default_factory=Future)
+    output_ids: List[int] = field(default_factory=list)
+
+
+def _cache_layers(cache) -> List[tuple]:
+    """Key and value tensors of each layer of a dynamic cache, of shape [batch, heads, length, head_dim]."""
+    return [(layer[0], layer[1]) for layer in cache]
+
+
+def _make_cache(layers: List[tuple]):
+    from transformers import DynamicCache
+
+    if hasattr(DynamicCache, "from_legacy_cache"):
+        return DynamicCache.from_legacy_cache(tuple(layers))
+    return DynamicCache(ddp_cache_data=layers)
+
+
+def _left_pad(tensor: torch.Tensor, length: int, dim: int) -> torch.Tensor:
+    """Left pad a tensor with zeros, or remove its first elements, so that its size along a dimension is `length`."""
+    if tensor.size(dim) >= length:
+        return tensor.narrow(dim, tensor.size(dim) - length, length)
+    shape = list(tensor.shape)
+    shape[dim] = length - tensor.size(dim)
+    return torch.cat([tensor.new_zeros(shape), tensor], dim=dim)
+
+
+def sample_next_tokens(
+    logits: torch.Tensor,
+    temperature: torch.Tensor,
+    top_k: torch.Tensor,
+    top_p: torch.Tensor,
+    do_sample: torch.Tensor,
+) -> torch.Tensor:
+    """
+    Sample the next token of each sequence of a batch from its logits, with its own temperature, top-k and top-p.
+    Like HF `generate`, the logits are divided by the temperature, and then the top-k and top-p filters are applied.
+    Sequences which do not sample, or whose temperature is 0 or top-k is 1, take the most probable token.
+
+    Args:
+        logits: Logits of the next tokens, of shape [batch, vocab].
+        temperature, top_k, top_p, do_sample: Sampling parameters of each sequence, of shape [batch]. A top-k of
+            0 and a top-p of 1 disable the filters.
+    """
+    greedy_tokens = logits.argmax(dim=-1)
+    greedy = ~do_sample | (temperature <= 0) | (top_k == 1)
+    if greedy.all():
+        return greedy_tokens
+
+    logits = logits.float() / temperature.clamp(min=1e-5).unsqueeze(1)
+    sorted_logits, sorted_indices = logits.sort(dim=-1, descending=True)
+    ranks = torch.arange(logits.size(-1), device=logits.device).unsqueeze(0)
+    remove = (top_k.unsqueeze(1) > 0) & (ranks >= top_k.unsqueeze(1))
+    probs = sorted_logits.masked_fill(remove, float("-inf")).softmax(dim=-1)
+    # Keep the most probable tokens until their probability reaches top-p, and at least one token
+    remove |= (top_p.unsqueeze(1) < 1.0) & (probs.cumsum(dim=-1) - probs >= top_p.unsqueeze(1))
+    remove[:, 0] = False
+    probs = sorted_logits.masked_fill(remove, float("-inf")).softmax(dim=-1)
+    sampled_tokens = sorted_indices.gather(1, torch.multinomial(probs, num_samples=1)).squeeze(1)
+    return torch.where(greedy, greedy_tokens, sampled_tokens)
+
+
+class ContinuousBatchingScheduler:
+    """
+    Generates text for concurrent requests to a HuggingFace causal LM with iteration-level (continuous) batching.
+
+    Requests are queued, and a background thread generates one token for all running sequences at a time, with one
+    forward pass of the model over a shared KV cache. Queued requests join the batch as soon as there is a free slot:
+    they are prefilled in groups of similar prompt lengths, and their KV cache is left padded to the length of the
+    cache of the batch. A sequence leaves the batch as soon as it generates an EOS token or its maximum number of new
+    tokens, instead of waiting for the longest sequence like with HF `generate`. Each sequence samples with its own
+    generation parameters, so requests with different parameters share the batch.
+
+    The model has to use a `DynamicCache` with one key and value tensor per layer, like Llama, Mistral or Qwen models.
+
+    Args:
+        model: The HuggingFace causal LM.
+        tokenizer: The tokenizer of the model, which is only needed by `generate`.
+        max_batch_size (int): Maximum number of sequences generated together.
+        eos_token_id (Optional[Union[int, List[int]]]): Tokens which end a sequence. Defaults to the EOS tokens of the
+            generation config of the model.
+    """
+
+    def __init__(self, model, tokenizer=None, max_batch_size: int = 8, eos_token_id=None):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.max_batch_size = max_batch_size
+        if eos_token_id is None:
+            generation_config = getattr(model, "generation_config", None)
+            eos_token_id = getattr(generation_config, "eos_token_id", None)
+        if eos_token_id is None and tokenizer is not None:
+            eos_token_id = tokenizer.eos_token_id
+        if eos_token_id is None:
+            eos_token_id = []
+        self.eos_token_ids = set([eos_token_id] if isinstance(eos_token_id, int) else eos_token_id)
+        self.device = next(model.parameters()).device
+
+        self._waiting: List[_Sequence] = []
+        self._running: List[_Sequence] = []
+        self._cache = None
+        self._attention_mask = None
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def submit(
+        self,
+        input_ids: List[int],
+        max_new_tokens: int = 256,
+        temperature: float = 1.0,
+        top_k: int = 0,
+        top_p: float = 1.0,
+        do_sample: bool = True,
+    ) -> Future:
+        """
+        Queue a request, and return a future of the generated token ids, which include the final EOS token if any.
+        """
+        sequence = _Sequence(
+            input_ids=list(input_ids),
+            max_new_tokens=int(max_new_tokens),
+            temperature=float(temperature),
+            top_k=int(top_k),
+            top_p=float(top_p),
+            do_sample=bool(do_sample),
+        )
+        if sequence.max_new_tokens <= 0:
+            sequence.future.set_result([])
+            return sequence.future
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("The scheduler is stopped.")
+            self._waiting.append(sequence)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="continuous_batching", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return sequence.future
+
+    def generate(
+        self,
+        text_inputs: List[str],
+        max_new_tokens: int = 256,
+        temperature: float = 1.0,
+        top_k: int = 0,
+        top_p: float = 1.0,
+        do_sample: bool = True,
+    ) -> List[str]:
+        """
+        Generate text for prompts, which are submitted as separate requests. Like HF `generate` for causal LMs, the
+        returned texts start with their prompts.
+        """
+        futures = []
+        for prompt in text_inputs:
+            input_ids = self.tokenizer(prompt)["input_ids"]
+            futures.append((input_ids, self.submit(input_ids, max_new_tokens, temperature, top_k, top_p, do_sample)))
+        return [
+            self.tokenizer.decode(input_ids + future.result(), skip_special_tokens=True)
+            for input_ids, future in futures
+        ]
+
+    def stop(self):
+        """Stop the background thread after the running sequences, and fail the queued requests."""
+        with self._condition:
+            self._stopped = True
+            for sequence in self._waiting:
+                sequence.future.set_exception(RuntimeError("The scheduler is stopped."))
+            self._waiting = []
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._waiting and not self._running and not self._stopped:
+                    self._condition.wait()
+                if self._stopped and not self._running:
+                    return
+            try:
+                self.step()
+            except Exception as error:
+                LOGGER.error(f"Continuous batching failed: {error}")
+                with self._condition:
+                    sequences = self._running + self._waiting
+                    self._running, self._waiting = [], []
+                self._cache = self._attention_mask = None
+                for sequence in sequences:
+                    if not sequence.future.done():
+                        sequence.future.set_exception(error)
+
+    @torch.no_grad()
+    def step(self):
+        """Let queued requests join the batch, and generate the next token of all running sequences."""
+        with self._condition:
+            num_joining = min(self.max_batch_size - len(self._running), len(self._waiting))
+            joining, self._waiting = self._waiting[:num_joining], self._waiting[num_joining:]
+        if joining:
+            self._join(joining)
+        elif self._running:
+            input_ids = torch.tensor([[sequence.output_ids[-1]] for sequence in self._running], device=self.device)
+            self._forward(input_ids)
+
+    def _forward(self, input_ids: torch.Tensor):
+        """Run the model on the next tokens of the running sequences, and sample their next tokens."""
+        new_mask = torch.ones_like(input_ids)
+        attention_mask = torch.cat([self._attention_mask, new_mask], dim=1)
+        position_ids = attention_mask.sum(dim=1, keepdim=True) - 1
+        outputs = self.model(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            position_ids=position_ids,
+            past_key_values=self._cache,
+            use_cache=True,
+        )
+        self._cache = outputs.past_key_values
+        self._attention_mask = attention_mask
+        keep = self._sample(self._running, outputs.logits[:, -1, :])
+        if len(keep) < len(self._running):
+            self._running = [self._running[i] for i in keep]
+            if not keep:
+                self._cache = self._attention_mask = None
+                return
+            indices = torch.tensor(keep, device=self.device)
+            self._cache.batch_select_indices(indices)
+            self._attention_mask = self._attention_mask[indices]
+
+    def _prefill(self, sequences: List[_Sequence]):
+        """
+        Run the model on the prompts of sequences, left padded to the same length, and sample their first tokens.
+        Return the sequences which did not finish, with their KV cache and attention mask.
+        """
+        length = max(len(sequence.input_ids) for sequence in sequences)
+        input_ids = torch.zeros(len(sequences), length, dtype=torch.long)
+        attention_mask = torch.zeros(len(sequences), length, dtype=torch.long)
+        for i, sequence in enumerate(sequences):
+            input_ids[i, length - len(sequence.input_ids) :] = torch.tensor(sequence.input_ids)
+            attention_mask[i, length - len(sequence.input_ids) :] = 1
+        input_ids, attention_mask = input_ids.to(self.device), attention_mask.to(self.device)
+        position_ids = (attention_mask.cumsum(dim=1) - 1).clamp(min=0)
+        outputs = self.model(
+            input_ids=input_ids, attention_mask=attention_mask, position_ids=position_ids, use_cache=True
+        )
+        layers = _cache_layers(outputs.past_key_values)
+        if any(key.dim() != 4 or key.size(2) != length for key, _ in layers):
+            raise ValueError("Continuous batching needs a model with a dynamic KV cache.")
+        keep = self._sample(sequences, outputs.logits[:, -1, :])
+        if len(keep) < len(sequences):
+            indices = torch.tensor(keep, dtype=torch.long, device=self.device)
+            sequences = [sequences[i] for i in keep]
+            layers = [(key[indices], value[indices]) for key, value in layers]
+            attention_mask = attention_mask[indices]
+        return sequences, layers, attention_mask
+
+    def _join(self, joining: List[_Sequence]):
+        """Prefill joining sequences in groups of similar prompt lengths, and add them to the running batch."""
+        joining = sorted(joining, key=lambda sequence: len(sequence.input_ids))
+        groups = [[joining[0]]]
+        for sequence in joining[1:]:
+            # Limit the padding of a group to the length of its shortest prompt
+            if len(sequence.input_ids) > 2 * len(groups[-1][0].input_ids):
+                groups.append([])
+            groups[-1].append(sequence)
+
+        parts = []
+        if self._running:
+            parts.append((self._running, _cache_layers(self._cache), self._attention_mask))
+        for group in groups:
+            parts.append(self._prefill(group))
+        parts = [(sequences, layers, mask) for sequences, layers, mask in parts if sequences]
+        if not parts:
+            self._running, self._cache, self._attention_mask = [], None, None
+            return
+        # Sequences are left padded, so the columns before the longest sequence only hold padding
+        length = max(int(mask.sum(dim=1).max()) for _, _, mask in parts)
+        self._running = [sequence for sequences, _, _ in parts for sequence in sequences]
+        self._attention_mask = torch.cat([_left_pad(mask, length, dim=1) for _, _, mask in parts])
+        self._cache = _make_cache(
+            [
+                tuple(torch.cat([_left_pad(layers[i][j], length, dim=2) for _, layers, _ in parts]) for j in range(2))
+                for i in range(len(parts[0][1]))
+            ]
+        )
+
+    def _sample(self, sequences: List[_Sequence], logits: torch.Tensor) -> List[int]:
+        """Sample the next tokens of sequences, resolve the finished sequences, and return the indices of the others."""
+
+        def params(name, dtype):
+            return torch.tensor([getattr(sequence, name) for sequence in sequences], dtype=dtype, device=self.device)
+
+        next_tokens = sample_next_tokens(
+            logits,
+            temperature=params("temperature", torch.float),
+            top_k=params("top_k", torch.long),
+            top_p=params("top_p", torch.float),
+            do_sample=params("do_sample", torch.bool),
+        ).tolist()
+
+        keep = []
+        for i, (sequence, token) in enumerate(zip(sequences, next_tokens)):
+            sequence.output_ids.append(token)
+            if token in self.eos_token_ids or len(sequence.output_ids) >= sequence.max_new_tokens:
+                sequence.future.set_result(sequence.output_ids)
+            else:
+                keep.append(i)
+        return keep
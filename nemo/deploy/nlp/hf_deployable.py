@@ -24,7 +24,8 @@ from pytriton.model_config import Tensor
 from transformers import AutoModel, AutoModelForCausalLM, AutoTokenizer
 
 from nemo.deploy import ITritonDeployable
-from nemo.deploy.utils import broadcast_list, cast_output, str_ndarray2list
+from nemo.deploy.nlp.hf_continuous_batching import ContinuousBatchingScheduler
+from nemo.deploy.utils import broadcast_list, cast_output, pack_topk, str_ndarray2list
 
 LOGGER = logging.getLogger("NeMo")
 
@@ -51,6 +52,11 @@ class HuggingFaceLLMDeploy(ITritonDeployable):
         tokenizer_truncation (bool): Whether to enable truncation in tokenizer. Defaults to True.
         tokenizer_padding_side (str): Which side to pad on ('left' or 'right'). Defaults to 'left'.
         task (str): HuggingFace task type (e.g., "text-generation"). Defaults to "text-generation".
+        continuous_batching (bool): Whether to generate the outputs of concurrent requests with a
+            ContinuousBatchingScheduler, which batches them at the level of the generated tokens.
+            Requests for logits or scores still use HuggingFace generate. Defaults to False.
+        max_running_sequences (int): Maximum number of sequences generated together with continuous
+            batching. Defaults to 8.
         **hf_kwargs: Additional keyword arguments to pass to HuggingFace model loading.
     """
 
@@ -65,6 +71,8 @@ class HuggingFaceLLMDeploy(ITritonDeployable):
         tokenizer_truncation=True,
         tokenizer_padding_side="left",
         task: Optional[str] = "text-generation",
+        continuous_batching: bool = False,
+        max_running_sequences: int = 8,
         **hf_kwargs,
     ):
         if hf_model_id_path is None and model is None:
@@ -93,6 +101,14 @@ class HuggingFaceLLMDeploy(ITritonDeployable):
         if model is None:
             self._load(**hf_kwargs)
 
+        self.scheduler = None
+        if continuous_batching:
+            if torch.distributed.is_initialized() and torch.distributed.get_world_size() > 1:
+                raise ValueError("Continuous batching is not supported with more than one process.")
+            self.scheduler = ContinuousBatchingScheduler(
+                self.model, self.tokenizer, max_batch_size=max_running_sequences
+            )
+
     def _load(self, **hf_kwargs) -> None:
         """
         Load the HuggingFace pipeline with the specified model and task.
@@ -162,6 +178,16 @@ class HuggingFaceLLMDeploy(ITritonDeployable):
         if not self.model:
             raise RuntimeError("Model is not initialized")
 
+        if self.scheduler is not None and not kwargs.get("return_dict_in_generate", False):
+            return self.scheduler.generate(
+                kwargs["text_inputs"],
+                max_new_tokens=kwargs.get("max_new_tokens", 256),
+                temperature=kwargs.get("temperature", 1.0),
+                top_k=kwargs.get("top_k", 0),
+                top_p=kwargs.get("top_p", 1.0),
+                do_sample=kwargs.get("do_sample", True),
+            )
+
         inputs = self.tokenizer(
             kwargs["text_inputs"],
             return_tensors="pt",
@@ -232,6 +258,8 @@ class HuggingFaceLLMDeploy(ITritonDeployable):
             Tensor(name="max_length", shape=(-1,), dtype=np.int_, optional=True),
             Tensor(name="output_logits", shape=(-1,), dtype=np.bool_, optional=True),
             Tensor(name="output_scores", shape=(-1,), dtype=np.bool_, optional=True),
+            Tensor(name="compact_output", shape=(-1,), dtype=np.bool_, optional=True),
+            Tensor(name="top_logprobs", shape=(-1,), dtype=np.int_, optional=True),
         )
         return inputs
 
@@ -241,6 +269,10 @@ class HuggingFaceLLMDeploy(ITritonDeployable):
             Tensor(name="sentences", shape=(-1,), dtype=bytes),
             Tensor(name="logits", shape=(-1,), dtype=np.single),
             Tensor(name="scores", shape=(-1,), dtype=np.single),
+            Tensor(name="logits_fp16", shape=(-1, -1), dtype=np.float16),
+            Tensor(name="scores_fp16", shape=(-1, -1), dtype=np.float16),
+            Tensor(name="top_logprobs_ids", shape=(-1, -1), dtype=np.int32),
+            Tensor(name="top_logprobs_values", shape=(-1, -1), dtype=np.float16),
         )
 
     @batch
@@ -255,8 +287,12 @@ class HuggingFaceLLMDeploy(ITritonDeployable):
             num_tokens_to_generate = inputs.pop("max_length")[0][0] if "max_length" in inputs else 256
             output_logits = inputs.pop("output_logits")[0][0] if "output_logits" in inputs else False
             output_scores = inputs.pop("output_scores")[0][0] if "output_scores" in inputs else False
+            compact_output = inputs.pop("compact_output")[0][0] if "compact_output" in inputs else False
+            top_logprobs = int(inputs.pop("top_logprobs")[0][0]) if "top_logprobs" in inputs else 0
+            # The top log-probs are computed from the logits, which are generated even if they are not returned
+            generate_logits = output_logits or top_logprobs > 0
             return_dict_in_generate = False
-            if output_logits or output_scores:
+            if generate_logits or output_scores:
                 return_dict_in_generate = True
 
             if torch.distributed.is_initialized():
@@ -269,7 +305,7 @@ class HuggingFaceLLMDeploy(ITritonDeployable):
                             top_k,
                             top_p,
                             num_tokens_to_generate,
-                            output_logits,
+                            generate_logits,
                             output_scores,
                         ],
                         src=0,
@@ -282,7 +318,7 @@ class HuggingFaceLLMDeploy(ITritonDeployable):
                 top_p=top_p,
                 temperature=temperature,
                 max_new_tokens=num_tokens_to_generate,
-                output_logits=output_logits,
+                output_logits=generate_logits,
                 output_scores=output_scores,
                 return_dict_in_generate=return_dict_in_generate,
             )
@@ -290,25 +326,38 @@ class HuggingFaceLLMDeploy(ITritonDeployable):
             if isinstance(output, dict):
                 output_infer = {"sentences": cast_output(output["sentences"], np.bytes_)}
 
-                if "scores" in output.keys():
-                    output_scores = []
-                    for r in output["scores"]:
-                        lp = torch.tensor(r).cpu().detach().numpy()
-                        if len(lp) == 0:
-                            output_scores.append([0])
-                        else:
-                            output_scores.append(lp)
-                    output_infer["scores"] = np.array(output_scores).transpose(1, 0, 2)
-
-                if "logits" in output.keys():
-                    output_logits = []
-                    for r in output["logits"]:
-                        lp = torch.tensor(r).cpu().detach().numpy()
-                        if len(lp) == 0:
-                            output_logits.append([0])
-                        else:
-                            output_logits.append(lp)
-                    output_infer["logits"] = np.array(output_logits).transpose(1, 0, 2)
+                if compact_output:
+                    # The steps are stacked on the device and sent as float16 arrays of shape
+                    # [batch, steps, vocab_size], instead of copying and converting each step separately
+                    if "scores" in output.keys():
+                        output_infer["scores_fp16"] = torch.stack(output["scores"], dim=1).half().cpu().numpy()
+                    if output_logits and "logits" in output.keys():
+                        output_infer["logits_fp16"] = torch.stack(output["logits"], dim=1).half().cpu().numpy()
+                else:
+                    if "scores" in output.keys():
+                        output_scores = []
+                        for r in output["scores"]:
+                            lp = torch.tensor(r).cpu().detach().numpy()
+                            if len(lp) == 0:
+                                output_scores.append([0])
+                            else:
+                                output_scores.append(lp)
+                        output_infer["scores"] = np.array(output_scores).transpose(1, 0, 2)
+
+                    if output_logits and "logits" in output.keys():
+                        output_logits = []
+                        for r in output["logits"]:
+                            lp = torch.tensor(r).cpu().detach().numpy()
+                            if len(lp) == 0:
+                                output_logits.append([0])
+                            else:
+                                output_logits.append(lp)
+                        output_infer["logits"] = np.array(output_logits).transpose(1, 0, 2)
+
+                if top_logprobs > 0:
+                    output_infer["top_logprobs_ids"], output_infer["top_logprobs_values"] = pack_topk(
+                        torch.stack(output["logits"], dim=1), top_logprobs
+                    )
             else:
                 output_infer = {"sentences": cast_output(output, np.bytes_)}
 
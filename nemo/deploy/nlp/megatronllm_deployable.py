@@ -29,7 +29,14 @@ from megatron.core.inference.inference_request import InferenceRequest
 import nemo.lightning as nl
 from nemo.collections.llm import inference
 from nemo.deploy import ITritonDeployable
-from nemo.deploy.utils import NEMO2, broadcast_list, cast_output, nemo_checkpoint_version, str_ndarray2list
+from nemo.deploy.utils import (
+    NEMO2,
+    broadcast_list,
+    cast_output,
+    nemo_checkpoint_version,
+    pack_ragged,
+    str_ndarray2list,
+)
 
 
 @wrapt.decorator
@@ -288,6 +295,7 @@ class MegatronLLMDeployableNemo2(ITritonDeployable):
             Tensor(name="random_seed", shape=(-1,), dtype=np.int_, optional=True),
             Tensor(name="compute_logprob", shape=(-1,), dtype=np.bool_, optional=True),
             Tensor(name="apply_chat_template", shape=(-1,), dtype=np.bool_, optional=True),
+            Tensor(name="compact_output", shape=(-1,), dtype=np.bool_, optional=True),
         )
         return inputs
 
@@ -296,6 +304,8 @@ class MegatronLLMDeployableNemo2(ITritonDeployable):
         return (
             Tensor(name="sentences", shape=(-1,), dtype=bytes),
             Tensor(name="log_probs", shape=(-1,), dtype=np.single),
+            Tensor(name="log_probs_fp16", shape=(-1,), dtype=np.float16),
+            Tensor(name="lengths", shape=(1,), dtype=np.int32),
         )
 
     @batch
@@ -308,6 +318,7 @@ class MegatronLLMDeployableNemo2(ITritonDeployable):
         "random_seed",
         "compute_logprob",
         "apply_chat_template",
+        "compact_output",
     )
     def triton_infer_fn(self, **inputs: np.ndarray):
         output_infer = {}
@@ -320,6 +331,7 @@ class MegatronLLMDeployableNemo2(ITritonDeployable):
         num_tokens_to_generate = inputs.pop("max_length", 256)
         log_probs = inputs.pop("compute_logprob", False)
         apply_chat_template = inputs.pop("apply_chat_template", False)
+        compact_output = inputs.pop("compact_output", False)
         text_only = True
 
         if apply_chat_template:
@@ -357,7 +369,13 @@ class MegatronLLMDeployableNemo2(ITritonDeployable):
         output_texts = [r.generated_text if text_only else r for r in results]
         output_texts = self.remove_eos_token(output_texts)
         output_infer = {"sentences": cast_output(output_texts, np.bytes_)}
-        if log_probs:
+        if log_probs and compact_output:
+            # The log-probs of the batch are sent as one float16 array padded to the longest sequence, with the
+            # number of generated tokens of each prompt, instead of converting each sequence separately
+            output_infer["log_probs_fp16"], output_infer["lengths"] = pack_ragged(
+                [[] if r.generated_log_probs is None else r.generated_log_probs for r in results]
+            )
+        elif log_probs:
             output_log_probs = []  ## will have 2 np arrays if 2 prompts are sent
             for r in results:
                 # Convert to torch tensor and then move to cpu as generated_log_probs is a list and cant be moved
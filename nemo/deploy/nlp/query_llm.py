@@ -18,7 +18,7 @@ from typing import List, Optional
 
 import numpy as np
 
-from nemo.deploy.utils import str_list2numpy
+from nemo.deploy.utils import str_list2numpy, unpack_ragged
 
 use_pytriton = True
 try:
@@ -59,13 +59,28 @@ class NemoQueryLLMPyTorch(NemoQueryLLMBase):
             temperature=0.0,
         )
         print("prompts: ", prompts)
+
+    Args:
+        url (str): The URL of the inference server.
+        model_name (str): The name of the model to be queried.
+        keep_alive (bool): Whether to keep the client and its connection to the server open between queries, instead
+            of connecting for each query. The client is not thread-safe, so all queries must then be sent from the
+            same thread, and the client is closed with `close`.
     """
 
-    def __init__(self, url, model_name):
+    def __init__(self, url, model_name, keep_alive: bool = False):
         super().__init__(
             url=url,
             model_name=model_name,
         )
+        self.keep_alive = keep_alive
+        self._client = None
+
+    def close(self):
+        """Close the client which is kept alive between queries, if any."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
 
     # these arguments are explicitly defined in order to make it clear to user what they can pass
     # names and optionality should exactly match the get_triton_input() results for MegatronGPTDeployable
@@ -85,6 +100,7 @@ class NemoQueryLLMPyTorch(NemoQueryLLMBase):
         max_length: Optional[int] = None,
         apply_chat_template: bool = False,
         init_timeout: float = 60.0,
+        compact_output: Optional[bool] = None,
     ):
         """
         Query the Triton server synchronously and return a list of responses.
@@ -104,6 +120,8 @@ class NemoQueryLLMPyTorch(NemoQueryLLMBase):
             max_length (int): max generated tokens.
             apply_chat_template (bool): applies chat template if its a chat model. Default: False
             init_timeout (flat): timeout for the connection.
+            compact_output (bool): with compute_logprob, receive the log-probs as a float16 array padded to the
+                longest sequence and the lengths of the sequences, which are decoded to float32 arrays.
         """
         prompts = str_list2numpy(prompts)
         inputs = {
@@ -133,38 +151,57 @@ class NemoQueryLLMPyTorch(NemoQueryLLMBase):
             inputs["max_length"] = np.full(prompts.shape, max_length, dtype=np.int_)
         if apply_chat_template is not None:
             inputs["apply_chat_template"] = np.full(prompts.shape, apply_chat_template, dtype=np.bool_)
-
-        with ModelClient(self.url, self.model_name, init_timeout_s=init_timeout, inference_timeout_s=600) as client:
-            result_dict = client.infer_batch(**inputs)
-            output_type = client.model_config.outputs[0].dtype
-
-            log_probs_output = None
-            if "log_probs" in result_dict.keys():
-                log_probs_output = result_dict["log_probs"]
-
-            if output_type == np.bytes_:
-                if "sentences" in result_dict.keys():
-                    output = result_dict["sentences"]
-                else:
-                    return "Unknown output keyword."
-
-                sentences = np.char.decode(output.astype("bytes"), "utf-8")
-                openai_response = {
-                    "id": f"cmpl-{int(time.time())}",
-                    "object": "text_completion",
-                    "created": int(time.time()),
-                    "model": self.model_name,
-                    "choices": [{"text": sentences}],
-                }
-                if log_probs_output is not None:
-                    # logprobs are stored under choices in openai format.
-                    openai_response["choices"][0]["logprobs"] = {}
-                    openai_response["choices"][0]["logprobs"]["token_logprobs"] = log_probs_output
-                    # TODO athitten: get top_n_logprobs from mcore once available
-                    openai_response["choices"][0]["logprobs"]["top_logprobs"] = log_probs_output
-                return openai_response
+        if compact_output is not None:
+            inputs["compact_output"] = np.full(prompts.shape, compact_output, dtype=np.bool_)
+
+        if not self.keep_alive:
+            with ModelClient(
+                self.url, self.model_name, init_timeout_s=init_timeout, inference_timeout_s=600
+            ) as client:
+                return self._infer(client, inputs)
+
+        if self._client is None:
+            self._client = ModelClient(self.url, self.model_name, init_timeout_s=init_timeout, inference_timeout_s=600)
+        try:
+            return self._infer(self._client, inputs)
+        except Exception:
+            # The connection may be broken, so the next query connects again
+            self.close()
+            raise
+
+    def _infer(self, client, inputs):
+        result_dict = client.infer_batch(**inputs)
+        output_type = client.model_config.outputs[0].dtype
+
+        log_probs_output = None
+        if "log_probs_fp16" in result_dict.keys():
+            log_probs_output = unpack_ragged(result_dict["log_probs_fp16"], result_dict["lengths"])
+        elif "log_probs" in result_dict.keys():
+            log_probs_output = result_dict["log_probs"]
+
+        if output_type == np.bytes_:
+            if "sentences" in result_dict.keys():
+                output = result_dict["sentences"]
             else:
-                return result_dict["sentences"]
+                return "Unknown output keyword."
+
+            sentences = np.char.decode(output.astype("bytes"), "utf-8")
+            openai_response = {
+                "id": f"cmpl-{int(time.time())}",
+                "object": "text_completion",
+                "created": int(time.time()),
+                "model": self.model_name,
+                "choices": [{"text": sentences}],
+            }
+            if log_probs_output is not None:
+                # logprobs are stored under choices in openai format.
+                openai_response["choices"][0]["logprobs"] = {}
+                openai_response["choices"][0]["logprobs"]["token_logprobs"] = log_probs_output
+                # TODO athitten: get top_n_logprobs from mcore once available
+                openai_response["choices"][0]["logprobs"]["top_logprobs"] = log_probs_output
+            return openai_response
+        else:
+            return result_dict["sentences"]
 
 
 class NemoQueryLLMHF(NemoQueryLLMBase):
@@ -211,6 +248,8 @@ class NemoQueryLLMHF(NemoQueryLLMBase):
         min_length: Optional[int] = None,
         max_length: Optional[int] = None,
         init_timeout: float = 60.0,
+        compact_output: Optional[bool] = None,
+        top_logprobs: Optional[int] = None,
     ):
         """
         Query the Triton server synchronously and return a list of responses.
@@ -230,6 +269,10 @@ class NemoQueryLLMHF(NemoQueryLLMBase):
             min_length (Optional[int]): min generated tokens.
             max_length (Optional[int]): max generated tokens.
             init_timeout (float): timeout for the connection.
+            compact_output (Optional[bool]): receive the logits and scores as float16 arrays, which are decoded
+                to float32 arrays of shape [batch, steps, vocab_size].
+            top_logprobs (Optional[int]): number of most probable tokens whose ids and log-probs are returned
+                for each generated token, as "top_logprobs" with arrays of shape [batch, steps, top_logprobs].
         """
         prompts = str_list2numpy(prompts)
         inputs = {
@@ -259,6 +302,10 @@ class NemoQueryLLMHF(NemoQueryLLMBase):
             inputs["min_length"] = np.full(prompts.shape, min_length, dtype=np.int_)
         if max_length is not None:
             inputs["max_length"] = np.full(prompts.shape, max_length, dtype=np.int_)
+        if compact_output is not None:
+            inputs["compact_output"] = np.full(prompts.shape, compact_output, dtype=np.bool_)
+        if top_logprobs is not None:
+            inputs["top_logprobs"] = np.full(prompts.shape, top_logprobs, dtype=np.int_)
 
         with ModelClient(self.url, self.model_name, init_timeout_s=init_timeout) as client:
             result_dict = client.infer_batch(**inputs)
@@ -278,10 +325,19 @@ class NemoQueryLLMHF(NemoQueryLLMBase):
                     "model": self.model_name,
                     "choices": [{"text": sentences}],
                 }
-                if output_logits and "logits" in result_dict:
+                if output_logits and "logits_fp16" in result_dict:
+                    openai_response["logits"] = result_dict["logits_fp16"].astype(np.float32)
+                elif output_logits and "logits" in result_dict:
                     openai_response["logits"] = result_dict["logits"]
-                if output_scores and "scores" in result_dict:
+                if output_scores and "scores_fp16" in result_dict:
+                    openai_response["scores"] = result_dict["scores_fp16"].astype(np.float32)
+                elif output_scores and "scores" in result_dict:
                     openai_response["scores"] = result_dict["scores"]
+                if "top_logprobs_ids" in result_dict:
+                    openai_response["top_logprobs"] = {
+                        "token_ids": result_dict["top_logprobs_ids"],
+                        "logprobs": result_dict["top_logprobs_values"].astype(np.float32),
+                    }
                 return openai_response
             else:
                 return result_dict["sentences"]
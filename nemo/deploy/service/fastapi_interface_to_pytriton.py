@@ -17,23 +17,32 @@ from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, model_validator
 from pydantic_settings import BaseSettings
 
-from nemo.deploy.nlp import NemoQueryLLMPyTorch
+from nemo.deploy.service.query_llm_pool import AsyncQueryLLMPool, QueryLLMCoalescer
 from nemo.utils import logging
 
 
 class TritonSettings(BaseSettings):
     """
-    TritonSettings class that gets the values of TRITON_HTTP_ADDRESS and TRITON_PORT.
+    TritonSettings class that gets the values of TRITON_HTTP_ADDRESS and TRITON_PORT, and of the settings of the
+    clients of the Triton server: TRITON_CLIENT_POOL_SIZE, the number of concurrent queries to the server,
+    TRITON_COALESCE_WINDOW_MS, the time to wait for concurrent requests to merge into one query (0 to not merge), and
+    TRITON_MAX_BATCH_SIZE, the maximum number of prompts of a merged query.
     """
 
     _triton_service_port: int
     _triton_service_ip: str
+    _client_pool_size: int = 8
+    _coalesce_window_ms: float = 5.0
+    _max_batch_size: int = 8
 
     def __init__(self):
         super(TritonSettings, self).__init__()
         try:
             self._triton_service_port = int(os.environ.get('TRITON_PORT', 8000))
             self._triton_service_ip = os.environ.get('TRITON_HTTP_ADDRESS', '0.0.0.0')
+            self._client_pool_size = int(os.environ.get('TRITON_CLIENT_POOL_SIZE', 8))
+            self._coalesce_window_ms = float(os.environ.get('TRITON_COALESCE_WINDOW_MS', 5.0))
+            self._max_batch_size = int(os.environ.get('TRITON_MAX_BATCH_SIZE', 8))
         except Exception as error:
             logging.error("An exception occurred trying to retrieve set args in TritonSettings class. Error:", error)
             return
@@ -52,9 +61,56 @@ class TritonSettings(BaseSettings):
         """
         return self._triton_service_ip
 
+    @property
+    def client_pool_size(self):
+        """
+        Returns the number of concurrent queries to the Triton service.
+        """
+        return self._client_pool_size
+
+    @property
+    def coalesce_window_ms(self):
+        """
+        Returns the time in milliseconds to wait for concurrent requests to merge into one query.
+        """
+        return self._coalesce_window_ms
+
+    @property
+    def max_batch_size(self):
+        """
+        Returns the maximum number of prompts of a merged query.
+        """
+        return self._max_batch_size
+
 
 app = FastAPI()
 triton_settings = TritonSettings()
+# Coalescers of the queries to each Triton server, which send them with a pool of clients kept alive between requests
+_query_coalescers = {}
+
+
+def get_query_coalescer(url: str) -> QueryLLMCoalescer:
+    """
+    Returns the coalescer of the queries to the Triton server at `url`, which is created on first use.
+    """
+    if url not in _query_coalescers:
+        pool = AsyncQueryLLMPool(url=url, max_workers=triton_settings.client_pool_size, init_timeout=300)
+        _query_coalescers[url] = QueryLLMCoalescer(
+            pool,
+            window=triton_settings.coalesce_window_ms / 1000,
+            max_batch_size=triton_settings.max_batch_size,
+        )
+    return _query_coalescers[url]
+
+
+@app.on_event("shutdown")
+def close_query_pools():
+    """
+    Closes the clients of the Triton servers.
+    """
+    for coalescer in _query_coalescers.values():
+        coalescer.pool.close()
+    _query_coalescers.clear()
 
 
 class CompletionRequest(BaseModel):
@@ -137,12 +193,16 @@ def convert_numpy(obj):
         return obj
 
 
-def _helper_fun(url, model, prompts, temperature, top_k, top_p, compute_logprob, max_length, apply_chat_template):
+async def query_llm_async(
+    *, url, model, prompts, temperature, top_k, top_p, compute_logprob, max_length, apply_chat_template
+):
     """
-    run_in_executor doesn't allow to pass kwargs, so we have this helper function to pass args as a list
+    Sends requests to `NemoQueryLLMPyTorch.query_llm` in a non-blocking way, allowing the server to process
+    concurrent requests. Concurrent requests with the same parameters are merged into one query, and the queries are
+    sent with a pool of clients whose connections to the Triton server are kept alive, see `get_query_coalescer`.
     """
-    nq = NemoQueryLLMPyTorch(url=url, model_name=model)
-    output = nq.query_llm(
+    return await get_query_coalescer(url).query_llm(
+        model,
         prompts=prompts,
         temperature=temperature,
         top_k=top_k,
@@ -150,37 +210,7 @@ def _helper_fun(url, model, prompts, temperature, top_k, top_p, compute_logprob,
         compute_logprob=compute_logprob,
         max_length=max_length,
         apply_chat_template=apply_chat_template,
-        init_timeout=300,
     )
-    return output
-
-
-async def query_llm_async(
-    *, url, model, prompts, temperature, top_k, top_p, compute_logprob, max_length, apply_chat_template
-):
-    """
-    Sends requests to `NemoQueryLLMPyTorch.query_llm` in a non-blocking way, allowing the server to process
-    concurrent requests. This way enables batching of requests in the underlying Triton server.
-    """
-    import asyncio
-    import concurrent
-
-    loop = asyncio.get_event_loop()
-    with concurrent.futures.ThreadPoolExecutor() as pool:
-        result = await loop.run_in_executor(
-            pool,
-            _helper_fun,
-            url,
-            model,
-            prompts,
-            temperature,
-            top_k,
-            top_p,
-            compute_logprob,
-            max_length,
-            apply_chat_template,
-        )
-    return result
 
 
 @app.post("/v1/completions/")
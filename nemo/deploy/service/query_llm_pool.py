@@ -0,0 +1,186 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from nemo.deploy.nlp.query_llm import NemoQueryLLMPyTorch
+
+
+class AsyncQueryLLMPool:
+    """
+    Sends queries to the models deployed on a PyTriton server from a fixed pool of threads, without blocking the
+    event loop.
+
+    Each thread keeps one `NemoQueryLLMPyTorch` client per model alive, so that its connection to the server is
+    reused across queries instead of being set up for every query. PyTriton clients are not thread-safe, so a client
+    is only used by the thread which created it. The number of threads bounds the number of concurrent queries to the
+    server, and further queries wait for a free thread.
+
+    Args:
+        url (str): The URL of the inference server.
+        max_workers (int): Number of threads, and thus of concurrent queries and open connections per model.
+        init_timeout (float): Timeout for connecting to the server.
+        query_factory (Callable): Creates the client of a thread for a model from the URL and the model name.
+            Defaults to a `NemoQueryLLMPyTorch` which keeps its connection alive.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_workers: int = 8,
+        init_timeout: float = 300.0,
+        query_factory: Optional[Callable[[str, str], NemoQueryLLMPyTorch]] = None,
+    ):
+        self.url = url
+        self.max_workers = max_workers
+        self.init_timeout = init_timeout
+        self.query_factory = query_factory or partial(NemoQueryLLMPyTorch, keep_alive=True)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="query_llm")
+        self._local = threading.local()
+        self._queries = []
+        self._lock = threading.Lock()
+
+    def _get_query(self, model: str) -> NemoQueryLLMPyTorch:
+        queries = getattr(self._local, "queries", None)
+        if queries is None:
+            queries = self._local.queries = {}
+        if model not in queries:
+            queries[model] = self.query_factory(self.url, model)
+            with self._lock:
+                self._queries.append(queries[model])
+        return queries[model]
+
+    def _query_llm(self, model: str, kwargs: Dict[str, Any]) -> Any:
+        return self._get_query(model).query_llm(init_timeout=self.init_timeout, **kwargs)
+
+    async def query_llm(self, model: str, **kwargs) -> Any:
+        """Send a query to a model, with the arguments of `NemoQueryLLMPyTorch.query_llm`."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._query_llm, model, kwargs)
+
+    def close(self):
+        """Wait for the running queries and close the clients."""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for query in self._queries:
+                if hasattr(query, "close"):
+                    query.close()
+            self._queries = []
+
+
+@dataclass
+class _PendingBatch:
+    prompts: List[str] = field(default_factory=list)
+    # Future of each merged query, with the range of its prompts in the batch
+    futures: List[asyncio.Future] = field(default_factory=list)
+    ranges: List[range] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+def split_query_output(output: Any, prompt_range: range) -> Any:
+    """
+    Return the part of the output of `NemoQueryLLMPyTorch.query_llm` which belongs to a range of its prompts.
+    """
+    if isinstance(output, dict):
+        output = dict(output)
+        output["choices"] = [
+            dict(choice, text=choice["text"][prompt_range.start : prompt_range.stop]) for choice in output["choices"]
+        ]
+        return output
+    if isinstance(output, np.ndarray):
+        return output[prompt_range.start : prompt_range.stop]
+    return output
+
+
+class QueryLLMCoalescer:
+    """
+    Merges concurrent queries of a model with the same generation parameters into one query with all of their
+    prompts, which is sent with an `AsyncQueryLLMPool`, and splits its output again. This lets the deployed model
+    generate the outputs of concurrent queries in one batch.
+
+    The first query of a batch waits for at most `window` seconds for other queries, and a batch is sent as soon as it
+    has `max_batch_size` prompts. Queries which compute log probabilities are not merged, because the log
+    probabilities of different prompts are not padded to the same length.
+
+    Args:
+        pool (AsyncQueryLLMPool): The pool which sends the merged queries.
+        window (float): Time in seconds to wait for other queries after the first query of a batch. Queries are not
+            merged if it is 0.
+        max_batch_size (int): Maximum number of prompts of a merged query, which must not exceed the maximum batch
+            size of the deployed model.
+    """
+
+    def __init__(self, pool: AsyncQueryLLMPool, window: float = 0.005, max_batch_size: int = 8):
+        self.pool = pool
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._batches: Dict[tuple, _PendingBatch] = {}
+        # References to the running batches, which asyncio only keeps weakly
+        self._tasks = set()
+
+    async def query_llm(self, model: str, prompts: List[str], **kwargs) -> Any:
+        """Send a query to a model, with the arguments of `NemoQueryLLMPyTorch.query_llm`."""
+        if self.window <= 0 or kwargs.get("compute_logprob") or len(prompts) >= self.max_batch_size:
+            return await self.pool.query_llm(model, prompts=prompts, **kwargs)
+
+        key = (model, tuple(sorted(kwargs.items())))
+        try:
+            batch = self._batches.get(key)
+        except TypeError:
+            # Parameters like lists of end strings are not compared
+            return await self.pool.query_llm(model, prompts=prompts, **kwargs)
+        if batch is not None and len(batch.prompts) + len(prompts) > self.max_batch_size:
+            self._send(key, batch)
+            batch = None
+        loop = asyncio.get_running_loop()
+        if batch is None:
+            batch = self._batches[key] = _PendingBatch()
+            batch.timer = loop.call_later(self.window, self._send, key, batch)
+
+        future = loop.create_future()
+        batch.futures.append(future)
+        batch.ranges.append(range(len(batch.prompts), len(batch.prompts) + len(prompts)))
+        batch.prompts.extend(prompts)
+        if len(batch.prompts) >= self.max_batch_size:
+            self._send(key, batch)
+        return await future
+
+    def _send(self, key: tuple, batch: _PendingBatch):
+        if self._batches.get(key) is batch:
+            del self._batches[key]
+        batch.timer.cancel()
+        task = asyncio.ensure_future(self._query_batch(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _query_batch(self, key: tuple, batch: _PendingBatch):
+        model, kwargs = key
+        try:
+            output = await self.pool.query_llm(model, prompts=batch.prompts, **dict(kwargs))
+        except Exception as e:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, prompt_range in zip(batch.futures, batch.ranges):
+            if not future.done():
+                future.set_result(output if len(batch.futures) == 1 else split_query_output(output, prompt_range))
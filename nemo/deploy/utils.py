@@ -187,6 +187,72 @@ def cast_output(data, required_dtype):
     return data.astype(required_dtype)
 
 
+def pack_ragged(sequences, dtype=torch.float16) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """Packs sequences of different lengths into one contiguous array for a binary Triton output.
+
+    The sequences are stacked on their device and padded with zeros to the longest sequence, so that
+    the output is copied to the host at once and sent as a single tensor, one row per request of the
+    batch. The lengths of the sequences are the offsets used by `unpack_ragged` to recover them.
+
+    Args:
+        sequences: Sequences of values, each a torch.Tensor, numpy array or list, of shape [length, ...].
+        dtype: The torch dtype of the packed values. Defaults to torch.float16.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The packed values of shape [num_sequences, max_length, ...] and
+            the int32 lengths of the sequences, of shape [num_sequences, 1].
+    """
+    tensors = [torch.as_tensor(sequence) for sequence in sequences]
+    lengths = np.array([len(tensor) for tensor in tensors], dtype=np.int32)[:, np.newaxis]
+    if not tensors:
+        return torch.zeros((0, 0), dtype=dtype).numpy(), lengths
+
+    device = tensors[0].device
+    tensors = [tensor.to(device=device, dtype=dtype) for tensor in tensors]
+    values = torch.nn.utils.rnn.pad_sequence(tensors, batch_first=True)
+    return values.cpu().numpy(), lengths
+
+
+def unpack_ragged(values: np.ndarray, lengths: np.ndarray) -> typing.List[np.ndarray]:
+    """Recovers the sequences packed by `pack_ragged` as float32 arrays.
+
+    The valid values of all sequences are gathered with a mask and cast at once, and the sequences are
+    views of the resulting contiguous array, so the values are not iterated in Python.
+
+    Args:
+        values (np.ndarray): Packed values of shape [num_sequences, max_length, ...].
+        lengths (np.ndarray): Lengths of the sequences, of shape [num_sequences] or [num_sequences, 1].
+
+    Returns:
+        List[np.ndarray]: The sequences, each of shape [length, ...].
+    """
+    lengths = np.asarray(lengths).reshape(-1)
+    if len(lengths) == 0:
+        return []
+    mask = np.arange(values.shape[1]) < lengths[:, np.newaxis]
+    flat = values[mask].astype(np.float32)
+    return np.split(flat, np.cumsum(lengths)[:-1])
+
+
+def pack_topk(logits: torch.Tensor, k: int) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """Packs the k most probable tokens of each position as token id and log-probability arrays.
+
+    Sending the top k log-probabilities instead of the logits reduces the output of each position from
+    the vocabulary size to k values.
+
+    Args:
+        logits (torch.Tensor): Logits of shape [..., vocab_size].
+        k (int): Number of tokens kept for each position.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The int32 token ids and the float16 log-probabilities of the k most
+            probable tokens, both of shape [..., k] and sorted by decreasing probability.
+    """
+    log_probs = torch.log_softmax(logits.float(), dim=-1)
+    values, indices = log_probs.topk(min(k, log_probs.shape[-1]), dim=-1)
+    return indices.to(torch.int32).cpu().numpy(), values.to(torch.float16).cpu().numpy()
+
+
 def broadcast_list(data, src=0, group=None):
     """Broadcasts a list of text data to all processes.
 
@@ -13,9 +13,12 @@
 # limitations under the License.
 
 import inspect
+import json
+import os
 import re
-from dataclasses import dataclass
-from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar, Union, overload
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar, Union, overload
 
 import numpy as np
 import torch
@@ -37,6 +40,8 @@ class TransformCTX:
     source_state: dict
     target: nn.Module
     target_state: dict
+    # Key indices of the state dicts, shared by all transforms applied to this context
+    _key_indices: dict = field(default_factory=dict, init=False, repr=False, compare=False)
 
 
 class _ModelState:
@@ -60,9 +65,78 @@ class _ModelState:
             self._state_dict[k] = v.to(dtype)
 
 
+class _SafetensorsModelState:
+    """
+    Helper class for converting a source model from a checkpoint in safetensors format, like the checkpoints of
+    Hugging Face models, without loading the model. The tensors are only read from the checkpoint files by
+    `apply_transforms`, one file at a time.
+
+    Args:
+        path: Directory of the checkpoint, with a `model.safetensors.index.json` index or `*.safetensors` files.
+        config: Config of the source model, for the transforms which use `ctx.source.config`.
+    """
+
+    def __init__(self, path: Union[str, Path], config=None):
+        from safetensors import safe_open
+
+        self.path = Path(path)
+        self.config = config
+        # Keys of the tensors in each file, in the order of the files
+        self.files: Dict[str, List[str]] = {}
+        index_path = self.path / "model.safetensors.index.json"
+        if index_path.exists():
+            with open(index_path) as f:
+                weight_map = json.load(f)["weight_map"]
+            for key, file in sorted(weight_map.items(), key=lambda item: item[1]):
+                self.files.setdefault(file, []).append(key)
+        else:
+            for file_path in sorted(self.path.glob("*.safetensors")):
+                with safe_open(file_path, framework="pt") as f:
+                    self.files[file_path.name] = list(f.keys())
+        if not self.files:
+            raise FileNotFoundError(f"No safetensors files found in {self.path}")
+
+    @classmethod
+    def from_pretrained(cls, path: Union[str, Path], config=None) -> "_SafetensorsModelState":
+        """Create the model state of a local checkpoint directory, or of a model on the Hugging Face Hub."""
+        if not os.path.isdir(path):
+            from huggingface_hub import snapshot_download
+
+            path = snapshot_download(repo_id=str(path), allow_patterns=["*.safetensors", "*.json"])
+        return cls(path, config=config)
+
+    @property
+    def dtype(self) -> Optional[torch.dtype]:
+        # pylint: disable=C0115,C0116
+        dtype = getattr(self.config, "dtype", None) or getattr(self.config, "torch_dtype", None)
+        if isinstance(dtype, str):
+            dtype = getattr(torch, dtype)
+        return dtype
+
+    def state_dict(self) -> Dict[str, None]:
+        """Keys of the checkpoint, without their tensors, which are read with `load_file`."""
+        return {key: None for keys in self.files.values() for key in keys}
+
+    def load_file(self, file: str, keys: List[str]) -> Dict[str, torch.Tensor]:
+        """
+        Read the tensors of some keys of a checkpoint file, in the dtype of the config if it has one, like the
+        weights of a model loaded with `torch_dtype='auto'`.
+        """
+        from safetensors import safe_open
+
+        dtype = self.dtype
+        with safe_open(self.path / file, framework="pt") as f:
+            tensors = {key: f.get_tensor(key) for key in keys}
+        if dtype is not None:
+            tensors = {
+                key: tensor.to(dtype) if tensor.is_floating_point() else tensor for key, tensor in tensors.items()
+            }
+        return tensors
+
+
 @torch.no_grad
 def apply_transforms(
-    source: Union[nn.Module, _ModelState],
+    source: Union[nn.Module, _ModelState, _SafetensorsModelState],
     target: TargetModuleT,
     mapping: Dict[str, str],
     transforms: Optional[List[Callable[[TransformCTX], TransformCTX]]] = [],
@@ -77,7 +151,9 @@ def apply_transforms(
     with `io.state_transform`.
 
     Args:
-        source (nn.Module): The source module from which parameters and buffers are taken.
+        source (nn.Module): The source module from which parameters and buffers are taken. If it is a
+            `_SafetensorsModelState`, the checkpoint is converted one file at a time and the converted
+            tensors are copied into the parameters and buffers of the target, see `_stream_transforms`.
         target (TargetModuleT): The target module to which parameters and buffers are adapted.
         mapping (Dict[str, str]): Key-value pairs where each key from the source state dictionary
             is mapped to a corresponding key in the target state dictionary.
@@ -138,6 +214,15 @@ def apply_transforms(
     if hasattr(target, "module") and isinstance(target.module, MegatronModule):
         _target = target.module
 
+    if isinstance(source, _SafetensorsModelState):
+        _apply_streamed_transforms(source, _target, mapping, transforms, state_dict_ignored_entries)
+        if hasattr(target, "module") and isinstance(target.module, MegatronModule):
+            target.module = _target
+
+            return target
+
+        return _target
+
     # Track dtypes to make sure they weren't modified during conversion.
     target_orig_dtypes = extract_dtypes(_target.named_parameters())
 
@@ -235,6 +320,164 @@ def apply_transforms(
     return _target
 
 
+@dataclass
+class _TransformCall:
+    """A call of the function of a `StateDictTransform`, with the keys of its arguments and of its outputs."""
+
+    args: Tuple[str, ...] = ()
+    kwargs: Dict[str, str] = field(default_factory=dict)
+    target: Any = None
+    # Whether the function returns a sequence of outputs, one for each key of `target`
+    spread_outputs: bool = False
+
+    def source_keys(self) -> List[str]:
+        """Keys of the source state dict which are passed to the function."""
+        return list(self.args) + list(self.kwargs.values())
+
+    def target_keys(self) -> List[str]:
+        """Keys of the target state dict which the outputs of the function are assigned to."""
+        return list(self.target) if self.spread_outputs else [self.target]
+
+
+def _stream_transforms(
+    source: _SafetensorsModelState,
+    ctx: TransformCTX,
+    transforms: List["StateDictTransform"],
+    write_fn: Callable[[Optional[str], torch.Tensor], None],
+):
+    """
+    Apply transforms to a checkpoint in safetensors format, reading one checkpoint file at a time.
+
+    The calls of the transform functions are planned from the keys of the state dicts. A call is run as soon as all
+    of its source tensors are read, and a source tensor is released after its last call, so that the peak memory is
+    bounded by a checkpoint file and the source tensors of the calls spanning several files, instead of the whole
+    checkpoint. The output of the last call which assigns a target key, like when the transforms are applied in
+    order, is passed to `write_fn`, after which the target state of the context is restored.
+    """
+    ctx.source_state = source.state_dict()
+    calls = []
+    for transform in transforms:
+        if not isinstance(transform, StateDictTransform):
+            raise ValueError(f"Transforms of a safetensors checkpoint must be StateDictTransforms, got {transform}.")
+        calls.extend((transform, call) for call in transform.plan(ctx))
+
+    last_calls = {}
+    # Number of source tensors which each call waits for, and the calls waiting for each source tensor
+    num_missing = []
+    waiting_calls: Dict[str, List[int]] = {}
+    for i, (_, call) in enumerate(calls):
+        for key in call.target_keys():
+            last_calls[key] = i
+        source_keys = set(call.source_keys())
+        num_missing.append(len(source_keys))
+        for key in source_keys:
+            waiting_calls.setdefault(key, []).append(i)
+    num_uses = {key: len(waiting) for key, waiting in waiting_calls.items()}
+
+    loaded = {}
+    read_keys = set()
+    ctx.source_state = loaded
+
+    def run_call(i: int):
+        transform, call = calls[i]
+        target_keys = call.target_keys()
+        target_state = {key: ctx.target_state[key] for key in target_keys if key in ctx.target_state}
+        transform.run(ctx, call)
+        for key in target_keys:
+            if last_calls[key] == i:
+                write_fn(key, ctx.target_state[key])
+            if key in target_state:
+                ctx.target_state[key] = target_state[key]
+            else:
+                ctx.target_state.pop(key, None)
+        for key in set(call.source_keys()):
+            num_uses[key] -= 1
+            if num_uses[key] == 0:
+                del loaded[key]
+
+    for i in range(len(calls)):
+        if num_missing[i] == 0:
+            run_call(i)
+    for file, keys in source.files.items():
+        keys = [key for key in keys if key in waiting_calls]
+        if not keys:
+            continue
+        logging.debug(f"Converting {len(keys)} tensors of {file}")
+        loaded.update(source.load_file(file, keys))
+        read_keys.update(keys)
+        ready = []
+        for key in keys:
+            for i in waiting_calls[key]:
+                num_missing[i] -= 1
+                if num_missing[i] == 0:
+                    ready.append(i)
+        for i in sorted(ready):
+            run_call(i)
+
+    missing_keys = sorted(str(key) for key in waiting_calls if key not in read_keys)
+    if missing_keys:
+        raise ValueError(f"Source keys {missing_keys} not found in the checkpoint files of {source.path}.")
+
+
+def _set_module_tensor(module: nn.Module, key: str, tensor: nn.Parameter, is_buffer: bool = False):
+    for part in key.split(".")[:-1]:
+        module = getattr(module, part)
+    if is_buffer:
+        module.register_buffer(key.split(".")[-1], tensor)
+    else:
+        module.register_parameter(key.split(".")[-1], tensor)
+
+
+def _apply_streamed_transforms(
+    source: _SafetensorsModelState,
+    target: nn.Module,
+    mapping: Dict[str, str],
+    transforms: List["StateDictTransform"],
+    state_dict_ignored_entries: List,
+):
+    """
+    `apply_transforms` for a checkpoint in safetensors format. The converted tensors are copied into the parameters
+    and buffers of the target as soon as they are complete, or replace them if they are on the meta device.
+    """
+    params = dict(target.named_parameters())
+    buffers = dict(target.named_buffers())
+    ctx = TransformCTX(source=source, source_state={}, target=target, target_state=target.state_dict())
+    additional_keys = []
+
+    def copy_to_target(key: Optional[str], tensor: torch.Tensor):
+        target_tensor = params.get(key, buffers.get(key))
+        if target_tensor is None:
+            if key is not None and not key.endswith("_extra_state") and key not in state_dict_ignored_entries:
+                additional_keys.append(key)
+            return
+        if target_tensor.shape != tensor.shape:
+            raise ValueError(
+                f"Shape mismatch for {key}: target shape {target_tensor.shape} vs converted source shape {tensor.shape}"
+            )
+        if target_tensor.dtype != tensor.dtype:
+            raise ValueError(
+                f"dtype mismatch for {key}: target dtype {target_tensor.dtype} vs converted source dtype {tensor.dtype}"
+            )
+        if not target_tensor.is_meta:
+            target_tensor.data.copy_(tensor)
+        elif key in params:
+            _set_module_tensor(target, key, nn.Parameter(tensor, requires_grad=target_tensor.requires_grad))
+        else:
+            _set_module_tensor(target, key, tensor, is_buffer=True)
+
+    transforms = [StateDictTransform(key, val) for key, val in mapping.items()] + list(transforms)
+    _stream_transforms(source, ctx, transforms, copy_to_target)
+
+    if additional_keys:
+        raise RuntimeError(f"Additional keys: {additional_keys} in checkpoint but not in model.")
+
+    meta_tensor_keys = [name for name, param in target.named_parameters() if param.is_meta]
+    assert not meta_tensor_keys, (
+        f"{meta_tensor_keys}\nThere are meta tensors in the model after conversion."
+        f"Did you forget to include these parameters in the mapping or transforms in `convert_state`?"
+    )
+
+
 def _default_transform(inp):
     return inp
 
@@ -274,6 +517,17 @@ class StateDictTransform(Generic[F]):
         self.transform = transform
 
     def __call__(self, ctx: TransformCTX) -> TransformCTX:
+        for call in self.plan(ctx):
+            self.run(ctx, call)
+
+        return ctx
+
+    def plan(self, ctx: TransformCTX) -> List["_TransformCall"]:
+        """
+        Match the source and target keys of the transform against the state dicts of the context, and return the
+        calls of the transform function in the order in which they are run. Only the keys of the state dicts are
+        used, so that the calls can be planned before the source tensors are loaded.
+        """
         source_key = self.source_key
         target_key = self.target_key
         source_dict, target_dict = ctx.source_state, ctx.target_state
@@ -281,13 +535,15 @@ class StateDictTransform(Generic[F]):
         fn_params = dict(inspect.signature(self.transform).parameters)
         fn_params.pop("ctx", None)
 
+        calls = []
         if isinstance(source_key, (dict, tuple)):
             if isinstance(source_key, tuple):
                 source_key_dict = {param: source_key[i] for i, param in enumerate(fn_params)}
             else:
                 source_key_dict = source_key
-            source_matches_dict = {k: _match_keys(list(source_dict.keys()), v) for k, v in source_key_dict.items()}
-            target_matches = _match_keys(list(target_dict.keys()), target_key)
+            source_index = _get_key_index(ctx, source_dict)
+            source_matches_dict = {k: source_index.match(v) for k, v in source_key_dict.items()}
+            target_matches = _get_key_index(ctx, target_dict).match(target_key)
             param_names = list(filter(lambda x: x in source_matches_dict, fn_params))
             source_matches = [
                 source_matches_dict[v] if source_matches_dict[v].ndim > 0 else [source_matches_dict[v].item()]
@@ -299,25 +555,24 @@ class StateDictTransform(Generic[F]):
                 if isinstance(layer_names_group[0], str):
                     layer_names_group = [[x] for x in layer_names_group]
                 for layer_names in zip(*layer_names_group):
-                    target_dict[layer_names[-1]] = self.call_transform(
-                        ctx, **dict(zip(param_names, [source_dict[x] for x in layer_names[:-1]]))
-                    )
+                    kwargs = dict(zip(param_names, layer_names[:-1]))
+                    calls.append(_TransformCall(kwargs=kwargs, target=layer_names[-1]))
         else:
-            source_keys = list(source_dict.keys())
-            target_keys = list(target_dict.keys())
+            source_index = _get_key_index(ctx, source_dict)
+            target_index = _get_key_index(ctx, target_dict)
 
-            source_matches = _match_keys(source_keys, source_key)
+            source_matches = source_index.match(source_key)
             if source_matches.size == 1 and source_matches == np.array(None):
                 raise ValueError(f"No matches found for source key: {source_key}")
 
             if isinstance(target_key, str):
-                target_matches = _match_keys(target_keys, target_key)
+                target_matches = target_index.match(target_key)
                 if target_matches.size == 1 and target_matches == np.array(None):
                     raise ValueError(f"No matches found for target key: {target_key}")
             else:
                 if isinstance(target_key, dict):
                     raise ValueError("Target key must be a string or a tuple of strings.")
-                _matches = [_match_keys(target_keys, key) for key in target_key]
+                _matches = [target_index.match(key) for key in target_key]
                 target_matches = np.stack(_matches, axis=-1)
 
             # Determine if we are dealing with multiple source matches or multiple target matches
@@ -334,8 +589,7 @@ class StateDictTransform(Generic[F]):
                         logging.error(f"Enountered IndexError during transform.\n{source_matches=}\n{target_matches=}")
                         raise e
                     if accepts_var_args:
-                        source_values = [source_dict[k] for k in source_match]
-                        target_dict[target_match] = self.call_transform(ctx, *source_values)
+                        calls.append(_TransformCall(args=tuple(source_match), target=target_match))
                     else:
                         _source_match_list = [source_match] if isinstance(source_match, str) else list(source_match)
                         if len(fn_params) != len(_source_match_list):
@@ -343,31 +597,37 @@ class StateDictTransform(Generic[F]):
                                 f"Mismatch between source and target keys: {source_match} vs {target_match}"
                             )
 
-                        kwargs = {param: source_dict[k] for param, k in zip(fn_params, _source_match_list)}
-                        target_dict[target_match] = self.call_transform(ctx, **kwargs)
+                        kwargs = {param: k for param, k in zip(fn_params, _source_match_list)}
+                        calls.append(_TransformCall(kwargs=kwargs, target=target_match))
                     logging.debug(f"Matched (multi source)! {target_match=} {source_match=}")
             else:
                 for source_index, source_match in np.ndenumerate(source_matches):
                     target_match = target_matches[source_index]
-                    source_values = (
-                        [source_dict[source_match]]
-                        if np.isscalar(source_match)
-                        else [source_dict[k] for k in source_match]
-                    )
+                    source_keys = [source_match] if np.isscalar(source_match) else list(source_match)
+                    # Transforms with several target keys return one output per target key
+                    spread_outputs = not isinstance(target_match, str)
                     if accepts_var_args:
-                        outputs = self.call_transform(ctx, *source_values)
-                    else:
-                        kwargs = {param: val for param, val in zip(fn_params, source_values)}
-                        outputs = self.call_transform(ctx, **kwargs)
-
-                    if isinstance(target_match, str):
-                        target_dict[target_match] = outputs
+                        calls.append(
+                            _TransformCall(args=tuple(source_keys), target=target_match, spread_outputs=spread_outputs)
+                        )
                     else:
-                        for i, t in enumerate(outputs):
-                            target_dict[target_match[i]] = t
+                        kwargs = {param: k for param, k in zip(fn_params, source_keys)}
+                        calls.append(_TransformCall(kwargs=kwargs, target=target_match, spread_outputs=spread_outputs))
                     logging.debug(f"Matched (single source)! {target_match=} {source_match=}")
 
-        return ctx
+        return calls
+
+    def run(self, ctx: TransformCTX, call: "_TransformCall"):
+        """Run a call of the transform function, which was planned by `plan`, on the state dicts of the context."""
+        source_dict, target_dict = ctx.source_state, ctx.target_state
+        args = [source_dict[k] for k in call.args]
+        kwargs = {param: source_dict[k] for param, k in call.kwargs.items()}
+        outputs = self.call_transform(ctx, *args, **kwargs)
+        if call.spread_outputs:
+            for i, t in enumerate(outputs):
+                target_dict[call.target[i]] = t
+        else:
+            target_dict[call.target] = outputs
 
     def call_transform(self, ctx: TransformCTX, *args, **kwargs):
         """Perform transform and check if the given args valid."""
@@ -387,18 +647,21 @@ class StateDictTransform(Generic[F]):
         return self.transform(*args, **kwargs)
 
 
-def _match_keys(keys: List[str], pattern: str) -> np.ndarray:
+# Characters which make a key pattern a regular expression, which is compared with all keys
+_REGEX_SPECIAL_CHARS = frozenset("()[]{}?+|^$\\")
+# Digits of the keys, like layer and expert numbers, which are removed from the shapes of the keys
+_DIGITS = '0123456789'
+
+
+def _wildcard_regex(pattern: str) -> str:
     escaped_pattern = ''
     i = 0
-    wildcard_positions = []
     while i < len(pattern):
         if pattern[i : i + 2] == '**':
             escaped_pattern += r'(.+)'  # Match any characters including dots
-            wildcard_positions.append('**')
             i += 2
         elif pattern[i] == '*':
             escaped_pattern += r'([^.]+)'  # Match any characters except dots
-            wildcard_positions.append('*')
             i += 1
         else:
             if pattern[i] == '.':
@@ -406,40 +669,120 @@ def _match_keys(keys: List[str], pattern: str) -> np.ndarray:
             else:
                 escaped_pattern += pattern[i]
             i += 1
+    return "^" + escaped_pattern + "$"
+
+
+class _StateKeyIndex:
+    """
+    Index of the keys of a state dict, to match key patterns with wildcards without comparing them with all keys.
+
+    The keys are grouped by their shape, which is the key without digits. State dicts are large because of their
+    layer and expert numbers, so they only have a few shapes. A pattern is first compared with the shapes, and then
+    only with the keys of the shapes which it can match.
 
-    regex_pattern = re.compile("^" + escaped_pattern + "$")
-    num_wildcards = len(wildcard_positions)
-    wildcard_matches = [[] for _ in range(num_wildcards)]
-
-    for key in filter(lambda x: x is not None, keys):
-        match = regex_pattern.match(key)
-        if match:
-            for i, group in enumerate(match.groups()):
-                if group not in wildcard_matches[i]:
-                    wildcard_matches[i].append(group)
-
-    # Sort the wildcard matches to maintain consistent ordering
-    for i in range(len(wildcard_matches)):
-        wildcard_matches[i].sort(key=lambda x: int(x) if x.isdigit() else x)
-
-    # Determine the shape of the output array based on the unique matches for each wildcard
-    shape = [len(matches) for matches in wildcard_matches]
-
-    if len(wildcard_matches) == 0:
-        # If there is no wildcard matches, assuming it is a single match
-        shape = [1]
-    # Initialize an empty array with the determined shape
-    output_array = np.empty(shape, dtype=object)
-
-    # Populate the array with the keys, now that we have the correct shape and ordering
-    for key in filter(lambda x: x is not None, keys):
-        match = regex_pattern.match(key)
-        if match:
-            # Convert match groups to indices based on their position in wildcard_matches
-            indices = [wildcard_matches[i].index(group) for i, group in enumerate(match.groups())]
-            output_array[tuple(indices)] = key  # Place the key in the array based on the indices
-
-    return output_array
+    Args:
+        keys: Keys of the state dict.
+        group_by_shape: Whether to group the keys by shape, which only pays off if several patterns are matched.
+            Otherwise, each pattern is compared with all keys.
+    """
+
+    def __init__(self, keys: Iterable[str], group_by_shape: bool = True):
+        self.keys = [key for key in keys if key is not None]
+        self.group_by_shape = group_by_shape
+        self._shapes = None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _get_shapes(self) -> Dict[str, List[int]]:
+        if self._shapes is None:
+            # Removing the digits of all keys at once is much faster than for each key
+            shapes = '\0'.join(self.keys).encode().translate(None, _DIGITS.encode()).decode().split('\0')
+            if len(shapes) != len(self.keys):
+                # Keys with null characters
+                shapes = [key.translate(str.maketrans('', '', _DIGITS)) for key in self.keys]
+            self._shapes = {}
+            for position, shape in enumerate(shapes):
+                self._shapes.setdefault(shape, []).append(position)
+        return self._shapes
+
+    def _candidate_positions(self, pattern: str) -> Iterable[int]:
+        if not self.group_by_shape or '**' in pattern or _REGEX_SPECIAL_CHARS.intersection(pattern):
+            return range(len(self.keys))
+
+        # The shapes of the keys matching the pattern match the pattern without digits, where wildcards can also
+        # match the empty string
+        shape_pattern = pattern.translate(str.maketrans('', '', _DIGITS)).replace('.', r'\.').replace('*', r'[^.]*')
+        shape_regex = re.compile("^" + shape_pattern + "$")
+
+        positions = []
+        for shape, shape_positions in self._get_shapes().items():
+            if shape_regex.match(shape):
+                positions.extend(shape_positions)
+        # Keep the order of the keys
+        positions.sort()
+        return positions
+
+    def match(self, pattern: str) -> np.ndarray:
+        """
+        Find the keys matching a pattern, where `*` matches any characters except dots and `**` matches any
+        characters including dots.
+
+        Returns:
+            Array of the matching keys with one dimension per wildcard, indexed by the sorted unique values of each
+            wildcard. A pattern without wildcards gives an array with one element, which is None if no key matches.
+        """
+        regex_pattern = re.compile(_wildcard_regex(pattern))
+        matched_keys = []
+        matched_groups = []
+        for position in self._candidate_positions(pattern):
+            key = self.keys[position]
+            match = regex_pattern.match(key)
+            if match:
+                matched_keys.append(key)
+                matched_groups.append(match.groups())
+
+        num_wildcards = regex_pattern.groups
+        if num_wildcards == 0:
+            # If there is no wildcard matches, assuming it is a single match
+            output_array = np.empty([1], dtype=object)
+            if matched_keys:
+                output_array[0] = matched_keys[-1]
+            return output_array
+
+        # Convert the match groups to indices into the sorted unique values of each wildcard. Dicts keep the unique
+        # values in order of appearance, which is the order of equal values after sorting.
+        indices = []
+        shape = []
+        matched_groups = np.array(matched_groups, dtype=object).reshape(len(matched_groups), num_wildcards)
+        for groups in matched_groups.T:
+            unique_groups = sorted(dict.fromkeys(groups), key=lambda x: int(x) if x.isdigit() else x)
+            group_indices = {group: i for i, group in enumerate(unique_groups)}
+            indices.append(np.fromiter(map(group_indices.__getitem__, groups), dtype=np.int64, count=len(groups)))
+            shape.append(len(unique_groups))
+
+        output_array = np.empty(shape, dtype=object)
+        if matched_keys:
+            keys_array = np.empty(len(matched_keys), dtype=object)
+            keys_array[:] = matched_keys
+            output_array[tuple(indices)] = keys_array
+        return output_array
+
+
+def _get_key_index(ctx: TransformCTX, state_dict: dict) -> _StateKeyIndex:
+    """Return the key index of a state dict of the context, which is only rebuilt if the state dict changed size."""
+    key_indices = getattr(ctx, "_key_indices", None)
+    if key_indices is None:
+        return _StateKeyIndex(state_dict.keys())
+    cached = key_indices.get(id(state_dict))
+    if cached is None or cached[0] is not state_dict or len(cached[1]) != len(state_dict):
+        cached = (state_dict, _StateKeyIndex(state_dict.keys()))
+        key_indices[id(state_dict)] = cached
+    return cached[1]
+
+
+def _match_keys(keys: List[str], pattern: str) -> np.ndarray:
+    return _StateKeyIndex(keys, group_by_shape=False).match(pattern)
 
 
 @overload
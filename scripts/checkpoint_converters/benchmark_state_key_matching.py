@@ -0,0 +1,117 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This script measures the time to match the key patterns of a MoE checkpoint conversion against the keys of a
+synthetic state dict, as done by `apply_transforms` in `nemo.lightning.io.state`.
+
+It compares scanning all keys with a regular expression for each pattern, to resolving all patterns against one key
+index of the state dict, which is built once and shared by the transforms of a conversion.
+
+$ python <nemo_root_path>/scripts/checkpoint_converters/benchmark_state_key_matching.py \
+    --num_layers=80 \
+    --num_experts=2048
+"""
+
+import argparse
+import time
+
+from nemo.lightning.io.state import _match_keys, _StateKeyIndex
+
+EXPERT_PROJECTIONS = ["gate_proj", "up_proj", "down_proj"]
+ATTENTION_PROJECTIONS = ["q_proj", "k_proj", "v_proj", "o_proj"]
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Benchmark matching key patterns against the keys of a large state dict.",
+    )
+    parser.add_argument("--num_layers", default=80, type=int, help="Number of transformer layers.")
+    parser.add_argument("--num_experts", default=2048, type=int, help="Number of experts in each layer.")
+    parser.add_argument("--num_runs", default=3, type=int, help="Number of timed runs of each method.")
+    args = parser.parse_args()
+    return args
+
+
+def get_state_keys(num_layers: int, num_experts: int):
+    """Keys of a HF MoE checkpoint, with a weight and a scale for every expert projection"""
+    keys = ["model.embed_tokens.weight", "model.norm.weight", "lm_head.weight"]
+    for layer in range(num_layers):
+        prefix = f"model.layers.{layer}"
+        keys += [f"{prefix}.input_layernorm.weight", f"{prefix}.post_attention_layernorm.weight"]
+        keys += [f"{prefix}.self_attn.{projection}.weight" for projection in ATTENTION_PROJECTIONS]
+        keys.append(f"{prefix}.mlp.gate.weight")
+        for expert in range(num_experts):
+            for projection in EXPERT_PROJECTIONS:
+                keys.append(f"{prefix}.mlp.experts.{expert}.{projection}.weight")
+                keys.append(f"{prefix}.mlp.experts.{expert}.{projection}.weight_scale_inv")
+    return keys
+
+
+def get_patterns():
+    """Source key patterns of the mapping and transforms of a MoE checkpoint conversion"""
+    patterns = [
+        "model.embed_tokens.weight",
+        "model.norm.weight",
+        "lm_head.weight",
+        "model.layers.*.input_layernorm.weight",
+        "model.layers.*.post_attention_layernorm.weight",
+        "model.layers.*.self_attn.o_proj.weight",
+        "model.layers.*.mlp.gate.weight",
+        "model.layers.*.mlp.experts.*.down_proj.weight",
+        "model.layers.*.mlp.experts.*.down_proj.weight_scale_inv",
+        "model.layers.*.mlp.experts.*.*_proj.weight",
+    ]
+    patterns += [f"model.layers.*.self_attn.{projection}.weight" for projection in ATTENTION_PROJECTIONS[:3]]
+    patterns += [f"model.layers.*.mlp.experts.*.{projection}.weight" for projection in EXPERT_PROJECTIONS[:2]]
+    return patterns
+
+
+def benchmark(num_layers: int, num_experts: int, num_runs: int):
+    keys = get_state_keys(num_layers=num_layers, num_experts=num_experts)
+    patterns = get_patterns()
+    print(f"Matching {len(patterns)} patterns against {len(keys)} keys")
+
+    scan_times = []
+    index_times = []
+    build_times = []
+    for _ in range(num_runs):
+        start_time = time.perf_counter()
+        scan_matches = [_match_keys(keys, pattern) for pattern in patterns]
+        scan_times.append(time.perf_counter() - start_time)
+
+        start_time = time.perf_counter()
+        key_index = _StateKeyIndex(keys)
+        key_index.match(patterns[0])
+        build_times.append(time.perf_counter() - start_time)
+        index_matches = [key_index.match(pattern) for pattern in patterns]
+        index_times.append(time.perf_counter() - start_time)
+
+    for pattern, scan_match, index_match in zip(patterns, scan_matches, index_matches):
+        if scan_match.shape != index_match.shape or not (scan_match == index_match).all():
+            raise ValueError(f"Different matches for pattern {pattern}")
+
+    print(f"Scan per pattern:    {min(scan_times):8.2f} s")
+    print(f"Shared index:        {min(index_times):8.2f} s (building the index {min(build_times):.2f} s)")
+    print(f"Speedup:             {min(scan_times) / min(index_times):8.1f}x")
+
+
+def main():
+    args = get_args()
+    benchmark(num_layers=args.num_layers, num_experts=args.num_experts, num_runs=args.num_runs)
+
+
+if __name__ == "__main__":
+    main()
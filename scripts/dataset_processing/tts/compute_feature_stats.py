@@ -16,6 +16,7 @@
 This script is to compute global and speaker-level feature statistics for a given TTS training manifest.
 
 This script should be run after compute_features.py as it loads the precomputed feature data.
+The same statistics can also be computed during feature extraction with compute_features.py --stats_path.
 
 $ python <nemo_root_path>/scripts/dataset_processing/tts/compute_feature_stats.py \
     --feature_config_path=<nemo_root_path>/examples/tts/conf/features/feature_22050.yaml
@@ -57,16 +58,14 @@ For example:
 
 import argparse
 import json
-from collections import defaultdict
 from pathlib import Path
-from typing import List, Tuple
 
-import torch
 from hydra.utils import instantiate
 from omegaconf import OmegaConf
 from tqdm import tqdm
 
 from nemo.collections.asr.parts.utils.manifest_utils import read_manifest
+from nemo.collections.tts.parts.preprocessing.feature_extraction import RunningFeatureStats
 
 
 def get_args():
@@ -114,13 +113,6 @@ def get_args():
     return args
 
 
-def _compute_stats(values: List[torch.Tensor]) -> Tuple[float, float]:
-    values_tensor = torch.cat(values, dim=0)
-    mean = values_tensor.mean().item()
-    std = values_tensor.std(dim=0).item()
-    return mean, std
-
-
 def main():
     args = get_args()
 
@@ -168,9 +160,8 @@ def main():
     featurizers = featurizer_dict.values()
 
     feature_names = feature_name_str.split(",")
-    # For each feature, we have a dictionary mapping speaker IDs to a list containing all features
-    # for that speaker
-    feature_stats = {name: defaultdict(list) for name in feature_names}
+    # Running global and speaker-level statistics of each feature
+    feature_stats = RunningFeatureStats()
 
     for (manifest_path, audio_dir, feature_dir) in zip(manifest_paths, audio_dirs, feature_dirs):
         entries = read_manifest(manifest_path)
@@ -193,19 +184,9 @@ def main():
                 if mask is not None:
                     values = values[mask]
 
-                feature_stat_dict = feature_stats[feature_name]
-                feature_stat_dict["default"].append(values)
-                feature_stat_dict[speaker].append(values)
-
-    stat_dict = defaultdict(dict)
-    for feature_name in feature_names:
-        mean_key = f"{feature_name}_mean"
-        std_key = f"{feature_name}_std"
-        feature_stat_dict = feature_stats[feature_name]
-        for speaker_id, values in feature_stat_dict.items():
-            speaker_mean, speaker_std = _compute_stats(values)
-            stat_dict[speaker_id][mean_key] = speaker_mean
-            stat_dict[speaker_id][std_key] = speaker_std
+                feature_stats.update(feature_name=feature_name, values=values.numpy(), speaker=speaker)
+
+    stat_dict = feature_stats.get_stats()
 
     with open(stats_path, 'w', encoding="utf-8") as stats_f:
         json.dump(stat_dict, stats_f, indent=4)
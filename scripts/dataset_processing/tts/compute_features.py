@@ -16,24 +16,35 @@
 This script computes features for TTS models prior to training, such as pitch and energy.
 The resulting features will be stored in the provided 'feature_dir'.
 
+The manifest is split into shards which are computed by 'num_workers' processes. Completed shards are recorded in
+'<feature_dir>/<featurizer_name>_completed.jsonl', so an interrupted run skips the completed entries when it is
+started again without '--overwrite'. Without '--overwrite', features which were already saved by a previous run,
+including runs of earlier versions of this script, are not computed again.
+
+If 'stats_path' is provided, global and speaker-level feature statistics are computed while the features are
+extracted and written in the same format as compute_feature_stats.py. The statistics of entries which are skipped
+are read from the completion index, or computed from their saved features if the run which saved them did not
+compute statistics.
+
 $ python <nemo_root_path>/scripts/dataset_processing/tts/compute_features.py \
     --feature_config_path=<nemo_root_path>/examples/tts/conf/features/feature_22050.yaml \
     --manifest_path=<data_root_path>/manifest.json \
     --audio_dir=<data_root_path>/audio \
     --feature_dir=<data_root_path>/features \
-    --overwrite \
-    --num_workers=1
+    --stats_path=<data_root_path>/feature_stats.json \
+    --num_workers=8
 """
 
 import argparse
+import json
+import os
 from pathlib import Path
 
 from hydra.utils import instantiate
-from joblib import Parallel, delayed
 from omegaconf import OmegaConf
-from tqdm import tqdm
 
 from nemo.collections.asr.parts.utils.manifest_utils import read_manifest
+from nemo.collections.tts.parts.preprocessing.feature_extraction import FeatureExtractor
 
 
 def get_args():
@@ -58,10 +69,41 @@ def get_args():
         help="If given, will only process the first manifest entry found for each audio file.",
     )
     parser.add_argument(
-        "--overwrite", action=argparse.BooleanOptionalAction, help="Whether to overwrite existing feature files.",
+        "--overwrite",
+        action=argparse.BooleanOptionalAction,
+        help="Whether to recompute all features, instead of skipping entries completed by a previous run.",
+    )
+    parser.add_argument(
+        "--num_workers", default=1, type=int, help="Number of parallel processes to use. If -1 all CPUs are used."
+    )
+    parser.add_argument(
+        "--shard_size", default=64, type=int, help="Number of manifest entries computed by a process at a time.",
+    )
+    parser.add_argument(
+        "--packed",
+        action=argparse.BooleanOptionalAction,
+        help="If given, save features to packed feature stores instead of one .npy file per utterance.",
+    )
+    parser.add_argument(
+        "--float16_feature_names",
+        default="",
+        type=str,
+        help="Comma separated list of features to store as float16 in packed feature stores.",
+    )
+    parser.add_argument(
+        "--stats_path", default=None, type=Path, help="If provided, path to output JSON file with feature statistics.",
     )
     parser.add_argument(
-        "--num_workers", default=1, type=int, help="Number of parallel threads to use. If -1 all CPUs are used."
+        "--stats_feature_names",
+        default="pitch,energy",
+        type=str,
+        help="Comma separated list of features to compute statistics for.",
+    )
+    parser.add_argument(
+        "--mask_field",
+        default="voiced_mask",
+        type=str,
+        help="If provided, stat computation will ignore non-masked frames.",
     )
 
     args = parser.parse_args()
@@ -101,14 +143,27 @@ def main():
             audio_filepath_set.add(audio_filepath)
         entries = final_entries
 
-    for feature_name, featurizer in featurizers.items():
-        print(f"Computing: {feature_name}")
-        Parallel(n_jobs=num_workers)(
-            delayed(featurizer.save)(
-                manifest_entry=entry, audio_dir=audio_dir, feature_dir=feature_dir, overwrite=overwrite
-            )
-            for entry in tqdm(entries)
-        )
+    if num_workers == -1:
+        num_workers = os.cpu_count()
+
+    feature_dtypes = {name: "float16" for name in args.float16_feature_names.split(",") if name}
+    stats_feature_names = args.stats_feature_names.split(",") if args.stats_path else None
+
+    feature_extractor = FeatureExtractor(
+        featurizers=dict(featurizers),
+        feature_dir=feature_dir,
+        num_workers=num_workers,
+        shard_size=args.shard_size,
+        packed=args.packed,
+        feature_dtypes=feature_dtypes,
+        stats_feature_names=stats_feature_names,
+        mask_feature_name=args.mask_field,
+    )
+    feature_stats = feature_extractor.extract(manifest_entries=entries, audio_dir=audio_dir, overwrite=overwrite)
+
+    if args.stats_path:
+        with open(args.stats_path, 'w', encoding="utf-8") as stats_f:
+            json.dump(feature_stats.get_stats(), stats_f, indent=4)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,192 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This script computes the speaker embeddings of the reference audio of TTS manifests prior to training or evaluation,
+so that MagpieTTS does not have to run the speaker verification model on the reference audio of every example.
+
+The reference audio of a manifest entry is its 'context_audio_filepath' if given, and its 'audio_filepath' otherwise,
+see get_speaker_reference_audio. With '--include_target_audio', the embeddings of the target audio of entries with
+context audio are computed too, which MagpieTTS evaluation compares the generated audio to. The audio is read like in
+MagpieTTSDataset, with volume normalization of the target audio unless '--no-volume_norm' is given. The embeddings are written into a packed store, with the absolute
+path, offset and duration of the reference audio as key (see get_speaker_embedding_key), and the name of the speaker
+verification model and whether volume normalization was applied as metadata. Audio which is already in the store is
+skipped, so that several manifests can be added to the same store. The audio is sorted by duration and embedded in
+batches, to minimize padding.
+
+To use the embeddings, set 'model.speaker_embedding_store_dir=<store_dir>' in the MagpieTTS config. The store is only
+used by datasets with the same 'volume_norm', and evaluation reads the target audio which is not in the store with the
+'volume_norm' of the store.
+
+$ python <nemo_root_path>/scripts/dataset_processing/tts/compute_speaker_embeddings.py \
+    --manifest_paths <data_root_path>/train_manifest.json <data_root_path>/dev_manifest.json \
+    --audio_dir=<data_root_path>/audio \
+    --store_dir=<data_root_path>/speaker_embeddings_packed \
+    --include_target_audio \
+    --batch_size=32
+"""
+
+import argparse
+from functools import partial
+from pathlib import Path
+
+import torch
+from tqdm import tqdm
+
+from nemo.collections.asr.models import EncDecSpeakerLabelModel
+from nemo.collections.asr.parts.utils.manifest_utils import read_manifest
+from nemo.collections.tts.parts.utils.tts_dataset_utils import (
+    PackedFeatureStore,
+    PackedFeatureWriter,
+    get_speaker_embedding_key,
+    get_speaker_embedding_metadata,
+    get_speaker_reference_audio,
+    get_target_audio,
+    load_audio,
+    load_speaker_reference_audio,
+    stack_tensors,
+)
+
+SAMPLE_RATE = 16000
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Compute speaker embeddings of the reference audio of TTS manifests.",
+    )
+    parser.add_argument(
+        "--manifest_paths",
+        required=True,
+        nargs="+",
+        type=Path,
+        help="Paths to manifests with the reference audio.",
+    )
+    parser.add_argument(
+        "--audio_dir",
+        required=True,
+        type=Path,
+        help="Base directory of the audio files in the manifests.",
+    )
+    parser.add_argument(
+        "--store_dir",
+        required=True,
+        type=Path,
+        help="Directory of the packed store to write the speaker embeddings to.",
+    )
+    parser.add_argument(
+        "--speaker_model",
+        default="titanet_large",
+        type=str,
+        help="Name of the pretrained speaker verification model.",
+    )
+    parser.add_argument(
+        "--volume_norm",
+        default=True,
+        action=argparse.BooleanOptionalAction,
+        help="Whether to apply volume normalization to the target audio, like the 'volume_norm' of the dataset.",
+    )
+    parser.add_argument(
+        "--include_target_audio",
+        action="store_true",
+        help="Whether to also compute the embeddings of the target audio of entries with context audio.",
+    )
+    parser.add_argument(
+        "--batch_size",
+        default=32,
+        type=int,
+        help="Number of audio files to embed at a time.",
+    )
+    parser.add_argument(
+        "--device",
+        default="cuda" if torch.cuda.is_available() else "cpu",
+        type=str,
+        help="Device to run the speaker verification model on.",
+    )
+    args = parser.parse_args()
+    return args
+
+
+def load_target_audio(manifest_entry, audio_dir, sample_rate, volume_norm):
+    audio, _, _ = load_audio(
+        manifest_entry=manifest_entry, audio_dir=audio_dir, sample_rate=sample_rate, volume_norm=volume_norm
+    )
+    return audio
+
+
+def main():
+    args = get_args()
+    metadata = get_speaker_embedding_metadata(speaker_model_name=args.speaker_model, volume_norm=args.volume_norm)
+
+    embedding_audio = {}
+    for manifest_path in args.manifest_paths:
+        if not manifest_path.exists():
+            raise ValueError(f"Manifest {manifest_path} does not exist.")
+        for entry in read_manifest(manifest_path):
+            audio_filepath, offset, duration = get_speaker_reference_audio(
+                manifest_entry=entry, audio_dir=args.audio_dir
+            )
+            key = get_speaker_embedding_key(audio_filepath=audio_filepath, offset=offset, duration=duration)
+            embedding_audio[key] = (
+                partial(load_speaker_reference_audio, manifest_entry=entry, volume_norm=args.volume_norm),
+                duration,
+            )
+            if args.include_target_audio:
+                audio_filepath, offset, duration = get_target_audio(manifest_entry=entry, audio_dir=args.audio_dir)
+                key = get_speaker_embedding_key(audio_filepath=audio_filepath, offset=offset, duration=duration)
+                embedding_audio[key] = (
+                    partial(load_target_audio, manifest_entry=entry, volume_norm=args.volume_norm),
+                    duration,
+                )
+
+    if PackedFeatureStore.exists(args.store_dir) and PackedFeatureStore(args.store_dir).metadata != metadata:
+        raise ValueError(
+            f"Speaker embeddings in {args.store_dir} were computed with {PackedFeatureStore(args.store_dir).metadata} "
+            f"instead of {metadata}."
+        )
+
+    with PackedFeatureWriter(store_dir=args.store_dir, dtype="float32", metadata=metadata) as writer:
+        keys = [key for key in embedding_audio if key not in writer]
+        print(f"Computing speaker embeddings of {len(keys)} audio files, {len(embedding_audio) - len(keys)} exist")
+        # Sort by duration, so that audio of similar length is embedded together. Entries without a duration are
+        # read until the end of the file.
+        keys.sort(key=lambda key: embedding_audio[key][1] or float("inf"))
+
+        speaker_model = EncDecSpeakerLabelModel.from_pretrained(
+            model_name=args.speaker_model, map_location=args.device
+        )
+        speaker_model.eval()
+
+        for batch_start in tqdm(range(0, len(keys), args.batch_size)):
+            batch_keys = keys[batch_start : batch_start + args.batch_size]
+            audio_list = []
+            for key in batch_keys:
+                load_audio_fn, _ = embedding_audio[key]
+                audio_array = load_audio_fn(audio_dir=args.audio_dir, sample_rate=SAMPLE_RATE)
+                audio_list.append(torch.tensor(audio_array, dtype=torch.float32))
+
+            audio_lens = torch.tensor([audio.shape[0] for audio in audio_list], dtype=torch.long)
+            audio = stack_tensors(audio_list, max_lens=[int(audio_lens.max().item())])
+            with torch.no_grad():
+                _, embeddings = speaker_model.forward(
+                    input_signal=audio.to(args.device), input_signal_length=audio_lens.to(args.device)
+                )
+            for key, embedding in zip(batch_keys, embeddings.float().cpu().numpy()):
+                writer.add(key=key, features=embedding)
+
+    print(f"Wrote speaker embeddings of {len(embedding_audio)} audio files to {args.store_dir}")
+
+
+if __name__ == "__main__":
+    main()
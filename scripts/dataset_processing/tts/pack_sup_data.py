@@ -0,0 +1,134 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This script converts per-utterance supplementary data files into packed feature stores, one per feature type.
+
+It supports both the '.pt' files saved by TTSDataset under 'sup_data_path' and the '.npy' files saved by
+compute_features.py under 'feature_dir'. The feature files in '<sup_data_dir>/<feature_name>' are packed into
+'<sup_data_dir>/<feature_name>_packed', which is read by TTSDataset and the Featurizer classes instead of the
+per-utterance files. The original files are not modified, and can be deleted once the packed stores are written.
+
+$ python <nemo_root_path>/scripts/dataset_processing/tts/pack_sup_data.py \
+    --sup_data_dir=<data_root_path>/sup_data \
+    --feature_names pitch energy \
+    --float16_feature_names energy
+"""
+
+import argparse
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import torch
+from tqdm import tqdm
+
+from nemo.collections.tts.parts.utils.tts_dataset_utils import PackedFeatureWriter, get_packed_feature_dir
+
+FEATURE_FILE_SUFFIXES = [".npy", ".pt"]
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Pack per-utterance supplementary data into packed feature stores.",
+    )
+    parser.add_argument(
+        "--sup_data_dir",
+        required=True,
+        type=Path,
+        help="Path to directory containing one folder per feature type.",
+    )
+    parser.add_argument(
+        "--feature_names",
+        nargs="*",
+        type=str,
+        default=None,
+        help="Names of the feature folders to pack. If not given, all feature folders are packed.",
+    )
+    parser.add_argument(
+        "--float16_feature_names",
+        nargs="*",
+        type=str,
+        default=[],
+        help="Names of floating point features to store as float16 to halve their size.",
+    )
+    parser.add_argument(
+        "--overwrite",
+        action=argparse.BooleanOptionalAction,
+        help="Whether to overwrite features which already exist in the packed stores.",
+    )
+    args = parser.parse_args()
+    return args
+
+
+def _read_feature_file(feature_filepath: Path) -> np.ndarray:
+    if feature_filepath.suffix == ".npy":
+        return np.load(feature_filepath)
+    return torch.load(feature_filepath).numpy()
+
+
+def pack_feature_folder(
+    feature_folder: Path, store_dir: Path, dtype: Optional[str] = None, overwrite: bool = False
+) -> int:
+    """
+    Pack all feature files in a folder into a packed feature store.
+    Features are stored with their path relative to the folder without suffix as key.
+
+    Returns:
+        Number of packed feature files.
+    """
+    feature_filepaths = sorted(
+        filepath for filepath in feature_folder.rglob("*") if filepath.suffix in FEATURE_FILE_SUFFIXES
+    )
+    num_packed = 0
+    with PackedFeatureWriter(store_dir=store_dir, dtype=dtype) as writer:
+        for feature_filepath in tqdm(feature_filepaths):
+            feature_key = feature_filepath.relative_to(feature_folder).with_suffix("").as_posix()
+            if not overwrite and feature_key in writer:
+                continue
+            writer.add(key=feature_key, features=_read_feature_file(feature_filepath))
+            num_packed += 1
+    return num_packed
+
+
+def main():
+    args = get_args()
+    sup_data_dir = args.sup_data_dir
+
+    if not sup_data_dir.exists():
+        raise ValueError(f"Supplementary data directory {sup_data_dir} does not exist.")
+
+    feature_names = args.feature_names
+    if not feature_names:
+        feature_names = sorted(
+            path.name for path in sup_data_dir.iterdir() if path.is_dir() and not path.name.endswith("_packed")
+        )
+
+    for feature_name in feature_names:
+        feature_folder = sup_data_dir / feature_name
+        if not feature_folder.is_dir():
+            raise ValueError(f"Feature folder {feature_folder} does not exist.")
+
+        store_dir = get_packed_feature_dir(feature_dir=sup_data_dir, feature_name=feature_name)
+        dtype = "float16" if feature_name in args.float16_feature_names else None
+        print(f"Packing: {feature_name}")
+        num_packed = pack_feature_folder(
+            feature_folder=feature_folder, store_dir=store_dir, dtype=dtype, overwrite=args.overwrite
+        )
+        print(f"Packed {num_packed} files into {store_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,9 @@ This script is used to preprocess audio before TTS model training.
 It can be configured to do several processing steps such as silence trimming, volume normalization,
 and duration filtering.
 
+Audio is read and written by a pool of num_workers threads, and trimmed in batches of batch_size files, so that
+the VAD model of VadAudioTrimmer classifies the frames of many files at once.
+
 These can be done separately through multiple executions of the script, or all at once to avoid saving
 too many copies of the same audio.
 
@@ -30,6 +33,7 @@ $ python <nemo_root_path>/scripts/dataset_processing/tts/preprocess_audio.py \
     --input_audio_dir="<data_root_path>/audio" \
     --output_audio_dir="<data_root_path>/audio_processed" \
     --num_workers=1 \
+    --batch_size=32 \
     --trim_config_path="<nemo_root_path>/examples/tts/conf/trim/energy.yaml" \
     --output_sample_rate=22050 \
     --output_format=flac \
@@ -42,9 +46,10 @@ $ python <nemo_root_path>/scripts/dataset_processing/tts/preprocess_audio.py \
 import argparse
 import os
 from pathlib import Path
-from typing import Tuple
+from typing import List, Optional, Tuple
 
 import librosa
+import numpy as np
 import soundfile as sf
 from hydra.utils import instantiate
 from joblib import Parallel, delayed
@@ -86,6 +91,9 @@ def get_args():
     parser.add_argument(
         "--num_workers", default=1, type=int, help="Number of parallel threads to use. If -1 all CPUs are used."
     )
+    parser.add_argument(
+        "--batch_size", default=32, type=int, help="Number of audio files to read, trim and write at a time."
+    )
     parser.add_argument(
         "--trim_config_path",
         required=False,
@@ -123,38 +131,78 @@ def get_args():
     return args
 
 
-def _process_entry(
+def _get_audio_paths(
+    entry: dict, input_audio_dir: Path, output_audio_dir: Path, output_format: str
+) -> Tuple[Path, Path, Path]:
+    audio_filepath = Path(entry["audio_filepath"])
+
+    audio_path, audio_path_rel = get_abs_rel_paths(input_path=audio_filepath, base_path=input_audio_dir)
+
+    if not output_format:
+        output_format = audio_path.suffix
+
+    output_path = output_audio_dir / audio_path_rel
+    output_path = output_path.with_suffix(output_format)
+
+    return audio_path, audio_path_rel, output_path
+
+
+def _load_entry_audio(
+    entry: dict, input_audio_dir: Path, output_audio_dir: Path, overwrite_audio: bool, output_format: str
+) -> Tuple[Optional[np.ndarray], int]:
+    audio_path, _, output_path = _get_audio_paths(
+        entry=entry, input_audio_dir=input_audio_dir, output_audio_dir=output_audio_dir, output_format=output_format
+    )
+
+    if output_path.exists() and not overwrite_audio:
+        return None, 0
+
+    audio, sample_rate = librosa.load(audio_path, sr=None)
+    return audio, int(sample_rate)
+
+
+def _trim_audio(
+    audio_trimmer: AudioTrimmer, audios: List[Optional[np.ndarray]], sample_rates: List[int], audio_ids: List[str]
+) -> List[Optional[np.ndarray]]:
+    # Audio with the same sample rate is trimmed together
+    trimmed_audios = list(audios)
+    for sample_rate in set(sample_rates):
+        indices = [i for i, audio in enumerate(audios) if audio is not None and sample_rates[i] == sample_rate]
+        if not indices:
+            continue
+        outputs = audio_trimmer.trim_audio_batch(
+            audios=[audios[i] for i in indices], sample_rate=sample_rate, audio_ids=[audio_ids[i] for i in indices]
+        )
+        for i, (trimmed_audio, _, _) in zip(indices, outputs):
+            trimmed_audios[i] = trimmed_audio
+
+    return trimmed_audios
+
+
+def _save_entry_audio(
     entry: dict,
+    audio: Optional[np.ndarray],
+    sample_rate: int,
+    original_duration: float,
     input_audio_dir: Path,
     output_audio_dir: Path,
-    overwrite_audio: bool,
-    audio_trimmer: AudioTrimmer,
     output_sample_rate: int,
     output_format: str,
     volume_level: float,
 ) -> Tuple[dict, float, float]:
     audio_filepath = Path(entry["audio_filepath"])
-
-    audio_path, audio_path_rel = get_abs_rel_paths(input_path=audio_filepath, base_path=input_audio_dir)
-
+    audio_path, audio_path_rel, output_path = _get_audio_paths(
+        entry=entry, input_audio_dir=input_audio_dir, output_audio_dir=output_audio_dir, output_format=output_format
+    )
     if not output_format:
         output_format = audio_path.suffix
-
-    output_path = output_audio_dir / audio_path_rel
-    output_path = output_path.with_suffix(output_format)
     output_path.parent.mkdir(exist_ok=True, parents=True)
 
-    if output_path.exists() and not overwrite_audio:
+    if audio is None:
+        # Output audio exists and is not overwritten
         original_duration = librosa.get_duration(path=audio_path)
         output_duration = librosa.get_duration(path=output_path)
     else:
-        audio, sample_rate = librosa.load(audio_path, sr=None)
-        original_duration = librosa.get_duration(y=audio, sr=sample_rate)
-        if audio_trimmer is not None:
-            audio, start_i, end_i = audio_trimmer.trim_audio(
-                audio=audio, sample_rate=int(sample_rate), audio_id=str(audio_path)
-            )
-
         if output_sample_rate:
             audio = librosa.resample(y=audio, orig_sr=sample_rate, target_sr=output_sample_rate)
             sample_rate = output_sample_rate
@@ -189,6 +237,7 @@ def main():
     overwrite_audio = args.overwrite_audio
     overwrite_manifest = args.overwrite_manifest
     num_workers = args.num_workers
+    batch_size = args.batch_size
     max_entries = args.max_entries
     output_sample_rate = args.output_sample_rate
     output_format = args.output_format
@@ -220,20 +269,50 @@ def main():
     if max_entries:
         entries = entries[:max_entries]
 
-    # 'threading' backend is required when parallelizing torch models.
-    job_outputs = Parallel(n_jobs=num_workers, backend='threading')(
-        delayed(_process_entry)(
-            entry=entry,
-            input_audio_dir=input_audio_dir,
-            output_audio_dir=output_audio_dir,
-            overwrite_audio=overwrite_audio,
-            audio_trimmer=audio_trimmer,
-            output_sample_rate=output_sample_rate,
-            output_format=output_format,
-            volume_level=volume_level,
-        )
-        for entry in tqdm(entries)
-    )
+    # Audio is read and written in parallel threads, and each batch is trimmed in the main thread.
+    job_outputs = []
+    with Parallel(n_jobs=num_workers, backend='threading') as parallel:
+        for batch_start in tqdm(range(0, len(entries), batch_size)):
+            batch_entries = entries[batch_start : batch_start + batch_size]
+            batch_outputs = parallel(
+                delayed(_load_entry_audio)(
+                    entry=entry,
+                    input_audio_dir=input_audio_dir,
+                    output_audio_dir=output_audio_dir,
+                    overwrite_audio=overwrite_audio,
+                    output_format=output_format,
+                )
+                for entry in batch_entries
+            )
+            audios = [audio for audio, _ in batch_outputs]
+            sample_rates = [sample_rate for _, sample_rate in batch_outputs]
+            original_durations = [
+                librosa.get_duration(y=audio, sr=sample_rate) if audio is not None else 0.0
+                for audio, sample_rate in batch_outputs
+            ]
+
+            if audio_trimmer is not None:
+                audio_ids = [entry["audio_filepath"] for entry in batch_entries]
+                audios = _trim_audio(
+                    audio_trimmer=audio_trimmer, audios=audios, sample_rates=sample_rates, audio_ids=audio_ids
+                )
+
+            job_outputs += parallel(
+                delayed(_save_entry_audio)(
+                    entry=entry,
+                    audio=audio,
+                    sample_rate=sample_rate,
+                    original_duration=original_duration,
+                    input_audio_dir=input_audio_dir,
+                    output_audio_dir=output_audio_dir,
+                    output_sample_rate=output_sample_rate,
+                    output_format=output_format,
+                    volume_level=volume_level,
+                )
+                for entry, audio, sample_rate, original_duration in zip(
+                    batch_entries, audios, sample_rates, original_durations
+                )
+            )
 
     output_entries = []
     filtered_entries = []
@@ -0,0 +1,117 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This script tokenizes the texts of a TTS manifest prior to training, so that TTSDataset and TextToSpeechDataset do
+not have to run text preprocessing and G2P on all texts every time a dataset is created.
+
+The tokenizer config file should contain the config of the text tokenizer, for example the 'text_tokenizer' section
+of the model config. The 'normalized_text' field of each manifest entry is tokenized, or the 'text' field if it is
+not given. The token IDs are written into a packed store '<manifest_stem>_text_tokens_packed' next to the manifest,
+with the index of the entry in the manifest as key.
+
+The datasets only read the pre-tokenized texts if the manifest and the tokenizer vocabulary did not change since they
+were written. Changes to the G2P module, such as its phoneme dictionary, are not detected, in which case this script
+should be run again with '--overwrite'. Tokenizers with a 'phoneme_probability' are not supported, since they
+phonemize each word with a probability every time a text is tokenized.
+
+$ python <nemo_root_path>/scripts/dataset_processing/tts/pretokenize_text.py \
+    --tokenizer_config_path=<data_root_path>/tokenizer.yaml \
+    --manifest_path=<data_root_path>/manifest.json \
+    --batch_size=256
+"""
+
+import argparse
+import shutil
+from pathlib import Path
+
+import numpy as np
+from hydra.utils import instantiate
+from omegaconf import OmegaConf
+from tqdm import tqdm
+
+from nemo.collections.asr.parts.utils.manifest_utils import read_manifest
+from nemo.collections.tts.parts.utils.tts_dataset_utils import (
+    PackedFeatureWriter,
+    get_text_tokens_dir,
+    get_text_tokens_metadata,
+)
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Tokenize the texts of a TTS manifest.",
+    )
+    parser.add_argument(
+        "--tokenizer_config_path",
+        required=True,
+        type=Path,
+        help="Path to text tokenizer config file.",
+    )
+    parser.add_argument(
+        "--manifest_path",
+        required=True,
+        type=Path,
+        help="Path to manifest with the texts to tokenize.",
+    )
+    parser.add_argument(
+        "--batch_size",
+        default=256,
+        type=int,
+        help="Number of texts to tokenize at a time.",
+    )
+    parser.add_argument(
+        "--overwrite",
+        action=argparse.BooleanOptionalAction,
+        help="Whether to overwrite existing pre-tokenized texts.",
+    )
+    args = parser.parse_args()
+    return args
+
+
+def main():
+    args = get_args()
+    manifest_path = args.manifest_path
+    batch_size = args.batch_size
+
+    if not manifest_path.exists():
+        raise ValueError(f"Manifest {manifest_path} does not exist.")
+
+    tokenizer_config = OmegaConf.load(args.tokenizer_config_path)
+    text_tokenizer = instantiate(tokenizer_config)
+    if getattr(text_tokenizer, "phoneme_probability", None) is not None:
+        raise ValueError("Texts can't be pre-tokenized with a tokenizer which has a phoneme_probability.")
+
+    store_dir = get_text_tokens_dir(manifest_path)
+    if store_dir.exists():
+        if not args.overwrite:
+            raise ValueError(f"Pre-tokenized texts {store_dir} already exist, use --overwrite to replace them.")
+        shutil.rmtree(store_dir)
+
+    entries = read_manifest(manifest_path)
+    texts = [entry["normalized_text"] if "normalized_text" in entry else entry["text"] for entry in entries]
+    metadata = get_text_tokens_metadata(manifest_path=manifest_path, tokens=text_tokenizer.tokens)
+
+    with PackedFeatureWriter(store_dir=store_dir, dtype="int32", metadata=metadata) as writer:
+        for batch_start in tqdm(range(0, len(texts), batch_size)):
+            batch_tokens = text_tokenizer.batch_encode(texts[batch_start : batch_start + batch_size])
+            for entry_index, tokens in enumerate(batch_tokens, start=batch_start):
+                writer.add(key=str(entry_index), features=np.array(tokens, dtype=np.int32))
+
+    print(f"Wrote {len(texts)} pre-tokenized texts to {store_dir}")
+
+
+if __name__ == "__main__":
+    main()
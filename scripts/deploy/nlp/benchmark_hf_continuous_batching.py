@@ -0,0 +1,148 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This script compares the generation of HuggingFaceLLMDeploy with HF `generate` on batches of requests, padded to the
+longest prompt and run until the largest number of new tokens of the batch, to the generation with the
+ContinuousBatchingScheduler (nemo/deploy/nlp/hf_continuous_batching.py), with a tiny randomly initialized Llama model
+on CPU.
+
+All requests are sent at once, with random prompt lengths and numbers of new tokens. The script reports the
+throughput in generated tokens per second, and the latencies of the requests.
+
+$ python <nemo_root_path>/scripts/deploy/nlp/benchmark_hf_continuous_batching.py \
+    --num_requests=64 \
+    --max_batch_size=8
+"""
+
+import argparse
+import time
+
+import numpy as np
+import torch
+from transformers import LlamaConfig, LlamaForCausalLM
+
+from nemo.deploy.nlp.hf_continuous_batching import ContinuousBatchingScheduler
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Benchmark continuous batching with a tiny random HuggingFace model on CPU.",
+    )
+    parser.add_argument("--num_requests", default=64, type=int, help="Number of requests.")
+    parser.add_argument("--max_batch_size", default=8, type=int, help="Maximum number of sequences of a batch.")
+    parser.add_argument("--min_prompt_length", default=4, type=int, help="Minimum number of tokens of a prompt.")
+    parser.add_argument("--max_prompt_length", default=64, type=int, help="Maximum number of tokens of a prompt.")
+    parser.add_argument("--min_new_tokens", default=4, type=int, help="Minimum number of tokens to generate.")
+    parser.add_argument("--max_new_tokens", default=128, type=int, help="Maximum number of tokens to generate.")
+    parser.add_argument("--hidden_size", default=128, type=int, help="Hidden size of the model.")
+    parser.add_argument("--num_layers", default=4, type=int, help="Number of layers of the model.")
+    parser.add_argument("--seed", default=0, type=int, help="Random seed.")
+    args = parser.parse_args()
+    return args
+
+
+def get_model(args):
+    config = LlamaConfig(
+        vocab_size=1024,
+        hidden_size=args.hidden_size,
+        intermediate_size=4 * args.hidden_size,
+        num_hidden_layers=args.num_layers,
+        num_attention_heads=4,
+        num_key_value_heads=2,
+        max_position_embeddings=args.max_prompt_length + args.max_new_tokens,
+    )
+    model = LlamaForCausalLM(config).eval()
+    # The number of generated tokens only depends on the requests
+    model.generation_config.eos_token_id = None
+    return model
+
+
+def static_batching(model, requests, max_batch_size):
+    """Generate the requests in batches with HF `generate`, like HuggingFaceLLMDeploy without continuous batching."""
+    latencies = []
+    start_time = time.perf_counter()
+    for i in range(0, len(requests), max_batch_size):
+        batch = requests[i : i + max_batch_size]
+        length = max(len(prompt) for prompt, _ in batch)
+        input_ids = torch.zeros(len(batch), length, dtype=torch.long)
+        attention_mask = torch.zeros(len(batch), length, dtype=torch.long)
+        for j, (prompt, _) in enumerate(batch):
+            input_ids[j, length - len(prompt) :] = torch.tensor(prompt)
+            attention_mask[j, length - len(prompt) :] = 1
+        with torch.no_grad():
+            model.generate(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                max_new_tokens=max(max_new_tokens for _, max_new_tokens in batch),
+                do_sample=False,
+                pad_token_id=0,
+            )
+        latencies.extend([time.perf_counter() - start_time] * len(batch))
+    return np.array(latencies), time.perf_counter() - start_time
+
+
+def continuous_batching(model, requests, max_batch_size):
+    """Generate the requests with the ContinuousBatchingScheduler."""
+    scheduler = ContinuousBatchingScheduler(model, max_batch_size=max_batch_size)
+    latencies = [None] * len(requests)
+    start_time = time.perf_counter()
+
+    def set_latency(i):
+        def callback(future):
+            latencies[i] = time.perf_counter() - start_time
+
+        return callback
+
+    futures = []
+    for i, (prompt, max_new_tokens) in enumerate(requests):
+        futures.append(scheduler.submit(prompt, max_new_tokens=max_new_tokens, do_sample=False))
+        futures[-1].add_done_callback(set_latency(i))
+    for future in futures:
+        future.result()
+    total_time = time.perf_counter() - start_time
+    scheduler.stop()
+    return np.array(latencies), total_time
+
+
+def benchmark(args):
+    torch.manual_seed(args.seed)
+    rng = np.random.default_rng(args.seed)
+    model = get_model(args)
+    requests = [
+        (
+            rng.integers(1, 1024, rng.integers(args.min_prompt_length, args.max_prompt_length + 1)).tolist(),
+            int(rng.integers(args.min_new_tokens, args.max_new_tokens + 1)),
+        )
+        for _ in range(args.num_requests)
+    ]
+    num_tokens = sum(max_new_tokens for _, max_new_tokens in requests)
+
+    print(f"{args.num_requests} requests, {num_tokens} generated tokens, max batch size {args.max_batch_size}")
+    print(f"{'':>20s} {'tokens/s':>9s} {'total (s)':>10s} {'p50 (s)':>8s} {'p99 (s)':>8s}")
+    for name, generate in [("static batching", static_batching), ("continuous batching", continuous_batching)]:
+        latencies, total_time = generate(model, requests, args.max_batch_size)
+        print(
+            f"{name:>20s} {num_tokens / total_time:9.1f} {total_time:10.2f} "
+            f"{np.percentile(latencies, 50):8.2f} {np.percentile(latencies, 99):8.2f}"
+        )
+
+
+def main():
+    benchmark(get_args())
+
+
+if __name__ == "__main__":
+    main()
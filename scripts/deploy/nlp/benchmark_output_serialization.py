@@ -0,0 +1,179 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This script compares the serialization of the log-probs of MegatronLLMDeployableNemo2 and of the logits of
+HuggingFaceLLMDeploy, converted one sequence or one step at a time to float32 arrays, to the compact outputs
+requested with `compact_output` and `top_logprobs`: float16 arrays packed on the device, with the lengths of
+the sequences, and the ids and log-probs of the top k tokens.
+
+Random outputs are converted like in the deployables, without a model. The script reports the time to convert the
+outputs, the size of the response and the time to decode it on the client. With `--triton`, the outputs are also
+returned by stub models of a local PyTriton server, and the script reports the latency of the queries.
+
+$ python <nemo_root_path>/scripts/deploy/nlp/benchmark_output_serialization.py \
+    --batch_size=8 \
+    --num_tokens=1024 \
+    --vocab_size=32000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import torch
+
+from nemo.deploy.utils import pack_ragged, pack_topk, unpack_ragged
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Benchmark the serialization of log-probs and logits of the PyTriton deployables.",
+    )
+    parser.add_argument("--batch_size", default=8, type=int, help="Number of prompts of a query.")
+    parser.add_argument("--num_tokens", default=1024, type=int, help="Number of log-probs of each prompt.")
+    parser.add_argument("--num_steps", default=64, type=int, help="Number of generated steps with logits.")
+    parser.add_argument("--vocab_size", default=32000, type=int, help="Size of the vocabulary.")
+    parser.add_argument("--top_logprobs", default=8, type=int, help="Number of top log-probs of each step.")
+    parser.add_argument("--num_iterations", default=10, type=int, help="Number of timed iterations.")
+    parser.add_argument("--device", default="cuda" if torch.cuda.is_available() else "cpu", help="Device of outputs.")
+    parser.add_argument("--triton", action="store_true", help="Query stub models of a local PyTriton server.")
+    parser.add_argument("--http_port", default=8000, type=int, help="HTTP port of the PyTriton server.")
+    args = parser.parse_args()
+    return args
+
+
+def log_probs_float32(generated_log_probs):
+    """Log-probs of MegatronLLMDeployableNemo2 without compact_output."""
+    output_log_probs = []
+    for log_probs in generated_log_probs:
+        output_log_probs.append(torch.tensor(log_probs).cpu().detach().numpy())
+    return {"log_probs": np.array(output_log_probs)}
+
+
+def log_probs_compact(generated_log_probs):
+    """Log-probs of MegatronLLMDeployableNemo2 with compact_output."""
+    log_probs_fp16, lengths = pack_ragged(generated_log_probs)
+    return {"log_probs_fp16": log_probs_fp16, "lengths": lengths}
+
+
+def logits_float32(logits):
+    """Logits of HuggingFaceLLMDeploy without compact_output."""
+    output_logits = []
+    for step_logits in logits:
+        output_logits.append(step_logits.cpu().detach().numpy())
+    return {"logits": np.array(output_logits).transpose(1, 0, 2)}
+
+
+def logits_compact(logits):
+    """Logits of HuggingFaceLLMDeploy with compact_output."""
+    return {"logits_fp16": torch.stack(logits, dim=1).half().cpu().numpy()}
+
+
+def top_logprobs_compact(logits, top_logprobs):
+    """Top log-probs of HuggingFaceLLMDeploy with top_logprobs, instead of the logits."""
+    top_logprobs_ids, top_logprobs_values = pack_topk(torch.stack(logits, dim=1), top_logprobs)
+    return {"top_logprobs_ids": top_logprobs_ids, "top_logprobs_values": top_logprobs_values}
+
+
+def decode(outputs):
+    """Decode a response like NemoQueryLLMPyTorch and NemoQueryLLMHF."""
+    if "log_probs_fp16" in outputs:
+        return unpack_ragged(outputs["log_probs_fp16"], outputs["lengths"])
+    return {name: value.astype(np.float32) if value.dtype == np.float16 else value for name, value in outputs.items()}
+
+
+def timeit(fn, num_iterations):
+    fn()
+    start_time = time.perf_counter()
+    for _ in range(num_iterations):
+        result = fn()
+    return (time.perf_counter() - start_time) / num_iterations * 1000, result
+
+
+def get_cases(args):
+    # mcore returns the log-probs of each prompt as a list of floats
+    generated_log_probs = [(-torch.rand(args.num_tokens, device=args.device)).tolist() for _ in range(args.batch_size)]
+    logits = tuple(torch.randn(args.batch_size, args.vocab_size, device=args.device) for _ in range(args.num_steps))
+    return [
+        ("log_probs float32", lambda: log_probs_float32(generated_log_probs)),
+        ("log_probs compact", lambda: log_probs_compact(generated_log_probs)),
+        ("logits float32", lambda: logits_float32(logits)),
+        ("logits compact", lambda: logits_compact(logits)),
+        ("top_logprobs", lambda: top_logprobs_compact(logits, args.top_logprobs)),
+    ]
+
+
+def query_triton(args, cases):
+    """Return the outputs of each case from a stub model of a local PyTriton server, and time the queries."""
+    from pytriton.client import ModelClient
+    from pytriton.decorators import batch
+    from pytriton.model_config import ModelConfig, Tensor
+    from pytriton.triton import Triton, TritonConfig
+
+    def stub_model(convert):
+        @batch
+        def infer_fn(**inputs):
+            return convert()
+
+        return infer_fn
+
+    latencies = {}
+    with Triton(config=TritonConfig(http_port=args.http_port, grpc_port=None, metrics_port=None)) as triton:
+        for i, (name, convert) in enumerate(cases):
+            outputs = convert()
+            triton.bind(
+                model_name=f"stub_{i}",
+                infer_func=stub_model(convert),
+                inputs=[Tensor(name="prompts", shape=(1,), dtype=bytes)],
+                outputs=[
+                    Tensor(name=output_name, shape=(-1,) * (value.ndim - 1), dtype=value.dtype.type)
+                    for output_name, value in outputs.items()
+                ],
+                config=ModelConfig(max_batch_size=args.batch_size),
+            )
+        triton.run()
+
+        prompts = np.array([[b"prompt"]] * args.batch_size)
+        for i, (name, _) in enumerate(cases):
+            with ModelClient(f"localhost:{args.http_port}", f"stub_{i}", inference_timeout_s=600) as client:
+                latencies[name], _ = timeit(lambda: decode(client.infer_batch(prompts=prompts)), args.num_iterations)
+    return latencies
+
+
+def benchmark(args):
+    torch.manual_seed(0)
+    cases = get_cases(args)
+
+    print(
+        f"batch size {args.batch_size}, {args.num_tokens} log-probs per prompt, "
+        f"{args.num_steps} steps of {args.vocab_size} logits, top {args.top_logprobs} log-probs, {args.device}"
+    )
+    latencies = query_triton(args, cases) if args.triton else {}
+    print(f"{'':>18s} {'convert (ms)':>13s} {'size (MB)':>10s} {'decode (ms)':>12s} {'query (ms)':>11s}")
+    for name, convert in cases:
+        convert_time, outputs = timeit(convert, args.num_iterations)
+        decode_time, _ = timeit(lambda: decode(outputs), args.num_iterations)
+        size = sum(value.nbytes for value in outputs.values()) / 2**20
+        query_time = f"{latencies[name]:11.2f}" if name in latencies else f"{'-':>11s}"
+        print(f"{name:>18s} {convert_time:13.2f} {size:10.2f} {decode_time:12.2f} {query_time}")
+
+
+def main():
+    benchmark(get_args())
+
+
+if __name__ == "__main__":
+    main()
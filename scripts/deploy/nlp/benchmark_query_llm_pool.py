@@ -0,0 +1,153 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This script measures the latency of the requests of the FastAPI interface to PyTriton
+(nemo/deploy/service/fastapi_interface_to_pytriton.py) with a local stub backend instead of a Triton server.
+
+The stub client takes `connect_ms` to connect to the server, and the stub server runs one query at a time, which takes
+`query_ms` plus `prompt_ms` per prompt. The script compares sending each request with a new thread pool and a new
+client, as the FastAPI interface used to, to sending the requests with `AsyncQueryLLMPool` alone, and with a
+`QueryLLMCoalescer` which merges concurrent requests into one query.
+
+$ python <nemo_root_path>/scripts/deploy/nlp/benchmark_query_llm_pool.py \
+    --num_requests=512 \
+    --concurrency=32
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+import numpy as np
+
+from nemo.deploy.service.query_llm_pool import AsyncQueryLLMPool, QueryLLMCoalescer
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Benchmark the clients of the FastAPI interface to PyTriton with a stub backend.",
+    )
+    parser.add_argument("--num_requests", default=512, type=int, help="Number of requests of each method.")
+    parser.add_argument("--concurrency", default=32, type=int, help="Number of concurrent requests.")
+    parser.add_argument("--pool_size", default=8, type=int, help="Number of threads of the client pool.")
+    parser.add_argument("--window_ms", default=5.0, type=float, help="Time window to merge requests.")
+    parser.add_argument("--max_batch_size", default=8, type=int, help="Maximum number of prompts of a query.")
+    parser.add_argument("--connect_ms", default=20.0, type=float, help="Time to connect a client to the server.")
+    parser.add_argument("--query_ms", default=20.0, type=float, help="Time of a query on the server.")
+    parser.add_argument("--prompt_ms", default=2.0, type=float, help="Additional time of a query per prompt.")
+    args = parser.parse_args()
+    return args
+
+
+class StubServer:
+    """Runs one query at a time, like a model deployed without dynamic batching."""
+
+    def __init__(self, query_ms: float, prompt_ms: float):
+        self.query_ms = query_ms
+        self.prompt_ms = prompt_ms
+        self.num_queries = 0
+        self._lock = threading.Lock()
+
+    def infer(self, prompts):
+        with self._lock:
+            self.num_queries += 1
+            time.sleep((self.query_ms + self.prompt_ms * len(prompts)) / 1000)
+        return {"choices": [{"text": np.array([[prompt] for prompt in prompts])}]}
+
+
+class StubQueryLLM:
+    """Client of the stub server, with the interface of `NemoQueryLLMPyTorch`."""
+
+    def __init__(self, server: StubServer, connect_ms: float):
+        self.server = server
+        self.connect_ms = connect_ms
+        self._connected = False
+
+    def query_llm(self, prompts, **kwargs):
+        if not self._connected:
+            time.sleep(self.connect_ms / 1000)
+            self._connected = True
+        return self.server.infer(prompts)
+
+    def close(self):
+        self._connected = False
+
+
+async def run_requests(query_fn, num_requests: int, concurrency: int):
+    latencies = []
+    request_ids = iter(range(num_requests))
+
+    async def send_requests():
+        for request_id in request_ids:
+            start_time = time.perf_counter()
+            await query_fn("model", prompts=[f"prompt {request_id}"], temperature=1.0, max_length=16)
+            latencies.append(time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*[send_requests() for _ in range(concurrency)])
+    return np.array(latencies), time.perf_counter() - start_time
+
+
+def benchmark(args):
+    def new_client_per_request(server):
+        async def query_llm(model, **kwargs):
+            # Like the FastAPI interface without a pool: a new thread pool and client for every request
+            loop = asyncio.get_event_loop()
+            with concurrent.futures.ThreadPoolExecutor() as pool:
+                client = StubQueryLLM(server, args.connect_ms)
+                return await loop.run_in_executor(pool, lambda: client.query_llm(**kwargs))
+
+        return query_llm, None
+
+    def client_pool(server):
+        pool = AsyncQueryLLMPool(
+            url="stub",
+            max_workers=args.pool_size,
+            query_factory=lambda url, model: StubQueryLLM(server, args.connect_ms),
+        )
+        return pool.query_llm, pool
+
+    def client_pool_with_coalescer(server):
+        query_llm, pool = client_pool(server)
+        coalescer = QueryLLMCoalescer(pool, window=args.window_ms / 1000, max_batch_size=args.max_batch_size)
+        return coalescer.query_llm, pool
+
+    print(f"{args.num_requests} requests, {args.concurrency} concurrent")
+    print(f"{'':>28s} {'p50 (ms)':>9s} {'p99 (ms)':>9s} {'requests/s':>11s} {'queries':>8s}")
+    for name, make_query_fn in [
+        ("new client per request", new_client_per_request),
+        ("client pool", client_pool),
+        ("client pool with coalescer", client_pool_with_coalescer),
+    ]:
+        server = StubServer(args.query_ms, args.prompt_ms)
+        query_fn, pool = make_query_fn(server)
+        latencies, total_time = asyncio.run(run_requests(query_fn, args.num_requests, args.concurrency))
+        if pool is not None:
+            pool.close()
+        print(
+            f"{name:>28s} {1000 * np.percentile(latencies, 50):9.1f} {1000 * np.percentile(latencies, 99):9.1f} "
+            f"{args.num_requests / total_time:11.1f} {server.num_queries:8d}"
+        )
+
+
+def main():
+    benchmark(get_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -121,6 +121,20 @@ def get_args(argv):
     parser.add_argument(
         "-mbs", "--max_batch_size", default=8, type=int, help="Maximum " "batch size for model inference"
     )
+    parser.add_argument(
+        "-cb",
+        "--continuous_batching",
+        default=False,
+        action='store_true',
+        help="Generate the outputs of concurrent requests with continuous batching",
+    )
+    parser.add_argument(
+        "-mrs",
+        "--max_running_sequences",
+        default=8,
+        type=int,
+        help="Maximum number of sequences generated together with continuous batching",
+    )
     parser.add_argument(
         "-dm", "--debug_mode", default=False, action='store_true', help="Enable " "verbose debug logging"
     )
@@ -180,6 +194,8 @@ def hf_deploy(argv):
         trust_remote_code=args.trust_remote_code,
         device_map=args.device_map,
         tp_plan=args.tp_plan,
+        continuous_batching=args.continuous_batching,
+        max_running_sequences=args.max_running_sequences,
     )
 
     start_triton_server = True
@@ -196,6 +212,8 @@ def hf_deploy(argv):
                 max_batch_size=args.max_batch_size,
                 http_port=args.triton_port,
                 address=args.triton_http_address,
+                # Concurrent requests join the running batch of the continuous batching scheduler
+                infer_instances=args.max_running_sequences if args.continuous_batching else 1,
             )
 
             LOGGER.info("Triton deploy function will be called.")
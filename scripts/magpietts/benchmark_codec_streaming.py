@@ -0,0 +1,148 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This script compares the latency of decoding audio codes with `AudioCodecModel.decode` after all frames are available,
+and with `AudioCodecStreamingDecoder` while the frames arrive in chunks, for example from a TTS model.
+
+The time to first audio of full decoding is the time to decode the whole sequence. For streaming decoding it is the
+time until the first non-empty audio chunk is returned, not counting the time to generate the frames. The script
+also reports the latency of each streaming step, the real-time factor of both methods and the maximum difference
+between their outputs.
+
+$ python <nemo_root_path>/scripts/magpietts/benchmark_codec_streaming.py \
+    --codec_model_path=<codec_model_path>.nemo \
+    --num_frames=200 \
+    --chunk_size=4
+"""
+
+import argparse
+import time
+
+import numpy as np
+import torch
+
+from nemo.collections.tts.models import AudioCodecModel
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Benchmark streaming decoding of audio codes.",
+    )
+    parser.add_argument("--codec_model_path", required=True, type=str, help="Path to .nemo audio codec model.")
+    parser.add_argument("--num_frames", default=200, type=int, help="Number of frames of codes to decode.")
+    parser.add_argument("--chunk_size", default=4, type=int, help="Number of frames pushed in each streaming step.")
+    parser.add_argument("--batch_size", default=1, type=int, help="Number of sequences decoded together.")
+    parser.add_argument("--num_runs", default=3, type=int, help="Number of timed runs of each method.")
+    parser.add_argument("--device", default="cuda" if torch.cuda.is_available() else "cpu", type=str)
+    parser.add_argument("--seed", default=0, type=int, help="Random seed.")
+    args = parser.parse_args()
+    return args
+
+
+def _synchronize(device: torch.device):
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+
+
+def benchmark(model: AudioCodecModel, num_frames: int, chunk_size: int, batch_size: int, num_runs: int, seed: int):
+    device = model.device
+    generator = torch.Generator().manual_seed(seed)
+    audio = torch.randn(batch_size, num_frames * model.samples_per_frame, generator=generator).clamp(-1.0, 1.0)
+    audio_len = torch.full((batch_size,), audio.size(1), dtype=torch.long)
+    with torch.no_grad():
+        tokens, tokens_len = model.encode(audio=audio.to(device), audio_len=audio_len.to(device))
+
+    # Warm up both methods. Creating the first streaming decoder also estimates the receptive field of the decoder.
+    with torch.no_grad():
+        model.decode(tokens=tokens, tokens_len=tokens_len)
+    streaming_decoder = model.get_streaming_decoder()
+    streaming_decoder.push(tokens[:, :, :chunk_size])
+    streaming_decoder.reset()
+    print(
+        f"Decoder context: {streaming_decoder.num_past_frames} past frames, "
+        f"{streaming_decoder.num_future_frames} future frames"
+    )
+
+    full_latencies = []
+    first_audio_latencies = []
+    total_stream_latencies = []
+    step_latencies = []
+    for _ in range(num_runs):
+        _synchronize(device)
+        start_time = time.perf_counter()
+        with torch.no_grad():
+            full_audio, _ = model.decode(tokens=tokens, tokens_len=tokens_len)
+        _synchronize(device)
+        full_latencies.append(time.perf_counter() - start_time)
+
+        chunks = []
+        first_audio_latency = None
+        stream_latency = 0.0
+        for chunk_start in range(0, num_frames + 1, chunk_size):
+            _synchronize(device)
+            start_time = time.perf_counter()
+            if chunk_start < num_frames:
+                chunk = streaming_decoder.push(tokens[:, :, chunk_start : chunk_start + chunk_size])
+            else:
+                chunk = streaming_decoder.flush()
+            _synchronize(device)
+            step_latency = time.perf_counter() - start_time
+            step_latencies.append(step_latency)
+            stream_latency += step_latency
+            if first_audio_latency is None and chunk.size(1) > 0:
+                first_audio_latency = stream_latency
+            chunks.append(chunk)
+        streaming_decoder.reset()
+        first_audio_latencies.append(first_audio_latency)
+        total_stream_latencies.append(stream_latency)
+
+    max_diff = (torch.cat(chunks, dim=1) - full_audio).abs().max().item()
+    audio_duration = num_frames * model.samples_per_frame / model.sample_rate
+    step_latencies_ms = 1000 * np.array(step_latencies)
+    print(f"Audio duration: {audio_duration:.2f} s, batch size {batch_size}, chunk size {chunk_size} frames")
+    print(f"{'':>24s} {'first audio (ms)':>17s} {'total (ms)':>11s} {'RTF':>8s}")
+    for name, first_latencies, total_latencies in [
+        ("full decode", full_latencies, full_latencies),
+        ("streaming decode", first_audio_latencies, total_stream_latencies),
+    ]:
+        total_latency = np.mean(total_latencies)
+        print(
+            f"{name:>24s} {1000 * np.mean(first_latencies):17.1f} {1000 * total_latency:11.1f} "
+            f"{total_latency / audio_duration:8.4f}"
+        )
+    print(
+        f"Streaming step latency (ms): mean {step_latencies_ms.mean():.1f}, "
+        f"p50 {np.percentile(step_latencies_ms, 50):.1f}, p99 {np.percentile(step_latencies_ms, 99):.1f}"
+    )
+    print(f"Max difference between streaming and full decoding: {max_diff:.3e}")
+
+
+def main():
+    args = get_args()
+    torch.manual_seed(args.seed)
+    model = AudioCodecModel.restore_from(args.codec_model_path, map_location=args.device).eval()
+    benchmark(
+        model=model,
+        num_frames=args.num_frames,
+        chunk_size=args.chunk_size,
+        batch_size=args.batch_size,
+        num_runs=args.num_runs,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    main()
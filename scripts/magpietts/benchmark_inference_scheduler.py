@@ -0,0 +1,235 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This script compares the throughput and latency of decoding requests to a MagpieTTS model in fixed batches, and with
+continuous batching by `MagpieTTSInferenceScheduler`.
+
+All requests are queued at the start. With fixed batches, the next batch starts when all requests of the previous
+batch ended. They are decoded with the KV cache, or with `infer_batch` without KV cache if `--no-use_kv_cache` is
+given. With continuous batching, queued requests are admitted as soon as requests of the batch end. The script
+reports the generated frames per second, and the mean and 90th percentile of the time from the start until the audio
+of a request is decoded.
+
+The requests have random text and context audio codes, of `decoder_context_tts` or `multi_encoder_context_tts` models.
+Since random inputs rarely end with the end of sequence token, each sampled frame ends its request with probability
+`--eos_probability`, which simulates utterances of different lengths.
+
+$ python <nemo_root_path>/scripts/magpietts/benchmark_inference_scheduler.py \
+    --model_path=<model_path>.nemo \
+    --codecmodel_path=<codec_model_path>.nemo \
+    --num_requests=32 \
+    --batch_size=8 \
+    --max_decoder_steps=300
+"""
+
+import argparse
+import time
+from functools import partial
+
+import numpy as np
+import torch
+
+from nemo.collections.tts.models import MagpieTTS_Model
+from nemo.collections.tts.parts.utils.magpietts_inference import MagpieTTSInferenceScheduler
+from nemo.collections.tts.parts.utils.tts_dataset_utils import stack_tensors
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Benchmark continuous batching inference of MagpieTTS.",
+    )
+    parser.add_argument("--model_path", required=True, type=str, help="Path to .nemo MagpieTTS model.")
+    parser.add_argument("--codecmodel_path", default=None, type=str, help="Optional path to .nemo codec model.")
+    parser.add_argument("--num_requests", default=32, type=int, help="Number of requests to decode.")
+    parser.add_argument("--batch_size", default=8, type=int, help="Maximum number of requests decoded together.")
+    parser.add_argument("--max_decoder_steps", default=300, type=int, help="Maximum number of frames of a request.")
+    parser.add_argument("--text_len", default=40, type=int, help="Maximum number of text tokens of a request.")
+    parser.add_argument("--context_len", default=100, type=int, help="Maximum number of context frames of a request.")
+    parser.add_argument("--eos_probability", default=1 / 80, type=float, help="Probability to end after a frame.")
+    parser.add_argument("--use_cfg", action="store_true", help="Use classifier-free guidance.")
+    parser.add_argument("--cfg_scale", default=2.5, type=float, help="Classifier-free guidance scale.")
+    parser.add_argument(
+        "--use_kv_cache",
+        default=True,
+        action=argparse.BooleanOptionalAction,
+        help="Whether to decode fixed batches with the KV cache.",
+    )
+    parser.add_argument("--device", default="cuda" if torch.cuda.is_available() else "cpu", type=str)
+    parser.add_argument("--seed", default=0, type=int, help="Random seed.")
+    args = parser.parse_args()
+    return args
+
+
+def _synchronize(device: torch.device):
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+
+
+def get_requests(model: MagpieTTS_Model, num_requests: int, text_len: int, context_len: int, seed: int):
+    if model.model_type not in ['decoder_context_tts', 'multi_encoder_context_tts']:
+        raise ValueError(f"Model type {model.model_type} is not supported, it has to use context audio.")
+
+    generator = torch.Generator().manual_seed(seed)
+    num_audio_codebooks = model.cfg.num_audio_codebooks
+    # Random tokens without the special tokens at the end of the vocabularies
+    max_audio_token = model.cfg.num_audio_tokens_per_codebook - 4
+    requests = []
+    for _ in range(num_requests):
+        text_lens = torch.randint(text_len // 2, text_len + 1, (1,), generator=generator)
+        context_audio_codes_lens = torch.randint(context_len // 2, context_len + 1, (1,), generator=generator)
+        requests.append(
+            {
+                'text': torch.randint(0, model.bos_id, (1, text_lens.item()), generator=generator),
+                'text_lens': text_lens,
+                'context_audio_codes': torch.randint(
+                    0, max_audio_token, (1, num_audio_codebooks, context_audio_codes_lens.item()), generator=generator
+                ),
+                'context_audio_codes_lens': context_audio_codes_lens,
+            }
+        )
+    return requests
+
+
+def collate(requests, device: torch.device):
+    text_lens = torch.cat([request['text_lens'] for request in requests])
+    context_audio_codes_lens = torch.cat([request['context_audio_codes_lens'] for request in requests])
+    batch = {
+        'text': stack_tensors([request['text'][0] for request in requests], max_lens=[text_lens.max().item()]),
+        'text_lens': text_lens,
+        'context_audio_codes': stack_tensors(
+            [request['context_audio_codes'][0] for request in requests],
+            max_lens=[context_audio_codes_lens.max().item()],
+        ),
+        'context_audio_codes_lens': context_audio_codes_lens,
+    }
+    return {name: value.to(device) for name, value in batch.items()}
+
+
+def force_eos(model: MagpieTTS_Model, eos_probability: float, seed: int):
+    """Ends each sampled frame with probability `eos_probability`. Returns a function to reset the random state."""
+    sample_codes_from_logits = model.sample_codes_from_logits
+    generator = torch.Generator()
+
+    def sample_codes_with_eos(all_code_logits_t, temperature=0.7, topk=80):
+        codes = sample_codes_from_logits(all_code_logits_t, temperature=temperature, topk=topk)
+        # The argmax codes are sampled with a temperature of 0.01
+        if temperature != 0.01:
+            is_end = torch.rand(codes.size(0), generator=generator) < eos_probability
+            codes[is_end.to(codes.device), 0] = model.audio_eos_id
+        return codes
+
+    model.sample_codes_from_logits = sample_codes_with_eos
+    return lambda: generator.manual_seed(seed)
+
+
+def decode_without_kv_cache(model: MagpieTTS_Model, requests, args):
+    """Returns the number of generated frames and the time until the audio of each request is decoded."""
+    model.use_kv_cache_for_inference = False
+    num_frames = 0
+    times_to_first_audio = []
+    start_time = time.perf_counter()
+    for batch_start in range(0, len(requests), args.batch_size):
+        batch = collate(requests[batch_start : batch_start + args.batch_size], device=model.device)
+        _, _, _, codes_lens = model.infer_batch(
+            batch, max_decoder_steps=args.max_decoder_steps, use_cfg=args.use_cfg, cfg_scale=args.cfg_scale
+        )
+        _synchronize(model.device)
+        # The frames with the end of sequence token are generated too
+        num_frames += (codes_lens + (codes_lens < args.max_decoder_steps).long()).sum().item()
+        times_to_first_audio += [time.perf_counter() - start_time] * codes_lens.size(0)
+    return num_frames, times_to_first_audio
+
+
+def decode_with_scheduler(model: MagpieTTS_Model, requests, args, continuous: bool):
+    """Returns the number of generated frames and the time until the audio of each request is decoded."""
+    scheduler = MagpieTTSInferenceScheduler(
+        model=model,
+        max_batch_size=args.batch_size,
+        max_decoder_steps=args.max_decoder_steps,
+        use_cfg=args.use_cfg,
+        cfg_scale=args.cfg_scale,
+    )
+    results = []
+    start_time = time.perf_counter()
+    if continuous:
+        # All requests are queued, and each one is admitted as soon as there is a free slot
+        for request in requests:
+            scheduler.add_requests(collate([request], device=model.device))
+        results = scheduler.run()
+    else:
+        for batch_start in range(0, len(requests), args.batch_size):
+            queue_time = time.perf_counter() - start_time
+            scheduler.add_requests(collate(requests[batch_start : batch_start + args.batch_size], model.device))
+            for result in scheduler.run():
+                result['time_to_first_audio'] += queue_time
+                results.append(result)
+    _synchronize(model.device)
+
+    # The frames with the end of sequence token are generated too
+    num_frames = sum(result['codes_len'] + int(result['codes_len'] < args.max_decoder_steps) for result in results)
+    return num_frames, [result['time_to_first_audio'] for result in results]
+
+
+def benchmark(model: MagpieTTS_Model, args):
+    requests = get_requests(
+        model, num_requests=args.num_requests, text_len=args.text_len, context_len=args.context_len, seed=args.seed
+    )
+    reset_eos = force_eos(model, eos_probability=args.eos_probability, seed=args.seed)
+    if args.use_kv_cache:
+        decode_fixed_batches = partial(decode_with_scheduler, model, requests, args, continuous=False)
+    else:
+        decode_fixed_batches = partial(decode_without_kv_cache, model, requests, args)
+    methods = [
+        ("fixed batches", decode_fixed_batches),
+        ("continuous batching", partial(decode_with_scheduler, model, requests, args, continuous=True)),
+    ]
+
+    # Warm up
+    with torch.no_grad():
+        decode_with_scheduler(model, requests[: args.batch_size], args, continuous=True)
+
+    print(
+        f"{args.num_requests} requests, batch size {args.batch_size}, at most {args.max_decoder_steps} frames, "
+        f"{'with' if args.use_cfg else 'without'} CFG, {model.device}"
+    )
+    print(f"{'':>20s} {'frames':>7s} {'time (s)':>9s} {'frames/s':>9s} {'mean TTFA (s)':>14s} {'p90 TTFA (s)':>13s}")
+    for name, decode in methods:
+        reset_eos()
+        start_time = time.perf_counter()
+        with torch.no_grad():
+            num_frames, times_to_first_audio = decode()
+        run_time = time.perf_counter() - start_time
+        print(
+            f"{name:>20s} {num_frames:7d} {run_time:9.2f} {num_frames / run_time:9.1f} "
+            f"{np.mean(times_to_first_audio):14.2f} {np.percentile(times_to_first_audio, 90):13.2f}"
+        )
+
+
+def main():
+    args = get_args()
+    torch.manual_seed(args.seed)
+    model_cfg = MagpieTTS_Model.restore_from(args.model_path, return_config=True)
+    if args.codecmodel_path is not None:
+        model_cfg.codecmodel_path = args.codecmodel_path
+    model_cfg.train_ds = None
+    model_cfg.validation_ds = None
+    model = MagpieTTS_Model.restore_from(args.model_path, override_config_path=model_cfg, map_location=args.device)
+    model.eval()
+    benchmark(model, args)
+
+
+if __name__ == "__main__":
+    main()
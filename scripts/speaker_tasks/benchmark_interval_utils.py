@@ -0,0 +1,79 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import time
+
+import torch
+
+from nemo.collections.asr.parts.utils.speaker_utils import (
+    get_interval_intersection,
+    get_interval_set,
+    get_interval_subtraction,
+    get_interval_union,
+    get_sub_range_list,
+    merge_float_intervals,
+)
+
+"""
+This script benchmarks the interval set utilities in `speaker_utils.py` on synthetic sessions
+with a large number of segments (RTTM lines or VAD segments).
+
+Usage:
+    python benchmark_interval_utils.py --num_segments 1000000 --session_duration 10000000
+"""
+
+
+def random_segments(num_segments: int, session_duration: float, max_segment_duration: float, seed: int):
+    """
+    Generate random [start, end] segments in a session of the given duration.
+    """
+    generator = torch.Generator().manual_seed(seed)
+    starts = torch.rand(num_segments, generator=generator, dtype=torch.float64) * session_duration
+    durations = torch.rand(num_segments, generator=generator, dtype=torch.float64) * max_segment_duration + 0.01
+    return torch.round(torch.stack([starts, starts + durations], dim=1), decimals=3)
+
+
+def timeit(name: str, func, *args):
+    start_time = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start_time
+    print(f"{name:<40s} {elapsed:10.4f} sec")
+    return result
+
+
+def main(num_segments: int, session_duration: float, max_segment_duration: float):
+    segments_a = random_segments(num_segments, session_duration, max_segment_duration, seed=0)
+    segments_b = random_segments(num_segments, session_duration, max_segment_duration, seed=1)
+    segments_list = segments_a.tolist()
+    print(f"Number of segments: {num_segments}, session duration: {session_duration} sec")
+
+    set_a = timeit("get_interval_set", get_interval_set, segments_a)
+    set_b = get_interval_set(segments_b)
+    timeit("get_interval_union", get_interval_union, set_a, set_b)
+    timeit("get_interval_intersection", get_interval_intersection, set_a, set_b)
+    timeit("get_interval_subtraction", get_interval_subtraction, set_a, set_b)
+    timeit("merge_float_intervals", merge_float_intervals, segments_list)
+    target_range = [session_duration * 0.25, session_duration * 0.75]
+    timeit("get_sub_range_list", get_sub_range_list, target_range, segments_list)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_segments", help="number of segments per session", type=int, default=1000000)
+    parser.add_argument("--session_duration", help="session duration in seconds", type=float, default=10000000.0)
+    parser.add_argument("--max_segment_duration", help="maximum segment duration in seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    main(args.num_segments, args.session_duration, args.max_segment_duration)
@@ -0,0 +1,106 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import time
+
+import numpy as np
+import torch
+
+from nemo.collections.asr.parts.utils.online_clustering import OnlineSpeakerClustering
+
+"""
+This script measures the per-step latency of `OnlineSpeakerClustering.forward_infer` on a simulated
+multi-hour streaming session, and reports latency statistics for each block of simulated time so that
+latency drift over the session can be inspected.
+
+The simulated stream feeds a sliding window of the most recent embeddings (history + current buffer size + margin)
+with global segment indexes, in the same way as `OnlineClusteringDiarizer` keeps only the recent segments.
+
+Usage:
+    python benchmark_online_clustering.py --hours 3 --num_speakers 4 --report_every_min 10
+"""
+
+
+def simulate_stream(num_segments: int, num_speakers: int, emb_dim: int, turn_segments: int, sigma: float, seed: int):
+    """
+    Generate speaker embeddings with speaker turns of `turn_segments` segments.
+    """
+    torch.manual_seed(seed)
+    centers = torch.linalg.qr(torch.randn(emb_dim, emb_dim))[0][:num_speakers]
+    speakers = torch.randint(0, num_speakers, (num_segments // turn_segments + 1,)).repeat_interleave(turn_segments)
+    speakers = speakers[:num_segments]
+    embs = centers[speakers] + sigma * torch.randn(num_segments, emb_dim)
+    return embs, speakers
+
+
+def main(args):
+    num_segments = int(args.hours * 3600 / args.shift_sec)
+    embs, _ = simulate_stream(num_segments, args.num_speakers, args.emb_dim, args.turn_segments, args.sigma, args.seed)
+    online_clus = OnlineSpeakerClustering(
+        max_num_speakers=args.max_num_speakers,
+        history_buffer_size=args.buffer_size,
+        current_buffer_size=args.buffer_size,
+        cuda=False,
+    )
+    if args.jit_script:
+        online_clus = torch.jit.script(online_clus)
+
+    window_size = 2 * args.buffer_size + args.memory_margin
+    n_steps = num_segments // args.segments_per_step
+    steps_per_report = max(int(args.report_every_min * 60 / (args.shift_sec * args.segments_per_step)), 1)
+    latencies = []
+    print(f"Simulating {args.hours} hours: {num_segments} segments, {n_steps} steps")
+    print(f"{'time (min)':>12s} {'mean (ms)':>10s} {'p50 (ms)':>10s} {'p99 (ms)':>10s} {'max (ms)':>10s}")
+    for step in range(n_steps):
+        total_n = (step + 1) * args.segments_per_step
+        stt = max(total_n - window_size, 0)
+        curr_emb = embs[stt:total_n]
+        base_segment_indexes = torch.arange(stt, total_n)
+
+        start_time = time.perf_counter()
+        online_clus.forward_infer(
+            curr_emb=curr_emb,
+            base_segment_indexes=base_segment_indexes,
+            max_num_speakers=args.max_num_speakers,
+            frame_index=step,
+            cuda=False,
+        )
+        latencies.append((time.perf_counter() - start_time) * 1000)
+
+        if (step + 1) % steps_per_report == 0 or step == n_steps - 1:
+            block = np.array(latencies[-steps_per_report:])
+            minutes = total_n * args.shift_sec / 60
+            print(
+                f"{minutes:12.1f} {block.mean():10.2f} {np.percentile(block, 50):10.2f} "
+                f"{np.percentile(block, 99):10.2f} {block.max():10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hours", help="duration of the simulated session in hours", type=float, default=3.0)
+    parser.add_argument("--shift_sec", help="shift length of the base scale segments", type=float, default=0.5)
+    parser.add_argument("--segments_per_step", help="number of new segments per streaming step", type=int, default=2)
+    parser.add_argument("--num_speakers", help="number of speakers in the simulated session", type=int, default=4)
+    parser.add_argument("--max_num_speakers", help="maximum number of speakers for clustering", type=int, default=8)
+    parser.add_argument("--turn_segments", help="number of segments per speaker turn", type=int, default=20)
+    parser.add_argument("--emb_dim", help="speaker embedding dimension", type=int, default=192)
+    parser.add_argument("--sigma", help="standard deviation of the embedding perturbation", type=float, default=0.1)
+    parser.add_argument("--buffer_size", help="history and current buffer size", type=int, default=150)
+    parser.add_argument("--memory_margin", help="extra segments kept in the input window", type=int, default=50)
+    parser.add_argument("--report_every_min", help="report interval in simulated minutes", type=float, default=10.0)
+    parser.add_argument("--jit_script", help="run the torch.jit.script version", action='store_true')
+    parser.add_argument("--seed", help="random seed", type=int, default=0)
+    main(parser.parse_args())
@@ -0,0 +1,107 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This script compares the run time of the monotonic alignment search of VITS implemented with Numba in
+`monotonic_align.numba_core`, and with PyTorch in `monotonic_align.torch_core`.
+
+The inputs are random, for batches of text lengths drawn uniformly from `--min_text_len` to `--max_text_len`, and mel
+lengths of about `--mel_ratio` times the text lengths. Both versions are called with the inputs on each device of
+`--devices`, so the time of the Numba version includes copying the inputs to the host and the path back to the
+device. The script also checks that both versions give the same paths.
+
+$ python <nemo_root_path>/scripts/tts/benchmark_monotonic_align.py \
+    --batch_sizes 16 32 64 \
+    --min_text_len=50 \
+    --max_text_len=200 \
+    --devices cpu cuda
+"""
+
+import argparse
+import time
+
+import torch
+
+from nemo.collections.tts.modules.monotonic_align import maximum_path_numba, maximum_path_torch
+from nemo.collections.tts.parts.utils.helpers import get_mask_from_lengths
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Benchmark the Numba and PyTorch versions of the monotonic alignment search.",
+    )
+    parser.add_argument("--batch_sizes", default=[16, 32, 64], nargs="+", type=int, help="Batch sizes to time.")
+    parser.add_argument("--min_text_len", default=50, type=int, help="Minimum text length.")
+    parser.add_argument("--max_text_len", default=200, type=int, help="Maximum text length.")
+    parser.add_argument("--mel_ratio", default=5.0, type=float, help="Average ratio of mel and text lengths.")
+    parser.add_argument("--num_iterations", default=10, type=int, help="Number of timed iterations.")
+    parser.add_argument(
+        "--devices",
+        default=["cpu", "cuda"] if torch.cuda.is_available() else ["cpu"],
+        nargs="+",
+        type=str,
+        help="Devices of the inputs.",
+    )
+    parser.add_argument("--seed", default=0, type=int, help="Random seed.")
+    args = parser.parse_args()
+    return args
+
+
+def get_inputs(batch_size: int, min_text_len: int, max_text_len: int, mel_ratio: float, device: torch.device):
+    text_lens = torch.randint(min_text_len, max_text_len + 1, (batch_size,))
+    # The alignment needs at least one mel frame per text token
+    mel_lens = (text_lens * mel_ratio * (0.8 + 0.4 * torch.rand(batch_size))).long().clamp(min=text_lens)
+    neg_cent = torch.randn(batch_size, mel_lens.max().item(), text_lens.max().item())
+    mask = get_mask_from_lengths(mel_lens).unsqueeze(2) * get_mask_from_lengths(text_lens).unsqueeze(1)
+    return neg_cent.to(device), mask.float().to(device)
+
+
+def timeit(fn, device: torch.device, num_iterations: int):
+    fn()
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+    start_time = time.perf_counter()
+    for _ in range(num_iterations):
+        result = fn()
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+    return (time.perf_counter() - start_time) / num_iterations * 1000, result
+
+
+def benchmark(args):
+    torch.manual_seed(args.seed)
+    print(f"text lengths {args.min_text_len}-{args.max_text_len}, mel lengths about {args.mel_ratio}x text lengths")
+    print(f"{'device':>8s} {'batch':>6s} {'shape':>16s} {'numba (ms)':>11s} {'torch (ms)':>11s} {'same path':>10s}")
+    for device in args.devices:
+        device = torch.device(device)
+        for batch_size in args.batch_sizes:
+            neg_cent, mask = get_inputs(
+                batch_size, args.min_text_len, args.max_text_len, mel_ratio=args.mel_ratio, device=device
+            )
+            numba_time, numba_path = timeit(lambda: maximum_path_numba(neg_cent, mask), device, args.num_iterations)
+            torch_time, torch_path = timeit(lambda: maximum_path_torch(neg_cent, mask), device, args.num_iterations)
+            shape = "x".join(str(size) for size in neg_cent.shape)
+            print(
+                f"{device.type:>8s} {batch_size:6d} {shape:>16s} {numba_time:11.2f} {torch_time:11.2f} "
+                f"{str(torch.equal(numba_path, torch_path)):>10s}"
+            )
+
+
+def main():
+    benchmark(get_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,7 @@ from typing import List, Type, Union
 import numpy as np
 import pytest
 from numpy.random import default_rng
+from scipy.signal import convolve
 
 from nemo.collections.asr.parts.preprocessing.segment import AudioSegment
 from nemo.collections.audio.data.data_simulation import (
@@ -25,6 +26,8 @@ from nemo.collections.audio.data.data_simulation import (
     check_angle,
     convert_placement_to_range,
     convert_rir_to_multichannel,
+    convolve_rir,
+    convolve_rir_batch,
     simulate_room_mix,
     wrap_to_180,
 )
@@ -211,6 +214,41 @@ class TestDataSimulationUtils:
                 pad = mc_rir[n_source][diff_len:, n_mic]
                 assert np.all(pad == 0.0), f'Original RIR not matching: source={n_source}, channel={n_mic}'
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("num_mics", [1, 4])
+    @pytest.mark.parametrize("num_sources", [1, 3])
+    def test_convolve_rir(self, num_mics: int, num_sources: int):
+        """Test batched convolution of signals and RIRs against per-channel convolution."""
+        atol = 1e-10
+        random = default_rng(seed=42)
+
+        signals, rirs = [], []
+        for n_source in range(num_sources):
+            signals.append(random.normal(size=random.integers(low=1000, high=5000)))
+            rir = random.normal(size=(random.integers(low=50, high=2000), num_mics))
+            rirs.append(rir[:, 0] if num_mics == 1 else rir)
+
+        # UUT
+        uut_batch = convolve_rir_batch(signals=signals, rirs=rirs, max_batch_size=2)
+
+        for n_source, (signal, rir) in enumerate(zip(signals, rirs)):
+            # Golden reference
+            golden_ref = np.zeros((len(signal), num_mics))
+            for n_mic in range(num_mics):
+                rir_m = rir if rir.ndim == 1 else rir[:, n_mic]
+                golden_ref[:, n_mic] = convolve(signal, rir_m)[: len(signal)]
+            if rir.ndim == 1:
+                golden_ref = golden_ref[:, 0]
+
+            # Compare
+            uut = convolve_rir(signal, rir)
+            assert uut.shape == golden_ref.shape, f'Shape not matching: source={n_source}'
+            assert np.allclose(uut, golden_ref, atol=atol), f'Single convolution not matching: source={n_source}'
+            assert uut_batch[n_source].shape == golden_ref.shape, f'Shape not matching: source={n_source}'
+            assert np.allclose(
+                uut_batch[n_source], golden_ref, atol=atol
+            ), f'Batched convolution not matching: source={n_source}'
+
 
 class TestArrayGeometry:
     @pytest.mark.unit
@@ -27,6 +27,7 @@ from nemo.collections.audio.parts.utils.audio import (
     convmtx_mc_numpy,
     db2mag,
     estimated_coherence,
+    fft_convolve,
     generate_approximate_noise_field,
     get_segment_start,
     mag2db,
@@ -358,3 +359,36 @@ class TestAudioUtilsElements:
                     assert np.allclose(
                         Tx[b, m, ...].cpu().numpy(), T_ref, atol=atol
                     ), f'Example {n}: not matching the reference for (b={b}, m={m}), .'
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('num_channels', [1, 3])
+    @pytest.mark.parametrize('filter_length', [10, 1000])
+    @pytest.mark.parametrize('num_samples', [100, 2000])
+    def test_fft_convolve(self, num_channels: int, filter_length: int, num_samples: int):
+        """Test batched FFT convolution against convolution of each signal with each filter."""
+        atol = 1e-10
+        random_seed = 42
+        batch_size = 5
+
+        _rng = np.random.default_rng(seed=random_seed)
+
+        x = _rng.normal(size=(batch_size, 1, num_samples))
+        h = _rng.normal(size=(batch_size, num_channels, filter_length))
+
+        # Full convolution, broadcasting the signal over channels
+        uut = fft_convolve(x=torch.tensor(x), h=torch.tensor(h), max_batch_size=4)
+        assert uut.shape == (batch_size, num_channels, num_samples + filter_length - 1)
+
+        # Truncated convolution
+        uut_trunc = fft_convolve(x=torch.tensor(x), h=torch.tensor(h), num_samples=num_samples)
+        assert uut_trunc.shape == (batch_size, num_channels, num_samples)
+
+        for b in range(batch_size):
+            for m in range(num_channels):
+                golden_ref = np.convolve(x[b, 0, :], h[b, m, :], mode='full')
+                assert np.allclose(
+                    uut[b, m, ...].cpu().numpy(), golden_ref, atol=atol
+                ), f'Not matching the reference for (b={b}, m={m}).'
+                assert np.allclose(
+                    uut_trunc[b, m, ...].cpu().numpy(), golden_ref[:num_samples], atol=atol
+                ), f'Truncated output not matching the reference for (b={b}, m={m}).'
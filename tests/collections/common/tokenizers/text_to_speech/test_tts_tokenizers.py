@@ -16,6 +16,7 @@ import pytest
 
 from nemo.collections.common.tokenizers.text_to_speech.tts_tokenizers import (
     EnglishCharsTokenizer,
+    EnglishPhonemesTokenizer,
     FrenchCharsTokenizer,
     GermanCharsTokenizer,
     IPATokenizer,
@@ -24,6 +25,7 @@ from nemo.collections.common.tokenizers.text_to_speech.tts_tokenizers import (
     SpanishCharsTokenizer,
     VietnameseCharsTokenizer,
 )
+from nemo.collections.tts.g2p.models.en_us_arpabet import EnglishG2p
 from nemo.collections.tts.g2p.models.i18n_ipa import IpaG2p
 from nemo.collections.tts.g2p.models.ja_jp_ipa import JapaneseG2p
 
@@ -272,6 +274,59 @@ class TestTTSTokenizers:
         expected_output = "HELLO, ˈwund"
         assert chars == expected_output
 
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_ipa_tokenizer_cache(self):
+        input_texts = ["Hello world.", "Hello café, world-hello!", "Hello world."]
+        g2p = IpaG2p(phoneme_dict=self.PHONEME_DICT_EN, apply_to_oov_word=None)
+        tokenizer = IPATokenizer(g2p=g2p, locale="en-US", cache_size=10)
+        tokenizer_no_cache = IPATokenizer(g2p=g2p, locale="en-US")
+
+        for _ in range(2):
+            tokens_list = tokenizer.batch_encode(input_texts)
+            assert tokens_list == [tokenizer_no_cache.encode(text) for text in input_texts]
+            # Outputs must not share lists with the cache
+            tokens_list[0].clear()
+
+        assert len(tokenizer._text_cache) == 2
+        assert len(tokenizer_no_cache._text_cache) == 0
+        tokenizer.clear_cache()
+        assert len(tokenizer._text_cache) == 0
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_ipa_tokenizer_cache_with_phoneme_probability(self):
+        input_texts = ["Hello world, cafe world.", "Hello-world café!", "World hello."] * 5
+        g2p = IpaG2p(phoneme_dict=self.PHONEME_DICT_EN, phoneme_probability=0.5)
+        g2p_no_cache = IpaG2p(phoneme_dict=self.PHONEME_DICT_EN, phoneme_probability=0.5)
+        tokenizer = IPATokenizer(g2p=g2p, locale="en-US", cache_size=10)
+        tokenizer_no_cache = IPATokenizer(g2p=g2p_no_cache, locale="en-US")
+        g2p._rng.seed(1234)
+        g2p_no_cache._rng.seed(1234)
+
+        tokens_list = [tokenizer.encode(text) for text in input_texts]
+        tokens_list_no_cache = [tokenizer_no_cache.encode(text) for text in input_texts]
+
+        assert tokens_list == tokens_list_no_cache
+        assert len(tokenizer._text_cache) == 3
+        # The cached texts are sampled again, so the same text gets both graphemes and phonemes
+        chars = {tokenizer.decode(tokens).replace('|', '') for tokens in tokens_list[2::3]}
+        assert len(chars) > 1
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_english_phonemes_tokenizer_cache(self):
+        input_texts = ["Hello world!", "World, hello.", "Hello world!"]
+        phoneme_dict = {"hello": [["HH", "AH0", "L", "OW1"]], "world": [["W", "ER1", "L", "D"]]}
+        g2p = EnglishG2p(phoneme_dict=phoneme_dict, apply_to_oov_word=lambda x: x)
+        tokenizer = EnglishPhonemesTokenizer(g2p=g2p, stresses=True, cache_size=10)
+        tokenizer_no_cache = EnglishPhonemesTokenizer(g2p=g2p, stresses=True)
+
+        tokens_list = tokenizer.batch_encode(input_texts)
+        assert tokens_list == tokenizer_no_cache.batch_encode(input_texts)
+        assert tokenizer.decode(tokens_list[0]) == "HH|AH0|L|OW1| |W|ER1|L|D|!"
+        assert len(tokenizer._text_cache) == 2
+
     @pytest.mark.run_only_on('CPU')
     @pytest.mark.unit
     def test_japanese_phoneme_tokenizer(self):
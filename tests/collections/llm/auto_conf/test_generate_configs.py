@@ -397,3 +397,27 @@ class TestGenerateConfgis:
             1,
             1,
         ], f"[2, 1, 1, 1, 1] is expected configuration output but got {auto_configs[4]}."
+
+    def test_prune_configs(self):
+        # Llama3 70B
+        recipe = partial(llm.llama3_70b.pretrain_recipe, num_nodes=8, num_gpus_per_node=8)()
+        recipe.data.global_batch_size = 128
+        kwargs = {
+            "recipe": recipe,
+            "tensor_parallel_sizes": [1, 2, 4, 8],
+            "pipeline_parallel_sizes": [1, 2, 4, 8],
+            "micro_batch_sizes": [1],
+            "context_parallel_sizes": [1],
+            "expert_parallel_sizes": [1],
+            "min_model_parallel_size": 1,
+            "max_model_parallel_size": 64,
+            "path_to_logs": "/",
+        }
+
+        _, configs = generate_configs(AutoConfigurator(**kwargs))
+        _, pruned_configs = generate_configs(AutoConfigurator(prune_configs=True, max_configs=3, **kwargs))
+
+        assert 0 < len(pruned_configs) <= 3 < len(configs)
+        assert set(pruned_configs) <= set(configs)
+        # The model does not fit on a single GPU
+        assert [1, 1, 1, 1, 1] not in get_auto_configs(pruned_configs)
@@ -0,0 +1,196 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+from types import SimpleNamespace
+
+import pandas as pd
+
+from nemo.collections.llm.tools.auto_configurator.core.performance_model import (
+    ModelSpec,
+    ParallelConfig,
+    activation_memory_per_layer,
+    compare_with_results,
+    estimate_memory,
+    estimate_step_time,
+    prune_configs,
+)
+
+LLAMA3_8B = ModelSpec(
+    num_layers=32,
+    hidden_size=4096,
+    ffn_hidden_size=14336,
+    num_attention_heads=32,
+    seq_length=8192,
+    vocab_size=128256,
+    num_query_groups=8,
+    gated_linear_unit=True,
+)
+
+LLAMA3_70B = ModelSpec(
+    num_layers=80,
+    hidden_size=8192,
+    ffn_hidden_size=28672,
+    num_attention_heads=64,
+    seq_length=8192,
+    vocab_size=128256,
+    num_query_groups=8,
+    gated_linear_unit=True,
+)
+
+GPT3_175B = ModelSpec(
+    num_layers=96,
+    hidden_size=12288,
+    ffn_hidden_size=4 * 12288,
+    num_attention_heads=96,
+    seq_length=2048,
+    vocab_size=51200,
+    share_embeddings_and_output_weights=True,
+)
+
+
+def _base_cfg(model, num_nodes):
+    return SimpleNamespace(
+        model=SimpleNamespace(config=SimpleNamespace(**vars(model), recompute_granularity=None)),
+        trainer=SimpleNamespace(num_nodes=num_nodes, devices=8),
+    )
+
+
+def _train_cfg(model, num_nodes):
+    return SimpleNamespace(
+        vocab_size=model.vocab_size, gpu_memory_gb=80, tflops_per_gpu=400, num_gpus=8, num_nodes=num_nodes
+    )
+
+
+class TestPerformanceModel:
+    def test_num_parameters(self):
+        for model, num_parameters in [(LLAMA3_8B, 8.03e9), (LLAMA3_70B, 70.55e9), (GPT3_175B, 174.6e9)]:
+            layer_params, expert_params, embedding_params = model.num_parameters()
+            total = model.num_layers * (layer_params + expert_params) + embedding_params
+            assert math.isclose(total, num_parameters, rel_tol=0.01)
+
+    def test_activation_memory_per_layer(self):
+        # Formulas of "Reducing Activation Recomputation in Large Transformer Models", with sequence parallelism
+        s, b, h, a, t = 2048, 1, 12288, 96, 8
+        parallel = ParallelConfig(tp=t, mbs=b, flash_attention=False)
+        assert math.isclose(activation_memory_per_layer(GPT3_175B, parallel), s * b * h / t * (34 + 5 * a * s / h))
+
+        parallel.recompute_granularity = "selective"
+        assert math.isclose(activation_memory_per_layer(GPT3_175B, parallel), 34 * s * b * h / t)
+
+        parallel.recompute_granularity = "full"
+        assert math.isclose(activation_memory_per_layer(GPT3_175B, parallel), 2 * s * b * h / t)
+        assert math.isclose(
+            activation_memory_per_layer(GPT3_175B, parallel, recompute=False),
+            34 * s * b * h / t + 5 * a * s * s * b / t,
+        )
+
+    def test_memory(self):
+        num_gpus, gbs = 64, 128
+        memory = estimate_memory(LLAMA3_70B, ParallelConfig(tp=1), num_gpus, gbs)
+        assert memory.total > 80
+        memory = estimate_memory(LLAMA3_70B, ParallelConfig(tp=8, pp=2), num_gpus, gbs)
+        assert memory.total < 80
+
+        # bf16 parameters and fp32 gradients, Adam states sharded by the distributed optimizer
+        assert math.isclose(memory.grads, 2 * memory.params)
+        unsharded = estimate_memory(LLAMA3_70B, ParallelConfig(tp=8, pp=2, distributed_optimizer=False), num_gpus, gbs)
+        assert math.isclose(unsharded.optimizer, 6 * unsharded.params)
+        assert math.isclose(memory.optimizer, unsharded.optimizer / 4)
+
+        activations = [
+            estimate_memory(LLAMA3_70B, ParallelConfig(tp=8, pp=2, recompute_granularity=mode), num_gpus, gbs)
+            for mode in [None, "selective", "full"]
+        ]
+        assert activations[0].activations == activations[1].activations > activations[2].activations
+        partial = estimate_memory(
+            LLAMA3_70B,
+            ParallelConfig(tp=8, pp=2, recompute_granularity="full", recompute_num_layers=20),
+            num_gpus,
+            gbs,
+        )
+        assert activations[2].activations < partial.activations < activations[0].activations
+
+        # The first stage keeps the activations of more micro batches with interleaving
+        interleaved = estimate_memory(LLAMA3_70B, ParallelConfig(tp=8, pp=4, vp=5), num_gpus, gbs)
+        assert (
+            interleaved.activations
+            > estimate_memory(LLAMA3_70B, ParallelConfig(tp=8, pp=4), num_gpus, gbs).activations
+        )
+
+    def test_step_time(self):
+        num_gpus, gbs = 64, 128
+        step_time = estimate_step_time(LLAMA3_8B, ParallelConfig(tp=1), num_gpus, gbs)
+        assert step_time.tp_comm == step_time.bubble == step_time.recompute == 0
+        assert step_time.total >= step_time.compute > 0
+
+        tp = estimate_step_time(LLAMA3_8B, ParallelConfig(tp=2), num_gpus, gbs)
+        assert tp.tp_comm > 0 and math.isclose(tp.compute, step_time.compute)
+        # Tensor parallelism across nodes is slower
+        assert (
+            estimate_step_time(LLAMA3_8B, ParallelConfig(tp=16), num_gpus, gbs).tp_comm
+            > 8 * estimate_step_time(LLAMA3_8B, ParallelConfig(tp=8), num_gpus, gbs).tp_comm
+        )
+
+        pp = estimate_step_time(LLAMA3_8B, ParallelConfig(pp=4), num_gpus, gbs)
+        interleaved = estimate_step_time(LLAMA3_8B, ParallelConfig(pp=4, vp=2), num_gpus, gbs)
+        assert 0 < interleaved.bubble < pp.bubble
+
+        full = estimate_step_time(LLAMA3_8B, ParallelConfig(recompute_granularity="full"), num_gpus, gbs)
+        selective = estimate_step_time(LLAMA3_8B, ParallelConfig(recompute_granularity="selective"), num_gpus, gbs)
+        assert math.isclose(full.recompute, full.compute / 3)
+        assert 0 < selective.recompute < full.recompute
+
+    def test_prune_configs(self):
+        configs = {}
+        for tp, pp, mbs in [(1, 1, 1), (2, 1, 1), (8, 1, 1), (8, 2, 1), (8, 4, 1), (8, 4, 2)]:
+            configs[f"tp_{tp}_pp_{pp}_mbs_{mbs}"] = {
+                "tensor_model_parallel_size": tp,
+                "pipeline_model_parallel_size": pp,
+                "context_parallel_size": 1,
+                "expert_model_parallel_size": 1,
+                "micro_batch_size": mbs,
+                "global_batch_size": 128,
+            }
+        base_cfg, train_cfg = _base_cfg(LLAMA3_70B, 8), _train_cfg(LLAMA3_70B, 8)
+
+        pruned = prune_configs(base_cfg, train_cfg, dict(configs))
+        assert "tp_1_pp_1_mbs_1" not in pruned and "tp_2_pp_1_mbs_1" not in pruned
+        assert all(config["estimated_memory_gb"] <= 80 for config in pruned.values())
+        step_times = [config["estimated_step_time"] for config in pruned.values()]
+        assert step_times == sorted(step_times)
+
+        assert list(prune_configs(base_cfg, train_cfg, dict(configs), max_configs=2)) == list(pruned)[:2]
+
+    def test_compare_with_results(self, tmp_path):
+        base_cfg, train_cfg = _base_cfg(LLAMA3_70B, 8), _train_cfg(LLAMA3_70B, 8)
+        runs = [(8, 2, 1, 1, 1, "None"), (8, 4, 1, 1, 1, "None"), (8, 4, 1, 1, 1, "10"), (4, 4, 2, 1, 1, "None")]
+        times = []
+        for tp, pp, cp, ep, mbs, vp in runs:
+            parallel = ParallelConfig(tp=tp, pp=pp, cp=cp, ep=ep, mbs=mbs, vp=None if vp == "None" else int(vp))
+            times.append(1.3 * estimate_step_time(LLAMA3_70B, parallel, 64, 128).total)
+        columns = ["TP", "PP", "CP", "EP", "MBS", "VP", "GBS"]
+        summary = pd.DataFrame([[*run, 128] for run in runs], columns=columns)
+        summary["Time per Step"] = times
+        summary.to_csv(tmp_path / "final_summary_8nodes.csv", index=False)
+        failed = pd.DataFrame(
+            [[8, 1, 1, 1, 1, "None", 128, "CUDA out of memory"]], columns=columns + ["Error Message"]
+        )
+        failed.to_csv(tmp_path / "failed_jobs_8nodes.csv", index=False)
+
+        comparison = compare_with_results(base_cfg, train_cfg, str(tmp_path))
+        assert len(comparison) == 5
+        assert comparison["OOM"].tolist() == comparison["Estimated OOM"].tolist() == [False] * 4 + [True]
+        completed = comparison.iloc[:4]
+        assert completed["Time per Step"].corr(completed["Estimated Time per Step"], method="spearman") == 1.0
@@ -467,3 +467,49 @@ def test_special_tokens(temp_jsonl_file, tokenizer):
     )
 
     assert dataset.special_tokens == special_tokens
+
+
+def test_pretokenized_dataset(tmp_path, sample_data, tokenizer):
+    data_path = tmp_path / "data.jsonl"
+    with open(data_path, "w") as f:
+        for i in range(600):
+            f.write(json.dumps({**sample_data[i % 2], "id": i}) + '\n')
+    kwargs = dict(
+        path=data_path,
+        tokenizer=tokenizer,
+        seq_length=32,
+        index_mapping_dir=str(tmp_path / "index"),
+        memmap_workers=2,
+    )
+    dataset = create_sft_dataset(**kwargs)
+    pretokenized_dataset = create_sft_dataset(**kwargs, pretokenize=True)
+
+    assert pretokenized_dataset.pretokenized_cache is not None
+    assert len(pretokenized_dataset.pretokenized_cache) == len(dataset)
+    for idx in [0, 1, 299, 599, -1]:
+        assert pretokenized_dataset[idx] == dataset[idx]
+    batch = [dataset[0], dataset[1]]
+    pretokenized_batch = [pretokenized_dataset[0], pretokenized_dataset[1]]
+    for key, value in dataset.collate_fn(batch).items():
+        if isinstance(value, torch.Tensor):
+            assert torch.equal(pretokenized_dataset.collate_fn(pretokenized_batch)[key], value)
+
+    # A different tokenization uses a different cache
+    other_dataset = create_sft_dataset(**{**kwargs, 'seq_length': 16}, pretokenize=True)
+    assert other_dataset.pretokenized_cache.cache_dir != pretokenized_dataset.pretokenized_cache.cache_dir
+
+
+def test_pretokenized_chat_dataset(temp_chat_jsonl_file, tokenizer, tmp_path):
+    kwargs = dict(
+        path=temp_chat_jsonl_file, tokenizer=tokenizer, seq_length=512, chat=True, index_mapping_dir=str(tmp_path)
+    )
+    dataset = create_sft_dataset(**kwargs)
+    pretokenized_dataset = create_sft_dataset(**kwargs, pretokenize=True)
+
+    for idx in range(len(dataset)):
+        item = dataset[idx]
+        pretokenized_item = pretokenized_dataset[idx]
+        assert pretokenized_item.keys() == item.keys()
+        for key in ['input_ids', 'mask', 'context_ids', 'answer_ids']:
+            assert torch.equal(pretokenized_item[key], item[key])
+        assert pretokenized_item['metadata'] == item['metadata']
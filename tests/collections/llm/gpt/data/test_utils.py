@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import json
+import os
 from unittest.mock import MagicMock
 
 import numpy as np
@@ -26,6 +27,7 @@ from nemo.collections.llm.gpt.data.utils import (
     _JSONLMemMapDataset,
     _mask_targets,
     _OnlineSampleMapping,
+    _PretokenizedSFTCache,
     _response_value_formater,
     _TextMemMapDataset,
     build_index_files,
@@ -274,5 +276,32 @@ def test_online_sample_mapping_cache():
     np.testing.assert_array_equal(mapping.get_sample_block(2), block3)
 
 
+def test_pretokenized_sft_cache_concurrent_writers(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    examples = [([1, 2, 3], [False, True, True], 1, 2, {"id": 0}), ([4, 5], [False, True], 1, 1, {"id": 1})]
+    other_examples = [([6, 7], [False, True], 1, 1, {"id": 2})]
+
+    # Another writer, for example on another node, completes the cache right before this writer moves its files
+    replace = os.replace
+
+    def replace_after_other_writer(src, dst):
+        monkeypatch.setattr(os, "replace", replace)
+        _PretokenizedSFTCache.write(cache_dir, other_examples, info={})
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", replace_after_other_writer)
+    _PretokenizedSFTCache.write(cache_dir, examples, info={})
+
+    # The cache of the other writer is kept, and the temporary files of this writer are removed
+    assert os.listdir(tmp_path) == ["cache"]
+    assert _PretokenizedSFTCache.exists(cache_dir)
+    cache = _PretokenizedSFTCache(cache_dir)
+    assert len(cache) == 1
+    input_ids, loss_mask, context_length, answer_length, metadata = cache[0]
+    np.testing.assert_array_equal(input_ids, [6, 7])
+    np.testing.assert_array_equal(loss_mask, [False, True])
+    assert (context_length, answer_length, metadata) == (1, 1, {"id": 2})
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,170 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import numpy as np
+import pytest
+
+from nemo.collections.nlp.data.language_modeling.megatron import gpt_dataset
+
+
+def _reference_build_doc_idx(documents, num_epochs, np_rng, separate_last_epoch, shuffle=True):
+    """Previous implementation of _build_doc_idx."""
+    if not separate_last_epoch or num_epochs == 1:
+        doc_idx = np.mgrid[0:num_epochs, 0 : len(documents)][1]
+        doc_idx[:] = documents
+        doc_idx = doc_idx.reshape(-1)
+        doc_idx = doc_idx.astype(np.int32)
+        if shuffle:
+            np_rng.shuffle(doc_idx)
+        return doc_idx
+
+    doc_idx_first = _reference_build_doc_idx(documents, num_epochs - 1, np_rng, False, shuffle)
+    doc_idx_last = _reference_build_doc_idx(documents, 1, np_rng, False, shuffle)
+    return np.concatenate((doc_idx_first, doc_idx_last))
+
+
+def _reference_build_sample_idx(sizes, doc_idx, seq_length, num_epochs, tokens_per_epoch, drop_last, add_extra_token):
+    """Previous Python implementation of _build_sample_idx, like helpers.build_sample_idx."""
+    if not drop_last:
+        num_samples = -(-(num_epochs * tokens_per_epoch - add_extra_token) // seq_length)
+    else:
+        num_samples = (num_epochs * tokens_per_epoch - add_extra_token) // seq_length
+    sample_idx = np.zeros([num_samples + 1, 2], dtype=np.int32)
+
+    sample_index = 1
+    doc_idx_index = 0
+    doc_offset = 0
+    while sample_index <= num_samples:
+        remaining_seq_length = seq_length + add_extra_token
+        while remaining_seq_length != 0:
+            doc_length = sizes[doc_idx[doc_idx_index]] - doc_offset
+            remaining_seq_length -= doc_length
+            if remaining_seq_length <= 0:
+                doc_offset += remaining_seq_length + doc_length - add_extra_token
+                remaining_seq_length = 0
+            else:
+                if doc_idx_index == (len(doc_idx) - 1):
+                    doc_offset = sizes[doc_idx[doc_idx_index]] - add_extra_token
+                    break
+                doc_idx_index += 1
+                doc_offset = 0
+        sample_idx[sample_index][0] = doc_idx_index
+        sample_idx[sample_index][1] = doc_offset
+        sample_index += 1
+
+    return sample_idx
+
+
+def _reference_build_shuffle_idx(num_samples, total_size, np_rng):
+    """Previous implementation of _build_shuffle_idx."""
+    dtype_ = np.uint32
+    if total_size >= (np.iinfo(np.uint32).max - 1):
+        dtype_ = np.int64
+
+    shuffle_idx_first = np.arange(start=0, stop=num_samples, step=1, dtype=dtype_)
+    np_rng.shuffle(shuffle_idx_first)
+    if num_samples == total_size:
+        return shuffle_idx_first
+
+    shuffle_idx_last = np.arange(start=num_samples, stop=total_size, step=1, dtype=dtype_)
+    np_rng.shuffle(shuffle_idx_last)
+
+    return np.concatenate((shuffle_idx_first, shuffle_idx_last))
+
+
+def _random_datasets(num_datasets=100):
+    rng = np.random.default_rng(0)
+    for i in range(num_datasets):
+        num_documents = int(rng.integers(1, 50))
+        # Some datasets have empty documents
+        sizes = rng.integers(0 if i % 3 == 0 else 1, 40, num_documents).astype(np.int32)
+        sizes[0] = max(sizes[0], 3)
+        seq_length = int(rng.integers(2, 20))
+        tokens_per_epoch = int(sizes.sum())
+        num_samples = int(rng.integers(1, 3 * max(1, tokens_per_epoch // seq_length) + 2))
+        yield sizes, seq_length, num_samples, bool(rng.integers(0, 2)), int(rng.integers(0, 2))
+
+
+class TestGPTDatasetIndexMappings:
+    @pytest.mark.unit
+    @pytest.mark.parametrize("chunk_size", [1, 3, 2**22])
+    def test_sample_idx_parity(self, chunk_size):
+        for sizes, seq_length, num_samples, drop_last, add_extra_token in _random_datasets():
+            documents = np.arange(len(sizes), dtype=np.int32)
+            tokens_per_epoch = gpt_dataset._num_tokens(documents, sizes)
+            num_epochs = gpt_dataset._num_epochs(tokens_per_epoch, seq_length, num_samples, add_extra_token)
+            doc_idx = gpt_dataset._build_doc_idx(documents, num_epochs, np.random.RandomState(1234), False)
+
+            args = (sizes, doc_idx, seq_length, num_epochs, tokens_per_epoch, drop_last, add_extra_token)
+            sample_idx = gpt_dataset._build_sample_idx(*args, chunk_size=chunk_size)
+            np.testing.assert_array_equal(sample_idx, _reference_build_sample_idx(*args))
+
+    @pytest.mark.unit
+    def test_sample_idx_parity_with_cpp_helper(self):
+        helpers = pytest.importorskip("nemo.collections.nlp.data.language_modeling.megatron.helpers")
+        for sizes, seq_length, num_samples, drop_last, add_extra_token in _random_datasets(20):
+            documents = np.arange(len(sizes), dtype=np.int32)
+            tokens_per_epoch = gpt_dataset._num_tokens(documents, sizes)
+            num_epochs = gpt_dataset._num_epochs(tokens_per_epoch, seq_length, num_samples, add_extra_token)
+            doc_idx = gpt_dataset._build_doc_idx(documents, num_epochs, np.random.RandomState(1234), False)
+
+            args = (sizes, doc_idx, seq_length, num_epochs, tokens_per_epoch, drop_last, add_extra_token)
+            np.testing.assert_array_equal(gpt_dataset._build_sample_idx(*args), helpers.build_sample_idx(*args))
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("separate_last_epoch", [False, True])
+    @pytest.mark.parametrize("shuffle", [False, True])
+    def test_doc_idx_parity(self, separate_last_epoch, shuffle):
+        documents = np.arange(3, 40, dtype=np.int32)
+        doc_idx = gpt_dataset._build_doc_idx(documents, 4, np.random.RandomState(1234), separate_last_epoch, shuffle)
+        expected = _reference_build_doc_idx(documents, 4, np.random.RandomState(1234), separate_last_epoch, shuffle)
+        assert doc_idx.dtype == np.int32
+        np.testing.assert_array_equal(doc_idx, expected)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("num_samples", [0, 70, 100])
+    def test_shuffle_idx_parity(self, num_samples):
+        shuffle_idx = gpt_dataset._build_shuffle_idx(num_samples, 100, np.random.RandomState(1234), chunk_size=7)
+        expected = _reference_build_shuffle_idx(num_samples, 100, np.random.RandomState(1234))
+        assert shuffle_idx.dtype == expected.dtype
+        np.testing.assert_array_equal(shuffle_idx, expected)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("num_samples", [40, 290])
+    def test_index_mapping_files(self, tmp_path, num_samples):
+        sizes = np.random.default_rng(0).integers(1, 30, 64).astype(np.int32)
+        documents = np.arange(8, 64, dtype=np.int32)
+        seq_length, seed = 16, 1234
+        filenames = gpt_dataset._get_index_mapping_filenames(
+            "data", "train", num_samples, seq_length, seed, index_mapping_dir=str(tmp_path)
+        )
+        gpt_dataset._build_index_mapping_files(*filenames, documents, sizes, num_samples, seq_length, seed)
+
+        tokens_per_epoch = gpt_dataset._num_tokens(documents, sizes)
+        num_epochs = gpt_dataset._num_epochs(tokens_per_epoch, seq_length, num_samples)
+        num_samples_from_epochs_minus_one = ((num_epochs - 1) * tokens_per_epoch - 1) // seq_length
+        separate_last_epoch = num_epochs > 1 and (num_samples - num_samples_from_epochs_minus_one) < int(
+            0.80 * ((tokens_per_epoch - 1) // seq_length)
+        )
+        np_rng = np.random.RandomState(seed=seed)
+        doc_idx = _reference_build_doc_idx(documents, num_epochs, np_rng, separate_last_epoch)
+        sample_idx = _reference_build_sample_idx(sizes, doc_idx, seq_length, num_epochs, tokens_per_epoch, True, 1)
+        num_shuffled = num_samples_from_epochs_minus_one if separate_last_epoch else sample_idx.shape[0] - 1
+        shuffle_idx = _reference_build_shuffle_idx(num_shuffled, sample_idx.shape[0] - 1, np_rng)
+
+        for filename, expected in zip(filenames, [doc_idx, sample_idx, shuffle_idx]):
+            np.testing.assert_array_equal(np.load(filename, mmap_mode='r'), expected)
+        assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(filename) for filename in filenames)
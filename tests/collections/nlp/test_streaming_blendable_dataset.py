@@ -0,0 +1,101 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from nemo.collections.nlp.data.language_modeling.megatron.blendable_dataset import StreamingBlendableDataset
+
+WEIGHTS = [[0.5, 0.3, 0.2], [1, 1], [0.001, 0.7, 0.299], [3, 1, 1, 1, 1, 1, 1, 1, 1, 0.01]]
+
+
+class _Dataset:
+    def __init__(self, size, name):
+        self.size = size
+        self.name = name
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, idx):
+        return self.name, idx
+
+
+def _reference_blending_indices(weights, size):
+    """Python version of helpers.build_blending_indices, used by BlendableDataset."""
+    weights = np.array(weights, dtype=np.float64) / np.sum(weights)
+    current_samples = np.zeros(len(weights), dtype=np.int64)
+    indices = []
+    for i in range(size):
+        dataset_idx = int(np.argmax(weights * max(i, 1) - current_samples))
+        indices.append((dataset_idx, int(current_samples[dataset_idx])))
+        current_samples[dataset_idx] += 1
+    return indices
+
+
+def _counts(indices, num_datasets):
+    """Number of samples of each dataset in each prefix of the blend."""
+    counts = np.zeros((len(indices) + 1, num_datasets), dtype=np.int64)
+    counts[np.arange(1, len(indices) + 1), [dataset_idx for dataset_idx, _ in indices]] = 1
+    return counts.cumsum(axis=0)
+
+
+class TestStreamingBlendableDataset:
+    @pytest.mark.unit
+    @pytest.mark.parametrize("weights", WEIGHTS)
+    def test_statistical_parity_with_blendable_dataset(self, weights):
+        size = 10000
+        datasets = [_Dataset(10**9, str(i)) for i in range(len(weights))]
+        blend = StreamingBlendableDataset(datasets, weights, size, seed=7, block_size=512)
+        indices = [blend.get_ds_sample_idx(i) for i in range(size)]
+        reference = _reference_blending_indices(weights, size)
+
+        # The number of samples of each dataset stays close to the weights in every prefix of the blend
+        counts = _counts(indices, len(weights))
+        target = np.arange(size + 1)[:, None] * (np.array(weights) / np.sum(weights))
+        assert np.abs(counts - target).max() < 8
+        assert np.abs(counts - _counts(reference, len(weights))).max() < 8
+
+        # Like BlendableDataset, the samples of each dataset are drawn once, in order up to the blocks
+        for dataset_idx in range(len(weights)):
+            samples = [sample_idx for ds_idx, sample_idx in indices if ds_idx == dataset_idx]
+            assert len(set(samples)) == len(samples)
+            assert max(samples, default=-1) < len(samples) + 512
+            assert all(abs(sample_idx - i) < 512 for i, sample_idx in enumerate(samples))
+
+    @pytest.mark.unit
+    def test_resume_from_any_index(self):
+        datasets = [_Dataset(1000, "a"), _Dataset(300, "b"), _Dataset(7, "c")]
+        blend = StreamingBlendableDataset(datasets, [0.5, 0.3, 0.2], 5000, seed=1234, block_size=64)
+        expected = [blend[i] for i in range(5000)]
+
+        rng = np.random.default_rng(0)
+        for start in [0, 63, 64, 1000, 4999, *rng.integers(0, 5000, 20).tolist()]:
+            resumed = StreamingBlendableDataset(datasets, [0.5, 0.3, 0.2], 5000, seed=1234, block_size=64)
+            assert [resumed[i] for i in range(start, min(start + 100, 5000))] == expected[start : start + 100]
+        order = rng.permutation(5000)
+        assert [blend[i] for i in order] == [expected[i] for i in order]
+
+        # Datasets wrap around once all their samples are drawn
+        assert {name_idx for name_idx in expected if name_idx[0] == "c"} == {("c", i) for i in range(7)}
+
+    @pytest.mark.unit
+    def test_seed_changes_the_blend(self):
+        datasets = [_Dataset(10**6, "a"), _Dataset(10**6, "b")]
+        blend = StreamingBlendableDataset(datasets, [0.6, 0.4], 2000, seed=1)
+        other = StreamingBlendableDataset(datasets, [0.6, 0.4], 2000, seed=2)
+        assert [blend[i] for i in range(2000)] != [other[i] for i in range(2000)]
+
+        with pytest.raises(IndexError):
+            blend.get_ds_sample_idx(2000)
@@ -0,0 +1,130 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+
+import pytest
+import torch
+from omegaconf import DictConfig
+
+from nemo.collections.asr.models import ClusteringDiarizer, EncDecSpeakerLabelModel
+
+
+def get_speaker_model():
+    preprocessor = {'_target_': 'nemo.collections.asr.modules.AudioToMelSpectrogramPreprocessor'}
+    encoder = {
+        '_target_': 'nemo.collections.asr.modules.ConvASREncoder',
+        'feat_in': 64,
+        'activation': 'relu',
+        'conv_mask': True,
+        'jasper': [
+            {
+                'filters': 32,
+                'repeat': 1,
+                'kernel': [3],
+                'stride': [1],
+                'dilation': [1],
+                'dropout': 0.0,
+                'residual': False,
+                'separable': False,
+            }
+        ],
+    }
+    decoder = {
+        '_target_': 'nemo.collections.asr.modules.SpeakerDecoder',
+        'feat_in': 32,
+        'num_classes': 2,
+        'pool_mode': 'xvector',
+        'emb_sizes': [16],
+    }
+    model_config = DictConfig(
+        {'preprocessor': DictConfig(preprocessor), 'encoder': DictConfig(encoder), 'decoder': DictConfig(decoder)}
+    )
+    torch.manual_seed(0)
+    return EncDecSpeakerLabelModel(cfg=model_config)
+
+
+def get_diarizer_config(out_dir: str, in_memory_multiscale: bool):
+    return DictConfig(
+        {
+            'sample_rate': 16000,
+            'batch_size': 3,
+            'num_workers': 0,
+            'device': 'cpu',
+            'verbose': False,
+            'diarizer': {
+                'out_dir': out_dir,
+                'oracle_vad': True,
+                'speaker_embeddings': {
+                    'model_path': None,
+                    'parameters': {
+                        'window_length_in_sec': [1.0, 0.5],
+                        'shift_length_in_sec': [0.5, 0.25],
+                        'multiscale_weights': [1, 1],
+                        'save_embeddings': False,
+                        'in_memory_multiscale': in_memory_multiscale,
+                    },
+                },
+                'clustering': {'parameters': {}},
+            },
+        }
+    )
+
+
+class TestClusteringDiarizer:
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_in_memory_multiscale_embeddings(self, tmpdir, test_data_dir):
+        audio_filenames = ['an22-flrp-b.wav', 'an90-fbbh-b.wav']
+        audio_paths = [os.path.join(test_data_dir, "asr", "train", "an4", "wav", fp) for fp in audio_filenames]
+        # Segments whose durations are not multiples of the shifts, so that their last subsegments are shorter than
+        # the windows, and whose subsegments do not fill the last batch of each session
+        segments = [(audio_paths[0], 0.0, 1.3), (audio_paths[0], 1.45, 0.62), (audio_paths[1], 0.2, 1.13)]
+        segments_manifest_path = os.path.join(tmpdir, 'segments.json')
+        with open(segments_manifest_path, 'w') as f:
+            for audio_filepath, offset, duration in segments:
+                entry = {'audio_filepath': audio_filepath, 'offset': offset, 'duration': duration, 'label': 'UNK'}
+                f.write(json.dumps(entry) + '\n')
+
+        speaker_model = get_speaker_model()
+        multiscale_embeddings_and_timestamps = {}
+        for in_memory_multiscale in [False, True]:
+            diarizer = ClusteringDiarizer(
+                cfg=get_diarizer_config(str(tmpdir), in_memory_multiscale), speaker_model=speaker_model
+            )
+            diarizer._speaker_manifest_path = segments_manifest_path
+            diarizer._speaker_dir = str(tmpdir)
+            if in_memory_multiscale:
+                diarizer._extract_multiscale_embeddings_in_memory()
+            else:
+                scales = diarizer.multiscale_args_dict['scale_dict'].items()
+                for scale_idx, (window, shift) in scales:
+                    diarizer._run_segmentation(window, shift, scale_tag=f'_scale{scale_idx}')
+                    diarizer._extract_embeddings(diarizer.subsegments_manifest_path, scale_idx, len(scales))
+                    diarizer.multiscale_embeddings_and_timestamps[scale_idx] = [
+                        diarizer.embeddings,
+                        diarizer.time_stamps,
+                    ]
+            multiscale_embeddings_and_timestamps[in_memory_multiscale] = diarizer.multiscale_embeddings_and_timestamps
+
+        expected = multiscale_embeddings_and_timestamps[False]
+        result = multiscale_embeddings_and_timestamps[True]
+        assert result.keys() == expected.keys()
+        for scale_idx, (expected_embeddings, expected_time_stamps) in expected.items():
+            embeddings, time_stamps = result[scale_idx]
+            assert time_stamps == expected_time_stamps
+            assert embeddings.keys() == expected_embeddings.keys()
+            for uniq_name, expected_embs in expected_embeddings.items():
+                torch.testing.assert_close(embeddings[uniq_name], expected_embs, rtol=0.0, atol=0.0)
@@ -13,13 +13,17 @@
 # limitations under the License.
 
 import os
+import pickle
 
 import numpy as np
 import pytest
+import soundfile as sf
 import torch
 from omegaconf import DictConfig
 
+from nemo.collections.asr.parts.preprocessing.segment import AudioSegment
 from nemo.collections.asr.parts.utils.data_simulation_utils import (
+    AudioMemmapIndex,
     DataAnnotator,
     SpeechSampler,
     add_silence_to_alignments,
@@ -27,6 +31,7 @@ from nemo.collections.asr.parts.utils.data_simulation_utils import (
     get_cleaned_base_path,
     get_split_points_in_alignments,
     normalize_audio,
+    read_audio_from_buffer,
     read_noise_manifest,
 )
 from nemo.collections.asr.parts.utils.manifest_utils import get_ctm_line
@@ -363,6 +368,73 @@ class TestDataSimulatorUtils:
             assert audio_manifest['words'] == words
 
 
+class TestAudioMemmapIndex:
+    @pytest.fixture()
+    def audio_files(self, tmp_path):
+        sr = 16000
+        audio_files = []
+        for k, num_channels in enumerate([1, 2, 1]):
+            samples = np.random.RandomState(k).uniform(-0.5, 0.5, (sr * (k + 2), num_channels)).squeeze()
+            audio_file = os.path.join(tmp_path, f"audio_{k}.wav")
+            sf.write(audio_file, samples, sr)
+            audio_files.append(audio_file)
+        return audio_files
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("offset, duration", [(0, 0), (0.5, 0), (0.25, 1.0), (1.5, 10.0)])
+    def test_read(self, tmp_path, audio_files, offset, duration):
+        audio_index = AudioMemmapIndex.build(audio_files, index_dir=os.path.join(tmp_path, "audio_index"))
+        assert len(audio_index) == len(audio_files)
+        for audio_file in audio_files:
+            samples, sr = audio_index.read(audio_file, offset=offset, duration=duration)
+            segment = AudioSegment.from_file(audio_file, offset=offset, duration=duration)
+            expected = torch.from_numpy(segment.samples)
+            if expected.ndim > 1:
+                expected = torch.mean(expected, 1, False)
+            assert sr == segment.sample_rate
+            assert samples.dtype == np.float32
+            assert np.array_equal(samples, expected.numpy())
+
+    @pytest.mark.unit
+    def test_read_audio_from_buffer(self, tmp_path, audio_files):
+        audio_index = AudioMemmapIndex.build(audio_files, index_dir=os.path.join(tmp_path, "audio_index"))
+        audio_manifest = {
+            'audio_filepath': audio_files[1],
+            'words': ['', 'hello', 'world', '', 'nemo', ''],
+            'alignments': [0.2, 0.8, 1.2, 1.5, 2.1, 2.6],
+        }
+        for read_subset in [True, False]:
+            outputs = []
+            for index in [None, audio_index]:
+                outputs.append(
+                    read_audio_from_buffer(
+                        audio_manifest=dict(audio_manifest),
+                        buffer_dict={},
+                        offset_index=3,
+                        device=torch.device('cpu'),
+                        max_audio_read_sec=2.5,
+                        read_subset=read_subset,
+                        audio_index=index,
+                    )
+                )
+            assert torch.equal(outputs[0][0], outputs[1][0])
+            assert outputs[0][1:] == outputs[1][1:]
+
+    @pytest.mark.unit
+    def test_reuse_and_pickle(self, tmp_path, audio_files):
+        index_dir = os.path.join(tmp_path, "audio_index")
+        AudioMemmapIndex.build(audio_files, index_dir=index_dir)
+        index_mtime = os.path.getmtime(os.path.join(index_dir, AudioMemmapIndex.INDEX_FILENAME))
+        audio_index = AudioMemmapIndex.build(audio_files[:2], index_dir=index_dir)
+        assert os.path.getmtime(os.path.join(index_dir, AudioMemmapIndex.INDEX_FILENAME)) == index_mtime
+
+        audio_index = pickle.loads(pickle.dumps(audio_index))
+        assert audio_files[2] in audio_index
+        assert "unknown.wav" not in audio_index
+        samples, _ = audio_index.read(audio_files[0])
+        assert np.array_equal(samples, AudioSegment.from_file(audio_files[0]).samples)
+
+
 class TestDataAnnotator:
     def test_init(self, annotator):
         assert isinstance(annotator, DataAnnotator)
@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import os
+
 import numpy as np
 import pytest
 import torch
@@ -42,9 +44,15 @@ from nemo.collections.asr.parts.utils.speaker_utils import (
     OnlineSegmentor,
     check_ranges,
     fl2int,
+    get_interval_intersection,
+    get_interval_set,
+    get_interval_subtraction,
+    get_interval_union,
+    get_multiscale_subsegments_from_manifest,
     get_new_cursor_for_update,
     get_online_segments_from_slices,
     get_online_subsegments_from_buffer,
+    get_overlap_ranges,
     get_speech_labels_for_update,
     get_sub_range_list,
     get_subsegments,
@@ -483,6 +491,34 @@ class TestGetSubsegments:
         )
         assert result == [[0.0, 0.25]]
 
+    @pytest.mark.unit
+    def test_get_multiscale_subsegments_from_manifest(self, tmp_path):
+        segments = [
+            {"audio_filepath": "/path/to/sess_a.wav", "offset": 0.5, "duration": 2.4, "label": "UNK"},
+            {"audio_filepath": "/path/to/sess_b.wav", "offset": 1.0, "duration": 0.8, "label": "UNK"},
+            {"audio_filepath": "/path/to/sess_a.wav", "offset": 4.0, "duration": 1.0, "label": "UNK"},
+        ]
+        manifest_path = tmp_path / "segments.json"
+        with open(manifest_path, "w") as f:
+            for segment in segments:
+                f.write(json.dumps(segment) + "\n")
+        scale_dict = {0: (1.5, 0.75), 1: (1.0, 0.5)}
+        result = get_multiscale_subsegments_from_manifest(str(manifest_path), scale_dict)
+
+        assert list(result.keys()) == ["sess_a", "sess_b"]
+        for uniq_name, session in result.items():
+            session_segments = [seg for seg in segments if uniq_name in seg["audio_filepath"]]
+            for scale_idx, (window, shift) in scale_dict.items():
+                expected = []
+                for seg in session_segments:
+                    subsegs = get_subsegments_scriptable(
+                        offset=seg["offset"], window=window, shift=shift, duration=seg["duration"]
+                    )
+                    expected.extend([subseg for subseg in subsegs if subseg[1] > 0.05])
+                assert session["subsegments"][scale_idx] == expected
+        assert result["sess_a"]["start"] == 0.5
+        assert abs(result["sess_a"]["end"] - 5.0) < 1e-6
+
 
 class TestDiarizationSegmentationUtils:
     """
@@ -590,6 +626,52 @@ class TestDiarizationSegmentationUtils:
         merged = merge_float_intervals(intervals)
         assert check_range_values(target, merged)
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "intervals, target",
+        [
+            ([[11, 20], [1, 10], [10, 12], [30, 40]], [[1, 20], [30, 40]]),
+            ([[1, 10], [2, 3], [4, 5]], [[1, 10]]),
+            ([[5, 6], [1, 2]], [[1, 2], [5, 6]]),
+        ],
+    )
+    def test_get_interval_set(self, intervals, target):
+        assert get_interval_set(torch.tensor(intervals)).tolist() == target
+
+    @pytest.mark.unit
+    def test_interval_set_operations(self):
+        set_a = get_interval_set(torch.tensor([[0.0, 2.0], [3.0, 6.0], [8.0, 9.0]], dtype=torch.float64))
+        set_b = get_interval_set(torch.tensor([[1.0, 4.0], [6.0, 8.0], [8.5, 10.0]], dtype=torch.float64))
+        assert get_interval_union(set_a, set_b).tolist() == [[0.0, 10.0]]
+        assert get_interval_intersection(set_a, set_b).tolist() == [[1.0, 2.0], [3.0, 4.0], [8.5, 9.0]]
+        assert get_interval_subtraction(set_a, set_b).tolist() == [[0.0, 1.0], [4.0, 6.0], [8.0, 8.5]]
+        assert get_interval_subtraction(set_b, set_a).tolist() == [[2.0, 3.0], [6.0, 8.0], [9.0, 10.0]]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_interval_set_operations_random(self, seed):
+        torch.manual_seed(seed)
+        grid = torch.linspace(0, 100, 10001, dtype=torch.float64)[:-1] + 0.005
+
+        def _random_set(num_intervals):
+            starts = torch.randint(0, 9000, (num_intervals,)) / 100.0
+            ends = starts + torch.randint(1, 1000, (num_intervals,)) / 100.0
+            return get_interval_set(torch.stack([starts, ends], dim=1).double())
+
+        def _covered(interval_set):
+            return ((grid[:, None] > interval_set[:, 0]) & (grid[:, None] < interval_set[:, 1])).any(dim=1)
+
+        set_a, set_b = _random_set(20), _random_set(20)
+        assert torch.equal(_covered(get_interval_union(set_a, set_b)), _covered(set_a) | _covered(set_b))
+        assert torch.equal(_covered(get_interval_intersection(set_a, set_b)), _covered(set_a) & _covered(set_b))
+        assert torch.equal(_covered(get_interval_subtraction(set_a, set_b)), _covered(set_a) & ~_covered(set_b))
+
+    @pytest.mark.unit
+    def test_get_overlap_ranges(self):
+        intervals = torch.tensor([[2.0, 3.0], [0.0, 1.0], [3.5, 5.0], [0.5, 1.5]], dtype=torch.float64)
+        overlap_ranges = get_overlap_ranges(intervals, 1.0, 4.0)
+        assert overlap_ranges.tolist() == [[2.0, 3.0], [3.5, 4.0], [1.0, 1.5]]
+
     @pytest.mark.unit
     def test_get_speech_labels_for_update(self):
         frame_start = 3.0
@@ -973,6 +1055,63 @@ class TestSpeakerClustering:
         assert Y_out.shape[0] == mc[-1]
         assert all(permuted_Y == gt)
 
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    @pytest.mark.parametrize("seed", [0, 1])
+    def test_online_clus_incremental_cos_affinity(self, seed):
+        torch.manual_seed(seed)
+        online_clus = OnlineSpeakerClustering(max_num_speakers=8, history_buffer_size=10, current_buffer_size=10)
+        emb_pool = torch.randn(60, 16)
+        # Overlapping windows of embeddings, in a different order, with repeated and unseen embeddings
+        windows = [
+            torch.arange(0, 20),
+            torch.arange(3, 23),
+            torch.cat([torch.arange(5, 15), torch.arange(30, 40)]),
+            torch.cat([torch.arange(35, 40), torch.arange(5, 15).flip(0), torch.tensor([50, 50, 51])]),
+            torch.arange(40, 60),
+        ]
+        for window in windows:
+            emb = emb_pool[window]
+            affinity_mat = online_clus.get_incremental_cos_affinity(emb)
+            assert torch.allclose(affinity_mat, getCosAffinityMatrix(emb), atol=1e-6)
+            assert torch.equal(online_clus.cached_emb, emb)
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_online_clus_update_label_history(self):
+        online_clus = OnlineSpeakerClustering(max_num_speakers=8, history_buffer_size=10, current_buffer_size=10)
+        labels = torch.tensor([0, 1, 1, 2])
+        Y_fullhist = online_clus.update_label_history(0, labels)
+        assert torch.equal(Y_fullhist, labels)
+        assert online_clus.Y_fullhist_buffer.shape[0] == 8
+        buffer_ptr = online_clus.Y_fullhist_buffer.data_ptr()
+
+        # Labels after `start` are overwritten, and the buffer is reused while it has enough capacity
+        Y_fullhist = online_clus.update_label_history(2, torch.tensor([3, 3, 3]))
+        assert torch.equal(Y_fullhist, torch.tensor([0, 1, 3, 3, 3]))
+        assert Y_fullhist.data_ptr() == online_clus.Y_fullhist_buffer.data_ptr() == buffer_ptr
+
+        # The capacity is doubled when the label history outgrows the buffer
+        Y_fullhist = online_clus.update_label_history(5, torch.tensor([4, 4, 4, 4, 4]))
+        assert torch.equal(Y_fullhist, torch.tensor([0, 1, 3, 3, 3, 4, 4, 4, 4, 4]))
+        assert online_clus.Y_fullhist_buffer.shape[0] == 20
+        assert torch.equal(online_clus.Y_fullhist, Y_fullhist)
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_online_clus_fill_processing_buffer(self):
+        online_clus = OnlineSpeakerClustering(max_num_speakers=8, history_buffer_size=4, current_buffer_size=6)
+        history_emb, emb_curr = torch.randn(4, 16), torch.randn(6, 16)
+        processing_emb = online_clus.fill_processing_buffer(history_emb, emb_curr)
+        assert torch.equal(processing_emb, torch.vstack([history_emb, emb_curr]))
+        buffer_ptr = processing_emb.data_ptr()
+
+        # The buffer is reused for embeddings of the same size
+        history_emb, emb_curr = torch.randn(4, 16), torch.randn(6, 16)
+        processing_emb = online_clus.fill_processing_buffer(history_emb, emb_curr)
+        assert torch.equal(processing_emb, torch.vstack([history_emb, emb_curr]))
+        assert processing_emb.data_ptr() == buffer_ptr
+
     @pytest.mark.run_only_on('GPU')
     @pytest.mark.unit
     @pytest.mark.parametrize("n_spks", [1, 2, 3])
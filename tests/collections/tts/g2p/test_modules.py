@@ -17,8 +17,9 @@ import unicodedata
 
 import pytest
 
+from nemo.collections.tts.g2p.models.en_us_arpabet import EnglishG2p
 from nemo.collections.tts.g2p.models.i18n_ipa import IpaG2p
-from nemo.collections.tts.g2p.utils import GRAPHEME_CASE_LOWER, GRAPHEME_CASE_MIXED, GRAPHEME_CASE_UPPER
+from nemo.collections.tts.g2p.utils import GRAPHEME_CASE_LOWER, GRAPHEME_CASE_MIXED, GRAPHEME_CASE_UPPER, LRUCache
 
 
 class TestIpaG2p:
@@ -38,6 +39,7 @@ class TestIpaG2p:
         phoneme_probability=None,
         grapheme_case=GRAPHEME_CASE_UPPER,
         grapheme_prefix="",
+        cache_size=100000,
     ):
         return IpaG2p(
             phoneme_dict,
@@ -47,6 +49,7 @@ class TestIpaG2p:
             phoneme_probability=phoneme_probability,
             grapheme_case=grapheme_case,
             grapheme_prefix=grapheme_prefix,
+            cache_size=cache_size,
         )
 
     @pytest.mark.run_only_on('CPU')
@@ -406,3 +409,149 @@ class TestIpaG2p:
 
         phonemes = g2p(input_text)
         assert phonemes == expected_output
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_word_cache(self):
+        input_text = "Hello NVIDIA'S airport's Jones's airports worlds Kitty!"
+        g2p = self._create_g2p(locale="en-US")
+        g2p_no_cache = self._create_g2p(locale="en-US", cache_size=0)
+
+        for _ in range(2):
+            phonemes = g2p(input_text)
+            assert phonemes == g2p_no_cache(input_text)
+            # Outputs must not share lists with the cache
+            phonemes.clear()
+
+        assert len(g2p._word_cache) > 0
+        assert len(g2p_no_cache._word_cache) == 0
+
+        g2p.replace_dict({"HELLO": ["ˈhɛɫoʊ"]})
+        assert len(g2p._word_cache) == 0
+        assert g2p("Hello")[:6] == list("ˈhɛɫoʊ")
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_word_cache_with_phoneme_probability(self):
+        input_texts = ["Hello world, lead the world.", "Hello NVIDIA airports!", "World hello Jones's."] * 5
+        g2p = self._create_g2p(locale="en-US", phoneme_probability=0.5)
+        g2p_no_cache = self._create_g2p(locale="en-US", phoneme_probability=0.5, cache_size=0)
+        g2p._rng.seed(1234)
+        g2p_no_cache._rng.seed(1234)
+
+        phonemes = g2p.batch_call(input_texts)
+        phonemes_no_cache = [g2p_no_cache(text) for text in input_texts]
+
+        assert phonemes == phonemes_no_cache
+        # both graphemes and phonemes are sampled
+        assert any("H" in pron for pron in phonemes)
+        assert any("ə" in pron for pron in phonemes)
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_lru_cache(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+
+class TestEnglishG2p:
+
+    PHONEME_DICT = {
+        "hello": [["HH", "AH0", "L", "OW1"]],
+        "world": [["W", "ER1", "L", "D"]],
+        "lead": [["L", "EH1", "D"], ["L", "IY1", "D"]],
+        "read": [["R", "EH1", "D"], ["R", "IY1", "D"]],
+    }
+
+    @staticmethod
+    def _create_g2p(
+        apply_to_oov_word=None,
+        ignore_ambiguous_words=True,
+        heteronyms=None,
+        phoneme_probability=None,
+        cache_size=100000,
+    ):
+        return EnglishG2p(
+            phoneme_dict=TestEnglishG2p.PHONEME_DICT,
+            apply_to_oov_word=apply_to_oov_word,
+            ignore_ambiguous_words=ignore_ambiguous_words,
+            heteronyms=heteronyms,
+            phoneme_probability=phoneme_probability,
+            cache_size=cache_size,
+        )
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_word_cache(self):
+        g2p = self._create_g2p()
+        g2p_no_cache = self._create_g2p(cache_size=0)
+
+        assert g2p.parse_one_word("hello") == (["HH", "AH0", "L", "OW1"], True)
+        assert len(g2p._word_cache) == 1
+        # The cached pronunciation is returned without parsing the word again
+        g2p.phoneme_dict = {}
+        assert g2p.parse_one_word("hello") == (["HH", "AH0", "L", "OW1"], True)
+        assert len(g2p._word_cache) == 1
+
+        # Outputs must not share lists with the cache
+        pron, _ = g2p.parse_one_word("hello")
+        pron.clear()
+        phonemes = g2p("Hello hello!")
+        assert phonemes == g2p_no_cache("Hello hello!") == (["HH", "AH0", "L", "OW1", " "] * 2)[:-1] + ["!"]
+        phonemes.clear()
+        assert g2p("hello") == ["HH", "AH0", "L", "OW1"]
+
+        g2p.clear_cache()
+        assert len(g2p._word_cache) == 0
+        assert g2p("hello") == list("hello")
+        assert len(g2p_no_cache._word_cache) == 0
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    @pytest.mark.parametrize("ignore_ambiguous_words", [True, False])
+    def test_word_cache_with_heteronyms_and_variants(self, ignore_ambiguous_words):
+        input_texts = ["Read the lead, world's worlds.", "Hello-world hello-nvidia!", "Read the lead, world's worlds."]
+        g2p = self._create_g2p(ignore_ambiguous_words=ignore_ambiguous_words, heteronyms=["read"])
+        g2p_no_cache = self._create_g2p(
+            ignore_ambiguous_words=ignore_ambiguous_words, heteronyms=["read"], cache_size=0
+        )
+
+        phonemes = g2p.batch_call(input_texts)
+        assert phonemes == [g2p_no_cache(text) for text in input_texts]
+        assert g2p.batch_get_pronunciation_variants(input_texts) == g2p_no_cache.batch_get_pronunciation_variants(
+            input_texts
+        )
+
+        # Heteronyms are left as graphemes, and ambiguous words only if they are ignored
+        assert phonemes[0][:4] == list("read")
+        lead = ["L", "EH1", "D"] if not ignore_ambiguous_words else list("lead")
+        assert phonemes[0][9:] == lead + [",", " "] + (["W", "ER1", "L", "D", "Z", " "] * 2)[:-1] + ["."]
+        # Words with hyphens which are not in the dictionary are parsed by parts
+        assert phonemes[1][:10] == ["HH", "AH0", "L", "OW1", "-", "W", "ER1", "L", "D", " "]
+        assert phonemes[1][10:] == ["HH", "AH0", "L", "OW1", "-"] + list("nvidia") + ["!"]
+        assert phonemes[2] == phonemes[0]
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_word_cache_with_phoneme_probability(self):
+        input_texts = ["Hello world, lead the world.", "World hello world's."] * 5
+        g2p = self._create_g2p(apply_to_oov_word=lambda x: x, phoneme_probability=0.5)
+        g2p_no_cache = self._create_g2p(apply_to_oov_word=lambda x: x, phoneme_probability=0.5, cache_size=0)
+        g2p._rng.seed(1234)
+        g2p_no_cache._rng.seed(1234)
+
+        phonemes = g2p.batch_call(input_texts)
+        phonemes_no_cache = [g2p_no_cache(text) for text in input_texts]
+
+        assert phonemes == phonemes_no_cache
+        # both graphemes and phonemes are sampled
+        assert any("h" in pron for pron in phonemes)
+        assert any("HH" in pron for pron in phonemes)
@@ -0,0 +1,136 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+import torch
+
+from nemo.collections.tts.data.text_to_speech_dataset import MagpieTTSDataset
+from nemo.collections.tts.models.magpietts import MagpieTTS_ModelInference
+from nemo.collections.tts.parts.utils.tts_dataset_utils import (
+    PackedFeatureWriter,
+    get_speaker_embedding_key,
+    get_speaker_embedding_metadata,
+    get_speaker_reference_audio,
+    get_target_audio,
+    load_speaker_embedding_store,
+)
+
+EMBEDDING_DIM = 8
+
+
+class _RecordingSpeakerModel:
+    """Speaker verification model which records its inputs, and returns their peak value as embedding."""
+
+    def __init__(self):
+        self.input_signals = []
+
+    def forward(self, input_signal, input_signal_length):
+        self.input_signals.append(input_signal)
+        embeddings = input_signal.abs().max(dim=1).values.unsqueeze(1).repeat(1, EMBEDDING_DIM)
+        return None, embeddings
+
+
+class _CharTokenizer:
+    pad = 0
+
+    def encode(self, text, tokenizer_name):
+        return [ord(char) % 32 for char in text]
+
+
+class _SpeakerEmbeddingModel:
+    get_speaker_embeddings_from_filepaths = MagpieTTS_ModelInference.get_speaker_embeddings_from_filepaths
+
+    def __init__(self):
+        self.device = torch.device("cpu")
+        self.eval_speaker_verification_model = _RecordingSpeakerModel()
+
+
+class TestMagpieTTSModelInference:
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_get_speaker_embeddings_from_store(self):
+        sample_rate = 16000
+        manifest = [
+            {
+                "audio_filepath": "target1.wav",
+                "duration": 1.0,
+                "text": "one",
+                "context_audio_filepath": "context.wav",
+                "context_audio_duration": 1.0,
+            },
+            {"audio_filepath": "target2.wav", "duration": 1.0, "text": "two"},
+            {"audio_filepath": "target3.wav", "duration": 1.0, "text": "three"},
+        ]
+
+        with tempfile.TemporaryDirectory() as test_dir:
+            audio_dir = Path(test_dir) / "audio"
+            audio_dir.mkdir()
+            for filename in ["target1.wav", "target2.wav", "target3.wav", "context.wav"]:
+                sf.write(audio_dir / filename, 0.1 * np.sin(np.linspace(0, 100, sample_rate)), sample_rate)
+
+            # Store the embeddings of the first two entries, with the keys of compute_speaker_embeddings.py with
+            # --include_target_audio
+            store_dir = Path(test_dir) / "speaker_embeddings_packed"
+            metadata = get_speaker_embedding_metadata("titanet_large", volume_norm=True)
+            stored_embeddings = {}
+            with PackedFeatureWriter(store_dir=store_dir, dtype="float32", metadata=metadata) as writer:
+                for entry in manifest[:2]:
+                    for audio in [get_speaker_reference_audio(entry, audio_dir), get_target_audio(entry, audio_dir)]:
+                        key = get_speaker_embedding_key(*audio)
+                        stored_embeddings[key] = np.random.randn(EMBEDDING_DIM)
+                        writer.add(key=key, features=stored_embeddings[key])
+            speaker_embedding_store = load_speaker_embedding_store(store_dir, "titanet_large")
+
+            manifest_path = Path(test_dir) / "manifest.json"
+            with open(manifest_path, "w") as manifest_f:
+                for entry in manifest:
+                    manifest_f.write(json.dumps(entry) + "\n")
+            dataset_meta = {"test": {"manifest_path": manifest_path, "audio_dir": audio_dir, "feature_dir": test_dir}}
+            dataset_kwargs = {
+                "dataset_meta": dataset_meta,
+                "sample_rate": sample_rate,
+                "codec_model_downsample_factor": 4,
+                "eos_id": 1,
+                "load_cached_codes_if_available": False,
+                "load_16khz_audio": False,
+                "speaker_embedding_store": speaker_embedding_store,
+            }
+            # The store is ignored by datasets with a different volume normalization
+            assert MagpieTTSDataset(volume_norm=False, **dataset_kwargs).speaker_embedding_store is None
+            dataset = MagpieTTSDataset(volume_norm=True, **dataset_kwargs)
+            dataset.text_tokenizer = _CharTokenizer()
+            batch = dataset.collate_fn([dataset[idx] for idx in range(len(dataset))])
+
+            # The target audio is looked up with the keys of the batch
+            keys = batch["target_speaker_embedding_keys"]
+            model = _SpeakerEmbeddingModel()
+            speaker_embeddings = model.get_speaker_embeddings_from_filepaths(
+                [audio_dir / filepath for filepath in batch["audio_filepaths"]],
+                speaker_embedding_store=speaker_embedding_store,
+                speaker_embedding_keys=keys,
+            )
+
+        assert speaker_embeddings.shape == (3, EMBEDDING_DIM)
+        for key, speaker_embedding in zip(keys[:2], speaker_embeddings[:2]):
+            np.testing.assert_allclose(speaker_embedding.numpy(), stored_embeddings[key], rtol=1e-6)
+        # Only the audio which is not in the store is embedded, with the volume normalization of the store
+        assert len(model.eval_speaker_verification_model.input_signals) == 1
+        assert model.eval_speaker_verification_model.input_signals[0].shape == (1, sample_rate)
+        np.testing.assert_allclose(speaker_embeddings[2].numpy(), 0.95, rtol=1e-5)
@@ -0,0 +1,38 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import torch
+
+from nemo.collections.tts.modules.monotonic_align import maximum_path_numba, maximum_path_torch
+from nemo.collections.tts.parts.utils.helpers import get_mask_from_lengths
+
+
+@pytest.mark.run_only_on('CPU')
+@pytest.mark.unit
+@pytest.mark.parametrize("integer_values", [False, True])
+def test_maximum_path_torch_matches_numba(integer_values):
+    torch.manual_seed(0)
+    for _ in range(10):
+        text_len = torch.randint(1, 30, (4,))
+        spec_len = text_len + torch.randint(0, 60, (4,))
+        neg_cent = torch.randn(4, int(spec_len.max()), int(text_len.max()))
+        if integer_values:
+            # Ties between paths are broken the same way
+            neg_cent = torch.round(neg_cent)
+        mask = get_mask_from_lengths(spec_len).unsqueeze(2) * get_mask_from_lengths(text_len).unsqueeze(1)
+
+        path = maximum_path_torch(neg_cent, mask)
+        assert torch.equal(path, maximum_path_numba(neg_cent, mask))
+        assert torch.equal(path.sum(2), mask[:, :, 0].float())
@@ -795,3 +795,79 @@ class TestTransformer:
                 expected_output["attn_probabilities"][i]["cross_attn_probabilities"][0],
                 atol=1e-4,
             )
+
+    def test_merge_and_select_cache(self):
+        set_seed(0)
+        model = Transformer(
+            n_layers=2,
+            d_model=self.d_model,
+            d_ffn=self.d_ffn,
+            sa_n_heads=self.sa_n_heads,
+            kernel_size=self.kernel_size,
+            has_xattn=True,
+            xa_d_memory=4,
+            xa_n_heads=2,
+            is_causal=self.is_causal,
+            apply_norm_out=True,
+            max_length_causal_mask=16,
+            use_learnable_pos_emb=True,
+        ).eval()
+
+        num_steps = 3
+        prefix_lens = [5, 2]
+        inputs = [torch.randn(1, prefix_len + num_steps, self.d_model) for prefix_len in prefix_lens]
+        conds = [torch.randn(1, 3, 4), torch.randn(1, 4, 4)]
+
+        def _cond_mask(cond):
+            return torch.ones(cond.shape[:2], dtype=torch.bool)
+
+        # Decode each sequence separately
+        expected_outputs = []
+        with torch.no_grad():
+            for x, cond, prefix_len in zip(inputs, conds, prefix_lens):
+                model.reset_cache(use_cache=True)
+                outputs = []
+                for length in range(prefix_len, prefix_len + num_steps + 1):
+                    x_mask = torch.ones(1, length, dtype=torch.bool)
+                    output = model(x[:, :length], x_mask, cond=cond, cond_mask=_cond_mask(cond))['output']
+                    outputs.append(output[0, -1])
+                expected_outputs.append(torch.stack(outputs))
+
+        # Decode the first step of each sequence separately, then both sequences in one batch
+        with torch.no_grad():
+            caches = []
+            for x, cond, prefix_len in zip(inputs, conds, prefix_lens):
+                model.reset_cache(use_cache=True)
+                x_mask = torch.ones(1, prefix_len, dtype=torch.bool)
+                model(x[:, :prefix_len], x_mask, cond=cond, cond_mask=_cond_mask(cond))
+                caches.append(model.get_cache())
+            model.set_cache(Transformer.merge_caches(caches))
+
+            max_prefix_len = max(prefix_lens)
+            offsets = [max_prefix_len - prefix_len for prefix_len in prefix_lens]
+            cond = torch.zeros(2, 4, 4)
+            cond_mask = torch.zeros(2, 4, dtype=torch.bool)
+            for i, cond_item in enumerate(conds):
+                cond[i, : cond_item.size(1)] = cond_item
+                cond_mask[i, : cond_item.size(1)] = True
+
+            length = max_prefix_len + 1
+            x = torch.zeros(2, length, self.d_model)
+            x_mask = torch.zeros(2, length, dtype=torch.bool)
+            for i, offset in enumerate(offsets):
+                x[i, offset:] = inputs[i][0, : length - offset]
+                x_mask[i, offset:] = True
+            positions = (torch.arange(length).unsqueeze(0) - torch.tensor(offsets).unsqueeze(1)).clamp(min=0)
+            output = model(x, x_mask, cond=cond, cond_mask=cond_mask, positions=positions)['output']
+            for i in range(2):
+                assert torch.allclose(output[i, -1], expected_outputs[i][1], atol=1e-5)
+
+            # Remove the first sequence, and the padding steps of the second sequence
+            model.select_cache(torch.tensor([1]))
+            model.trim_cache(offsets[1])
+            cond, cond_mask = cond[1:], cond_mask[1:]
+            for step in range(2, num_steps + 1):
+                length = prefix_lens[1] + step
+                x_mask = torch.ones(1, length, dtype=torch.bool)
+                output = model(inputs[1][:, :length], x_mask, cond=cond, cond_mask=cond_mask)['output']
+                assert torch.allclose(output[0, -1], expected_outputs[1][step], atol=1e-5)
@@ -16,6 +16,7 @@ import numpy as np
 import pytest
 
 from nemo.collections.tts.parts.preprocessing.audio_trimming import (
+    EnergyAudioTrimmer,
     get_start_and_end_of_speech_frames,
     pad_sample_indices,
 )
@@ -66,3 +67,34 @@ class TestAudioTrimming:
         )
         assert start_sample == 0
         assert end_sample == 1150
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_energy_trim_audio_batch(self):
+        rng = np.random.default_rng(0)
+        sample_rate = 16000
+        audios = []
+        for num_samples in [500, 8000, 16000, 24001, 40000]:
+            audio = 1e-4 * rng.standard_normal(num_samples)
+            speech_start = num_samples // 4
+            speech_end = 3 * num_samples // 4
+            audio[speech_start:speech_end] += 0.5 * np.sin(np.arange(speech_end - speech_start) / 10)
+            audios.append(audio.astype(np.float32))
+        # Silent audio, in which no speech is found
+        audios.append(np.zeros(8000, dtype=np.float32))
+
+        audio_trimmer = EnergyAudioTrimmer(speech_frame_threshold=2, trim_win_length=1024, trim_hop_length=256)
+        outputs = audio_trimmer.trim_audio_batch(audios=audios, sample_rate=sample_rate)
+
+        assert len(outputs) == len(audios)
+        for audio, (trimmed_audio, start_sample, end_sample) in zip(audios, outputs):
+            expected_audio, expected_start_sample, expected_end_sample = audio_trimmer.trim_audio(
+                audio=audio, sample_rate=sample_rate
+            )
+            assert start_sample == expected_start_sample
+            assert end_sample == expected_end_sample
+            np.testing.assert_array_equal(trimmed_audio, expected_audio)
+
+        assert outputs[3][1] > 0
+        assert outputs[3][2] < audios[3].shape[0]
+        assert outputs[-1][0].size == 0
@@ -0,0 +1,212 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+import torch
+
+from nemo.collections.tts.parts.preprocessing.feature_extraction import FeatureExtractor, RunningFeatureStats
+from nemo.collections.tts.parts.preprocessing.features import EnergyFeaturizer, MelSpectrogramFeaturizer
+
+
+class TestFeatureExtraction:
+    def setup_class(self):
+        self.spec_dim = 16
+        self.hop_len = 100
+        self.sample_rate = 10000
+        self.audio_lens = [5000, 7000, 3000, 6000, 4000]
+        self.speakers = ["spk1", "spk2", "spk1", "spk2", "spk1"]
+
+    def _create_test_data(self, test_dir):
+        entries = []
+        for i, (audio_len, speaker) in enumerate(zip(self.audio_lens, self.speakers)):
+            audio_filename = f"{speaker}/audio{i}.wav"
+            (test_dir / speaker).mkdir(exist_ok=True)
+            sf.write(test_dir / audio_filename, np.random.uniform(-0.5, 0.5, size=[audio_len]), self.sample_rate)
+            entries.append({"audio_filepath": audio_filename, "speaker": speaker})
+        return entries
+
+    def _get_featurizers(self):
+        mel_featurizer = MelSpectrogramFeaturizer(
+            mel_dim=self.spec_dim, hop_length=self.hop_len, win_length=400, sample_rate=self.sample_rate
+        )
+        energy_featurizer = EnergyFeaturizer(spec_featurizer=mel_featurizer)
+        return {"mel": mel_featurizer, "energy": energy_featurizer}
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_running_feature_stats(self):
+        values = [np.random.normal(loc=i, size=[10 * (i + 1)]) for i in range(6)]
+        speakers = ["a", "b", "a", None, "b", "a"]
+
+        stats1 = RunningFeatureStats()
+        stats2 = RunningFeatureStats()
+        for i, (value, speaker) in enumerate(zip(values, speakers)):
+            stats = stats1 if i % 2 == 0 else stats2
+            stats.update(feature_name="pitch", values=value, speaker=speaker)
+        stats1.merge(stats2)
+        state = json.loads(json.dumps(stats1.state_dict()))
+        stats = RunningFeatureStats()
+        stats.load_state_dict(state)
+        stat_dict = stats.get_stats()
+
+        assert set(stat_dict.keys()) == {"default", "a", "b"}
+        all_values = np.concatenate(values)
+        speaker_values = np.concatenate([value for value, speaker in zip(values, speakers) if speaker == "a"])
+        np.testing.assert_allclose(stat_dict["default"]["pitch_mean"], all_values.mean())
+        np.testing.assert_allclose(stat_dict["default"]["pitch_std"], all_values.std(ddof=1))
+        np.testing.assert_allclose(stat_dict["a"]["pitch_mean"], speaker_values.mean())
+        np.testing.assert_allclose(stat_dict["a"]["pitch_std"], speaker_values.std(ddof=1))
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    @pytest.mark.parametrize("packed", [False, True])
+    def test_extract_and_resume(self, packed):
+        featurizers = self._get_featurizers()
+
+        with tempfile.TemporaryDirectory() as test_dir:
+            test_dir = Path(test_dir)
+            feature_dir = test_dir / "features"
+            entries = self._create_test_data(test_dir)
+            feature_extractor = FeatureExtractor(
+                featurizers=featurizers,
+                feature_dir=feature_dir,
+                shard_size=2,
+                packed=packed,
+                stats_feature_names=["energy"],
+            )
+
+            # Simulate an interrupted run which only computed the first 3 entries
+            feature_extractor.extract(manifest_entries=entries[:3], audio_dir=test_dir)
+            stats = feature_extractor.extract(manifest_entries=entries, audio_dir=test_dir)
+
+            completed_lines = (feature_dir / "energy_completed.jsonl").read_text().splitlines()
+            completed_keys = [key for line in completed_lines for key in json.loads(line)["keys"]]
+            assert sorted(completed_keys) == sorted(
+                str(Path(entry["audio_filepath"]).with_suffix("")) for entry in entries
+            )
+
+            energies = []
+            for entry in entries:
+                spec = featurizers["mel"].compute_mel_spec(manifest_entry=entry, audio_dir=test_dir)
+                energy = featurizers["energy"].compute_energy(manifest_entry=entry, audio_dir=test_dir)
+                feature_dict = featurizers["mel"].load(
+                    manifest_entry=entry, audio_dir=test_dir, feature_dir=feature_dir
+                )
+                feature_dict.update(
+                    featurizers["energy"].load(manifest_entry=entry, audio_dir=test_dir, feature_dir=feature_dir)
+                )
+                torch.testing.assert_close(feature_dict["mel_spec"], torch.from_numpy(spec))
+                torch.testing.assert_close(feature_dict["energy"], torch.from_numpy(energy))
+                energies.append(energy)
+
+        stat_dict = stats.get_stats()
+        all_energies = np.concatenate(energies)
+        spk1_energies = np.concatenate([energy for energy, spk in zip(energies, self.speakers) if spk == "spk1"])
+        np.testing.assert_allclose(stat_dict["default"]["energy_mean"], all_energies.mean(), rtol=1e-5)
+        np.testing.assert_allclose(stat_dict["default"]["energy_std"], all_energies.std(ddof=1), rtol=1e-5)
+        np.testing.assert_allclose(stat_dict["spk1"]["energy_mean"], spk1_energies.mean(), rtol=1e-5)
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    @pytest.mark.parametrize("packed", [False, True])
+    def test_resume_without_completion_index_or_stats(self, packed):
+        featurizers = self._get_featurizers()
+
+        with tempfile.TemporaryDirectory() as test_dir:
+            test_dir = Path(test_dir)
+            feature_dir = test_dir / "features"
+            entries = self._create_test_data(test_dir)
+            expected_stats = (
+                FeatureExtractor(
+                    featurizers=featurizers, feature_dir=test_dir / "expected", stats_feature_names=["energy"]
+                )
+                .extract(manifest_entries=entries, audio_dir=test_dir)
+                .get_stats()
+            )
+
+            # Features of the first 2 entries saved without completion index, like by previous versions of
+            # compute_features.py, and of the next 2 entries by a run without statistics
+            for featurizer in featurizers.values():
+                if packed:
+                    featurizer.save_packed(manifest_entries=entries[:2], audio_dir=test_dir, feature_dir=feature_dir)
+                else:
+                    for entry in entries[:2]:
+                        featurizer.save(manifest_entry=entry, audio_dir=test_dir, feature_dir=feature_dir)
+            FeatureExtractor(featurizers=featurizers, feature_dir=feature_dir, packed=packed).extract(
+                manifest_entries=entries[2:4], audio_dir=test_dir
+            )
+
+            computed_entries = []
+            for featurizer in featurizers.values():
+                compute_features = featurizer.compute_features
+
+                def _compute_features(manifest_entry, audio_dir, compute_features=compute_features):
+                    computed_entries.append(manifest_entry["audio_filepath"])
+                    return compute_features(manifest_entry=manifest_entry, audio_dir=audio_dir)
+
+                featurizer.compute_features = _compute_features
+            feature_extractor = FeatureExtractor(
+                featurizers=featurizers, feature_dir=feature_dir, packed=packed, stats_feature_names=["energy"]
+            )
+            stat_dict = feature_extractor.extract(manifest_entries=entries, audio_dir=test_dir).get_stats()
+            assert computed_entries == [entries[4]["audio_filepath"]] * 2
+
+            # The statistics computed from the saved features are recorded, and not counted twice
+            resumed_stat_dict = feature_extractor.extract(manifest_entries=entries, audio_dir=test_dir).get_stats()
+            assert computed_entries == [entries[4]["audio_filepath"]] * 2
+
+        for speaker in ["default", "spk1", "spk2"]:
+            for key in ["energy_mean", "energy_std"]:
+                np.testing.assert_allclose(stat_dict[speaker][key], expected_stats[speaker][key], rtol=1e-5)
+                np.testing.assert_allclose(resumed_stat_dict[speaker][key], expected_stats[speaker][key], rtol=1e-5)
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_extract_multiprocess(self):
+        featurizers = self._get_featurizers()
+
+        with tempfile.TemporaryDirectory() as test_dir:
+            test_dir = Path(test_dir)
+            entries = self._create_test_data(test_dir)
+            stats = FeatureExtractor(
+                featurizers=featurizers, feature_dir=test_dir / "features1", stats_feature_names=["energy"]
+            ).extract(manifest_entries=entries, audio_dir=test_dir)
+            stats_multiprocess = FeatureExtractor(
+                featurizers=featurizers,
+                feature_dir=test_dir / "features2",
+                num_workers=2,
+                shard_size=1,
+                stats_feature_names=["energy"],
+            ).extract(manifest_entries=entries, audio_dir=test_dir)
+
+            for entry in entries:
+                energy = featurizers["energy"].load(
+                    manifest_entry=entry, audio_dir=test_dir, feature_dir=test_dir / "features1"
+                )
+                energy_multiprocess = featurizers["energy"].load(
+                    manifest_entry=entry, audio_dir=test_dir, feature_dir=test_dir / "features2"
+                )
+                torch.testing.assert_close(energy_multiprocess, energy)
+
+        stat_dict = stats.get_stats()
+        stat_dict_multiprocess = stats_multiprocess.get_stats()
+        for speaker in ["default", "spk1", "spk2"]:
+            for key in ["energy_mean", "energy_std"]:
+                np.testing.assert_allclose(stat_dict_multiprocess[speaker][key], stat_dict[speaker][key])
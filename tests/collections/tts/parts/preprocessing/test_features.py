@@ -307,3 +307,69 @@ class TestTTSFeatures:
 
         torch.testing.assert_close(energy_segment1, energy[start1:end1])
         torch.testing.assert_close(energy_segment2, energy[start2:end2])
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_save_packed_and_load_pitch_segments(self):
+        pitch_name = "pitch_test"
+        voiced_mask_name = "voiced_mask_test"
+        offset = 1.0
+        duration = 2.0
+        start, end = self._compute_start_end_frames(offset=offset, duration=duration)
+        manifest_entry_segment = {"audio_filepath": self.audio_filename, "offset": offset, "duration": duration}
+
+        pitch_featurizer = PitchFeaturizer(
+            pitch_name=pitch_name,
+            voiced_mask_name=voiced_mask_name,
+            hop_length=self.hop_len,
+            sample_rate=self.sample_rate,
+        )
+
+        with self._create_test_dir() as test_dir:
+            feature_dir = test_dir / "feature"
+            pitch, voiced_mask, _ = pitch_featurizer.compute_pitch(
+                manifest_entry=self.manifest_entry, audio_dir=test_dir
+            )
+            pitch_featurizer.save_packed(
+                manifest_entries=[self.manifest_entry], audio_dir=test_dir, feature_dir=feature_dir
+            )
+            pitch_dict = pitch_featurizer.load(
+                manifest_entry=self.manifest_entry, audio_dir=test_dir, feature_dir=feature_dir
+            )
+            pitch_dict_segment = pitch_featurizer.load(
+                manifest_entry=manifest_entry_segment, audio_dir=test_dir, feature_dir=feature_dir
+            )
+
+            assert (feature_dir / f"{pitch_name}_packed").exists()
+            assert not (feature_dir / pitch_name).exists()
+
+        torch.testing.assert_close(pitch_dict[pitch_name], torch.from_numpy(pitch))
+        torch.testing.assert_close(pitch_dict[voiced_mask_name], torch.from_numpy(voiced_mask))
+        torch.testing.assert_close(pitch_dict_segment[pitch_name], torch.from_numpy(pitch[start:end]))
+        torch.testing.assert_close(pitch_dict_segment[voiced_mask_name], torch.from_numpy(voiced_mask[start:end]))
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_save_packed_and_load_mel_spectrogram_float16(self):
+        mel_name = "mel_test"
+        mel_featurizer = MelSpectrogramFeaturizer(
+            feature_name=mel_name, mel_dim=self.spec_dim, hop_length=self.hop_len, sample_rate=self.sample_rate
+        )
+
+        with self._create_test_dir() as test_dir:
+            feature_dir = test_dir / "feature"
+            spec = mel_featurizer.compute_mel_spec(manifest_entry=self.manifest_entry, audio_dir=test_dir)
+            mel_featurizer.save_packed(
+                manifest_entries=[self.manifest_entry],
+                audio_dir=test_dir,
+                feature_dir=feature_dir,
+                feature_dtypes={mel_name: "float16"},
+            )
+            mel_dict = mel_featurizer.load(
+                manifest_entry=self.manifest_entry, audio_dir=test_dir, feature_dir=feature_dir
+            )
+
+        mel_spec = mel_dict[mel_name]
+        assert mel_spec.dtype == torch.float32
+        assert mel_spec.shape == (self.spec_dim, self.spec_len)
+        torch.testing.assert_close(mel_spec, torch.from_numpy(spec), atol=1e-2, rtol=1e-3)
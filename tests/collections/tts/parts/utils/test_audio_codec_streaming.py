@@ -0,0 +1,115 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import torch
+from omegaconf import OmegaConf
+
+from nemo.collections.tts.models import AudioCodecModel
+
+
+def _get_codec_model(decoder_name: str) -> AudioCodecModel:
+    modules = "nemo.collections.tts.modules.audio_codec_modules"
+    losses = "nemo.collections.tts.losses.audio_codec_loss"
+    cfg = OmegaConf.create(
+        {
+            "sample_rate": 16000,
+            "samples_per_frame": 16,
+            "commit_loss_scale": 0.0,
+            "loss_resolutions": [[32, 8, 32]],
+            "mel_loss_dims": [5],
+            "audio_encoder": {
+                "_target_": f"{modules}.HiFiGANEncoder",
+                "down_sample_rates": [2, 2, 4],
+                "encoded_dim": 8,
+                "base_channels": 8,
+            },
+            "audio_decoder": {
+                "_target_": f"{modules}.{decoder_name}",
+                "up_sample_rates": [4, 2, 2],
+                "input_dim": 8,
+                "base_channels": 32,
+            },
+            "vector_quantizer": {
+                "_target_": f"{modules}.GroupFiniteScalarQuantizer",
+                "num_groups": 2,
+                "num_levels_per_group": [8, 5, 5, 5],
+            },
+            "discriminator": {"_target_": f"{modules}.MultiPeriodDiscriminator"},
+            "generator_loss": {"_target_": f"{losses}.GeneratorSquaredLoss"},
+            "discriminator_loss": {"_target_": f"{losses}.DiscriminatorSquaredLoss"},
+        }
+    )
+    return AudioCodecModel(cfg=cfg).eval()
+
+
+class TestAudioCodecStreamingDecoder:
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    @pytest.mark.parametrize("decoder_name", ["HiFiGANDecoder", "CausalHiFiGANDecoder"])
+    def test_streaming_decode_matches_decode(self, decoder_name):
+        torch.manual_seed(0)
+        model = _get_codec_model(decoder_name)
+        num_frames = 75
+        tokens = torch.randint(0, 5, (2, 2, num_frames))
+        tokens_len = torch.full((2,), num_frames)
+        expected_audio, _ = model.decode(tokens=tokens, tokens_len=tokens_len)
+
+        streaming_decoder = model.get_streaming_decoder()
+        audio_chunks = []
+        for chunk_start, chunk_size in zip([0, 1, 5, 12, 40], [1, 4, 7, 28, 35]):
+            audio_chunks.append(streaming_decoder.push(tokens[:, :, chunk_start : chunk_start + chunk_size]))
+        audio_chunks.append(streaming_decoder.flush())
+
+        for audio_chunk in audio_chunks:
+            assert audio_chunk.size(1) % model.samples_per_frame == 0
+        if decoder_name == "CausalHiFiGANDecoder":
+            assert streaming_decoder.num_future_frames == 0
+            assert audio_chunks[0].size(1) == model.samples_per_frame
+
+        audio = torch.cat(audio_chunks, dim=1)
+        assert audio.shape == expected_audio.shape
+        torch.testing.assert_close(audio, expected_audio, atol=1e-6, rtol=0.0)
+        assert streaming_decoder.num_pending_frames == 0
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_context_frames_are_estimated_once_per_model(self, monkeypatch):
+        estimate_calls = []
+
+        def estimate_decoder_context_frames(**kwargs):
+            estimate_calls.append(kwargs)
+            return 3, 2
+
+        monkeypatch.setattr(
+            "nemo.collections.tts.models.audio_codec.estimate_decoder_context_frames", estimate_decoder_context_frames
+        )
+        torch.manual_seed(0)
+        model = _get_codec_model("HiFiGANDecoder")
+
+        streaming_decoders = [model.get_streaming_decoder() for _ in range(3)]
+        streaming_decoders.append(model.get_streaming_decoder(num_future_frames=0))
+        assert len(estimate_calls) == 1
+        assert estimate_calls[0]["input_dim"] == model.vector_quantizer.codebook_dim
+        assert [(decoder.num_past_frames, decoder.num_future_frames) for decoder in streaming_decoders] == [
+            (3, 2),
+            (3, 2),
+            (3, 2),
+            (3, 0),
+        ]
+
+        # Flushing before any push returns no audio
+        audio = streaming_decoders[0].flush()
+        assert audio.shape == (0, 0)
+        assert audio.device == model.device
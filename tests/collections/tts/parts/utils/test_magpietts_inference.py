@@ -0,0 +1,177 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import torch
+from omegaconf import OmegaConf
+
+from nemo.collections.tts.models.magpietts import MagpieTTS_Model
+from nemo.collections.tts.modules.transformer_2501 import Transformer
+from nemo.collections.tts.parts.utils.magpietts_inference import MagpieTTSInferenceScheduler
+
+NUM_CODEBOOKS = 4
+NUM_TOKENS_PER_CODEBOOK = 64
+SAMPLES_PER_FRAME = 4
+
+
+class _TinyMagpieTTS(torch.nn.Module):
+    """
+    Small decoder_context_tts model with random weights, which runs the inference code of MagpieTTS_Model without a
+    codec model. Codes are sampled greedily, and a request ends when its last codebook predicts a multiple of 17.
+    """
+
+    prepare_context_tensors = MagpieTTS_Model.prepare_context_tensors
+    prepare_dummy_cond_for_cfg = MagpieTTS_Model.prepare_dummy_cond_for_cfg
+    embed_audio_tokens = MagpieTTS_Model.embed_audio_tokens
+    scale_prior = MagpieTTS_Model.scale_prior
+    forward = MagpieTTS_Model.forward
+    infer_batch = MagpieTTS_Model.infer_batch
+
+    def __init__(self, d_model: int = 32):
+        super().__init__()
+        self.cfg = OmegaConf.create(
+            {"num_audio_codebooks": NUM_CODEBOOKS, "num_audio_tokens_per_codebook": NUM_TOKENS_PER_CODEBOOK}
+        )
+        self.model_type = 'decoder_context_tts'
+        self.use_text_conditioning_encoder = False
+        self.use_kv_cache_for_inference = False
+        self.global_step = 0
+        self.audio_bos_id = NUM_TOKENS_PER_CODEBOOK - 2
+        self.audio_eos_id = NUM_TOKENS_PER_CODEBOOK - 1
+        self.text_embedding = torch.nn.Embedding(20, d_model)
+        self.audio_embeddings = torch.nn.ModuleList(
+            [torch.nn.Embedding(NUM_TOKENS_PER_CODEBOOK, d_model) for _ in range(NUM_CODEBOOKS)]
+        )
+        self.encoder = Transformer(
+            n_layers=1, d_model=d_model, d_ffn=2 * d_model, sa_n_heads=2, kernel_size=3, is_causal=False
+        )
+        self.decoder = Transformer(
+            n_layers=2,
+            d_model=d_model,
+            d_ffn=2 * d_model,
+            sa_n_heads=2,
+            kernel_size=1,
+            has_xattn=True,
+            xa_d_memory=d_model,
+            xa_n_heads=1,
+            is_causal=True,
+            apply_norm_out=True,
+            max_length_causal_mask=256,
+            use_learnable_pos_emb=True,
+        )
+        self.final_proj = torch.nn.Linear(d_model, NUM_CODEBOOKS * NUM_TOKENS_PER_CODEBOOK)
+
+    def sample_codes_from_logits(self, all_code_logits_t, temperature=0.7, topk=80):
+        logits = all_code_logits_t.view(-1, NUM_CODEBOOKS, NUM_TOKENS_PER_CODEBOOK)
+        preds = logits.argmax(dim=-1)
+        preds[preds[:, -1] % 17 == 0, 0] = self.audio_eos_id
+        return preds
+
+    def codes_to_audio(self, codes, codes_len):
+        return codes[:, 0].double().repeat_interleave(SAMPLES_PER_FRAME, dim=-1), codes_len * SAMPLES_PER_FRAME
+
+
+class _RecordingScheduler(MagpieTTSInferenceScheduler):
+    """Records the requests in the batch at each decoding step."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batch_request_ids = []
+
+    def _decode_step(self):
+        self.batch_request_ids.append(list(self._batch.request_ids))
+        super()._decode_step()
+
+
+def _get_requests(num_requests: int):
+    generator = torch.Generator().manual_seed(0)
+    requests = []
+    for _ in range(num_requests):
+        text_len = torch.randint(3, 10, (1,), generator=generator)
+        context_len = torch.randint(2, 8, (1,), generator=generator)
+        requests.append(
+            {
+                'text': torch.randint(0, 20, (1, text_len.item()), generator=generator),
+                'text_lens': text_len,
+                'context_audio_codes': torch.randint(
+                    0, NUM_TOKENS_PER_CODEBOOK - 2, (1, NUM_CODEBOOKS, context_len.item()), generator=generator
+                ),
+                'context_audio_codes_lens': context_len,
+            }
+        )
+    return requests
+
+
+class TestMagpieTTSInferenceScheduler:
+    @pytest.fixture(scope="class")
+    def model(self):
+        torch.manual_seed(0)
+        return _TinyMagpieTTS().double().eval()
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    @pytest.mark.parametrize("use_cfg", [False, True])
+    def test_matches_unbatched_inference(self, model, use_cfg):
+        max_decoder_steps = 30
+        requests = _get_requests(num_requests=7)
+
+        scheduler = _RecordingScheduler(
+            model=model, max_batch_size=3, max_decoder_steps=max_decoder_steps, use_cfg=use_cfg, cfg_scale=2.0
+        )
+        request_ids = [scheduler.add_requests(request)[0] for request in requests]
+        results = scheduler.run()
+        assert [result['request_id'] for result in results] == request_ids == list(range(7))
+
+        # Requests end at different steps, and queued requests join the batch while other requests are decoded
+        assert len(set(result['codes_len'] for result in results)) > 1
+        assert all(len(batch_request_ids) <= 3 for batch_request_ids in scheduler.batch_request_ids)
+        assert any(
+            min(batch_request_ids) < 3 <= max(batch_request_ids) for batch_request_ids in scheduler.batch_request_ids
+        )
+
+        for request, result in zip(requests, results):
+            # Decoding each request alone without KV cache gives the same codes
+            _, _, expected_codes, expected_codes_lens = model.infer_batch(
+                request, max_decoder_steps=max_decoder_steps, use_cfg=use_cfg, cfg_scale=2.0
+            )
+            codes_len = expected_codes_lens[0].item()
+            assert result['codes_len'] == codes_len
+            assert torch.equal(result['codes'], expected_codes[0, :, :codes_len])
+            assert result['audio_len'] == codes_len * SAMPLES_PER_FRAME
+            assert result['audio'].shape == (codes_len * SAMPLES_PER_FRAME,)
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_requests_finish_independently(self, model):
+        requests = _get_requests(num_requests=4)
+        scheduler = _RecordingScheduler(model=model, max_batch_size=4, max_decoder_steps=30)
+        for request in requests:
+            scheduler.add_requests(request)
+        results = scheduler.run()
+
+        # Each request leaves the batch after its last frame, and its audio is returned without waiting for the
+        # requests which are still decoded
+        codes_lens = [result['codes_len'] for result in results]
+        assert len(set(codes_lens)) > 1
+        for step, batch_request_ids in enumerate(scheduler.batch_request_ids):
+            assert batch_request_ids == [
+                request_id for request_id, codes_len in enumerate(codes_lens) if step < min(codes_len, 29)
+            ]
+        first_result = min(results, key=lambda result: result['codes_len'])
+        last_result = max(results, key=lambda result: result['codes_len'])
+        assert first_result['time_to_first_audio'] < last_result['time_to_first_audio']
+
+        # The scheduler can decode more requests afterwards
+        scheduler.add_requests(requests[0])
+        assert torch.equal(scheduler.run()[0]['codes'], results[0]['codes'])
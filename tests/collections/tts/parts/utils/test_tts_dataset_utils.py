@@ -12,23 +12,67 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import pickle
+import tempfile
 from pathlib import Path
 
 import librosa
 import numpy as np
 import pytest
+import soundfile as sf
 import torch
+from pytorch_lightning import LightningModule, Trainer
+from pytorch_lightning.callbacks import ModelCheckpoint
 
 from nemo.collections.tts.parts.utils.tts_dataset_utils import (
+    LengthBucketingBatchSampler,
+    PackedFeatureStore,
+    PackedFeatureWriter,
     filter_dataset_by_duration,
+    filter_entry_indices_by_duration,
     get_abs_rel_paths,
     get_audio_filepaths,
+    get_dataloader_params,
+    get_speaker_embedding_key,
+    get_speaker_embedding_metadata,
+    get_speaker_reference_audio,
+    get_target_audio,
+    get_text_tokens_dir,
+    get_text_tokens_metadata,
     load_audio,
+    load_speaker_embedding_store,
+    load_speaker_reference_audio,
+    load_text_tokens_store,
     normalize_volume,
+    set_batch_sampler_epoch,
     stack_tensors,
 )
 
 
+class _BatchRecordingModel(LightningModule):
+    """Records the batches of its training steps, and sets the epoch of the batch sampler like the TTS models."""
+
+    def __init__(self, dataloader):
+        super().__init__()
+        self.dataloader = dataloader
+        self.layer = torch.nn.Linear(1, 1)
+        self.batches = []
+
+    def train_dataloader(self):
+        set_batch_sampler_epoch(self.dataloader, self.trainer)
+        return self.dataloader
+
+    def on_train_epoch_start(self):
+        set_batch_sampler_epoch(self.dataloader, self.trainer)
+
+    def training_step(self, batch, batch_idx):
+        self.batches.append(batch.tolist())
+        return self.layer(batch.float().unsqueeze(1)).mean()
+
+    def configure_optimizers(self):
+        return torch.optim.SGD(self.parameters(), lr=0.0)
+
+
 class TestTTSDatasetUtils:
     @pytest.mark.run_only_on('CPU')
     @pytest.mark.unit
@@ -208,3 +252,285 @@ class TestTTSDatasetUtils:
         assert filtered_entries[1]["duration"] == 5.0
         assert total_hours == (135.6 / 3600.0)
         assert filtered_hours == (15.0 / 3600.0)
+
+        entry_indices, _, _ = filter_entry_indices_by_duration(
+            entries=entries, min_duration=min_duration, max_duration=max_duration
+        )
+        assert entry_indices == [1, 5]
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_packed_feature_store(self):
+        features = {
+            "speaker1/audio1": np.random.uniform(size=[4, 10]).astype(np.float32),
+            "speaker1/audio2": np.random.uniform(size=[4, 3]).astype(np.float32),
+            "audio3": np.zeros([4, 0], dtype=np.float32),
+        }
+
+        with tempfile.TemporaryDirectory() as test_dir:
+            store_dir = Path(test_dir) / "mel_packed"
+            assert not PackedFeatureStore.exists(store_dir)
+            with PackedFeatureWriter(store_dir=store_dir) as writer:
+                for key, feature in features.items():
+                    writer.add(key=key, features=feature)
+
+            assert PackedFeatureStore.exists(store_dir)
+            feature_store = pickle.loads(pickle.dumps(PackedFeatureStore(store_dir)))
+            assert len(feature_store) == 3
+            for key, feature in features.items():
+                assert key in feature_store
+                np.testing.assert_array_equal(feature_store.read(key), feature)
+            np.testing.assert_array_equal(
+                feature_store.read("speaker1/audio1", indices=(1, 3)), features["speaker1/audio1"][1:3]
+            )
+
+            # Append to the existing store
+            new_feature = np.random.uniform(size=[4, 5]).astype(np.float32)
+            with PackedFeatureWriter(store_dir=store_dir) as writer:
+                assert "audio3" in writer
+                writer.add(key="audio4", features=new_feature)
+
+            assert len(feature_store) == 4
+            np.testing.assert_array_equal(feature_store.read("audio4"), new_feature)
+            np.testing.assert_array_equal(feature_store.read("speaker1/audio2"), features["speaker1/audio2"])
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_packed_feature_store_float16(self):
+        feature = np.random.uniform(size=[20]).astype(np.float32)
+
+        with tempfile.TemporaryDirectory() as test_dir:
+            store_dir = Path(test_dir) / "energy_packed"
+            with PackedFeatureWriter(store_dir=store_dir, dtype="float16") as writer:
+                writer.add(key="audio1", features=feature)
+
+            with pytest.raises(ValueError):
+                PackedFeatureWriter(store_dir=store_dir, dtype="float32")
+
+            output = PackedFeatureStore(store_dir).read("audio1")
+
+        assert output.dtype == np.float32
+        np.testing.assert_allclose(output, feature, atol=1e-3)
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_load_text_tokens_store(self):
+        vocab = ["a", "b", "c", " "]
+        tokens = [[0, 3, 1], [2], []]
+
+        with tempfile.TemporaryDirectory() as test_dir:
+            manifest_path = Path(test_dir) / "manifest.json"
+            manifest_path.write_text('{"text": "a b"}\n{"text": "c"}\n{"text": ""}\n')
+            assert load_text_tokens_store(manifest_path=manifest_path, tokens=vocab) is None
+
+            store_dir = get_text_tokens_dir(manifest_path)
+            assert store_dir == Path(test_dir) / "manifest_text_tokens_packed"
+            metadata = get_text_tokens_metadata(manifest_path=manifest_path, tokens=vocab)
+            with PackedFeatureWriter(store_dir=store_dir, dtype="int32", metadata=metadata) as writer:
+                for entry_index, entry_tokens in enumerate(tokens):
+                    writer.add(key=str(entry_index), features=np.array(entry_tokens, dtype=np.int32))
+
+            text_tokens_store = load_text_tokens_store(manifest_path=manifest_path, tokens=vocab)
+            assert text_tokens_store.metadata == metadata
+            for entry_index, entry_tokens in enumerate(tokens):
+                assert text_tokens_store.read(str(entry_index)).tolist() == entry_tokens
+                assert text_tokens_store.shape(str(entry_index)) == (len(entry_tokens),)
+
+            # Pre-tokenized texts are ignored for a different vocabulary or manifest
+            assert load_text_tokens_store(manifest_path=manifest_path, tokens=vocab[::-1]) is None
+            with open(manifest_path, "a") as manifest_f:
+                manifest_f.write('{"text": "b"}\n')
+            assert load_text_tokens_store(manifest_path=manifest_path, tokens=vocab) is None
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_get_speaker_reference_audio(self):
+        audio_dir = Path("/home/data/audio")
+        manifest_entry = {"audio_filepath": "target.wav", "duration": 2.0}
+        assert get_speaker_reference_audio(manifest_entry, audio_dir) == (audio_dir / "target.wav", 0.0, 2.0)
+        assert get_speaker_embedding_key(audio_dir / "target.wav", 0.0, 2.0) == "/home/data/audio/target.wav:0.0:2.0"
+        assert get_speaker_embedding_key(audio_dir / "target.wav", 1.5, 2.0) == "/home/data/audio/target.wav:1.5:2.0"
+        assert get_speaker_embedding_key(audio_dir / "target.wav") == "/home/data/audio/target.wav:0.0:0.0"
+
+        manifest_entry.update({"context_audio_filepath": "context.wav", "context_audio_duration": 3.0})
+        assert get_speaker_reference_audio(manifest_entry, audio_dir) == (audio_dir / "context.wav", 0.0, 3.0)
+        assert get_target_audio(manifest_entry, audio_dir) == (audio_dir / "target.wav", 0.0, 2.0)
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_load_speaker_reference_audio(self):
+        sample_rate = 16000
+        target_audio = 0.1 * np.sin(np.linspace(0, 100, 2 * sample_rate))
+        context_audio = 0.2 * np.sin(np.linspace(0, 100, 3 * sample_rate))
+
+        with tempfile.TemporaryDirectory() as test_dir:
+            audio_dir = Path(test_dir)
+            sf.write(audio_dir / "target.wav", target_audio, sample_rate)
+            sf.write(audio_dir / "context.wav", context_audio, sample_rate)
+
+            # Volume normalization is applied to the target audio, like in MagpieTTSDataset
+            manifest_entry = {"audio_filepath": "target.wav", "duration": 2.0}
+            audio = load_speaker_reference_audio(manifest_entry, audio_dir, sample_rate, volume_norm=False)
+            np.testing.assert_allclose(audio, target_audio, atol=1e-4)
+            normalized_audio = load_speaker_reference_audio(manifest_entry, audio_dir, sample_rate, volume_norm=True)
+            np.testing.assert_allclose(normalized_audio, normalize_volume(audio))
+
+            # But not to the context audio
+            manifest_entry.update({"context_audio_filepath": "context.wav", "context_audio_duration": 1.0})
+            audio = load_speaker_reference_audio(manifest_entry, audio_dir, sample_rate, volume_norm=True)
+            np.testing.assert_allclose(audio, context_audio[:sample_rate], atol=1e-4)
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_load_speaker_embedding_store(self):
+        embeddings = {
+            "/data/audio1.wav:0.0:0.0": np.random.randn(192),
+            "/data/audio2.wav:1.0:2.0": np.random.randn(192),
+        }
+
+        with tempfile.TemporaryDirectory() as test_dir:
+            store_dir = Path(test_dir) / "speaker_embeddings_packed"
+            assert load_speaker_embedding_store(store_dir, "titanet_large") is None
+
+            metadata = get_speaker_embedding_metadata("titanet_large", volume_norm=True)
+            assert metadata == {"speaker_model": "titanet_large", "volume_norm": True}
+            with PackedFeatureWriter(store_dir=store_dir, dtype="float32", metadata=metadata) as writer:
+                for key, embedding in embeddings.items():
+                    writer.add(key=key, features=embedding)
+
+            speaker_embedding_store = load_speaker_embedding_store(store_dir, "titanet_large")
+            for key, embedding in embeddings.items():
+                np.testing.assert_allclose(speaker_embedding_store.read(key), embedding, rtol=1e-6)
+
+            # Embeddings computed with a different speaker model are ignored
+            assert load_speaker_embedding_store(store_dir, "titanet_small") is None
+
+        # Embeddings without the volume normalization in their metadata are ignored
+        with tempfile.TemporaryDirectory() as test_dir:
+            store_dir = Path(test_dir) / "speaker_embeddings_packed"
+            metadata = {"speaker_model": "titanet_large"}
+            with PackedFeatureWriter(store_dir=store_dir, dtype="float32", metadata=metadata):
+                pass
+            assert load_speaker_embedding_store(store_dir, "titanet_large") is None
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_length_bucketing_batch_sampler(self):
+        rng = np.random.default_rng(0)
+        audio_lengths = rng.integers(100, 2000, size=500).tolist()
+        text_lengths = rng.integers(5, 100, size=500).tolist()
+        max_batch_length = 8000
+
+        sampler = LengthBucketingBatchSampler(
+            audio_lengths=audio_lengths,
+            text_lengths=text_lengths,
+            max_batch_length=max_batch_length,
+            max_batch_size=6,
+            num_buckets=10,
+        )
+        batches = list(sampler)
+
+        assert len(batches) == len(sampler)
+        assert sorted(index for batch in batches for index in batch) == list(range(500))
+        for batch in batches:
+            assert len(batch) <= 6
+            assert len(batch) * max(audio_lengths[index] for index in batch) <= max_batch_length
+
+        # The order is the same within an epoch and different between epochs
+        assert list(sampler) == batches
+        sampler.set_epoch(1)
+        assert list(sampler) != batches
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_length_bucketing_batch_sampler_distributed(self):
+        audio_lengths = np.random.default_rng(0).integers(100, 2000, size=500).tolist()
+        rank_batches = []
+        for rank in range(3):
+            sampler = LengthBucketingBatchSampler(
+                audio_lengths=audio_lengths, max_batch_length=8000, num_buckets=10, world_size=3, rank=rank
+            )
+            rank_batches.append(list(sampler))
+
+        assert len(rank_batches[0]) == len(rank_batches[1]) == len(rank_batches[2])
+        indices = [index for batches in rank_batches for batch in batches for index in batch]
+        assert len(indices) == len(set(indices))
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_length_bucketing_batch_sampler_epochs(self):
+        audio_lengths = np.random.default_rng(0).integers(100, 2000, size=500).tolist()
+        sampler = LengthBucketingBatchSampler(audio_lengths=audio_lengths, max_batch_length=8000, num_buckets=10)
+        sampler.set_epoch(2)
+        batches = list(sampler)
+
+        # The batches of an epoch only depend on the seed and the epoch
+        other_sampler = LengthBucketingBatchSampler(audio_lengths=audio_lengths, max_batch_length=8000, num_buckets=10)
+        other_sampler.set_epoch(2)
+        assert list(other_sampler) == batches
+        assert list(sampler) == batches
+
+        sampler.set_epoch(3)
+        assert list(sampler) != batches
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_length_bucketing_batch_sampler_resume(self):
+        audio_lengths = np.random.default_rng(0).integers(100, 2000, size=500).tolist()
+        sampler = LengthBucketingBatchSampler(audio_lengths=audio_lengths, max_batch_length=8000, num_buckets=10)
+        sampler.set_epoch(2)
+        batches = list(sampler)
+
+        # The consumed batches are skipped once, the next iteration starts the epoch again
+        sampler.set_epoch(2, consumed_batches=5)
+        assert len(sampler) == len(batches)
+        assert list(sampler) == batches[5:]
+        assert list(sampler) == batches
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_set_batch_sampler_epoch(self):
+        audio_lengths = np.random.default_rng(0).integers(100, 2000, size=200).tolist()
+
+        def fit(max_steps=-1, ckpt_path=None, callbacks=None):
+            sampler = LengthBucketingBatchSampler(audio_lengths=audio_lengths, max_batch_length=8000, num_buckets=5)
+            dataloader = torch.utils.data.DataLoader(torch.arange(len(audio_lengths)), batch_sampler=sampler)
+            model = _BatchRecordingModel(dataloader)
+            trainer = Trainer(
+                accelerator="cpu",
+                max_epochs=2,
+                max_steps=max_steps,
+                callbacks=callbacks,
+                logger=False,
+                enable_checkpointing=callbacks is not None,
+                enable_progress_bar=False,
+                enable_model_summary=False,
+                use_distributed_sampler=False,
+            )
+            trainer.fit(model, ckpt_path=ckpt_path)
+            return model.batches, len(sampler)
+
+        batches, num_batches = fit()
+        # The epoch is set at the start of each epoch
+        assert len(batches) == 2 * num_batches
+        assert batches[:num_batches] != batches[num_batches:]
+
+        # Resume from a checkpoint saved after consuming some batches of the second epoch
+        num_steps = num_batches + 5
+        with tempfile.TemporaryDirectory() as test_dir:
+            checkpoint = ModelCheckpoint(
+                dirpath=test_dir, filename="{step}", every_n_train_steps=num_steps, save_top_k=-1
+            )
+            first_batches, _ = fit(max_steps=num_steps + 3, callbacks=[checkpoint])
+            assert first_batches == batches[: num_steps + 3]
+            resumed_batches, _ = fit(ckpt_path=Path(test_dir) / f"step={num_steps}.ckpt")
+        assert resumed_batches == batches[num_steps:]
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_get_dataloader_params(self):
+        dataloader_params = {"batch_size": 4, "shuffle": True, "drop_last": True, "num_workers": 2}
+        sampler = LengthBucketingBatchSampler(audio_lengths=[1, 2, 3], max_batch_length=4)
+
+        assert get_dataloader_params(sampler, dataloader_params) == {"num_workers": 2, "batch_sampler": sampler}
+        assert get_dataloader_params(None, dataloader_params) == {**dataloader_params, "sampler": None}
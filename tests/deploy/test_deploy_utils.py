@@ -30,9 +30,12 @@ from nemo.deploy.utils import (
     cast_output,
     ndarray2img,
     nemo_checkpoint_version,
+    pack_ragged,
+    pack_topk,
     str_list2numpy,
     str_ndarray2list,
     typedict2tensor,
+    unpack_ragged,
 )
 
 
@@ -200,6 +203,50 @@ class TestCastOutput:
         assert result.shape == (3, 1)
 
 
+class TestPackedOutputs:
+    def test_pack_ragged_roundtrip(self):
+        sequences = [[0.5, -1.25, -3.0], torch.tensor([-0.75]), np.array([], dtype=np.float32), [-2.5, -0.125]]
+        values, lengths = pack_ragged(sequences)
+        assert values.dtype == np.float16
+        assert values.shape == (4, 3)
+        assert lengths.dtype == np.int32
+        np.testing.assert_array_equal(lengths, [[3], [1], [0], [2]])
+
+        unpacked = unpack_ragged(values, lengths)
+        assert len(unpacked) == 4
+        for sequence, expected in zip(unpacked, sequences):
+            assert sequence.dtype == np.float32
+            np.testing.assert_array_equal(sequence, np.asarray(expected, dtype=np.float32))
+
+    def test_pack_ragged_extra_dims(self):
+        sequences = [torch.randn(5, 4), torch.randn(2, 4)]
+        values, lengths = pack_ragged(sequences, dtype=torch.float32)
+        assert values.shape == (2, 5, 4)
+        for sequence, expected in zip(unpack_ragged(values, lengths.reshape(-1)), sequences):
+            np.testing.assert_array_equal(sequence, expected.numpy())
+
+    def test_pack_ragged_empty(self):
+        values, lengths = pack_ragged([])
+        assert values.shape == (0, 0)
+        assert lengths.shape == (0, 1)
+        assert unpack_ragged(values, lengths) == []
+
+    def test_pack_topk(self):
+        logits = torch.randn(2, 3, 50)
+        ids, values = pack_topk(logits, 5)
+        assert ids.dtype == np.int32 and values.dtype == np.float16
+        assert ids.shape == values.shape == (2, 3, 5)
+
+        log_probs = torch.log_softmax(logits, dim=-1)
+        expected_values, expected_ids = log_probs.topk(5, dim=-1)
+        np.testing.assert_array_equal(ids, expected_ids.numpy())
+        np.testing.assert_allclose(values, expected_values.numpy(), rtol=1e-3, atol=1e-3)
+        assert np.all(np.diff(values.astype(np.float32), axis=-1) <= 0)
+
+        # k is limited to the vocabulary size
+        assert pack_topk(logits, 100)[0].shape == (2, 3, 50)
+
+
 class TestBroadcastList:
     def test_broadcast_list_no_distributed(self):
         with pytest.raises(RuntimeError, match="Distributed environment is not initialized"):
@@ -0,0 +1,116 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import torch
+from transformers import LlamaConfig, LlamaForCausalLM
+
+from nemo.deploy.nlp.hf_continuous_batching import ContinuousBatchingScheduler, sample_next_tokens
+
+PROMPTS = [[1, 5, 9], [3, 4, 5, 6, 7, 8, 9, 10], [7], [11, 12, 13, 14], list(range(20, 31)), [40, 41]]
+
+
+@pytest.fixture(scope="module")
+def model():
+    torch.manual_seed(0)
+    config = LlamaConfig(
+        vocab_size=128,
+        hidden_size=32,
+        intermediate_size=64,
+        num_hidden_layers=2,
+        num_attention_heads=4,
+        num_key_value_heads=2,
+        max_position_embeddings=256,
+    )
+    # Double precision, so that padding does not change the greedy tokens
+    model = LlamaForCausalLM(config).double().eval()
+    model.generation_config.eos_token_id = None
+    return model
+
+
+def _generate(model, prompt, max_new_tokens):
+    with torch.no_grad():
+        output = model.generate(torch.tensor([prompt]), max_new_tokens=max_new_tokens, do_sample=False, pad_token_id=0)
+    return output[0, len(prompt) :].tolist()
+
+
+class TestContinuousBatchingScheduler:
+    @pytest.mark.unit
+    def test_greedy_outputs_match_generate(self, model):
+        scheduler = ContinuousBatchingScheduler(model, max_batch_size=3)
+        futures = [
+            scheduler.submit(prompt, max_new_tokens=3 + 2 * i, do_sample=False) for i, prompt in enumerate(PROMPTS)
+        ]
+        outputs = [future.result(timeout=60) for future in futures]
+        scheduler.stop()
+
+        for i, (prompt, output) in enumerate(zip(PROMPTS, outputs)):
+            assert output == _generate(model, prompt, 3 + 2 * i)
+
+    @pytest.mark.unit
+    def test_sequences_join_and_leave_the_batch(self, model):
+        scheduler = ContinuousBatchingScheduler(model, max_batch_size=2)
+        short = scheduler.submit(PROMPTS[0], max_new_tokens=2, do_sample=False)
+        long = scheduler.submit(PROMPTS[1], max_new_tokens=6, do_sample=False)
+        # Joins the batch when the short sequence leaves it
+        late = scheduler.submit(PROMPTS[2], max_new_tokens=4, do_sample=False)
+
+        assert long.result(timeout=60) == _generate(model, PROMPTS[1], 6)
+        assert short.result(timeout=60) == _generate(model, PROMPTS[0], 2)
+        assert late.result(timeout=60) == _generate(model, PROMPTS[2], 4)
+        scheduler.stop()
+        assert scheduler._running == [] and scheduler._cache is None
+
+    @pytest.mark.unit
+    def test_eos_ends_sequences(self, model):
+        max_new_tokens = 8
+        expected = _generate(model, PROMPTS[3], max_new_tokens)
+        scheduler = ContinuousBatchingScheduler(model, eos_token_id=expected[2])
+        output = scheduler.submit(PROMPTS[3], max_new_tokens=max_new_tokens, do_sample=False).result(timeout=60)
+        scheduler.stop()
+        assert output == expected[: expected.index(expected[2]) + 1]
+
+    @pytest.mark.unit
+    def test_stopped_scheduler_rejects_requests(self, model):
+        scheduler = ContinuousBatchingScheduler(model)
+        assert scheduler.submit(PROMPTS[0], max_new_tokens=0).result() == []
+        scheduler.stop()
+        with pytest.raises(RuntimeError):
+            scheduler.submit(PROMPTS[0])
+
+    @pytest.mark.unit
+    def test_sample_next_tokens(self):
+        torch.manual_seed(0)
+        logits = torch.randn(4, 16)
+        next_tokens = sample_next_tokens(
+            logits,
+            temperature=torch.tensor([1.0, 0.0, 1.0, 0.7]),
+            top_k=torch.tensor([0, 0, 1, 3]),
+            top_p=torch.tensor([1.0, 1.0, 1.0, 0.0]),
+            do_sample=torch.tensor([False, True, True, True]),
+        )
+        # Rows without sampling, with a temperature of 0, a top-k of 1 or a top-p of 0 take the most probable token
+        assert next_tokens.tolist() == logits.argmax(dim=-1).tolist()
+
+        top_k_tokens = {
+            sample_next_tokens(
+                logits[:1],
+                temperature=torch.tensor([1.0]),
+                top_k=torch.tensor([3]),
+                top_p=torch.tensor([1.0]),
+                do_sample=torch.tensor([True]),
+            ).item()
+            for _ in range(50)
+        }
+        assert top_k_tokens <= set(logits[0].topk(3).indices.tolist())
@@ -17,7 +17,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from transformers import AutoModelForCausalLM, AutoTokenizer, LlamaConfig, LlamaForCausalLM
 
 from nemo.deploy.nlp.hf_deployable import HuggingFaceLLMDeploy
 
@@ -62,8 +62,8 @@ class TestHuggingFaceLLMDeploy:
         inputs = deployer.get_triton_input
         outputs = deployer.get_triton_output
 
-        assert len(inputs) == 10  # Verify number of input tensors
-        assert len(outputs) == 3  # Verify number of output tensors
+        assert len(inputs) == 12  # Verify number of input tensors
+        assert len(outputs) == 7  # Verify number of output tensors
 
         # Verify required input tensor names
         assert any(tensor.name == "prompts" for tensor in inputs)
@@ -73,3 +73,32 @@ class TestHuggingFaceLLMDeploy:
         assert any(tensor.name == "sentences" for tensor in outputs)
         assert any(tensor.name == "logits" for tensor in outputs)
         assert any(tensor.name == "scores" for tensor in outputs)
+        assert {"logits_fp16", "scores_fp16", "top_logprobs_ids", "top_logprobs_values"} <= {
+            tensor.name for tensor in outputs
+        }
+
+    def test_generate_with_continuous_batching(self):
+        model = LlamaForCausalLM(
+            LlamaConfig(
+                vocab_size=64,
+                hidden_size=16,
+                intermediate_size=32,
+                num_hidden_layers=1,
+                num_attention_heads=2,
+                num_key_value_heads=1,
+            )
+        ).eval()
+        model.generation_config.eos_token_id = None
+        tokenizer = MagicMock()
+        tokenizer.eos_token_id = None
+        tokenizer.side_effect = lambda text: {"input_ids": [ord(char) % 64 for char in text]}
+        tokenizer.decode.side_effect = lambda ids, skip_special_tokens: " ".join(map(str, ids))
+        deployer = HuggingFaceLLMDeploy(
+            model=model, tokenizer=tokenizer, task="text-generation", continuous_batching=True
+        )
+
+        output = deployer.generate(text_inputs=["ab", "abcd"], max_new_tokens=3, do_sample=False)
+        deployer.scheduler.stop()
+
+        assert [len(text.split()) for text in output] == [5, 7]
+        assert output[1].startswith("33 34 35 36 ")
@@ -102,8 +102,8 @@ def test_triton_input_output(deployable):
     inputs = deployable.get_triton_input
     outputs = deployable.get_triton_output
 
-    assert len(inputs) == 9  # Number of input tensors
-    assert len(outputs) == 2  # Number of output tensors
+    assert len(inputs) == 10  # Number of input tensors
+    assert len(outputs) == 4  # Number of output tensors
 
     # Check input tensor names
     input_names = [tensor.name for tensor in inputs]
@@ -115,3 +115,5 @@ def test_triton_input_output(deployable):
     output_names = [tensor.name for tensor in outputs]
     assert "sentences" in output_names
     assert "log_probs" in output_names
+    assert "log_probs_fp16" in output_names
+    assert "lengths" in output_names
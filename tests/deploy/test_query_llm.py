@@ -71,6 +71,51 @@ class TestNemoQueryLLMPyTorch:
         assert "logprobs" in response["choices"][0]
         assert "token_logprobs" in response["choices"][0]["logprobs"]
 
+    @patch('nemo.deploy.nlp.query_llm.ModelClient')
+    def test_query_llm_with_compact_logprobs(self, mock_client, query):
+        mock_instance = MagicMock()
+        mock_client.return_value.__enter__.return_value = mock_instance
+        mock_instance.infer_batch.return_value = {
+            "sentences": np.array([[b"first"], [b"second"]]),
+            "log_probs_fp16": np.array([[-0.5, -1.0, -2.0], [-0.25, 0.0, 0.0]], dtype=np.float16),
+            "lengths": np.array([[3], [1]], dtype=np.int32),
+        }
+        mock_instance.model_config.outputs = [MagicMock(dtype=np.bytes_)]
+
+        response = query.query_llm(prompts=["a", "b"], max_length=3, compute_logprob=True, compact_output=True)
+
+        inputs = mock_instance.infer_batch.call_args.kwargs
+        assert inputs["compact_output"].dtype == np.bool_ and inputs["compact_output"].all()
+        token_logprobs = response["choices"][0]["logprobs"]["token_logprobs"]
+        assert len(token_logprobs) == 2
+        np.testing.assert_array_equal(token_logprobs[0], np.array([-0.5, -1.0, -2.0], dtype=np.float32))
+        np.testing.assert_array_equal(token_logprobs[1], np.array([-0.25], dtype=np.float32))
+
+    @patch('nemo.deploy.nlp.query_llm.ModelClient')
+    def test_query_llm_keep_alive(self, mock_client):
+        mock_instance = mock_client.return_value
+        mock_instance.infer_batch.return_value = {"sentences": np.array([b"test response"])}
+        mock_instance.model_config.outputs = [MagicMock(dtype=np.bytes_)]
+
+        query = NemoQueryLLMPyTorch(url="localhost:8000", model_name="test-model", keep_alive=True)
+        for _ in range(3):
+            response = query.query_llm(prompts=["test prompt"], max_length=100)
+            assert response["choices"][0]["text"] == "test response"
+        assert mock_client.call_count == 1
+        assert mock_instance.infer_batch.call_count == 3
+
+        query.close()
+        mock_instance.close.assert_called_once()
+
+        # A failed query closes the client, so that the next query connects again
+        mock_instance.infer_batch.side_effect = RuntimeError("connection lost")
+        with pytest.raises(RuntimeError):
+            query.query_llm(prompts=["test prompt"], max_length=100)
+        assert mock_instance.close.call_count == 2
+        mock_instance.infer_batch.side_effect = None
+        query.query_llm(prompts=["test prompt"], max_length=100)
+        assert mock_client.call_count == 3
+
 
 class TestNemoQueryLLMHF:
     @pytest.fixture
@@ -113,6 +158,31 @@ class TestNemoQueryLLMHF:
 
         assert "logits" in response
 
+    @patch('nemo.deploy.nlp.query_llm.ModelClient')
+    def test_query_llm_with_compact_output(self, mock_client, query):
+        mock_instance = MagicMock()
+        mock_client.return_value.__enter__.return_value = mock_instance
+        logits = np.random.default_rng(0).standard_normal((2, 4, 16)).astype(np.float16)
+        mock_instance.infer_batch.return_value = {
+            "sentences": np.array([[b"first"], [b"second"]]),
+            "logits_fp16": logits,
+            "top_logprobs_ids": np.zeros((2, 4, 3), dtype=np.int32),
+            "top_logprobs_values": np.full((2, 4, 3), -0.5, dtype=np.float16),
+        }
+        mock_instance.model_config.outputs = [MagicMock(dtype=np.bytes_)]
+
+        response = query.query_llm(
+            prompts=["a", "b"], max_length=4, output_logits=True, compact_output=True, top_logprobs=3
+        )
+
+        inputs = mock_instance.infer_batch.call_args.kwargs
+        assert inputs["top_logprobs"].tolist() == [[3], [3]]
+        assert response["logits"].dtype == np.float32
+        np.testing.assert_array_equal(response["logits"], logits.astype(np.float32))
+        assert "scores" not in response
+        assert response["top_logprobs"]["token_ids"].shape == (2, 4, 3)
+        assert response["top_logprobs"]["logprobs"].dtype == np.float32
+
 
 class TestNemoQueryLLM:
     @pytest.fixture
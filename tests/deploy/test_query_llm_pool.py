@@ -0,0 +1,139 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from nemo.deploy.service.query_llm_pool import AsyncQueryLLMPool, QueryLLMCoalescer, split_query_output
+
+
+class StubQueryLLM:
+    """Client which returns the prompts in upper case, in the output format of NemoQueryLLMPyTorch"""
+
+    instances = []
+
+    def __init__(self, url, model_name, delay=0.01):
+        self.url = url
+        self.model_name = model_name
+        self.delay = delay
+        self.thread = threading.get_ident()
+        self.queries = []
+        self.closed = False
+        StubQueryLLM.instances.append(self)
+
+    def query_llm(self, prompts, init_timeout=None, **kwargs):
+        assert threading.get_ident() == self.thread
+        if prompts == ["fail"]:
+            raise RuntimeError("query failed")
+        self.queries.append((list(prompts), kwargs))
+        time.sleep(self.delay)
+        return {
+            "model": self.model_name,
+            "choices": [{"text": np.array([[prompt.upper()] for prompt in prompts])}],
+        }
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool():
+    StubQueryLLM.instances = []
+    pool = AsyncQueryLLMPool(url="localhost:8000", max_workers=2, query_factory=StubQueryLLM)
+    yield pool
+    pool.close()
+
+
+async def _gather_queries(query_fn, prompts, **kwargs):
+    return await asyncio.gather(*[query_fn("model", prompts=[prompt], **kwargs) for prompt in prompts])
+
+
+class TestAsyncQueryLLMPool:
+    @pytest.mark.unit
+    def test_clients_are_reused(self, pool):
+        prompts = [f"prompt {i}" for i in range(10)]
+        outputs = asyncio.run(_gather_queries(pool.query_llm, prompts, max_length=4))
+
+        assert [output["choices"][0]["text"][0][0] for output in outputs] == [prompt.upper() for prompt in prompts]
+        assert 1 <= len(StubQueryLLM.instances) <= 2
+        assert sum(len(query.queries) for query in StubQueryLLM.instances) == len(prompts)
+
+        pool.close()
+        assert all(query.closed for query in StubQueryLLM.instances)
+
+
+class TestQueryLLMCoalescer:
+    @pytest.mark.unit
+    def test_concurrent_queries_are_merged(self, pool):
+        coalescer = QueryLLMCoalescer(pool, window=0.05, max_batch_size=8)
+        prompts = [f"prompt {i}" for i in range(5)]
+        outputs = asyncio.run(_gather_queries(coalescer.query_llm, prompts, temperature=1.0, max_length=4))
+
+        for prompt, output in zip(prompts, outputs):
+            assert output["choices"][0]["text"].tolist() == [[prompt.upper()]]
+        queries = [query for instance in StubQueryLLM.instances for query in instance.queries]
+        assert queries == [(prompts, {"temperature": 1.0, "max_length": 4})]
+
+    @pytest.mark.unit
+    def test_max_batch_size(self, pool):
+        coalescer = QueryLLMCoalescer(pool, window=0.05, max_batch_size=2)
+        prompts = [f"prompt {i}" for i in range(5)]
+        outputs = asyncio.run(_gather_queries(coalescer.query_llm, prompts, max_length=4))
+
+        assert [output["choices"][0]["text"][0][0] for output in outputs] == [prompt.upper() for prompt in prompts]
+        queries = [query for instance in StubQueryLLM.instances for query in instance.queries]
+        assert sorted(len(query_prompts) for query_prompts, _ in queries) == [1, 2, 2]
+
+    @pytest.mark.unit
+    def test_incompatible_queries_are_not_merged(self, pool):
+        coalescer = QueryLLMCoalescer(pool, window=0.05, max_batch_size=8)
+
+        async def run_queries():
+            return await asyncio.gather(
+                coalescer.query_llm("model", prompts=["a"], temperature=1.0),
+                coalescer.query_llm("model", prompts=["b"], temperature=0.5),
+                coalescer.query_llm("model", prompts=["c"], temperature=1.0, compute_logprob=True),
+                coalescer.query_llm("model", prompts=["d"], temperature=1.0, compute_logprob=True),
+            )
+
+        outputs = asyncio.run(run_queries())
+        assert [output["choices"][0]["text"][0][0] for output in outputs] == ["A", "B", "C", "D"]
+        queries = [query for instance in StubQueryLLM.instances for query in instance.queries]
+        assert len(queries) == 4
+
+    @pytest.mark.unit
+    def test_errors_are_raised_for_all_merged_queries(self, pool):
+        coalescer = QueryLLMCoalescer(pool, window=0.05, max_batch_size=8)
+
+        async def run_queries():
+            return await asyncio.gather(
+                coalescer.query_llm("model", prompts=["fail"]),
+                coalescer.query_llm("model", prompts=["fail"], max_length=4),
+                return_exceptions=True,
+            )
+
+        outputs = asyncio.run(run_queries())
+        assert all(isinstance(output, RuntimeError) for output in outputs)
+
+    @pytest.mark.unit
+    def test_split_query_output(self):
+        output = {"model": "model", "choices": [{"text": np.array([["A"], ["B"], ["C"]])}]}
+        assert split_query_output(output, range(1, 3))["choices"][0]["text"].tolist() == [["B"], ["C"]]
+        assert output["choices"][0]["text"].shape == (3, 1)
+        assert split_query_output(np.array(["A", "B"]), range(1, 2)).tolist() == ["B"]
+        assert split_query_output("Unknown output keyword.", range(0, 1)) == "Unknown output keyword."
@@ -41,6 +41,7 @@ class TestEvaluateFunction(unittest.TestCase):
         self.eval_cfg.params.limit_samples = 100
         self.eval_cfg.params.num_fewshot = 4
         self.eval_cfg.params.bootstrap_iters = 1000
+        self.eval_cfg.params.extra = {}
 
     @patch('nemo.lightning.io.load_context')
     @patch('nemo.collections.llm.evaluation.base.wait_for_server_ready')
@@ -72,6 +73,7 @@ class TestEvaluateFunction(unittest.TestCase):
             top_p=0.9,
             top_k=50,
             add_bos=True,
+            group_by_prefix=False,
         )
         mock_simple_evaluate.assert_called_once_with(
             model="model",
@@ -0,0 +1,47 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from nemo.collections.llm.evaluation.prefix_grouping import group_requests_by_prefix
+
+
+class TestGroupRequestsByPrefix:
+    @pytest.mark.unit
+    def test_continuations_scored_by_longer_continuations(self):
+        context_encs = [[1, 2], [1, 2], [1, 2], [3], [1, 2]]
+        continuation_encs = [[5], [5, 6, 7], [8, 9], [5, 6], [5, 6]]
+        queries, sources = group_requests_by_prefix(context_encs, continuation_encs)
+
+        # The longest context comes first, and [5] and [5, 6] are prefixes of [5, 6, 7]
+        assert queries == [1, 2, 3]
+        assert sources == [1, 1, 2, 3, 1]
+
+    @pytest.mark.unit
+    def test_single_prediction_token(self):
+        context_encs = [[1, 2, 3], [1, 2, 3], [1, 2, 3], [1, 2, 3], [4, 5]]
+        continuation_encs = [[10], [11], [12], [13], [10]]
+        queries, sources = group_requests_by_prefix(context_encs, continuation_encs, single_prediction_token=True)
+
+        assert queries == [0, 4]
+        assert sources == [0, 0, 0, 0, 4]
+
+    @pytest.mark.unit
+    def test_single_prediction_token_needs_same_prompt(self):
+        context_encs = [[1], [1]]
+        continuation_encs = [[5, 6], [5, 6, 7]]
+        queries, sources = group_requests_by_prefix(context_encs, continuation_encs, single_prediction_token=True)
+
+        assert sorted(queries) == [0, 1]
+        assert sources == [0, 1]
@@ -12,10 +12,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from types import SimpleNamespace
+
 import pytest
+import torch
 from torch import nn
 
-from nemo.lightning.io.state import StateDictTransform, TransformCTX, state_transform
+from nemo.lightning.io.state import (
+    StateDictTransform,
+    TransformCTX,
+    TransformFns,
+    _get_key_index,
+    _match_keys,
+    _SafetensorsModelState,
+    apply_transforms,
+    state_transform,
+)
 
 
 class TestStateDictTransform:
@@ -272,6 +284,186 @@ class TestStateDictTransform:
             transform(mock_ctx)
 
 
+class TestMatchKeys:
+    """
+    Tests for matching key patterns against the keys of a state dict.
+    """
+
+    keys = [
+        "model.layers.10.mlp.experts.1.up_proj.weight",
+        "model.layers.2.mlp.experts.0.up_proj.weight",
+        "model.layers.2.mlp.experts.1.up_proj.weight",
+        "model.layers.10.mlp.experts.0.up_proj.weight",
+        "model.layers.2.self_attn.q_proj.weight",
+        "model.layers.2.self_attn.k_proj.weight",
+        "model.norm.weight",
+        None,
+    ]
+
+    def test_match_wildcards(self):
+        matches = _match_keys(self.keys, "model.layers.*.mlp.experts.*.up_proj.weight")
+        assert matches.shape == (2, 2)
+        assert matches[0, 1] == "model.layers.2.mlp.experts.1.up_proj.weight"
+        assert matches[1, 0] == "model.layers.10.mlp.experts.0.up_proj.weight"
+
+        matches = _match_keys(self.keys, "model.layers.2.self_attn.*_proj.weight")
+        assert matches.tolist() == ["model.layers.2.self_attn.k_proj.weight", "model.layers.2.self_attn.q_proj.weight"]
+
+    def test_match_double_wildcard(self):
+        matches = _match_keys(self.keys, "model.**.q_proj.weight")
+        assert matches.tolist() == ["model.layers.2.self_attn.q_proj.weight"]
+
+    def test_match_without_wildcards(self):
+        assert _match_keys(self.keys, "model.norm.weight").tolist() == ["model.norm.weight"]
+        assert _match_keys(self.keys, "model.norm.bias").tolist() == [None]
+
+    def test_key_index_is_shared_until_keys_change(self):
+        state = {key: 0 for key in self.keys if key is not None}
+        ctx = TransformCTX(source=nn.Module(), source_state=state, target=nn.Module(), target_state={})
+        key_index = _get_key_index(ctx, state)
+        assert _get_key_index(ctx, state) is key_index
+
+        state["model.layers.3.self_attn.q_proj.weight"] = 0
+        key_index = _get_key_index(ctx, state)
+        assert key_index.match("model.layers.*.self_attn.q_proj.weight").shape == (2,)
+
+
+class _TinyTargetModel(nn.Module):
+    """Module with the state dict layout of a NeMo Llama model, without Megatron"""
+
+    def __init__(self, config, device=None):
+        super().__init__()
+        self.config = config
+        hidden_size, ffn_hidden_size = config.hidden_size, config.ffn_hidden_size
+        qkv_size = config.kv_channels * (config.num_attention_heads + 2 * config.num_query_groups)
+        shapes = {
+            "embedding.word_embeddings.weight": (config.vocab_size, hidden_size),
+            "decoder.final_layernorm.weight": (hidden_size,),
+            "output_layer.weight": (config.vocab_size, hidden_size),
+        }
+        for layer in range(config.num_layers):
+            prefix = f"decoder.layers.{layer}"
+            shapes[f"{prefix}.self_attention.linear_qkv.weight"] = (qkv_size, hidden_size)
+            shapes[f"{prefix}.self_attention.linear_qkv.layer_norm_weight"] = (hidden_size,)
+            shapes[f"{prefix}.self_attention.linear_proj.weight"] = (hidden_size, hidden_size)
+            shapes[f"{prefix}.mlp.linear_fc1.weight"] = (2 * ffn_hidden_size, hidden_size)
+            shapes[f"{prefix}.mlp.linear_fc1.layer_norm_weight"] = (hidden_size,)
+            shapes[f"{prefix}.mlp.linear_fc2.weight"] = (hidden_size, ffn_hidden_size)
+        for key, shape in shapes.items():
+            module = self
+            for part in key.split(".")[:-1]:
+                if not hasattr(module, part):
+                    module.add_module(part, nn.Module())
+                module = getattr(module, part)
+            module.register_parameter(key.split(".")[-1], nn.Parameter(torch.zeros(shape, device=device)))
+
+
+class TestStreamTransforms:
+    """
+    Tests for converting checkpoints in safetensors format one file at a time.
+    """
+
+    mapping = {
+        "model.embed_tokens.weight": "embedding.word_embeddings.weight",
+        "model.layers.*.self_attn.o_proj.weight": "decoder.layers.*.self_attention.linear_proj.weight",
+        "model.layers.*.input_layernorm.weight": "decoder.layers.*.self_attention.linear_qkv.layer_norm_weight",
+        "model.layers.*.post_attention_layernorm.weight": "decoder.layers.*.mlp.linear_fc1.layer_norm_weight",
+        "model.layers.*.mlp.down_proj.weight": "decoder.layers.*.mlp.linear_fc2.weight",
+        "model.norm.weight": "decoder.final_layernorm.weight",
+        "lm_head.weight": "output_layer.weight",
+    }
+    transforms = [
+        state_transform(
+            source_key=(
+                "model.layers.*.self_attn.q_proj.weight",
+                "model.layers.*.self_attn.k_proj.weight",
+                "model.layers.*.self_attn.v_proj.weight",
+            ),
+            target_key="decoder.layers.*.self_attention.linear_qkv.weight",
+            fn=TransformFns.merge_qkv,
+        ),
+        state_transform(
+            source_key=("model.layers.*.mlp.gate_proj.weight", "model.layers.*.mlp.up_proj.weight"),
+            target_key="decoder.layers.*.mlp.linear_fc1.weight",
+            fn=TransformFns.merge_fc1,
+        ),
+    ]
+
+    @pytest.fixture
+    def source_model(self, tmp_path):
+        """
+        A tiny randomly initialized HF Llama model, saved in several safetensors files.
+        """
+        from transformers import LlamaConfig, LlamaForCausalLM
+
+        config = LlamaConfig(
+            vocab_size=64,
+            hidden_size=16,
+            intermediate_size=32,
+            num_hidden_layers=2,
+            num_attention_heads=4,
+            num_key_value_heads=2,
+            tie_word_embeddings=False,
+        )
+        torch.manual_seed(0)
+        model = LlamaForCausalLM(config)
+        model.save_pretrained(tmp_path / "source", max_shard_size="4KB")
+        return model
+
+    @pytest.fixture
+    def target_config(self):
+        return SimpleNamespace(
+            vocab_size=64,
+            hidden_size=16,
+            ffn_hidden_size=32,
+            num_layers=2,
+            num_attention_heads=4,
+            num_query_groups=2,
+            kv_channels=4,
+        )
+
+    def test_apply_transforms_streamed(self, source_model, target_config, tmp_path):
+        expected = apply_transforms(source_model, _TinyTargetModel(target_config), self.mapping, self.transforms)
+
+        source = _SafetensorsModelState(tmp_path / "source", config=source_model.config)
+        assert len(source.files) > 1
+        for device in ["cpu", "meta"]:
+            target = apply_transforms(source, _TinyTargetModel(target_config, device), self.mapping, self.transforms)
+            assert target.state_dict().keys() == expected.state_dict().keys()
+            for key, tensor in target.state_dict().items():
+                torch.testing.assert_close(tensor, expected.state_dict()[key], rtol=0.0, atol=0.0)
+
+    def test_apply_transforms_streamed_config_dtype(self, source_model, target_config, tmp_path):
+        # The checkpoint is stored in float32, and converted to the dtype of its config
+        expected = apply_transforms(
+            source_model.to(torch.bfloat16),
+            _TinyTargetModel(target_config).to(torch.bfloat16),
+            self.mapping,
+            self.transforms,
+        )
+
+        source = _SafetensorsModelState(tmp_path / "source", config=SimpleNamespace(torch_dtype="bfloat16"))
+        assert source.dtype == torch.bfloat16
+        loaded_files = []
+        load_file_fn = source.load_file
+        source.load_file = lambda file, keys: loaded_files.append(file) or load_file_fn(file, keys)
+        for device in ["cpu", "meta"]:
+            target = _TinyTargetModel(target_config, device).to(torch.bfloat16)
+            target = apply_transforms(source, target, self.mapping, self.transforms)
+            for key, tensor in target.state_dict().items():
+                assert tensor.dtype == torch.bfloat16
+                torch.testing.assert_close(tensor, expected.state_dict()[key], rtol=0.0, atol=0.0)
+        assert loaded_files == 2 * list(source.files)
+
+    def test_missing_source_keys(self, source_model, target_config, tmp_path):
+        source = _SafetensorsModelState(tmp_path / "source", config=source_model.config)
+        for keys in source.files.values():
+            if "lm_head.weight" in keys:
+                keys.remove("lm_head.weight")
+        with pytest.raises(ValueError):
+            apply_transforms(source, _TinyTargetModel(target_config), self.mapping, self.transforms)
+
+
 class TestStateTransformDecorator:
     """
     Tests for the @state_transform decorator functionality.